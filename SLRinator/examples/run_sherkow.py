@@ -318,9 +318,9 @@ def perform_sourcepull_with_redboxing():
             monitor.end_operation(op_id, success=False, error=str(e))
             print(f"  ❌ Error: {e}")
     
-    # Update spreadsheet
+    # Update spreadsheet and its summary with one save
     print("\n📊 Updating Master Sheet...")
-    success = spreadsheet_manager.update_sourcepull_results(results)
+    success = spreadsheet_manager.apply_stage_results(sourcepull_results=results)
     if success:
         print("✅ Master Sheet updated successfully")
     
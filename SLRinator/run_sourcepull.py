@@ -15,6 +15,10 @@ from datetime import datetime
 sys.path.insert(0, str(Path(__file__).parent))
 
 from src.core.sourcepull_system import SourcepullSystem
+from src.core.sourcepull_queue import (
+    SourcepullQueue, enqueue_citations, process_job, queued_results, queue_report,
+    DEFAULT_LEASE, DONE, FAILED, MANUAL
+)
 from src.processors.footnote_extractor import extract_footnotes_from_docx
 
 
@@ -136,6 +140,15 @@ Examples:
   
   # Use custom API keys file
   python run_sourcepull.py --docx article.docx --config my_api_keys.json
+  
+  # Resume an interrupted run: finished citations are not retrieved again
+  python run_sourcepull.py --docx article.docx
+  
+  # Add a second worker process to a running queue
+  python run_sourcepull.py --drain --queue output/data/Sourcepull/article.queue.db
+  
+  # Report on a queue while it is being worked on
+  python run_sourcepull.py --status --queue output/data/Sourcepull/article.queue.db
         """
     )
     
@@ -145,6 +158,10 @@ Examples:
     input_group.add_argument('--file', type=str, help='Text file with citations (one per line)')
     input_group.add_argument('--json', type=str, help='JSON file with citations')
     input_group.add_argument('--test', action='store_true', help='Run with test citations')
+    input_group.add_argument('--drain', action='store_true',
+                             help='Work on an existing queue (extra worker process)')
+    input_group.add_argument('--status', action='store_true',
+                             help='Write the report from an existing queue without processing')
     
     # Processing options
     parser.add_argument('--footnotes', type=str, help='Footnote range to process (e.g., "1-50" or "1,3,5-10")')
@@ -154,9 +171,17 @@ Examples:
                        help='Output directory for retrieved sources')
     parser.add_argument('--report', type=str, default='sourcepull_report.json',
                        help='Output filename for report')
+    parser.add_argument('--queue', type=str,
+                       help='Queue database (default: <output-dir>/<input name>.queue.db)')
+    parser.add_argument('--lease', type=float, default=DEFAULT_LEASE,
+                       help='Seconds before a dead worker\'s citation is handed to another worker')
+    parser.add_argument('--retry-failed', action='store_true',
+                       help='Retry citations that errored or need manual retrieval')
     parser.add_argument('--verbose', action='store_true', help='Verbose output')
     
     args = parser.parse_args()
+    if (args.drain or args.status) and not args.queue:
+        parser.error("--drain and --status require --queue")
     
     print_banner()
     
@@ -216,7 +241,7 @@ Examples:
             print(f"Error loading JSON: {e}")
             return 1
     
-    if not citations:
+    if not citations and not (args.drain or args.status):
         print("No citations to process")
         return 1
     
@@ -231,39 +256,54 @@ Examples:
         print(f"Error initializing system: {e}")
         return 1
     
-    # Process citations
-    print(f"\nProcessing {len(citations)} citations...")
-    print("-" * 60)
+    # Queue the citations; ones already in the queue (from an earlier run) are kept as they are
+    input_name = Path(args.docx or args.file or args.json or "test").stem
+    queue_path = Path(args.queue) if args.queue else Path(args.output_dir) / f"{input_name}.queue.db"
+    queue = SourcepullQueue(queue_path)
     
-    results = []
-    for i, (fn_num, citation_text) in enumerate(citations, 1):
-        if args.verbose:
-            print(f"\n[{i}/{len(citations)}] FN{fn_num}: {citation_text[:80]}...")
-        else:
-            print(f"  [{i}/{len(citations)}] Processing FN{fn_num}...", end="")
+    if citations:
+        added = enqueue_citations(queue, system, [(fn, text, {}) for fn, text in citations])
+        print(f"\nQueue: {queue_path} ({added} new sources)")
+    if args.retry_failed:
+        print(f"  Retrying {queue.requeue((FAILED, MANUAL))} failed sources")
+    
+    counts = queue.counts()
+    finished = counts[DONE] + counts[MANUAL]
+    total = sum(counts.values())
+    if finished:
+        print(f"  Resuming: {finished}/{total} sources already processed")
+    
+    # Process citations
+    if not args.status:
+        print(f"\nProcessing {total - finished} sources...")
+        print("-" * 60)
         
-        try:
-            result = system.process_citation(fn_num, citation_text)
-            results.append(result)
-            
+        def handle(job):
             if args.verbose:
-                print(f"  → Type: {result.source_type.value}")
-                print(f"  → Status: {result.final_status}")
-                if result.final_file_path:
-                    print(f"  → File: {Path(result.final_file_path).name}")
+                print(f"\nFN{job.footnote_number}: {job.citation_text[:80]}...")
             else:
-                status_symbol = "✓" if result.final_status == "success" else "✗"
-                print(f" {status_symbol}")
-                
-        except Exception as e:
-            print(f" Error: {e}")
+                print(f"  Processing FN{job.footnote_number}...", end="", flush=True)
+            
+            state, result = process_job(system, job)
+            
             if args.verbose:
-                import traceback
-                traceback.print_exc()
+                print(f"  → Type: {result['source_type']}")
+                print(f"  → Status: {result['final_status']}")
+                if result['final_file_path']:
+                    print(f"  → File: {Path(result['final_file_path']).name}")
+            else:
+                print(f" {'✓' if state == DONE else '✗'}")
+            return state, result
+        
+        try:
+            queue.drain(handle, lease_seconds=args.lease)
+        except KeyboardInterrupt:
+            print("\nInterrupted; finished sources are saved. Re-run the same command to resume.")
     
-    # Generate and save report
+    # Generate and save report (from the queue, so it covers every worker's results)
     print("\nGenerating report...")
-    report = system.generate_report(results)
+    results = queued_results(queue)
+    report = queue_report(queue, system)
     report_path = system.save_report(report, args.report)
     print(f"  Report saved to: {report_path}")
     
@@ -301,7 +341,11 @@ Examples:
         
         print(f"\n📋 Manual retrieval list saved to: {manual_list_path}")
     
-    print("\n✅ Sourcepull process complete!")
+    remaining = report['queue']['remaining']
+    if remaining:
+        print(f"\n⏳ {remaining} sources still queued or in progress")
+    else:
+        print("\n✅ Sourcepull process complete!")
     return 0
 
 
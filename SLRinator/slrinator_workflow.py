@@ -4,11 +4,17 @@ SLRinator Complete Workflow
 1. Intake DOCX file
 2. Parse footnotes with GPT-5
 3. Run sourcepull with proper naming
+4. Optionally redbox each retrieved PDF
+Steps 2-4 run concurrently: sources are retrieved as soon as their footnote is parsed.
 """
 
 import sys
 import json
+import hashlib
 import argparse
+import threading
+import importlib.util
+from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
@@ -18,9 +24,15 @@ import logging
 sys.path.insert(0, str(Path(__file__).parent))
 
 from src.processors.footnote_extractor import extract_footnotes_from_docx
-from src.core.gpt_citation_parser import GPTCitationParser, ParsedFootnote, ParsedCitation
-from src.core.sourcepull_system import SourcepullSystem
-from src.core.source_identifier import CitationComponents, SourceType
+from src.core.gpt_citation_parser import ParsedFootnote, ParsedCitation
+from src.core.citation_cascade import CascadingCitationParser
+from src.core.sourcepull_system import SourcepullSystem, SourcepullResult
+from src.core.sourcepull_queue import (
+    SourcepullQueue, enqueue_citations, process_job, queue_report, default_worker_id,
+    DEFAULT_LEASE, FINISHED, PENDING, IN_FLIGHT, DONE
+)
+from src.core.stage_pipeline import Stage, StagePipeline
+from src.core.source_identifier import CitationComponents
 
 
 def setup_logging():
@@ -96,18 +108,45 @@ def convert_parsed_to_components(citation: ParsedCitation) -> CitationComponents
     return components
 
 
+@dataclass
+class StreamSettings:
+    """Worker counts and queue sizes for the streaming workflow"""
+    parse_workers: int = 1       # Threads parsing footnote batches
+    parse_batch: int = 10        # Footnotes per batch (escalations share packed GPT requests)
+    retrieve_workers: int = 2    # Threads retrieving queued sources
+    redbox: bool = False         # Redbox each retrieved PDF into <output_dir>/Redboxed
+    redbox_workers: int = 2      # Redboxing processes (PyMuPDF is not thread-safe)
+    queue_size: int = 16         # Items waiting between two stages before the earlier one blocks
+
+
 def process_document(docx_path: str, 
                      footnote_range: Optional[str] = None,
                      use_gpt: bool = True,
-                     output_dir: str = "output/data/Sourcepull") -> Dict:
+                     output_dir: str = "output/data/Sourcepull",
+                     lease_seconds: float = DEFAULT_LEASE,
+                     report_only: bool = False,
+                     settings: Optional[StreamSettings] = None,
+                     system: Optional[SourcepullSystem] = None) -> Dict:
     """
-    Process a complete document through the SLRinator workflow
+    Process a complete document through the SLRinator workflow.
+    
+    Parsing, retrieval and redboxing run concurrently (see stream_document),
+    so the first sources arrive while later footnotes are still being parsed.
+    Progress is kept in <output_dir>/<document>.queue.db: re-running the same
+    command resumes where an interrupted run stopped, and further processes
+    started with the same arguments drain the queue alongside it. If the
+    document's content changed since the queue was built, the queue is reset
+    and the document parsed again.
     
     Args:
         docx_path: Path to the Word document
         footnote_range: Optional range of footnotes to process (e.g., "1-50")
         use_gpt: Whether to use GPT for parsing (requires API key)
         output_dir: Output directory for PDFs
+        lease_seconds: How long a dead worker's source stays claimed
+        report_only: Only write the report from the queue's current state
+        settings: Stage worker counts and queue sizes
+        system: Warm sourcepull system to share (the daemon's); a new one if None
         
     Returns:
         Dictionary with processing results
@@ -115,114 +154,48 @@ def process_document(docx_path: str,
     logger = setup_logging()
     logger.info(f"Starting SLRinator workflow for: {docx_path}")
     
-    # Step 1: Extract footnotes from DOCX
-    logger.info("Step 1: Extracting footnotes from document...")
-    footnotes = extract_footnotes_from_docx(docx_path)
-    
-    # Filter by range if specified
-    if footnote_range:
-        selected = parse_footnote_range(footnote_range)
-        footnotes = {fn: text for fn, text in footnotes.items() if fn in selected}
-    
-    logger.info(f"  Extracted {len(footnotes)} footnotes")
-    
-    # Step 2: Parse citations with GPT
-    logger.info("Step 2: Parsing citations with GPT-5...")
-    
-    if use_gpt:
-        parser = GPTCitationParser()
-        parsed_footnotes = parser.parse_footnotes_batch(footnotes)
-        
-        # Export parsed citations for review
-        parser.export_to_json(parsed_footnotes)
-    else:
-        # Use basic parsing
-        parser = GPTCitationParser()
-        parsed_footnotes = {}
-        for fn_num, fn_text in footnotes.items():
-            parsed_footnotes[fn_num] = parser._basic_parse(fn_num, fn_text)
-    
-    # Count total citations
-    total_citations = sum(len(pf.citations) for pf in parsed_footnotes.values())
-    logger.info(f"  Found {total_citations} citations across {len(parsed_footnotes)} footnotes")
-    
-    # Step 3: Run sourcepull for each citation
-    logger.info("Step 3: Running sourcepull...")
-    
-    system = SourcepullSystem()
-    results = []
-    source_counter = 1  # For SP-XXX numbering
-    
-    # Process each footnote's citations
-    for fn_num, parsed_fn in sorted(parsed_footnotes.items()):
-        for citation in parsed_fn.citations:
-            # Skip non-substantive citations
-            if citation.is_short_form or citation.citation_type in ["other", "unknown"]:
-                continue
-            
-            # Generate source ID and name
-            source_id = f"SP-{source_counter:03d}"
-            source_name = generate_source_name(citation)
-            
-            logger.info(f"  Processing {source_id}: {citation.citation_text[:50]}...")
-            
-            # Convert to components for sourcepull
-            components = convert_parsed_to_components(citation)
-            
-            # Map citation type to SourceType
-            source_type_map = {
-                "case": SourceType.UNKNOWN,  # Will be refined by identifier
-                "statute": SourceType.FEDERAL_STATUTE,
-                "regulation": SourceType.FEDERAL_REGULATION,
-                "article": SourceType.LAW_REVIEW_ARTICLE,
-                "book": SourceType.BOOK,
-                "website": SourceType.WEBSITE,
-                "legislative": SourceType.CONGRESSIONAL_RECORD,
-                "brief": SourceType.BRIEF,
-            }
-            
-            # Run sourcepull
-            result = system.process_citation(fn_num, citation.citation_text)
-            
-            # If successful, rename the file
-            if result.final_status == "success" and result.final_file_path:
-                old_path = Path(result.final_file_path)
-                new_filename = f"{source_id}-{source_name}.pdf"
-                new_path = old_path.parent / new_filename
-                
-                try:
-                    old_path.rename(new_path)
-                    result.final_file_path = str(new_path)
-                    logger.info(f"    ✓ Retrieved and saved as: {new_filename}")
-                except Exception as e:
-                    logger.error(f"    Error renaming file: {e}")
-            
-            # Store result with metadata
-            results.append({
-                "source_id": source_id,
-                "footnote": fn_num,
-                "citation": citation.citation_text,
-                "type": citation.citation_type,
-                "status": result.final_status,
-                "file": result.final_file_path,
-                "source_name": source_name
-            })
-            
-            source_counter += 1
+    system = system.for_document() if system is not None else SourcepullSystem()
+    queue = SourcepullQueue(Path(output_dir) / f"{Path(docx_path).stem}.queue.db")
+    digest = document_hash(docx_path)
+    queued_digest = queue.get_meta("document_hash")
+    if queued_digest not in (None, digest):
+        if report_only:
+            logger.warning(f"{Path(docx_path).name} changed since {queue.db_path} was built; reporting the old queue")
+        else:
+            removed = queue.reset()
+            logger.info(f"{Path(docx_path).name} changed since the last run: dropped {removed} queued sources")
+    if not report_only:
+        queue.set_meta("document_hash", digest)
+    
+    statistics = queue.get_meta("statistics", {})
+    if not report_only:
+        parsed = statistics.get("footnote_range") == (footnote_range or "all")
+        if parsed:
+            logger.info(f"Resuming from {queue.db_path}: footnotes already parsed and queued")
+        statistics = stream_document(queue, system, docx_path, footnote_range, use_gpt, output_dir,
+                                     lease_seconds, settings or StreamSettings(), logger, parse=not parsed)
     
     # Step 4: Generate summary report
     logger.info("Step 4: Generating report...")
     
+    results = queued_sources(queue, Path(output_dir) / "Redboxed")
+    sourcepull_report = queue_report(queue, system)
     report = {
         "document": str(Path(docx_path).name),
         "processed_at": datetime.now().isoformat(),
         "statistics": {
-            "total_footnotes": len(footnotes),
-            "total_citations": total_citations,
-            "sources_processed": len(results),
+            "total_footnotes": statistics.get("total_footnotes", 0),
+            "total_citations": statistics.get("total_citations", 0),
+            "sources_processed": sum(1 for r in results if r["status"] not in (PENDING, IN_FLIGHT)),
             "successful_retrievals": sum(1 for r in results if r["status"] == "success"),
-            "failed_retrievals": sum(1 for r in results if r["status"] == "failed")
+            "failed_retrievals": sum(1 for r in results if r["status"] == "failed"),
+            "redboxed": sum(1 for r in results if r.get("redboxed")),
+            "parsing": statistics.get("parsing", {}),
+            "deduplication": sourcepull_report["deduplication"],
+            "pipeline": statistics.get("pipeline", {}),
+            "redbox": statistics.get("redbox", {})
         },
+        "queue": sourcepull_report["queue"],
         "sources": results
     }
     
@@ -234,11 +207,289 @@ def process_document(docx_path: str,
     # Create spreadsheet-ready CSV
     create_sourcepull_spreadsheet(results, output_dir)
     
-    logger.info(f"✅ Workflow complete! Report saved to: {report_path}")
+    if report["queue"]["remaining"]:
+        logger.info(f"Report saved to: {report_path} ({report['queue']['remaining']} sources still queued)")
+    else:
+        logger.info(f"✅ Workflow complete! Report saved to: {report_path}")
     
     return report
 
 
+def stream_document(queue: SourcepullQueue, system: SourcepullSystem, docx_path: str,
+                    footnote_range: Optional[str], use_gpt: bool, output_dir: str,
+                    lease_seconds: float, settings: StreamSettings, logger, parse: bool = True) -> Dict:
+    """
+    Run the workflow as concurrent stages joined by bounded queues:
+    
+        parse    - footnote batches, rules first and GPT only where needed
+        queue    - each batch's sources into the durable queue, in footnote
+                   order whatever order batches finish in (job N becomes SP-N)
+        retrieve - claim queued sources and retrieve them
+        redbox   - redbox each retrieved PDF (settings.redbox)
+    
+    Sources left in the queue by an interrupted run, and retrieved PDFs not
+    yet redboxed, are fed straight to their stage. With parse=False the
+    footnotes are not read again.
+    
+    Returns:
+        The document's statistics, including per-stage pipeline stats
+    """
+    statistics = queue.get_meta("statistics", {})
+    footnotes: Dict[int, str] = {}
+    if parse:
+        # Step 1: Extract footnotes from DOCX
+        logger.info("Step 1: Extracting footnotes from document...")
+        footnotes = extract_footnotes_from_docx(docx_path)
+        
+        # Filter by range if specified
+        if footnote_range:
+            selected = parse_footnote_range(footnote_range)
+            footnotes = {fn: text for fn, text in footnotes.items() if fn in selected}
+        
+        logger.info(f"  Extracted {len(footnotes)} footnotes")
+    
+    redbox_dir = Path(output_dir) / "Redboxed"
+    redbox = settings.redbox and redbox_available(logger)
+    parser = CascadingCitationParser(use_gpt=use_gpt)
+    parsed_footnotes: Dict[int, ParsedFootnote] = {}
+    finished_batches: Dict[int, Dict[int, ParsedFootnote]] = {}
+    next_batch = [0]
+    worker_id = default_worker_id()
+    
+    def batches():
+        ordered = sorted(footnotes.items())
+        for index, start in enumerate(range(0, len(ordered), settings.parse_batch)):
+            yield index, dict(ordered[start:start + settings.parse_batch])
+    
+    def parse_batch(item):
+        """A batch that fails to parse is passed on empty, so the batches after it are still queued"""
+        index, batch = item
+        try:
+            return [(index, parser.parse_footnotes_batch(batch))]
+        except Exception as e:
+            logger.error(f"Parsing footnotes {min(batch)}-{max(batch)} failed: {e}")
+            return [(index, {})]
+    
+    def queue_batch(item):
+        """Single worker: queue finished batches in order; one retrieval token per new source"""
+        index, parsed = item
+        finished_batches[index] = parsed
+        added = 0
+        while next_batch[0] in finished_batches:
+            parsed = finished_batches.pop(next_batch[0])
+            parsed_footnotes.update(parsed)
+            added += enqueue_citations(queue, system, source_citations(parsed))
+            next_batch[0] += 1
+        return [None] * added
+    
+    def retrieve(_token):
+        """Claim one queued source and retrieve it, retrying errors until it finishes or fails for good"""
+        lease_owner = f"{worker_id}/{threading.current_thread().name}"
+        while True:
+            job = queue.claim(lease_owner, lease_seconds)
+            if job is None:
+                return None
+            try:
+                with queue.keep_alive(job, lease_seconds):
+                    state, result = retrieve_source(system, job, logger)
+            except Exception as e:
+                logger.error(f"FN{job.footnote_number} attempt {job.attempts} failed: {e}")
+                queue.fail(job, f"{type(e).__name__}: {e}")
+                continue
+            saved = queue.complete(job, state, result)
+            if saved and redbox and state == DONE and result.get("final_file_path"):
+                return [(job, result)]
+            return None
+    
+    redboxer = None
+    if redbox:
+        from src.stage1.batch_redboxer import BatchRedboxer, MANIFEST_NAME
+        redboxer = BatchRedboxer({"redbox_workers": settings.redbox_workers}, redbox_dir / MANIFEST_NAME)
+    
+    def redbox_pdf(item):
+        job, result = item
+        outcome = redboxer.redbox(redbox_job(job.payload["type"], result, redbox_dir))
+        if not outcome["success"]:
+            raise RuntimeError(f"could not redbox {result['final_file_path']}: {outcome['error']}")
+        logger.info(f"    ✓ Redboxed {Path(outcome['output_path']).name}")
+        return [Path(outcome["output_path"])]
+    
+    stages = [
+        Stage("parse", parse_batch, settings.parse_workers, settings.queue_size),
+        Stage("queue", queue_batch, 1, settings.queue_size),
+        Stage("retrieve", retrieve, settings.retrieve_workers, settings.queue_size),
+    ]
+    if redbox:
+        stages.append(Stage("redbox", redbox_pdf, settings.redbox_workers, settings.queue_size))
+    
+    # Work an interrupted run left behind
+    counts = queue.counts()
+    inject = {"retrieve": [None] * (counts[PENDING] + counts[IN_FLIGHT])}
+    if redbox:
+        inject["redbox"] = [
+            (job, job.result) for job in queue.jobs((DONE,))
+            if job.result.get("final_file_path") and Path(job.result["final_file_path"]).exists()
+            and not (redbox_dir / Path(job.result["final_file_path"]).name).exists()
+        ]
+    
+    logger.info("Steps 2-3: Parsing citations and running sourcepull "
+                f"({settings.parse_workers} parse, {settings.retrieve_workers} retrieval"
+                + (f", {settings.redbox_workers} redbox" if redbox else "") + " workers)...")
+    pipeline = StagePipeline(stages)
+    try:
+        summary = pipeline.run(batches(), inject)
+    finally:
+        if redboxer:
+            redboxer.close()
+    
+    # Retries and sources other workers handed back after the last token was used
+    queue.drain(lambda job: retrieve_source(system, job, logger), lease_seconds=lease_seconds)
+    
+    first = summary["first_result_seconds"]
+    logger.info(f"  Pipeline finished in {summary['elapsed_seconds']:.1f}s"
+                + (f", first {stages[-1].name} result after {first:.1f}s" if first is not None else "")
+                + f"; bottleneck: {summary['bottleneck']}")
+    
+    if parse:
+        total_citations = sum(len(pf.citations) for pf in parsed_footnotes.values())
+        logger.info(f"  Found {total_citations} citations across {len(parsed_footnotes)} footnotes")
+        if use_gpt:
+            # Export parsed citations for review
+            parser.export_to_json(dict(sorted(parsed_footnotes.items())))
+        statistics = {
+            "footnote_range": footnote_range or "all",
+            "total_footnotes": len(footnotes),
+            "total_citations": total_citations,
+            "parsing": parser.get_statistics()
+        }
+        if len(parsed_footnotes) < len(footnotes):
+            # A batch failed: leave the document unmarked so the next run parses it again
+            statistics.pop("footnote_range")
+    statistics["pipeline"] = summary
+    if redboxer:
+        statistics["redbox"] = redboxer.summary()
+        logger.info(f"  Redboxed {statistics['redbox']['processed']} PDFs at "
+                    f"{statistics['redbox']['pages_per_second']} pages/sec; {statistics['redbox']['skipped']} already boxed")
+    queue.set_meta("statistics", statistics)
+    return statistics
+
+
+def document_hash(docx_path: str) -> str:
+    """SHA-256 of the document's bytes, to tell an edited document from the one a queue was built from"""
+    digest = hashlib.sha256()
+    with open(docx_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_citations(parsed_footnotes: Dict[int, ParsedFootnote]) -> List[Tuple[int, str, Dict]]:
+    """(footnote, citation, payload) for each substantive citation, in footnote order"""
+    citations = []
+    for fn_num, parsed_fn in sorted(parsed_footnotes.items()):
+        for citation in parsed_fn.citations:
+            # Skip non-substantive citations
+            if citation.is_short_form or citation.citation_type in ["other", "unknown"]:
+                continue
+            citations.append((fn_num, citation.citation_text, {
+                "type": citation.citation_type,
+                "source_name": generate_source_name(citation)
+            }))
+    return citations
+
+
+def retrieve_source(system: SourcepullSystem, job, logger) -> Tuple[str, Dict]:
+    """Drain handler: retrieve one queued source and name its PDF after its SP number"""
+    source_id = f"SP-{job.job_id:03d}"
+    logger.info(f"  Processing {source_id}: {job.citation_text[:50]}...")
+    
+    state, result = process_job(system, job)
+    
+    # If successful, rename the file
+    if result["final_status"] == "success" and result["final_file_path"]:
+        old_path = Path(result["final_file_path"])
+        new_filename = f"{source_id}-{job.payload['source_name']}.pdf"
+        new_path = old_path.parent / new_filename
+        
+        try:
+            old_path.rename(new_path)
+            result["final_file_path"] = str(new_path)
+            logger.info(f"    ✓ Retrieved and saved as: {new_filename}")
+        except Exception as e:
+            logger.error(f"    Error renaming file: {e}")
+    
+    return state, result
+
+
+def redbox_available(logger) -> bool:
+    if importlib.util.find_spec("fitz") is None:
+        logger.warning("PyMuPDF not installed (pip install PyMuPDF); skipping redboxing")
+        return False
+    return True
+
+
+def redbox_job(citation_type: str, result: Dict, redbox_dir: Path):
+    """BatchRedboxer job boxing a retrieved source's PDF into redbox_dir"""
+    from src.stage1.batch_redboxer import RedboxJob, TEXT_CACHE_NAME
+    
+    return RedboxJob(
+        input_path=result["final_file_path"],
+        output_path=str(redbox_dir / Path(result["final_file_path"]).name),
+        citation_type=citation_type,
+        citation_data=redbox_terms(citation_type, result["components"]),
+        text_cache_dir=str(redbox_dir / TEXT_CACHE_NAME)
+    )
+
+
+def redbox_terms(citation_type: str, components: Dict) -> Dict:
+    """SmartRedboxer citation data from a sourcepull result's components"""
+    data = {key: components.get(key) for key in
+            ("party1", "party2", "volume", "reporter", "page", "year", "section", "author", "journal")}
+    data["title"] = components.get("title_number") if citation_type == "statute" else components.get("article_title")
+    return {key: value for key, value in data.items() if value}
+
+
+def queued_sources(queue: SourcepullQueue, redbox_dir: Optional[Path] = None) -> List[Dict]:
+    """Report rows for every queued citation; unfinished ones show their queue state"""
+    results = []
+    for job in queue.jobs():
+        source_id = f"SP-{job.job_id:03d}"
+        if job.state in FINISHED:
+            result = SourcepullResult.from_dict(job.result)
+            status, file_path = result.final_status, result.final_file_path
+        else:
+            status, file_path = job.state, None
+        redboxed = redbox_dir / Path(file_path).name if redbox_dir and file_path else None
+        
+        results.append({
+            "source_id": source_id,
+            "footnote": job.footnote_number,
+            "citation": job.citation_text,
+            "type": job.payload["type"],
+            "status": status,
+            "file": file_path,
+            "source_name": job.payload["source_name"]
+        })
+        if redboxed and redboxed.exists():
+            results[-1]["redboxed"] = str(redboxed)
+        for repeat in job.payload.get("repeats", []):
+            # Same source cited again: shares the first citation's SP number and PDF
+            results.append({
+                "source_id": source_id,
+                "footnote": repeat["footnote"],
+                "citation": repeat["citation"],
+                "type": repeat["type"],
+                "status": status,
+                "file": file_path,
+                "source_name": repeat["source_name"],
+                "reused_from": job.footnote_number
+            })
+            if redboxed and redboxed.exists():
+                results[-1]["redboxed"] = str(redboxed)
+    
+    return sorted(results, key=lambda r: r["footnote"])
+
+
 def create_sourcepull_spreadsheet(results: List[Dict], output_dir: str):
     """Create a CSV file ready for import to Google Sheets"""
     import csv
@@ -310,6 +561,15 @@ Examples:
   
   # Custom output directory
   python slrinator_workflow.py article.docx --output ~/Desktop/Sourcepull
+  
+  # Resume after an interruption, or add a worker to a running job: same command
+  python slrinator_workflow.py article.docx
+  
+  # Report progress without processing anything
+  python slrinator_workflow.py article.docx --report-only
+  
+  # Redbox sources as they arrive; more retrieval workers
+  python slrinator_workflow.py article.docx --redbox --retrieve-workers 4
         """
     )
     
@@ -320,6 +580,22 @@ Examples:
                        help='Output directory for PDFs')
     parser.add_argument('--config', type=str, default='config/api_keys.json',
                        help='Path to API keys configuration')
+    parser.add_argument('--lease', type=float, default=DEFAULT_LEASE,
+                       help='Seconds before a dead worker\'s source is handed to another worker')
+    parser.add_argument('--report-only', action='store_true',
+                       help='Write the report from the queue without processing')
+    parser.add_argument('--redbox', action='store_true',
+                       help='Redbox each retrieved PDF into <output>/Redboxed')
+    parser.add_argument('--parse-workers', type=int, default=1,
+                       help='Threads parsing footnote batches')
+    parser.add_argument('--parse-batch', type=int, default=10,
+                       help='Footnotes per parsing batch')
+    parser.add_argument('--retrieve-workers', type=int, default=2,
+                       help='Threads retrieving sources')
+    parser.add_argument('--redbox-workers', type=int, default=2,
+                       help='Processes redboxing PDFs')
+    parser.add_argument('--queue-size', type=int, default=16,
+                       help='Items waiting between two stages before the earlier stage pauses')
     
     args = parser.parse_args()
     
@@ -339,7 +615,17 @@ Examples:
             docx_path=args.docx,
             footnote_range=args.footnotes,
             use_gpt=not args.no_gpt,
-            output_dir=args.output
+            output_dir=args.output,
+            lease_seconds=args.lease,
+            report_only=args.report_only,
+            settings=StreamSettings(
+                parse_workers=args.parse_workers,
+                parse_batch=args.parse_batch,
+                retrieve_workers=args.retrieve_workers,
+                redbox=args.redbox,
+                redbox_workers=args.redbox_workers,
+                queue_size=args.queue_size
+            )
         )
         
         # Print summary
@@ -355,6 +641,11 @@ Examples:
                        if report['statistics']['sources_processed'] > 0 else 0)
         print(f"Success Rate: {success_rate:.1f}%")
         
+        pipeline = report['statistics']['pipeline']
+        if pipeline.get('first_result_seconds') is not None:
+            print(f"First Result: {pipeline['first_result_seconds']:.1f}s "
+                  f"(total {pipeline['elapsed_seconds']:.1f}s, bottleneck: {pipeline['bottleneck']})")
+        
         print(f"\nOutput Directory: {args.output}")
         print(f"Report: {args.output}/sourcepull_report.json")
         print(f"Spreadsheet: {args.output}/sourcepull_spreadsheet.csv")
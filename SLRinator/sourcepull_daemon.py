@@ -0,0 +1,427 @@
+#!/usr/bin/env python3
+"""
+SLRinator Sourcepull Daemon
+Keeps one warm SourcepullSystem (HTTP session and circuit breakers, learned
+strategy order, negative cache) and runs documents submitted over local HTTP
+(TCP on localhost or a Unix socket) through the streaming workflow.
+
+    python sourcepull_daemon.py serve [--socket /tmp/sourcepull.sock | --port 8766] [--jobs 2]
+    python sourcepull_daemon.py submit article.docx [--footnotes 1-50] [--redbox]
+    python sourcepull_daemon.py status [JOB_ID]
+
+Endpoints: POST /jobs, GET /jobs, GET /jobs/<id>, GET /status
+
+Up to --jobs documents run at once; queued documents start in turn per user.
+Every document's GPT requests go through the process-wide "openai" rate
+limiter, which serves waiting requests in turn per user. Each document's
+queue, report and redboxed PDFs go to <output>/<document name>/.
+"""
+
+import sys
+import json
+import time
+import getpass
+import logging
+import socket
+import argparse
+import threading
+import http.client
+import socketserver
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.utils.retry_handler import get_rate_limiter, rate_limiter_stats, rate_limit_tenant, DEFAULT_TENANT
+
+logger = logging.getLogger("sourcepull.daemon")
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8766
+DEFAULT_OUTPUT = "output/data/Sourcepull"
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+@dataclass
+class Job:
+    """One document submitted to the daemon"""
+    job_id: int
+    user: str
+    document: str
+    spec: Dict[str, Any]
+    state: str = QUEUED
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    result: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        def stamp(value):
+            return datetime.fromtimestamp(value).isoformat(timespec="seconds") if value else None
+        return {
+            "id": self.job_id,
+            "user": self.user,
+            "document": self.document,
+            "state": self.state,
+            "spec": self.spec,
+            "submitted_at": stamp(self.submitted_at),
+            "started_at": stamp(self.started_at),
+            "finished_at": stamp(self.finished_at),
+            "error": self.error,
+            "result": self.result
+        }
+
+
+def job_from_spec(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Validate a submitted job
+
+    Keys: docx (required), footnotes, use_gpt, output, redbox, parse_workers,
+    retrieve_workers, user
+
+    Raises:
+        ValueError: Missing document or malformed values
+    """
+    if not isinstance(spec, dict) or not spec.get("docx"):
+        raise ValueError("docx is required")
+    docx = Path(spec["docx"]).expanduser().resolve()
+    if not docx.exists():
+        raise ValueError(f"docx not found: {docx}")
+    clean = {
+        "docx": str(docx),
+        "footnotes": spec.get("footnotes") or None,
+        "use_gpt": bool(spec.get("use_gpt", True)),
+        "output": str(Path(spec.get("output") or DEFAULT_OUTPUT) / docx.stem),
+        "redbox": bool(spec.get("redbox", False)),
+        "user": str(spec.get("user") or DEFAULT_TENANT)
+    }
+    for key, default in (("parse_workers", 1), ("retrieve_workers", 2)):
+        clean[key] = max(1, int(spec.get(key, default)))
+    if clean["footnotes"] is not None and not isinstance(clean["footnotes"], str):
+        raise ValueError('footnotes must be a range string such as "1-50"')
+    return clean
+
+
+class JobQueue:
+    """Runs documents on max_jobs worker threads, starting queued ones in turn per user"""
+
+    def __init__(self, runner: Callable[[Job], Dict[str, Any]], max_jobs: int = 2):
+        self.runner = runner
+        self.max_jobs = max(1, max_jobs)
+        self._jobs: "OrderedDict[int, Job]" = OrderedDict()
+        self._started_per_user: Counter = Counter()
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._threads = [threading.Thread(target=self._work, name=f"job-{n + 1}", daemon=True)
+                         for n in range(self.max_jobs)]
+
+    def start(self):
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, wait: bool = True):
+        """Stop taking queued jobs; with wait, let running ones finish first"""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if wait:
+            for thread in self._threads:
+                if thread.is_alive():
+                    thread.join()
+
+    def submit(self, spec: Dict[str, Any]) -> Job:
+        """
+        Queue a document
+
+        Raises:
+            ValueError: Invalid spec
+            RuntimeError: The same document is already queued or running
+        """
+        spec = job_from_spec(spec)
+        with self._cond:
+            if self._stopping:
+                raise RuntimeError("daemon is shutting down")
+            for job in self._jobs.values():
+                if job.spec["output"] == spec["output"] and job.state in (QUEUED, RUNNING):
+                    raise RuntimeError(f"{Path(spec['docx']).name} is already {job.state} as job {job.job_id}")
+            job = Job(len(self._jobs) + 1, spec.pop("user"), Path(spec["docx"]).name, spec)
+            self._jobs[job.job_id] = job
+            self._cond.notify()
+        logger.info(f"Queued job {job.job_id}: {job.document} for {job.user}")
+        return job
+
+    def get(self, job_id: int) -> Optional[Job]:
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> List[Job]:
+        with self._cond:
+            return list(self._jobs.values())
+
+    def counts(self) -> Dict[str, int]:
+        with self._cond:
+            counts = Counter(job.state for job in self._jobs.values())
+        return {state: counts[state] for state in (QUEUED, RUNNING, DONE, FAILED)}
+
+    def _next_job(self) -> Optional[Job]:
+        """Queued job of the user with the fewest running, then fewest started, jobs"""
+        running = Counter(job.user for job in self._jobs.values() if job.state == RUNNING)
+        queued = [job for job in self._jobs.values() if job.state == QUEUED]
+        if not queued:
+            return None
+        return min(queued, key=lambda job: (running[job.user], self._started_per_user[job.user], job.job_id))
+
+    def _work(self):
+        while True:
+            with self._cond:
+                job = self._next_job()
+                while job is None and not self._stopping:
+                    self._cond.wait()
+                    job = self._next_job()
+                if self._stopping:
+                    return
+                job.state = RUNNING
+                job.started_at = time.time()
+                self._started_per_user[job.user] += 1
+
+            logger.info(f"Starting job {job.job_id}: {job.document} for {job.user}")
+            try:
+                with rate_limit_tenant(job.user):
+                    result = self.runner(job)
+                state, error = DONE, None
+            except Exception as e:
+                logger.exception(f"Job {job.job_id} ({job.document}) failed")
+                result, state, error = {}, FAILED, f"{type(e).__name__}: {e}"
+
+            with self._cond:
+                job.result = result or {}
+                job.state, job.error = state, error
+                job.finished_at = time.time()
+                self._cond.notify_all()
+            logger.info(f"Job {job.job_id} {state} in {job.finished_at - job.started_at:.1f}s")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """JSON API over the daemon's JobQueue (self.server.daemon)"""
+
+    def do_GET(self):
+        daemon = self.server.daemon
+        parts = [part for part in self.path.split("?")[0].split("/") if part]
+        if parts == ["status"]:
+            return self._reply(200, daemon.status())
+        if parts == ["jobs"]:
+            return self._reply(200, {"jobs": [job.to_dict() for job in daemon.queue.jobs()]})
+        if len(parts) == 2 and parts[0] == "jobs" and parts[1].isdigit():
+            job = daemon.queue.get(int(parts[1]))
+            if job is None:
+                return self._reply(404, {"error": f"no job {parts[1]}"})
+            return self._reply(200, {"job": job.to_dict()})
+        self._reply(404, {"error": f"unknown path {self.path}"})
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/jobs":
+            return self._reply(404, {"error": f"unknown path {self.path}"})
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            job = self.server.daemon.queue.submit(json.loads(self.rfile.read(length) or b"{}"))
+        except ValueError as e:
+            return self._reply(400, {"error": str(e)})
+        except RuntimeError as e:
+            return self._reply(409, {"error": str(e)})
+        self._reply(202, {"job": job.to_dict()})
+
+    def _reply(self, status: int, body: Dict[str, Any]):
+        payload = json.dumps(body, indent=2).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        # Unix-socket clients have no address for the default access log
+        logger.debug(f"{self.command} {self.path}: " + format % args)
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class SourcepullDaemon:
+    """A JobQueue served over local HTTP"""
+
+    def __init__(self, runner: Callable[[Job], Dict[str, Any]], max_jobs: int = 2,
+                 status: Optional[Callable[[], Dict[str, Any]]] = None):
+        """
+        Args:
+            runner: Processes one job (see run_document)
+            max_jobs: Documents processed at once
+            status: Extra fields for GET /status
+        """
+        self.queue = JobQueue(runner, max_jobs)
+        self.extra_status = status
+        self.started = time.time()
+        self.server = None
+
+    def status(self) -> Dict[str, Any]:
+        status = {
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "max_jobs": self.queue.max_jobs,
+            "jobs": self.queue.counts(),
+            "rate_limiters": rate_limiter_stats()
+        }
+        if self.extra_status:
+            status.update(self.extra_status())
+        return status
+
+    def bind(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, socket_path: Optional[str] = None):
+        """Listen on a Unix socket if socket_path is given, else on host:port"""
+        if socket_path:
+            Path(socket_path).unlink(missing_ok=True)
+            self.server = UnixHTTPServer(socket_path, _Handler)
+        else:
+            self.server = ThreadingHTTPServer((host, port), _Handler)
+        self.server.daemon = self
+        return self.server
+
+    def serve_forever(self):
+        self.queue.start()
+        address = self.server.server_address
+        logger.info(f"Sourcepull daemon listening on {address if isinstance(address, str) else '%s:%s' % address[:2]}")
+        try:
+            self.server.serve_forever()
+        except KeyboardInterrupt:
+            logger.info("Shutting down; waiting for running jobs to finish")
+        finally:
+            self.close()
+
+    def close(self):
+        if self.server is not None:
+            self.server.server_close()
+            if isinstance(self.server, UnixHTTPServer):
+                Path(self.server.server_address).unlink(missing_ok=True)
+        self.queue.stop()
+
+
+def run_document(system) -> Callable[[Job], Dict[str, Any]]:
+    """Runner processing a job with the streaming workflow on the warm system"""
+    import slrinator_workflow as workflow
+
+    def run(job: Job) -> Dict[str, Any]:
+        spec = job.spec
+        report = workflow.process_document(
+            docx_path=spec["docx"],
+            footnote_range=spec["footnotes"],
+            use_gpt=spec["use_gpt"],
+            output_dir=spec["output"],
+            settings=workflow.StreamSettings(parse_workers=spec["parse_workers"],
+                                             retrieve_workers=spec["retrieve_workers"],
+                                             redbox=spec["redbox"]),
+            system=system
+        )
+        statistics = report["statistics"]
+        return {
+            "total_footnotes": statistics["total_footnotes"],
+            "sources_processed": statistics["sources_processed"],
+            "successful_retrievals": statistics["successful_retrievals"],
+            "failed_retrievals": statistics["failed_retrievals"],
+            "remaining": report["queue"]["remaining"],
+            "report": str(Path(spec["output"]) / "sourcepull_report.json")
+        }
+    return run
+
+
+def serve(args):
+    from src.core.sourcepull_system import SourcepullSystem
+
+    # Created first, so its rate holds for every GPT parser in the process
+    get_rate_limiter("openai", calls_per_second=args.gpt_rate, burst_size=args.gpt_burst)
+    system = SourcepullSystem(config_path=args.config)
+    daemon = SourcepullDaemon(run_document(system), args.jobs, status=lambda: {
+        "open_circuits": system.session.breakers.open_hosts()
+    })
+    daemon.bind(args.host, args.port, args.socket)
+    daemon.serve_forever()
+    return 0
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: float = 30):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+def request(method: str, path: str, body: Optional[Dict[str, Any]] = None, host: str = DEFAULT_HOST,
+            port: int = DEFAULT_PORT, socket_path: Optional[str] = None):
+    """Call the daemon's API; returns (HTTP status, decoded JSON)"""
+    connection = _UnixHTTPConnection(socket_path) if socket_path else http.client.HTTPConnection(host, port, timeout=30)
+    try:
+        payload = json.dumps(body).encode("utf-8") if body is not None else None
+        connection.request(method, path, body=payload, headers={"Content-Type": "application/json"})
+        response = connection.getresponse()
+        return response.status, json.loads(response.read() or b"{}")
+    finally:
+        connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SLRinator sourcepull daemon")
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--socket', default=None, help='Unix socket path (instead of host:port)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = commands.add_parser('serve', help='Run the daemon')
+    serve_parser.add_argument('--jobs', type=int, default=2, help='Documents processed at once')
+    serve_parser.add_argument('--config', default='config/api_keys.json', help='Path to API keys configuration')
+    serve_parser.add_argument('--gpt-rate', type=float, default=2.0,
+                              help='GPT requests per second shared by all documents')
+    serve_parser.add_argument('--gpt-burst', type=int, default=4)
+
+    submit_parser = commands.add_parser('submit', help='Queue a document')
+    submit_parser.add_argument('docx', help='Path to Word document')
+    submit_parser.add_argument('--footnotes', type=str, help='Footnote range (e.g., "1-50" or "1,3,5-10")')
+    submit_parser.add_argument('--no-gpt', dest='use_gpt', action='store_false', help='Disable GPT parsing')
+    submit_parser.add_argument('--output', type=str, default=DEFAULT_OUTPUT,
+                               help='Output directory (the document gets its own folder inside it)')
+    submit_parser.add_argument('--redbox', action='store_true', help='Redbox each retrieved PDF')
+    submit_parser.add_argument('--parse-workers', type=int, default=1)
+    submit_parser.add_argument('--retrieve-workers', type=int, default=2)
+    submit_parser.add_argument('--user', default=getpass.getuser())
+
+    status_parser = commands.add_parser('status', help='Daemon status, or one job\'s')
+    status_parser.add_argument('job_id', nargs='?', type=int)
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        return serve(args)
+
+    connection = {"host": args.host, "port": args.port, "socket_path": args.socket}
+    if args.command == 'submit':
+        spec = {key: value for key, value in vars(args).items()
+                if key in ("docx", "footnotes", "use_gpt", "output", "redbox", "parse_workers",
+                           "retrieve_workers", "user") and value is not None}
+        spec["docx"] = str(Path(spec["docx"]).resolve())
+        status, body = request("POST", "/jobs", spec, **connection)
+    else:
+        path = f"/jobs/{args.job_id}" if args.job_id else "/status"
+        status, body = request("GET", path, **connection)
+    print(json.dumps(body, indent=2))
+    return 0 if status < 400 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
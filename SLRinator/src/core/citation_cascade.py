@@ -0,0 +1,437 @@
+#!/usr/bin/env python3
+"""
+Tiered Citation Parser for Stanford Law Review
+Parses footnotes with the rule-based identifier first and escalates to GPT-5
+only when the deterministic result is incomplete
+"""
+
+import re
+import json
+import time
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any, Tuple
+
+from src.core.gpt_citation_parser import GPTCitationParser, ParsedFootnote, ParsedCitation
+from src.core.source_identifier import SourceIdentifier, SourceType, CitationComponents
+from src.core.footnote_packing import pack_footnotes
+
+logger = logging.getLogger(__name__)
+
+# Serializes memo writes of every parser in the process
+_memo_file_lock = threading.Lock()
+
+# Order matters: longer signals must be tried before their prefixes
+SIGNALS = [
+    "See, e.g.,", "See also", "See generally", "See", "But see", "But cf.", "Cf.",
+    "Compare", "Accord", "Contra", "E.g.,"
+]
+SIGNAL_PATTERN = re.compile(
+    r"^(" + "|".join(re.escape(s) for s in SIGNALS) + r")(?=[\s,])[\s,]*",
+    re.IGNORECASE
+)
+ID_PATTERN = re.compile(r"^Id\.(?:\s+at\s+([\w\-–,\s]+?))?\.?$", re.IGNORECASE)
+SUPRA_PATTERN = re.compile(r"\bsupra\s+notes?\s+(\d+)", re.IGNORECASE)
+
+# ParsedCitation type for each identified SourceType
+CITATION_TYPES = {
+    SourceType.SUPREME_COURT: "case",
+    SourceType.FEDERAL_APPELLATE: "case",
+    SourceType.FEDERAL_DISTRICT: "case",
+    SourceType.STATE_HIGH_COURT: "case",
+    SourceType.STATE_APPELLATE: "case",
+    SourceType.STATE_TRIAL: "case",
+    SourceType.FEDERAL_STATUTE: "statute",
+    SourceType.STATE_STATUTE: "statute",
+    SourceType.FEDERAL_REGULATION: "regulation",
+    SourceType.STATE_REGULATION: "regulation",
+    SourceType.LAW_REVIEW_ARTICLE: "article",
+    SourceType.BOOK: "book",
+    SourceType.TREATISE: "book",
+    SourceType.WEBSITE: "website",
+    SourceType.CONGRESSIONAL_RECORD: "legislative",
+    SourceType.HOUSE_REPORT: "legislative",
+    SourceType.SENATE_REPORT: "legislative",
+    SourceType.HEARING: "legislative",
+    SourceType.BRIEF: "brief",
+}
+
+# Fields a complete citation of each type must have
+REQUIRED_FIELDS = {
+    "case": ["party1", "party2", "volume", "reporter", "page", "year"],
+    "statute": ["title_number", "code_type", "section"],
+    "regulation": ["title_number", "code_type", "section"],
+    "article": ["author", "article_title", "volume", "journal", "page", "year"],
+    "book": ["author", "book_title", "year"],
+    "website": ["url"],
+}
+
+TIERS = ["short_form", "rules", "memo", "gpt", "basic"]
+
+
+def normalize_footnote_text(text: str) -> str:
+    """Normalize footnote text for memoization (quotes, dashes, whitespace, case)"""
+    text = text.replace("“", '"').replace("”", '"').replace("‘", "'").replace("’", "'")
+    text = text.replace("–", "-").replace("—", "-").replace(" ", " ")
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+def split_citation_sentences(text: str) -> List[str]:
+    """Split a footnote into citation segments at semicolons outside parentheses"""
+    segments = []
+    depth = 0
+    current = []
+    for ch in text:
+        if ch in "([":
+            depth += 1
+        elif ch in ")]" and depth:
+            depth -= 1
+        if ch == ";" and depth == 0:
+            segments.append("".join(current))
+            current = []
+        else:
+            current.append(ch)
+    segments.append("".join(current))
+    return [s.strip() for s in segments if s.strip()]
+
+
+@dataclass
+class CascadeStats:
+    """Per-tier hit counts and GPT usage for one parsing run"""
+    footnotes: int = 0
+    tier_hits: Dict[str, int] = field(default_factory=lambda: {tier: 0 for tier in TIERS})
+    gpt_calls: int = 0
+    gpt_seconds: float = 0.0
+    local_seconds: float = 0.0
+
+    def summary(self, assumed_gpt_seconds: float) -> Dict[str, Any]:
+        avg_gpt = self.gpt_seconds / self.gpt_calls if self.gpt_calls else assumed_gpt_seconds
+        avoided = self.tier_hits["short_form"] + self.tier_hits["rules"] + self.tier_hits["memo"]
+        return {
+            "footnotes": self.footnotes,
+            "tier_hits": dict(self.tier_hits),
+            "hit_rates": {tier: (hits / self.footnotes if self.footnotes else 0.0)
+                          for tier, hits in self.tier_hits.items()},
+            "gpt_calls": self.gpt_calls,
+            "gpt_seconds": round(self.gpt_seconds, 3),
+            "local_seconds": round(self.local_seconds, 3),
+            "gpt_calls_saved": avoided,
+            "estimated_seconds_saved": round(avoided * avg_gpt, 1),
+        }
+
+
+class CascadingCitationParser:
+    """
+    Parse footnotes deterministically first, and with GPT-5 only when needed
+
+    Tiers, in order:
+        short_form - footnotes made only of Id./supra references
+        rules      - SourceIdentifier on each citation sentence, accepted when
+                     every citation has the fields its type requires
+        memo       - an earlier GPT result for the same normalized text
+        gpt        - GPTCitationParser
+        basic      - best local result when GPT is unavailable or fails
+    """
+
+    def __init__(self, gpt_parser: Optional[GPTCitationParser] = None,
+                 use_gpt: bool = True,
+                 min_confidence: float = 0.8,
+                 memo_path: Optional[str] = "output/cache/gpt_citation_memo.json",
+                 assumed_gpt_seconds: float = 5.0,
+                 packed: bool = True,
+                 max_workers: int = 4):
+        """
+        Args:
+            gpt_parser: GPT parser to escalate to (defaults to a new GPTCitationParser)
+            use_gpt: Whether low-confidence footnotes may be sent to GPT
+            min_confidence: Rule-based results at or above this are accepted
+            memo_path: JSON file memoizing GPT results across runs (None to disable)
+            assumed_gpt_seconds: GPT latency assumed for savings estimates when
+                no GPT call was timed in this run
+            packed: Send escalated footnotes in packed multi-footnote requests
+            max_workers: Packed requests in flight at once
+        """
+        self.gpt_parser = gpt_parser or GPTCitationParser()
+        self.use_gpt = use_gpt and bool(self.gpt_parser.api_key)
+        self.min_confidence = min_confidence
+        self.memo_path = Path(memo_path) if memo_path else None
+        self.assumed_gpt_seconds = assumed_gpt_seconds
+        self.packed = packed
+        self.max_workers = max_workers
+
+        self.identifier = SourceIdentifier()
+        self.stats = CascadeStats()
+        self.memo: Dict[str, Dict[str, Any]] = self._load_memo()
+        self._memo_dirty = False
+        self._memo_lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Memo persistence
+    # ------------------------------------------------------------------
+
+    def _load_memo(self) -> Dict[str, Dict[str, Any]]:
+        if self.memo_path and self.memo_path.exists():
+            try:
+                with open(self.memo_path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable GPT memo {self.memo_path}: {e}")
+        return {}
+
+    def save_memo(self):
+        """Write new GPT results to the memo file"""
+        if not self.memo_path or not self._memo_dirty:
+            return
+        # Batches may be parsed on several threads, and documents by several parsers at
+        # once (daemon): one writer at a time, keeping entries other parsers saved
+        with self._memo_lock, _memo_file_lock:
+            self._memo_dirty = False
+            memo = {**self._load_memo(), **self.memo}
+            self.memo_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.memo_path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(memo, f)
+            tmp_path.replace(self.memo_path)
+
+    @staticmethod
+    def memo_key(footnote_text: str) -> str:
+        return hashlib.sha256(normalize_footnote_text(footnote_text).encode("utf-8")).hexdigest()
+
+    # ------------------------------------------------------------------
+    # Deterministic tiers
+    # ------------------------------------------------------------------
+
+    def _parse_short_form(self, segment: str) -> Optional[ParsedCitation]:
+        """Id. and supra references"""
+        text = segment.rstrip().rstrip(".") + "."
+        id_match = ID_PATTERN.match(text)
+        if id_match:
+            return ParsedCitation(citation_text=segment, citation_type="other",
+                                  pincite=(id_match.group(1) or None), is_short_form=True)
+
+        supra_match = SUPRA_PATTERN.search(segment)
+        if supra_match:
+            return ParsedCitation(citation_text=segment, citation_type="other", is_short_form=True,
+                                  refers_to_footnote=int(supra_match.group(1)))
+        return None
+
+    def _parse_rules(self, segment: str) -> ParsedCitation:
+        """Identify one citation sentence and score its field completeness"""
+        source_type, components = self.identifier.identify(segment.rstrip("."))
+        citation_type = CITATION_TYPES.get(source_type, "other")
+        citation = self._to_parsed(segment, citation_type, components)
+
+        required = REQUIRED_FIELDS.get(citation_type)
+        if required:
+            filled = sum(1 for name in required if getattr(citation, name))
+            citation.confidence = filled / len(required)
+        else:
+            # Identified but with no field checks (legislative, brief) or not identified
+            citation.confidence = 0.5 if citation_type != "other" else 0.0
+        return citation
+
+    @staticmethod
+    def _to_parsed(segment: str, citation_type: str, components: CitationComponents) -> ParsedCitation:
+        citation = ParsedCitation(
+            citation_text=segment,
+            citation_type=citation_type,
+            party1=components.party1,
+            party2=components.party2,
+            volume=components.volume,
+            reporter=components.reporter,
+            page=components.page,
+            pincite=components.pincite,
+            court=components.court or None,
+            year=components.year,
+            title_number=components.title_number,
+            code_type=components.code_name,
+            section=components.section,
+            author=components.author,
+            article_title=components.article_title,
+            book_title=components.book_title,
+            journal=components.journal,
+            publisher=components.publisher,
+            url=components.url,
+            database=components.database,
+            docket_number=components.docket_number,
+            document_type=components.document_type
+        )
+        if citation_type == "case" and citation.party1 and citation.party2:
+            citation.case_name = f"{citation.party1} v. {citation.party2}"
+        return citation
+
+    def _parse_locally(self, footnote_number: int, footnote_text: str) -> Tuple[ParsedFootnote, float, str]:
+        """
+        Run the deterministic tiers.
+
+        Returns:
+            (parsed footnote, confidence, tier) where confidence is that of the
+            weakest citation in the footnote
+        """
+        citations = []
+        signal_type = None
+        all_short = True
+
+        for i, segment in enumerate(split_citation_sentences(footnote_text)):
+            signal_match = SIGNAL_PATTERN.match(segment)
+            if signal_match:
+                if i == 0:
+                    signal_type = signal_match.group(1)
+                segment = segment[signal_match.end():]
+            if not segment:
+                continue
+
+            citation = self._parse_short_form(segment)
+            if citation is None:
+                all_short = False
+                citation = self._parse_rules(segment)
+            citations.append(citation)
+
+        parsed = ParsedFootnote(
+            footnote_number=footnote_number,
+            original_text=footnote_text,
+            citations=citations,
+            has_signal=signal_type is not None,
+            signal_type=signal_type
+        )
+        confidence = min((c.confidence for c in citations), default=0.0)
+        return parsed, confidence, ("short_form" if citations and all_short else "rules")
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def _parse_without_gpt(self, footnote_number: int,
+                           footnote_text: str) -> Tuple[Optional[ParsedFootnote], ParsedFootnote]:
+        """
+        Run the local tiers and the memo.
+
+        Returns:
+            (accepted result or None if GPT is needed, local parse)
+        """
+        self.stats.footnotes += 1
+
+        start = time.time()
+        local, confidence, tier = self._parse_locally(footnote_number, footnote_text)
+        self.stats.local_seconds += time.time() - start
+
+        if confidence >= self.min_confidence:
+            self.stats.tier_hits[tier] += 1
+            return local, local
+
+        memo_entry = self.memo.get(self.memo_key(footnote_text))
+        if memo_entry is not None:
+            self.stats.tier_hits["memo"] += 1
+            return self.gpt_parser.footnote_from_response(footnote_number, footnote_text, memo_entry), local
+
+        return None, local
+
+    def _accept_gpt(self, footnote_number: int, footnote_text: str,
+                    parsed_data: Dict[str, Any]) -> ParsedFootnote:
+        """Record a GPT result in the memo and convert it"""
+        self.memo[self.memo_key(footnote_text)] = parsed_data
+        self._memo_dirty = True
+        self.stats.tier_hits["gpt"] += 1
+        return self.gpt_parser.footnote_from_response(footnote_number, footnote_text, parsed_data)
+
+    def _parse_with_gpt(self, footnote_number: int, footnote_text: str) -> Optional[ParsedFootnote]:
+        """One single-footnote GPT request; None if it fails"""
+        start = time.time()
+        try:
+            self.stats.gpt_calls += 1
+            parsed_data = json.loads(self.gpt_parser._call_gpt(footnote_text))
+            return self._accept_gpt(footnote_number, footnote_text, parsed_data)
+        except Exception as e:
+            logger.error(f"Error parsing footnote {footnote_number} with GPT: {e}")
+            return None
+        finally:
+            self.stats.gpt_seconds += time.time() - start
+
+    def _fall_back(self, footnote_number: int, footnote_text: str, local: ParsedFootnote) -> ParsedFootnote:
+        """GPT unavailable or failed: keep whatever the rules recognized"""
+        self.stats.tier_hits["basic"] += 1
+        if any(c.citation_type != "other" or c.is_short_form for c in local.citations):
+            return local
+        return self.gpt_parser._basic_parse(footnote_number, footnote_text)
+
+    def parse_footnote(self, footnote_number: int, footnote_text: str) -> ParsedFootnote:
+        """
+        Parse a footnote, escalating to GPT only when the local parse is weak
+
+        Args:
+            footnote_number: The footnote number
+            footnote_text: The full text of the footnote
+
+        Returns:
+            ParsedFootnote with extracted citations
+        """
+        accepted, local = self._parse_without_gpt(footnote_number, footnote_text)
+        if accepted is not None:
+            return accepted
+
+        if self.use_gpt:
+            parsed = self._parse_with_gpt(footnote_number, footnote_text)
+            if parsed is not None:
+                return parsed
+
+        return self._fall_back(footnote_number, footnote_text, local)
+
+    def parse_footnotes_batch(self, footnotes: Dict[int, str]) -> Dict[int, ParsedFootnote]:
+        """
+        Parse multiple footnotes and log how each tier performed
+
+        Footnotes that need GPT are sent together as packed, concurrent
+        requests; any a packed response misses are retried one at a time.
+
+        Args:
+            footnotes: Dictionary mapping footnote numbers to text
+
+        Returns:
+            Dictionary mapping footnote numbers to ParsedFootnote objects
+        """
+        parsed = {}
+        escalate = {}
+        local_results = {}
+        for fn_num, fn_text in footnotes.items():
+            accepted, local = self._parse_without_gpt(fn_num, fn_text)
+            if accepted is not None:
+                parsed[fn_num] = accepted
+            else:
+                escalate[fn_num] = fn_text
+                local_results[fn_num] = local
+
+        if escalate and self.use_gpt and self.packed and len(escalate) > 1:
+            start = time.time()
+            self.stats.gpt_calls += len(pack_footnotes(sorted(escalate.items())))
+            entries = self.gpt_parser.request_packed(escalate, self.max_workers)
+            self.stats.gpt_seconds += time.time() - start
+            for fn_num, entry in entries.items():
+                parsed[fn_num] = self._accept_gpt(fn_num, escalate[fn_num], entry)
+
+        for fn_num, fn_text in escalate.items():
+            if fn_num in parsed:
+                continue
+            result = self._parse_with_gpt(fn_num, fn_text) if self.use_gpt else None
+            parsed[fn_num] = result or self._fall_back(fn_num, fn_text, local_results[fn_num])
+        self.save_memo()
+
+        summary = self.get_statistics()
+        logger.info(
+            f"Parsed {summary['footnotes']} footnotes: "
+            + ", ".join(f"{tier} {hits}" for tier, hits in summary["tier_hits"].items())
+            + f"; {summary['gpt_calls']} GPT calls ({summary['gpt_seconds']:.1f}s), "
+            f"~{summary['gpt_calls_saved']} calls / {summary['estimated_seconds_saved']:.0f}s saved"
+        )
+        return {fn_num: parsed[fn_num] for fn_num in footnotes}
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Per-tier hit rates and GPT calls/seconds saved for this run"""
+        return self.stats.summary(self.assumed_gpt_seconds)
+
+    def export_to_json(self, parsed_footnotes: Dict[int, ParsedFootnote],
+                       output_path: str = "output/data/parsed_citations.json"):
+        """Export parsed citations to JSON file"""
+        return self.gpt_parser.export_to_json(parsed_footnotes, output_path)
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Canonical Citation Keys for Stanford Law Review
+Names the authority behind a citation independent of signal, pincite and
+parentheticals, so repeated citations of one source share a single retrieval.
+Keys use the same format as the R2 pipeline's ("cite:573 u.s. 208"), so the
+two tools name a source the same way.
+"""
+
+import re
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+from src.core.source_identifier import SourceType, CitationComponents
+
+DOI_PATTERN = re.compile(r"\b(10\.\d{4,9}/[^\s,;()\"“”]+)", re.IGNORECASE)
+URL_TRAILING = ".,;:)]}\"'”’"
+SIGNAL_PREFIX = re.compile(r"^(?:see(?:\s+also|,?\s+e\.g\.)?|cf\.|accord|compare)[\s,]+", re.IGNORECASE)
+# Transcripts and briefs cite the case they were filed in; the document itself has no key
+FILING_PATTERN = re.compile(r"^(?:Transcript|Brief)\b[^,]*?\bat\s+\*?\d+", re.IGNORECASE)
+
+CASE_TYPES = {
+    SourceType.SUPREME_COURT, SourceType.FEDERAL_APPELLATE, SourceType.FEDERAL_DISTRICT,
+    SourceType.STATE_HIGH_COURT, SourceType.STATE_APPELLATE, SourceType.STATE_TRIAL,
+}
+
+
+def _squash(text: str) -> str:
+    """Lowercase with all whitespace removed ("F. Supp. 2d" -> "f.supp.2d")"""
+    return re.sub(r"\s+", "", text).lower()
+
+
+def normalize_url(url: str) -> str:
+    """Scheme-, www-, fragment- and trailing-slash-insensitive form of a URL"""
+    parts = urlsplit(url.strip().rstrip(URL_TRAILING))
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    path = parts.path.rstrip("/")
+    query = f"?{parts.query}" if parts.query else ""
+    return f"{host}{path}{query}"
+
+
+def canonical_key(source_type: SourceType, components: CitationComponents,
+                  citation_text: str = "") -> Optional[str]:
+    """
+    Canonical key for the authority a citation points to.
+
+    Returns:
+        e.g. "cite:573 u.s. 208", "usc:17 1202", "doi:10.1000/xyz", "url:example.com/a",
+        or None for transcripts, briefs and citations with nothing stable enough to key on
+    """
+    if FILING_PATTERN.match(SIGNAL_PREFIX.sub("", citation_text.replace("*", "").strip())):
+        return None
+
+    if source_type in CASE_TYPES and components.volume and components.reporter and components.page:
+        return f"cite:{components.volume} {_squash(components.reporter)} {components.page}"
+
+    if source_type == SourceType.FEDERAL_STATUTE and components.title_number and components.section:
+        # Subsections are pincites; the retrieved document is the section
+        base_section = re.match(r"[0-9a-zA-Z]+", components.section)
+        return f"usc:{components.title_number} {base_section.group(0).lower()}"
+
+    if source_type == SourceType.FEDERAL_REGULATION and components.title_number and components.section:
+        return f"cfr:{components.title_number} {components.section.lower()}"
+
+    doi = DOI_PATTERN.search(citation_text)
+    if doi:
+        return f"doi:{doi.group(1).rstrip(URL_TRAILING).lower()}"
+
+    if components.url:
+        return f"url:{normalize_url(components.url)}"
+
+    if components.volume and components.journal and components.page:
+        return f"cite:{components.volume} {_squash(components.journal)} {components.page}"
+
+    return None
+
+
+class DedupStats:
+    """Per-article counts of citations that shared an earlier retrieval"""
+
+    def __init__(self):
+        self.citations = 0
+        self.keyed = 0
+        self.reused = 0
+        self.unique_keys = set()
+
+    def record(self, key: Optional[str], reused: bool):
+        self.citations += 1
+        if key:
+            self.keyed += 1
+            self.unique_keys.add(key)
+        if reused:
+            self.reused += 1
+
+    def summary(self) -> Dict:
+        return {
+            "citations": self.citations,
+            "keyed_citations": self.keyed,
+            "unique_sources": len(self.unique_keys),
+            "reused_retrievals": self.reused,
+            "dedup_ratio": f"{(self.reused / self.citations * 100):.1f}%" if self.citations else "0%"
+        }
@@ -6,15 +6,19 @@ Parses footnotes into structured citation data using GPT
 
 import json
 import logging
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 from datetime import datetime
 import openai
 import os
 
 from src.utils.api_logger import log_api_usage
-from src.utils.retry_handler import retry_on_failure, RetryHandler
+from src.utils.retry_handler import retry_on_failure, RetryHandler, get_rate_limiter
 from src.utils.action_logger import get_action_logger
+from src.core.footnote_packing import (
+    PACKED_INSTRUCTIONS, pack_footnotes, packed_user_message,
+    extract_packed_entries, run_packed_requests
+)
 
 
 @dataclass
@@ -166,6 +170,38 @@ Do NOT leave case_name, volume, reporter, page, court, or year blank for case ci
         
         return response
     
+    def _make_packed_gpt_call(self, group: List[Tuple[int, str]]) -> str:
+        """One JSON-mode GPT call for a group of footnotes; returns the message text"""
+        if not self.api_available:
+            raise Exception("OpenAI API key not configured")
+        
+        response = self.client.chat.completions.create(
+            model="gpt-4o",
+            messages=[
+                {"role": "system", "content": self.system_prompt + "\n" + PACKED_INSTRUCTIONS},
+                {"role": "user", "content": packed_user_message(group)}
+            ],
+            max_tokens=min(16000, 200 + 800 * len(group)),
+            temperature=0,
+            response_format={"type": "json_object"}
+        )
+        
+        log_api_usage(
+            api_name="openai_gpt4o",
+            endpoint="https://api.openai.com/v1/chat/completions",
+            method="POST",
+            response_code=200,
+            success=True,
+            call_reason=f"Parse footnotes {group[0][0]}-{group[-1][0]} in one packed request",
+            retrieval_strategy="gpt_parsing_packed",
+            additional_metadata={
+                "footnotes_packed": len(group),
+                "tokens_used": response.usage.total_tokens if hasattr(response, 'usage') else None
+            }
+        )
+        
+        return response.choices[0].message.content
+    
     def parse_footnote(self, footnote_number: int, footnote_text: str) -> ParsedFootnote:
         """Parse a single footnote using GPT"""
         
@@ -255,48 +291,7 @@ Do NOT leave case_name, volume, reporter, page, court, or year blank for case ci
                 }
             )
             
-            # Convert to Citation objects
-            citations = []
-            for i, cite_data in enumerate(parsed_data.get("citations", [])):
-                citation = Citation(
-                    citation_id=cite_data.get("citation_id", f"fn{footnote_number}_{i}"),
-                    citation_type=cite_data.get("citation_type", "other"),
-                    full_text=cite_data.get("full_text", ""),
-                    case_name=cite_data.get("case_name"),
-                    plaintiff=cite_data.get("plaintiff"),
-                    defendant=cite_data.get("defendant"),
-                    volume=cite_data.get("volume"),
-                    reporter=cite_data.get("reporter"),
-                    page=cite_data.get("page"),
-                    pincite=cite_data.get("pincite"),
-                    court=cite_data.get("court"),
-                    year=cite_data.get("year"),
-                    title_number=cite_data.get("title_number"),
-                    code_name=cite_data.get("code_name"),
-                    section=cite_data.get("section"),
-                    subsection=cite_data.get("subsection"),
-                    author=cite_data.get("author"),
-                    title=cite_data.get("title"),
-                    journal=cite_data.get("journal"),
-                    book_title=cite_data.get("book_title"),
-                    publisher=cite_data.get("publisher"),
-                    volume_number=cite_data.get("volume_number"),
-                    url=cite_data.get("url"),
-                    doi=cite_data.get("doi"),
-                    isbn=cite_data.get("isbn"),
-                    retrieval_priority=cite_data.get("retrieval_priority", 1),
-                    notes=cite_data.get("notes")
-                )
-                citations.append(citation)
-            
-            return ParsedFootnote(
-                footnote_number=footnote_number,
-                original_text=footnote_text,
-                citations=citations,
-                parsing_confidence=parsed_data.get("parsing_confidence", 0.8),
-                gpt_reasoning=parsed_data.get("reasoning", ""),
-                parsed_at=datetime.now().isoformat()
-            )
+            return self._build_parsed_footnote(footnote_number, footnote_text, parsed_data)
             
         except Exception as e:
             # Log error with detailed context
@@ -339,16 +334,100 @@ Do NOT leave case_name, volume, reporter, page, court, or year blank for case ci
                 parsed_at=datetime.now().isoformat()
             )
     
-    def parse_multiple_footnotes(self, footnotes: List[tuple]) -> List[ParsedFootnote]:
-        """Parse multiple footnotes"""
-        results = []
+    def _build_parsed_footnote(self, footnote_number: int, footnote_text: str,
+                               parsed_data: Dict[str, Any]) -> ParsedFootnote:
+        """Convert GPT's JSON for one footnote into a ParsedFootnote"""
+        citations = []
+        for i, cite_data in enumerate(parsed_data.get("citations", [])):
+            citation = Citation(
+                citation_id=cite_data.get("citation_id", f"fn{footnote_number}_{i}"),
+                citation_type=cite_data.get("citation_type", "other"),
+                full_text=cite_data.get("full_text", ""),
+                case_name=cite_data.get("case_name"),
+                plaintiff=cite_data.get("plaintiff"),
+                defendant=cite_data.get("defendant"),
+                volume=cite_data.get("volume"),
+                reporter=cite_data.get("reporter"),
+                page=cite_data.get("page"),
+                pincite=cite_data.get("pincite"),
+                court=cite_data.get("court"),
+                year=cite_data.get("year"),
+                title_number=cite_data.get("title_number"),
+                code_name=cite_data.get("code_name"),
+                section=cite_data.get("section"),
+                subsection=cite_data.get("subsection"),
+                author=cite_data.get("author"),
+                title=cite_data.get("title"),
+                journal=cite_data.get("journal"),
+                book_title=cite_data.get("book_title"),
+                publisher=cite_data.get("publisher"),
+                volume_number=cite_data.get("volume_number"),
+                url=cite_data.get("url"),
+                doi=cite_data.get("doi"),
+                isbn=cite_data.get("isbn"),
+                retrieval_priority=cite_data.get("retrieval_priority", 1),
+                notes=cite_data.get("notes")
+            )
+            citations.append(citation)
+        
+        return ParsedFootnote(
+            footnote_number=footnote_number,
+            original_text=footnote_text,
+            citations=citations,
+            parsing_confidence=parsed_data.get("parsing_confidence", 0.8),
+            gpt_reasoning=parsed_data.get("reasoning", ""),
+            parsed_at=datetime.now().isoformat()
+        )
+    
+    @staticmethod
+    def _valid_entry(entry: Dict[str, Any]) -> bool:
+        """Check one footnote's result from a packed response"""
+        citations = entry.get("citations")
+        return isinstance(citations, list) and all(
+            isinstance(cite, dict) and isinstance(cite.get("full_text"), str)
+            for cite in citations
+        )
+    
+    def parse_multiple_footnotes(self, footnotes: List[tuple], packed: bool = True,
+                                 max_workers: int = 4, calls_per_second: float = 2.0) -> List[ParsedFootnote]:
+        """
+        Parse multiple footnotes
         
+        Args:
+            footnotes: (footnote_number, footnote_text) pairs
+            packed: Group short footnotes into concurrent multi-footnote
+                requests; anything a packed response misses is parsed singly
+            max_workers: Packed requests in flight at once
+            calls_per_second: Sustained request rate shared by all workers
+        """
+        parsed: Dict[int, ParsedFootnote] = {}
+        texts = dict(footnotes)
+        
+        if packed and self.api_available and len(footnotes) > 1:
+            groups = pack_footnotes(list(footnotes))
+            limiter = get_rate_limiter("openai_gpt4o", calls_per_second=calls_per_second,
+                                       burst_size=max_workers)
+            for group, response, error in run_packed_requests(groups, self._make_packed_gpt_call,
+                                                              max_workers, limiter):
+                if error is not None:
+                    continue
+                entries, missing = extract_packed_entries(response, group, self._valid_entry)
+                for footnote_number, entry in entries.items():
+                    parsed[footnote_number] = self._build_parsed_footnote(
+                        footnote_number, texts[footnote_number], entry)
+                if missing:
+                    self.logger.warning(f"Packed response omitted or garbled footnotes {missing}")
+            self.logger.info(f"Parsed {len(parsed)}/{len(footnotes)} footnotes in {len(groups)} packed requests")
+        
+        results = []
         for footnote_number, footnote_text in footnotes:
-            self.logger.info(f"Parsing footnote {footnote_number}...")
-            result = self.parse_footnote(footnote_number, footnote_text)
+            result = parsed.get(footnote_number)
+            if result is None:
+                self.logger.info(f"Parsing footnote {footnote_number}...")
+                result = self.parse_footnote(footnote_number, footnote_text)
             results.append(result)
             
             # Log progress
-            self.logger.info(f"  Found {len(result.citations)} citations with confidence {result.parsing_confidence:.2f}")
+            self.logger.info(f"  Footnote {footnote_number}: {len(result.citations)} citations with confidence {result.parsing_confidence:.2f}")
         
         return results
\ No newline at end of file
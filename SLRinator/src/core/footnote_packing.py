@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Packed GPT Requests for Stanford Law Review
+Groups many short footnotes into one JSON-mode request and runs the groups
+concurrently under a shared rate limiter
+"""
+
+import json
+import logging
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Characters of footnote text per packed request; keeps the response well
+# under the model's output limit
+MAX_PACKED_CHARS = 6000
+MAX_PACKED_FOOTNOTES = 25
+
+PACKED_INSTRUCTIONS = """
+You will receive a JSON object mapping footnote numbers to footnote text.
+Parse every footnote independently and return a JSON object of the form
+{"footnotes": {"<footnote number>": <result for that footnote>}}
+where each result has exactly the structure described above.
+Include every footnote number you were given, even if it has no citations."""
+
+
+def pack_footnotes(footnotes: List[Tuple[int, str]],
+                   max_chars: int = MAX_PACKED_CHARS,
+                   max_footnotes: int = MAX_PACKED_FOOTNOTES) -> List[List[Tuple[int, str]]]:
+    """
+    Group footnotes into packed requests, in footnote order.
+
+    A footnote longer than max_chars gets a request of its own.
+    """
+    groups: List[List[Tuple[int, str]]] = []
+    current: List[Tuple[int, str]] = []
+    size = 0
+
+    for number, text in footnotes:
+        if current and (size + len(text) > max_chars or len(current) >= max_footnotes):
+            groups.append(current)
+            current, size = [], 0
+        current.append((number, text))
+        size += len(text)
+
+    if current:
+        groups.append(current)
+    return groups
+
+
+def packed_user_message(group: List[Tuple[int, str]]) -> str:
+    """User message for one packed request"""
+    return "Parse these footnotes:\n" + json.dumps({str(number): text for number, text in group},
+                                                    ensure_ascii=False)
+
+
+def extract_packed_entries(response_text: str, group: List[Tuple[int, str]],
+                           validate: Callable[[Dict], bool]) -> Tuple[Dict[int, Dict], List[int]]:
+    """
+    Split a packed response into per-footnote entries.
+
+    Returns:
+        (entries keyed by footnote number, footnote numbers that were missing
+        or failed validation)
+    """
+    try:
+        data = json.loads(response_text)
+    except (TypeError, ValueError):
+        return {}, [number for number, _ in group]
+
+    results = data.get("footnotes", data) if isinstance(data, dict) else {}
+    if not isinstance(results, dict):
+        results = {}
+
+    entries: Dict[int, Dict] = {}
+    missing: List[int] = []
+    for number, _ in group:
+        entry = results.get(str(number))
+        if isinstance(entry, dict) and validate(entry):
+            entries[number] = entry
+        else:
+            missing.append(number)
+    return entries, missing
+
+
+def run_packed_requests(groups: List[List[Tuple[int, str]]],
+                        request: Callable[[List[Tuple[int, str]]], str],
+                        max_workers: int = 4,
+                        rate_limiter=None) -> Iterator[Tuple[List[Tuple[int, str]], Optional[str], Optional[Exception]]]:
+    """
+    Send packed requests concurrently.
+
+    Yields (group, response_text, error) as requests complete; exactly one of
+    response_text and error is set.
+    """
+    def send(group):
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        return request(group)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        # Each request runs in a copy of the caller's context, keeping its rate-limit tenant
+        futures = {executor.submit(contextvars.copy_context().run, send, group): group for group in groups}
+        for future in as_completed(futures):
+            group = futures[future]
+            try:
+                yield group, future.result(), None
+            except Exception as e:
+                logger.warning(f"Packed request for footnotes {group[0][0]}-{group[-1][0]} failed: {e}")
+                yield group, None, e
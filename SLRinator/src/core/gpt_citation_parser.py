@@ -6,13 +6,18 @@ Extracts and classifies citations from footnotes using GPT-5
 
 import json
 import os
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, asdict
 import requests
 from pathlib import Path
 import logging
 
 from src.utils.api_logger import log_api_usage
+from src.utils.retry_handler import get_rate_limiter
+from src.core.footnote_packing import (
+    PACKED_INSTRUCTIONS, pack_footnotes, packed_user_message,
+    extract_packed_entries, run_packed_requests
+)
 
 logger = logging.getLogger(__name__)
 
@@ -157,52 +162,77 @@ Think step by step but respond only with valid JSON."""
             # Parse the response
             parsed_data = json.loads(response)
             
-            # Convert to ParsedFootnote
-            citations = []
-            for cite_data in parsed_data.get("citations", []):
-                citation = ParsedCitation(
-                    citation_text=cite_data.get("citation_text", ""),
-                    citation_type=cite_data.get("citation_type", "other"),
-                    case_name=cite_data.get("case_name"),
-                    party1=cite_data.get("party1"),
-                    party2=cite_data.get("party2"),
-                    volume=cite_data.get("volume"),
-                    reporter=cite_data.get("reporter"),
-                    page=cite_data.get("page"),
-                    pincite=cite_data.get("pincite"),
-                    court=cite_data.get("court"),
-                    year=cite_data.get("year"),
-                    title_number=cite_data.get("title_number"),
-                    code_type=cite_data.get("code_type"),
-                    section=cite_data.get("section"),
-                    subsection=cite_data.get("subsection"),
-                    author=cite_data.get("author"),
-                    article_title=cite_data.get("article_title"),
-                    book_title=cite_data.get("book_title"),
-                    journal=cite_data.get("journal"),
-                    url=cite_data.get("url"),
-                    confidence=cite_data.get("confidence", 1.0),
-                    is_short_form=cite_data.get("is_short_form", False),
-                    refers_to_footnote=cite_data.get("refers_to_footnote")
-                )
-                citations.append(citation)
-            
-            return ParsedFootnote(
-                footnote_number=footnote_number,
-                original_text=footnote_text,
-                citations=citations,
-                has_signal=parsed_data.get("has_signal", False),
-                signal_type=parsed_data.get("signal_type"),
-                explanatory_text=parsed_data.get("explanatory_text")
-            )
+            return self.footnote_from_response(footnote_number, footnote_text, parsed_data)
             
         except Exception as e:
             logger.error(f"Error parsing footnote {footnote_number} with GPT: {e}")
             # Fallback to basic parsing
             return self._basic_parse(footnote_number, footnote_text)
     
+    def footnote_from_response(self, footnote_number: int, footnote_text: str,
+                               parsed_data: Dict[str, Any]) -> ParsedFootnote:
+        """Convert GPT's JSON response into a ParsedFootnote"""
+        citations = []
+        for cite_data in parsed_data.get("citations", []):
+            citation = ParsedCitation(
+                citation_text=cite_data.get("citation_text", ""),
+                citation_type=cite_data.get("citation_type", "other"),
+                case_name=cite_data.get("case_name"),
+                party1=cite_data.get("party1"),
+                party2=cite_data.get("party2"),
+                volume=cite_data.get("volume"),
+                reporter=cite_data.get("reporter"),
+                page=cite_data.get("page"),
+                pincite=cite_data.get("pincite"),
+                court=cite_data.get("court"),
+                year=cite_data.get("year"),
+                title_number=cite_data.get("title_number"),
+                code_type=cite_data.get("code_type"),
+                section=cite_data.get("section"),
+                subsection=cite_data.get("subsection"),
+                author=cite_data.get("author"),
+                article_title=cite_data.get("article_title"),
+                book_title=cite_data.get("book_title"),
+                journal=cite_data.get("journal"),
+                url=cite_data.get("url"),
+                confidence=cite_data.get("confidence", 1.0),
+                is_short_form=cite_data.get("is_short_form", False),
+                refers_to_footnote=cite_data.get("refers_to_footnote")
+            )
+            citations.append(citation)
+        
+        return ParsedFootnote(
+            footnote_number=footnote_number,
+            original_text=footnote_text,
+            citations=citations,
+            has_signal=parsed_data.get("has_signal", False),
+            signal_type=parsed_data.get("signal_type"),
+            explanatory_text=parsed_data.get("explanatory_text")
+        )
+    
     def _call_gpt(self, footnote_text: str) -> str:
         """Call GPT-5 API with low-latency settings"""
+        return self._post_chat(
+            system_prompt=self.SYSTEM_PROMPT,
+            user_content=f"Parse this footnote:\n{footnote_text}",
+            max_tokens=1000,
+            timeout=10,
+            log_text=footnote_text[:100]
+        )
+    
+    def _call_gpt_packed(self, group: List[Tuple[int, str]]) -> str:
+        """Call GPT-5 once for a group of footnotes; the prompt is sent once per group"""
+        return self._post_chat(
+            system_prompt=self.SYSTEM_PROMPT + "\n" + PACKED_INSTRUCTIONS,
+            user_content=packed_user_message(group),
+            max_tokens=min(16000, 200 + 600 * len(group)),
+            timeout=20 + 5 * len(group),
+            log_text=f"footnotes {group[0][0]}-{group[-1][0]} ({len(group)} packed)"
+        )
+    
+    def _post_chat(self, system_prompt: str, user_content: str, max_tokens: int,
+                   timeout: float, log_text: str) -> str:
+        """POST a JSON-mode chat completion and return the message content"""
         url = "https://api.openai.com/v1/chat/completions"
         
         headers = {
@@ -214,11 +244,11 @@ Think step by step but respond only with valid JSON."""
         data = {
             "model": "gpt-5",
             "messages": [
-                {"role": "system", "content": self.SYSTEM_PROMPT},
-                {"role": "user", "content": f"Parse this footnote:\n{footnote_text}"}
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_content}
             ],
             "temperature": 0.1,  # Low temperature for consistency
-            "max_tokens": 1000,
+            "max_tokens": max_tokens,
             "response_format": {"type": "json_object"}  # Force JSON response
         }
         
@@ -228,10 +258,10 @@ Think step by step but respond only with valid JSON."""
             endpoint=url,
             method="POST",
             parameters={"model": data["model"], "max_tokens": data["max_tokens"]},
-            citation_text=footnote_text[:100]
+            citation_text=log_text
         )
         
-        response = requests.post(url, headers=headers, json=data, timeout=10)
+        response = requests.post(url, headers=headers, json=data, timeout=timeout)
         
         # Log response
         log_api_usage(
@@ -292,22 +322,70 @@ Think step by step but respond only with valid JSON."""
             explanatory_text=None
         )
     
-    def parse_footnotes_batch(self, footnotes: Dict[int, str]) -> Dict[int, ParsedFootnote]:
+    @staticmethod
+    def _valid_entry(entry: Dict[str, Any]) -> bool:
+        """Check one footnote's result from a packed response"""
+        citations = entry.get("citations")
+        return isinstance(citations, list) and all(
+            isinstance(cite, dict) and isinstance(cite.get("citation_text"), str)
+            for cite in citations
+        )
+    
+    def request_packed(self, footnotes: Dict[int, str], max_workers: int = 4,
+                       calls_per_second: float = 2.0) -> Dict[int, Dict[str, Any]]:
+        """
+        Send footnotes to GPT-5 in packed, concurrent requests
+        
+        Args:
+            footnotes: Dictionary mapping footnote numbers to text
+            max_workers: Packed requests in flight at once
+            calls_per_second: Sustained request rate shared by all workers
+            
+        Returns:
+            Raw JSON result per footnote; footnotes whose entry was missing,
+            invalid, or whose request failed are omitted
+        """
+        groups = pack_footnotes(sorted(footnotes.items()))
+        limiter = get_rate_limiter("openai", calls_per_second=calls_per_second, burst_size=max_workers)
+        
+        results = {}
+        for group, response, error in run_packed_requests(groups, self._call_gpt_packed,
+                                                          max_workers, limiter):
+            if error is not None:
+                continue
+            entries, missing = extract_packed_entries(response, group, self._valid_entry)
+            results.update(entries)
+            if missing:
+                logger.warning(f"Packed response omitted or garbled footnotes {missing}")
+        
+        logger.info(f"Parsed {len(results)}/{len(footnotes)} footnotes in {len(groups)} packed requests")
+        return results
+    
+    def parse_footnotes_batch(self, footnotes: Dict[int, str], packed: bool = True,
+                              max_workers: int = 4) -> Dict[int, ParsedFootnote]:
         """
         Parse multiple footnotes in batch
         
         Args:
             footnotes: Dictionary mapping footnote numbers to text
+            packed: Group footnotes into concurrent multi-footnote requests;
+                footnotes a packed response misses are parsed one at a time
+            max_workers: Packed requests in flight at once
             
         Returns:
             Dictionary mapping footnote numbers to ParsedFootnote objects
         """
         parsed = {}
+        if packed and self.api_key and len(footnotes) > 1:
+            for fn_num, entry in self.request_packed(footnotes, max_workers).items():
+                parsed[fn_num] = self.footnote_from_response(fn_num, footnotes[fn_num], entry)
+        
         for fn_num, fn_text in footnotes.items():
-            logger.info(f"Parsing footnote {fn_num}")
-            parsed[fn_num] = self.parse_footnote(fn_num, fn_text)
+            if fn_num not in parsed:
+                logger.info(f"Parsing footnote {fn_num}")
+                parsed[fn_num] = self.parse_footnote(fn_num, fn_text)
         
-        return parsed
+        return {fn_num: parsed[fn_num] for fn_num in footnotes}
     
     def export_to_json(self, parsed_footnotes: Dict[int, ParsedFootnote], 
                       output_path: str = "output/data/parsed_citations.json"):
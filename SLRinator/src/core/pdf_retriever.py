@@ -5,8 +5,8 @@ Gets actual readable PDFs from various sources
 """
 
 import os
+import time
 import logging
-import requests
 import urllib3
 import fitz  # PyMuPDF for PDF validation
 
@@ -18,7 +18,10 @@ from dataclasses import dataclass
 from datetime import datetime
 
 from src.core.enhanced_gpt_parser import Citation
+from src.core.strategy_scheduler import StrategyScheduler, retrieval_context
 from src.utils.api_logger import log_api_usage
+from src.utils.retrieval_guard import GuardedSession, NegativeCache
+from src.utils.pdf_stream import stream_pdf
 
 
 @dataclass
@@ -39,16 +42,21 @@ class RetrievalResult:
 class PDFRetriever:
     """Retrieves actual readable PDFs from various sources"""
     
-    def __init__(self, api_keys: Dict[str, Any], output_dir: Path):
+    def __init__(self, api_keys: Dict[str, Any], output_dir: Path,
+                 scheduler: Optional[StrategyScheduler] = None):
         """Initialize with API keys and output directory"""
         self.api_keys = api_keys
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
+        # Learned source order; the routing below is the fallback for unseen citations
+        self.scheduler = scheduler or StrategyScheduler(self.output_dir.parent / "pdf_retrieval_history.jsonl")
+        self.negative_cache = NegativeCache(self.output_dir.parent / "pdf_negative_cache.json")
+        
         self.logger = logging.getLogger(__name__)
         
-        # HTTP session for efficiency
-        self.session = requests.Session()
+        # HTTP session for efficiency, with a circuit breaker per host
+        self.session = GuardedSession()
         self.session.headers.update({
             'User-Agent': 'Stanford Law Review Sourcepull System (Academic Research)'
         })
@@ -110,21 +118,38 @@ class PDFRetriever:
         """Retrieve PDF for a single citation"""
         self.logger.info(f"Retrieving {citation.citation_type}: {citation.full_text[:60]}...")
         
-        # Get source priority list with intelligent routing
-        sources = self._get_intelligent_sources(citation)
+        # Get source priority list with intelligent routing, reordered by past outcomes
+        context = retrieval_context(citation.reporter, citation.court)
+        sources = self.scheduler.order(citation.citation_type, context, self._get_intelligent_sources(citation))
+        citation_key = " ".join(citation.full_text.lower().split())
         
         for source in sources:
+            known_failure = self.negative_cache.get(source, citation_key)
+            if known_failure:
+                self.logger.debug(f"  ✗ {source}: {self.negative_cache.describe(known_failure)}")
+                continue
             self.logger.debug(f"  Trying source: {source}")
             
+            self.session.begin_attempt()
+            started = time.monotonic()
             try:
                 result = self._try_source(citation, source)
                 # Accept PDFs for cases, or any successful file for statutes
-                if result.success and (result.is_valid_pdf or citation.citation_type == 'statute'):
+                accepted = result.success and (result.is_valid_pdf or citation.citation_type == 'statute')
+                if result.error_message != "Source not implemented":
+                    self.scheduler.record(citation.citation_type, context, source, accepted,
+                                          time.monotonic() - started, result.retrieved_at)
+                if accepted:
+                    self.negative_cache.discard(source, citation_key)
                     self.logger.info(f"  ✓ Retrieved from {source}: {result.file_path}")
                     return result
                 else:
+                    self.negative_cache.put(source, citation_key, self.session.attempt_failure())
                     self.logger.debug(f"  ✗ Failed {source}: {result.error_message}")
             except Exception as e:
+                self.scheduler.record(citation.citation_type, context, source, False,
+                                      time.monotonic() - started)
+                self.negative_cache.put(source, citation_key, self.session.attempt_failure())
                 self.logger.debug(f"  ✗ Exception in {source}: {e}")
         
         # All sources failed
@@ -197,16 +222,14 @@ class PDFRetriever:
             head_response = self.session.head(volume_url, timeout=10)
             
             if head_response.status_code == 200:
-                # Download the volume (this is large but contains the case)
-                get_response = self.session.get(volume_url, timeout=60)
+                # Stream the volume to disk (this is large but contains the case)
+                filename = f"{citation.citation_id}_SCOTUS_Vol{citation.volume}.pdf"
+                file_path = self.output_dir / filename
+                download = stream_pdf(self.session, volume_url, file_path, timeout=60)
                 
-                if get_response.status_code == 200:
-                    filename = f"{citation.citation_id}_SCOTUS_Vol{citation.volume}.pdf"
-                    file_path = self.output_dir / filename
-                    
-                    with open(file_path, 'wb') as f:
-                        f.write(get_response.content)
-                    
+                if not download.success:
+                    self.logger.debug(f"Rejected {volume_url}: {download.reason}")
+                else:
                     # Validate PDF
                     is_valid, page_count = self._validate_pdf(file_path)
                     
@@ -222,8 +245,8 @@ class PDFRetriever:
                         citation_type="case", 
                         retrieval_strategy="supreme_court_official",
                         additional_metadata={
-                            "file_size_bytes": len(get_response.content),
-                            "file_size_mb": round(len(get_response.content) / 1024 / 1024, 2),
+                            "file_size_bytes": download.size_bytes,
+                            "file_size_mb": round(download.size_bytes / 1024 / 1024, 2),
                             "pdf_pages": page_count,
                             "validation_status": "valid_pdf" if is_valid else "invalid_pdf",
                             "download_success": True,
@@ -236,7 +259,7 @@ class PDFRetriever:
                         source_name="supreme_court_official",
                         success=True,
                         file_path=str(file_path),
-                        file_size_bytes=len(get_response.content),
+                        file_size_bytes=download.size_bytes,
                         is_valid_pdf=is_valid,
                         page_count=page_count,
                         error_message=None,
@@ -349,19 +372,15 @@ class PDFRetriever:
                 self.logger.debug(f"Trying PDF from: {case_name} ({date[:10] if date else 'no date'})")
                 
                 try:
+                    filename = f"{citation.citation_id}_CourtListener.pdf"
+                    file_path = self.output_dir / filename
                     # Handle SSL issues with government sites
-                    if 'gov' in pdf_url:
-                        pdf_response = requests.get(pdf_url, headers=headers, timeout=30, verify=False)
-                    else:
-                        pdf_response = self.session.get(pdf_url, headers=headers, timeout=30)
+                    download = stream_pdf(self.session, pdf_url, file_path, headers=headers, timeout=30,
+                                          verify='gov' not in pdf_url)
                     
-                    if pdf_response.status_code == 200 and pdf_response.headers.get("content-type", "").startswith("application/pdf"):
-                        filename = f"{citation.citation_id}_CourtListener.pdf"
-                        file_path = self.output_dir / filename
-                        
-                        with open(file_path, 'wb') as f:
-                            f.write(pdf_response.content)
-                        
+                    if not download.success:
+                        self.logger.debug(f"Rejected {pdf_url}: {download.reason}")
+                    else:
                         is_valid, page_count = self._validate_pdf(file_path)
                         
                         if is_valid:
@@ -379,7 +398,7 @@ class PDFRetriever:
                                 source_name="courtlistener_pdf",
                                 success=True,
                                 file_path=str(file_path),
-                                file_size_bytes=len(pdf_response.content),
+                                file_size_bytes=download.size_bytes,
                                 is_valid_pdf=True,
                                 page_count=page_count,
                                 error_message=None,
@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Sourcepull Work Queue
+SQLite-backed queue of citations to retrieve. Each job moves through
+pending -> in_flight -> done/manual/failed and is saved as soon as it
+finishes, so an interrupted run resumes where it stopped and several worker
+processes can drain the same queue. Claims are leases: a worker that dies
+leaves its job to be picked up again once the lease expires.
+"""
+
+import os
+import json
+import time
+import socket
+import sqlite3
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.core.citation_key import DedupStats
+from src.core.sourcepull_system import SourcepullSystem, SourcepullResult
+
+# Job states
+PENDING = "pending"
+IN_FLIGHT = "in_flight"
+DONE = "done"          # PDF retrieved
+MANUAL = "manual"      # Every strategy tried; needs manual retrieval
+FAILED = "failed"      # Processing raised (or the worker died) max_attempts times
+STATES = (PENDING, IN_FLIGHT, DONE, MANUAL, FAILED)
+FINISHED = (DONE, MANUAL)
+
+DEFAULT_LEASE = 900      # Seconds; renewed while the job is being worked on
+MAX_ATTEMPTS = 3
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Job:
+    """A claimed (or listed) queue entry"""
+    job_id: int
+    job_key: str
+    footnote_number: int
+    citation_text: str
+    state: str
+    attempts: int
+    payload: Dict[str, Any] = field(default_factory=dict)
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    lease_owner: Optional[str] = None
+    lease_expires: Optional[float] = None
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class SourcepullQueue:
+    """Durable queue of sourcepull jobs shared by any number of worker processes"""
+
+    _COLUMNS = ("job_id, job_key, footnote_number, citation_text, state, attempts, "
+                "payload, result, error, lease_owner, lease_expires")
+
+    def __init__(self, db_path: Path, max_attempts: int = MAX_ATTEMPTS):
+        self.db_path = Path(db_path)
+        self.max_attempts = max_attempts
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._init_database()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode; multi-statement updates use explicit BEGIN IMMEDIATE
+        conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+        conn.execute("PRAGMA busy_timeout = 30000")
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Write transaction that holds the database lock from its first statement"""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def _init_database(self):
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id INTEGER PRIMARY KEY,
+                    job_key TEXT UNIQUE NOT NULL,
+                    footnote_number INTEGER NOT NULL,
+                    citation_text TEXT NOT NULL,
+                    state TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    payload TEXT,
+                    result TEXT,
+                    error TEXT,
+                    lease_owner TEXT,
+                    lease_expires REAL,
+                    updated_at REAL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_state ON jobs (state, job_id)")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        finally:
+            conn.close()
+
+    def _job(self, row) -> Job:
+        return Job(
+            job_id=row[0], job_key=row[1], footnote_number=row[2], citation_text=row[3],
+            state=row[4], attempts=row[5],
+            payload=json.loads(row[6]) if row[6] else {},
+            result=json.loads(row[7]) if row[7] else None,
+            error=row[8], lease_owner=row[9], lease_expires=row[10]
+        )
+
+    def enqueue(self, jobs: List[Tuple[str, int, str, Dict[str, Any]]]) -> int:
+        """
+        Add (job_key, footnote_number, citation_text, payload) entries whose key
+        is not queued yet. Re-enqueueing the same input is a no-op, so a resumed
+        run can always start by enqueueing. Returns the number of new jobs.
+        Job ids are assigned consecutively in enqueue order.
+
+        A payload with a "repeats" list marks a key that may be cited again
+        later: enqueueing the key once more (e.g. from a later footnote, when
+        footnotes are queued as they are parsed) adds that citation to the
+        queued job's repeats rather than being dropped.
+        """
+        added = 0
+        now = time.time()
+        with self._transaction() as conn:
+            for job_key, footnote_number, citation_text, payload in jobs:
+                row = conn.execute(
+                    "SELECT job_id, footnote_number, citation_text, payload FROM jobs WHERE job_key = ?",
+                    (job_key,)
+                ).fetchone()
+                if row:
+                    if payload and "repeats" in payload:
+                        self._merge_repeats(conn, row, footnote_number, citation_text, payload)
+                    continue
+                conn.execute(
+                    "INSERT INTO jobs (job_key, footnote_number, citation_text, payload, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (job_key, footnote_number, citation_text, json.dumps(payload or {}), now)
+                )
+                added += 1
+        return added
+
+    @staticmethod
+    def _merge_repeats(conn: sqlite3.Connection, row: tuple, footnote_number: int,
+                       citation_text: str, payload: Dict[str, Any]):
+        """Add citations not yet recorded to an already queued job's repeats"""
+        job_id, first_footnote, first_citation, stored = row
+        stored = json.loads(stored) if stored else {}
+        repeats = stored.setdefault("repeats", [])
+        seen = {(first_footnote, first_citation)} | {(r["footnote"], r["citation"]) for r in repeats}
+        entry = {key: value for key, value in payload.items() if key != "repeats"}
+        candidates = [dict(entry, footnote=footnote_number, citation=citation_text)] + payload["repeats"]
+        new = [c for c in candidates if (c["footnote"], c["citation"]) not in seen]
+        if new:
+            repeats.extend(new)
+            repeats.sort(key=lambda r: r["footnote"])
+            conn.execute("UPDATE jobs SET payload = ?, updated_at = ? WHERE job_id = ?",
+                         (json.dumps(stored), time.time(), job_id))
+
+    def claim(self, worker_id: str, lease_seconds: float = DEFAULT_LEASE) -> Optional[Job]:
+        """Lease the next pending job (or one whose lease expired); None when nothing is left"""
+        now = time.time()
+        with self._transaction() as conn:
+            # Jobs that keep killing their worker are given up on
+            conn.execute(
+                "UPDATE jobs SET state = ?, error = 'lease expired ' || attempts || ' times', "
+                "lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+                "WHERE state = ? AND lease_expires < ? AND attempts >= ?",
+                (FAILED, now, IN_FLIGHT, now, self.max_attempts)
+            )
+            row = conn.execute(
+                f"SELECT {self._COLUMNS} FROM jobs "
+                "WHERE state = ? OR (state = ? AND lease_expires < ?) ORDER BY job_id LIMIT 1",
+                (PENDING, IN_FLIGHT, now)
+            ).fetchone()
+            if row is None:
+                return None
+            job = self._job(row)
+            if job.state == IN_FLIGHT:
+                logger.warning(f"Reclaiming FN{job.footnote_number} from {job.lease_owner} (lease expired)")
+            job.state = IN_FLIGHT
+            job.attempts += 1
+            job.lease_owner = worker_id
+            job.lease_expires = now + lease_seconds
+            conn.execute(
+                "UPDATE jobs SET state = ?, attempts = ?, lease_owner = ?, lease_expires = ?, "
+                "updated_at = ? WHERE job_id = ?",
+                (IN_FLIGHT, job.attempts, worker_id, job.lease_expires, now, job.job_id)
+            )
+        return job
+
+    def _update_leased(self, job: Job, assignments: str, params: tuple) -> bool:
+        """Apply an update only while this worker still holds the job's lease"""
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                f"UPDATE jobs SET {assignments}, updated_at = ? "
+                "WHERE job_id = ? AND state = ? AND lease_owner = ? AND attempts = ?",
+                params + (time.time(), job.job_id, IN_FLIGHT, job.lease_owner, job.attempts)
+            )
+            return cursor.rowcount == 1
+        finally:
+            conn.close()
+
+    def heartbeat(self, job: Job, lease_seconds: float = DEFAULT_LEASE) -> bool:
+        """Extend the lease; False if the job was reclaimed by another worker"""
+        job.lease_expires = time.time() + lease_seconds
+        return self._update_leased(job, "lease_expires = ?", (job.lease_expires,))
+
+    def complete(self, job: Job, state: str, result: Dict[str, Any]) -> bool:
+        """Save a finished job (DONE or MANUAL); False if the lease was lost meanwhile"""
+        return self._update_leased(
+            job, "state = ?, result = ?, error = NULL, lease_owner = NULL, lease_expires = NULL",
+            (state, json.dumps(result, default=str))
+        )
+
+    def fail(self, job: Job, error: str) -> bool:
+        """Record an error; the job is retried until it has used max_attempts"""
+        state = FAILED if job.attempts >= self.max_attempts else PENDING
+        return self._update_leased(
+            job, "state = ?, error = ?, lease_owner = NULL, lease_expires = NULL",
+            (state, error)
+        )
+
+    def release(self, job: Job) -> bool:
+        """Hand an unfinished job back (e.g. on Ctrl-C) without counting the attempt"""
+        return self._update_leased(
+            job, "state = ?, attempts = attempts - 1, lease_owner = NULL, lease_expires = NULL",
+            (PENDING,)
+        )
+
+    def requeue(self, states: Tuple[str, ...] = (FAILED,)) -> int:
+        """Put jobs in the given states back to pending with a fresh attempt budget"""
+        placeholders = ", ".join("?" for _ in states)
+        conn = self._connect()
+        try:
+            cursor = conn.execute(
+                f"UPDATE jobs SET state = ?, attempts = 0, error = NULL, updated_at = ? "
+                f"WHERE state IN ({placeholders})",
+                (PENDING, time.time()) + tuple(states)
+            )
+            return cursor.rowcount
+        finally:
+            conn.close()
+
+    @contextmanager
+    def keep_alive(self, job: Job, lease_seconds: float = DEFAULT_LEASE) -> Iterator[None]:
+        """Renew the job's lease in the background while the caller works on it"""
+        stop = threading.Event()
+
+        def renew():
+            while not stop.wait(lease_seconds / 3):
+                if not self.heartbeat(job, lease_seconds):
+                    logger.warning(f"Lost lease on FN{job.footnote_number}")
+                    return
+
+        thread = threading.Thread(target=renew, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            thread.join()
+
+    def drain(self, handler: Callable[[Job], Tuple[str, Dict[str, Any]]],
+              worker_id: Optional[str] = None, lease_seconds: float = DEFAULT_LEASE) -> int:
+        """
+        Claim and process jobs until none are left.
+
+        Args:
+            handler: Called with each job; returns (DONE or MANUAL, result dict)
+            worker_id: Lease owner name (defaults to host:pid)
+            lease_seconds: Lease length; renewed every third of it while the handler runs
+
+        Returns:
+            Number of jobs this worker finished
+        """
+        worker_id = worker_id or default_worker_id()
+        finished = 0
+        while True:
+            job = self.claim(worker_id, lease_seconds)
+            if job is None:
+                return finished
+            try:
+                with self.keep_alive(job, lease_seconds):
+                    state, result = handler(job)
+            except KeyboardInterrupt:
+                self.release(job)
+                raise
+            except Exception as e:
+                logger.error(f"FN{job.footnote_number} attempt {job.attempts} failed: {e}")
+                self.fail(job, f"{type(e).__name__}: {e}")
+                continue
+            if self.complete(job, state, result):
+                finished += 1
+
+    def jobs(self, states: Optional[Tuple[str, ...]] = None) -> List[Job]:
+        """Jobs in enqueue order, optionally only those in the given states"""
+        query = f"SELECT {self._COLUMNS} FROM jobs"
+        params: tuple = ()
+        if states:
+            query += f" WHERE state IN ({', '.join('?' for _ in states)})"
+            params = tuple(states)
+        conn = self._connect()
+        try:
+            return [self._job(row) for row in conn.execute(query + " ORDER BY job_id", params)]
+        finally:
+            conn.close()
+
+    def counts(self) -> Dict[str, int]:
+        conn = self._connect()
+        try:
+            counts = dict(conn.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall())
+        finally:
+            conn.close()
+        return {state: counts.get(state, 0) for state in STATES}
+
+    def status(self) -> Dict[str, Any]:
+        """Queue progress for reports: counts, live leases and errored jobs"""
+        now = time.time()
+        jobs = self.jobs((IN_FLIGHT, FAILED))
+        counts = self.counts()
+        return {
+            "counts": counts,
+            "remaining": counts[PENDING] + counts[IN_FLIGHT],
+            "in_flight": [
+                {"footnote": j.footnote_number, "worker": j.lease_owner,
+                 "lease_expires_in": round(j.lease_expires - now)}
+                for j in jobs if j.state == IN_FLIGHT
+            ],
+            "failed": [
+                {"footnote": j.footnote_number, "citation": j.citation_text[:100],
+                 "attempts": j.attempts, "error": j.error}
+                for j in jobs if j.state == FAILED
+            ]
+        }
+
+    def reset(self) -> int:
+        """Drop every job and all metadata (e.g. the document changed); returns the jobs removed"""
+        with self._transaction() as conn:
+            removed = conn.execute("DELETE FROM jobs").rowcount
+            conn.execute("DELETE FROM meta")
+        return removed
+
+    def get_meta(self, key: str, default: Any = None) -> Any:
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        finally:
+            conn.close()
+        return json.loads(row[0]) if row else default
+
+    def set_meta(self, key: str, value: Any):
+        conn = self._connect()
+        try:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, json.dumps(value)))
+        finally:
+            conn.close()
+
+
+def enqueue_citations(queue: SourcepullQueue, system: SourcepullSystem,
+                      citations: List[Tuple[int, str, Dict[str, Any]]]) -> int:
+    """
+    Queue one job per source. Citations are (footnote_number, citation_text,
+    payload); later citations of an already queued source are listed in the
+    first one's payload under "repeats" instead of being retrieved again, so
+    parallel workers never fetch the same source twice. This holds across
+    calls too, so citations can be queued a footnote at a time.
+    """
+    groups: Dict[str, Tuple[int, str, Dict[str, Any]]] = {}
+    for footnote_number, citation_text, payload in citations:
+        key = system.citation_key(citation_text)
+        if key is None:
+            digest = hashlib.sha1(" ".join(citation_text.split()).encode()).hexdigest()[:16]
+            key = f"fn{footnote_number}:{digest}"
+        if key in groups:
+            groups[key][2]["repeats"].append(dict(payload, footnote=footnote_number, citation=citation_text))
+        else:
+            groups[key] = (footnote_number, citation_text, dict(payload, repeats=[]))
+
+    return queue.enqueue([(key, fn, text, payload) for key, (fn, text, payload) in groups.items()])
+
+
+def process_job(system: SourcepullSystem, job: Job) -> Tuple[str, Dict[str, Any]]:
+    """Default drain handler: run sourcepull for the job's citation"""
+    result = system.process_citation(job.footnote_number, job.citation_text)
+    return (MANUAL if result.requires_manual else DONE), result.to_dict()
+
+
+def queued_results(queue: SourcepullQueue) -> List[SourcepullResult]:
+    """Finished results so far, one per citation (repeats expanded), in footnote order"""
+    results = []
+    for job in queue.jobs(FINISHED):
+        result = SourcepullResult.from_dict(job.result)
+        results.append(result)
+        for repeat in job.payload.get("repeats", []):
+            results.append(replace(
+                result,
+                footnote_number=repeat["footnote"],
+                citation_text=repeat["citation"],
+                retrieval_attempts=[],
+                reused_from=result.footnote_number
+            ))
+    return sorted(results, key=lambda r: r.footnote_number)
+
+
+def queue_report(queue: SourcepullQueue, system: SourcepullSystem) -> Dict[str, Any]:
+    """Sourcepull report built from the queue, valid at any point of a run"""
+    results = queued_results(queue)
+    report = system.generate_report(results)
+
+    dedup = DedupStats()
+    for result in results:
+        dedup.record(result.canonical_key, result.reused_from is not None)
+    report["deduplication"] = dedup.summary()
+    report["queue"] = queue.status()
+    return report
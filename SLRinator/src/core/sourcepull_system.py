@@ -5,17 +5,21 @@ Implements the complete retrieval hierarchy from the Member Handbook
 """
 
 import os
+import copy
 import json
 import time
 import logging
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, replace
 from datetime import datetime
-import requests
 
 from src.core.source_identifier import SourceIdentifier, SourceType, CitationComponents
+from src.core.citation_key import canonical_key, DedupStats
+from src.core.strategy_scheduler import StrategyScheduler, retrieval_context
 from src.utils.api_logger import get_api_logger, log_api_usage
+from src.utils.retrieval_guard import GuardedSession, NegativeCache
+from src.utils.pdf_stream import stream_pdf
 
 
 @dataclass
@@ -27,6 +31,7 @@ class RetrievalAttempt:
     message: str
     file_path: Optional[str] = None
     url: Optional[str] = None
+    duration: Optional[float] = None  # Seconds spent on the source (None if never contacted)
     
 
 @dataclass 
@@ -42,6 +47,23 @@ class SourcepullResult:
     final_file_path: Optional[str] = None
     requires_manual: bool = False
     manual_instructions: Optional[str] = None
+    canonical_key: Optional[str] = None
+    reused_from: Optional[int] = None  # Footnote whose retrieval this result shares
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization"""
+        data = asdict(self)
+        data['source_type'] = self.source_type.value
+        return data
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'SourcepullResult':
+        """Rebuild a result saved with to_dict"""
+        data = dict(data)
+        data['source_type'] = SourceType(data['source_type'])
+        data['components'] = CitationComponents(**data['components'])
+        data['retrieval_attempts'] = [RetrievalAttempt(**a) for a in data['retrieval_attempts']]
+        return cls(**data)
 
 
 class RetrievalStrategy:
@@ -204,12 +226,33 @@ class SourcepullSystem:
         self.log_dir.mkdir(parents=True, exist_ok=True)
         self._setup_logging()
         
-        # Session for HTTP requests
-        self.session = requests.Session()
+        # Session for HTTP requests; hosts that keep failing are skipped by their circuit breaker
+        self.session = GuardedSession()
         self.session.headers.update({
             'User-Agent': 'Stanford Law Review Sourcepull System'
         })
         
+        # One retrieval per source: canonical citation key -> first result
+        self.results_by_key: Dict[str, SourcepullResult] = {}
+        self.dedup = DedupStats()
+        
+        # Strategy order learned from past attempts (falls back to the handbook order)
+        self.scheduler = StrategyScheduler(self.output_dir / "retrieval_history.jsonl")
+        
+        # Strategies that recently failed for a citation are not retried until their TTL expires
+        self.negative_cache = NegativeCache(self.output_dir / "negative_cache.json")
+        
+    def for_document(self) -> "SourcepullSystem":
+        """
+        System for another document that shares this one's warm parts (API keys,
+        HTTP session and circuit breakers, learned strategy order, negative
+        cache) but deduplicates sources per document
+        """
+        system = copy.copy(self)
+        system.results_by_key = {}
+        system.dedup = DedupStats()
+        return system
+    
     def _load_api_keys(self, config_path: str) -> Dict[str, Any]:
         """Load API keys from configuration file"""
         config_file = Path(config_path)
@@ -233,6 +276,11 @@ class SourcepullSystem:
         )
         self.logger = logging.getLogger(__name__)
     
+    def citation_key(self, citation_text: str) -> Optional[str]:
+        """Canonical key of the source a citation refers to (None if it cannot be keyed)"""
+        source_type, components = self.identifier.identify(citation_text)
+        return canonical_key(source_type, components, citation_text)
+
     def process_citation(self, footnote_number: int, citation_text: str) -> SourcepullResult:
         """
         Process a single citation through the sourcepull system
@@ -252,6 +300,21 @@ class SourcepullSystem:
         
         self.logger.info(f"  Identified as: {source_type.value} (priority: {priority})")
         
+        # Same authority already processed (different pincite/signal): share its retrieval
+        key = canonical_key(source_type, components, citation_text)
+        earlier = self.results_by_key.get(key) if key else None
+        self.dedup.record(key, earlier is not None)
+        if earlier is not None:
+            self.logger.info(f"  ↺ Same source as FN{earlier.footnote_number} ({key}), reusing its retrieval")
+            return replace(
+                earlier,
+                footnote_number=footnote_number,
+                citation_text=citation_text,
+                components=components,
+                retrieval_attempts=[],
+                reused_from=earlier.footnote_number
+            )
+        
         # Initialize result
         result = SourcepullResult(
             footnote_number=footnote_number,
@@ -260,11 +323,18 @@ class SourcepullSystem:
             components=components,
             retrieval_attempts=[],
             final_status="failed",
-            reasoning=f"Source type: {source_type.value}, Priority level: {priority}"
+            reasoning=f"Source type: {source_type.value}, Priority level: {priority}",
+            canonical_key=key
         )
+        if key:
+            self.results_by_key[key] = result
         
-        # Get retrieval strategies
-        strategies = self.strategy.get_strategies(source_type)
+        # Get retrieval strategies, fastest expected path to a PDF first
+        context = retrieval_context(components.reporter, components.court)
+        citation_key = key or " ".join(citation_text.lower().split())
+        strategies = self.scheduler.order(
+            source_type.value, context, self.strategy.get_strategies(source_type)
+        )
         
         # Try each strategy in order
         for strategy in strategies:
@@ -272,9 +342,12 @@ class SourcepullSystem:
                 break
                 
             attempt = self._try_retrieval_strategy(
-                strategy, source_type, components, footnote_number
+                strategy, source_type, components, footnote_number, citation_key
             )
             result.retrieval_attempts.append(attempt)
+            if attempt.duration is not None:
+                self.scheduler.record(source_type.value, context, strategy,
+                                      attempt.success, attempt.duration, attempt.timestamp)
             
             if attempt.success:
                 result.final_status = "success"
@@ -294,8 +367,9 @@ class SourcepullSystem:
     
     def _try_retrieval_strategy(self, strategy: str, source_type: SourceType, 
                                 components: CitationComponents, 
-                                footnote_number: int) -> RetrievalAttempt:
-        """Try a specific retrieval strategy"""
+                                footnote_number: int,
+                                citation_key: Optional[str] = None) -> RetrievalAttempt:
+        """Try a specific retrieval strategy, skipping ones known to fail for this citation"""
         timestamp = datetime.now().isoformat()
         
         # Map strategies to methods
@@ -337,16 +411,34 @@ class SourcepullSystem:
                     message=f"API not enabled in configuration"
                 )
         
+        known_failure = self.negative_cache.get(strategy, citation_key)
+        if known_failure:
+            return RetrievalAttempt(
+                source=strategy,
+                timestamp=timestamp,
+                success=False,
+                message=self.negative_cache.describe(known_failure)
+            )
+        
         # Try the retrieval
+        self.session.begin_attempt()
+        started = time.monotonic()
         try:
-            return method(source_type, components, footnote_number)
+            attempt = method(source_type, components, footnote_number)
         except Exception as e:
-            return RetrievalAttempt(
+            attempt = RetrievalAttempt(
                 source=strategy,
                 timestamp=timestamp,
                 success=False,
                 message=f"Error: {str(e)}"
             )
+        attempt.duration = time.monotonic() - started
+        
+        if attempt.success:
+            self.negative_cache.discard(strategy, citation_key)
+        else:
+            self.negative_cache.put(strategy, citation_key, self.session.attempt_failure())
+        return attempt
     
     def _retrieve_courtlistener(self, source_type: SourceType, 
                                 components: CitationComponents,
@@ -422,26 +514,23 @@ class SourcepullSystem:
                         footnote_number=footnote_number
                     )
                     
-                    pdf_response = self.session.get(pdf_url, headers=headers, timeout=30)
+                    # Stream the PDF to disk, rejecting HTML pages and truncated files early
+                    filename = self._generate_filename(footnote_number, components)
+                    file_path = self.retrieved_dir / filename
+                    download = stream_pdf(self.session, pdf_url, file_path, headers=headers, timeout=30)
                     
                     # Log PDF retrieval result
                     log_api_usage(
                         api_name="courtlistener",
                         endpoint=pdf_url,
                         method="GET",
-                        response_code=pdf_response.status_code,
-                        success=(pdf_response.status_code == 200),
+                        response_code=download.status_code,
+                        success=download.success,
+                        error_message=download.reason,
                         footnote_number=footnote_number
                     )
                     
-                    if pdf_response.status_code == 200:
-                        # Save the PDF
-                        filename = self._generate_filename(footnote_number, components)
-                        file_path = self.retrieved_dir / filename
-                        
-                        with open(file_path, 'wb') as f:
-                            f.write(pdf_response.content)
-                        
+                    if download.success:
                         return RetrievalAttempt(
                             source="courtlistener",
                             timestamp=timestamp,
@@ -548,25 +637,21 @@ class SourcepullSystem:
                                             footnote_number=footnote_number
                                         )
                                         
-                                        pdf_response = self.session.get(pdf_url, timeout=30)
+                                        filename = self._generate_filename(footnote_number, components)
+                                        file_path = self.retrieved_dir / filename
+                                        download = stream_pdf(self.session, pdf_url, file_path, timeout=30)
                                         
                                         log_api_usage(
                                             api_name="govinfo",
                                             endpoint=download_url,
                                             method="GET",
-                                            response_code=pdf_response.status_code,
-                                            success=(pdf_response.status_code == 200),
+                                            response_code=download.status_code,
+                                            success=download.success,
+                                            error_message=download.reason,
                                             footnote_number=footnote_number
                                         )
                                         
-                                        if pdf_response.status_code == 200:
-                                            # Save the PDF
-                                            filename = self._generate_filename(footnote_number, components)
-                                            file_path = self.retrieved_dir / filename
-                                            
-                                            with open(file_path, 'wb') as f:
-                                                f.write(pdf_response.content)
-                                            
+                                        if download.success:
                                             return RetrievalAttempt(
                                                 source="govinfo",
                                                 timestamp=timestamp,
@@ -1070,13 +1155,17 @@ class SourcepullSystem:
             },
             "by_source_type": by_type,
             "retrieval_sources": source_stats,
+            "deduplication": self.dedup.summary(),
+            "strategy_learning": self.scheduler.summary(),
+            "skipped_known_failures": self.negative_cache.hits,
+            "open_circuits": self.session.breakers.open_hosts(),
             "manual_required": [
                 {
                     "footnote": r.footnote_number,
                     "citation": r.citation_text[:100],
                     "instructions": r.manual_instructions
                 }
-                for r in results if r.requires_manual
+                for r in results if r.requires_manual and r.reused_from is None
             ]
         }
         
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Staged Pipeline
+Runs work through a chain of stages joined by bounded queues, each stage
+with its own worker threads. A stage starts on an item as soon as the stage
+before it emits one, so the first results arrive early and wall-clock time
+approaches that of the slowest stage instead of the sum of all of them. A
+full queue blocks the stage feeding it (backpressure), so a fast stage never
+runs far ahead of a slow one or holds the whole document in memory.
+"""
+
+import time
+import queue
+import logging
+import threading
+import contextvars
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# End-of-input marker; each worker of a stage receives one
+_DONE = object()
+_EMPTY = object()
+
+POLL_INTERVAL = 0.1   # Seconds between checks for Ctrl-C while blocked
+
+
+@dataclass
+class Stage:
+    """One step of a pipeline; handler(item) returns the items for the next stage (or None)"""
+    name: str
+    handler: Callable[[Any], Optional[Iterable[Any]]]
+    workers: int = 1
+    capacity: int = 16    # Items waiting for this stage before its producers block
+
+
+@dataclass
+class StageStats:
+    """What one stage did during a run; times are summed over its workers"""
+    name: str
+    workers: int
+    processed: int = 0
+    emitted: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0       # Inside the handler
+    idle_seconds: float = 0.0       # Waiting for input
+    blocked_seconds: float = 0.0    # Waiting for room downstream (backpressure)
+    max_queued: int = 0             # Deepest the stage's input queue got
+    first_output: Optional[float] = None   # Seconds after the run started
+    last_output: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        for key in ("busy_seconds", "idle_seconds", "blocked_seconds", "first_output", "last_output"):
+            if data[key] is not None:
+                data[key] = round(data[key], 3)
+        return data
+
+
+class StagePipeline:
+    """Bounded-queue pipeline of threaded stages"""
+
+    def __init__(self, stages: List[Stage]):
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        self.stages = stages
+        self.stats = [StageStats(stage.name, stage.workers) for stage in stages]
+        self.errors: List[Dict[str, Any]] = []
+        self._queues = [queue.Queue(maxsize=max(1, stage.capacity)) for stage in stages]
+        self._producers = [0] * len(stages)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._started = 0.0
+        self._elapsed = 0.0
+
+    def _index(self, name: str) -> int:
+        for index, stage in enumerate(self.stages):
+            if stage.name == name:
+                return index
+        raise KeyError(f"No stage named {name!r}")
+
+    def _put(self, index: int, item: Any) -> bool:
+        """Block until the stage's queue has room; False if the run was stopped meanwhile"""
+        target = self._queues[index]
+        while not self._stop.is_set():
+            try:
+                target.put(item, timeout=POLL_INTERVAL)
+            except queue.Full:
+                continue
+            stats = self.stats[index]
+            stats.max_queued = max(stats.max_queued, target.qsize())
+            return True
+        return False
+
+    def _producer_done(self, index: int):
+        """The last producer of a stage to finish tells each of its workers to stop"""
+        with self._lock:
+            self._producers[index] -= 1
+            last = self._producers[index] == 0
+        if last:
+            for _ in range(self.stages[index].workers):
+                self._put(index, _DONE)
+
+    def _feed(self, index: int, items: Iterable[Any]):
+        try:
+            for item in items:
+                if not self._put(index, item):
+                    return
+        except Exception as e:
+            logger.error(f"Reading input for {self.stages[index].name} failed: {e}")
+            self.errors.append({"stage": self.stages[index].name, "item": None,
+                                "error": f"{type(e).__name__}: {e}"})
+        finally:
+            self._producer_done(index)
+
+    def _work(self, index: int):
+        stage, stats = self.stages[index], self.stats[index]
+        inbox = self._queues[index]
+        downstream = index + 1 if index + 1 < len(self.stages) else None
+        try:
+            while not self._stop.is_set():
+                waited = time.perf_counter()
+                try:
+                    item = inbox.get(timeout=POLL_INTERVAL)
+                except queue.Empty:
+                    item = _EMPTY
+                with self._lock:
+                    stats.idle_seconds += time.perf_counter() - waited
+                if item is _DONE:
+                    return
+                if item is _EMPTY:
+                    continue
+
+                started = time.perf_counter()
+                try:
+                    outputs = list(stage.handler(item) or ())
+                except Exception as e:
+                    logger.error(f"{stage.name} failed on {str(item)[:80]}: {e}")
+                    with self._lock:
+                        stats.errors += 1
+                        stats.busy_seconds += time.perf_counter() - started
+                        self.errors.append({"stage": stage.name, "item": str(item)[:200],
+                                            "error": f"{type(e).__name__}: {e}"})
+                    continue
+                finished = time.perf_counter()
+                with self._lock:
+                    stats.processed += 1
+                    stats.busy_seconds += finished - started
+                    if outputs:
+                        stats.emitted += len(outputs)
+                        if stats.first_output is None:
+                            stats.first_output = finished - self._started
+                        stats.last_output = finished - self._started
+
+                if downstream is not None:
+                    for output in outputs:
+                        waited = time.perf_counter()
+                        if not self._put(downstream, output):
+                            return
+                        with self._lock:
+                            stats.blocked_seconds += time.perf_counter() - waited
+        finally:
+            if downstream is not None:
+                self._producer_done(downstream)
+
+    @staticmethod
+    def _thread(name: str, target: Callable, *args) -> threading.Thread:
+        """Worker thread running in a copy of the caller's context (e.g. its rate-limit tenant)"""
+        return threading.Thread(target=contextvars.copy_context().run, args=(target, *args), name=name, daemon=True)
+
+    def run(self, items: Iterable[Any], inject: Optional[Dict[str, Iterable[Any]]] = None) -> Dict[str, Any]:
+        """
+        Push items through every stage and wait until all of them are handled.
+
+        Args:
+            items: Input for the first stage; consumed lazily, so it can be a generator
+            inject: Extra input for later stages by name (e.g. work left over
+                from an interrupted run), fed alongside the upstream stages
+
+        Returns:
+            The run summary (see summary())
+
+        Ctrl-C stops every stage after the items its workers are handling.
+        """
+        inject = {self._index(name): feed for name, feed in (inject or {}).items()}
+        for index in range(len(self.stages)):
+            self._producers[index] = (1 if index == 0 else self.stages[index - 1].workers) + (index in inject)
+
+        self._started = time.perf_counter()
+        threads = [self._thread("stage-input", self._feed, 0, items)]
+        threads += [self._thread(f"{self.stages[index].name}-inject", self._feed, index, feed)
+                    for index, feed in inject.items()]
+        for index, stage in enumerate(self.stages):
+            threads += [self._thread(f"{stage.name}-{n + 1}", self._work, index)
+                        for n in range(max(1, stage.workers))]
+        for thread in threads:
+            thread.start()
+
+        try:
+            for thread in threads:
+                while thread.is_alive():
+                    thread.join(POLL_INTERVAL)
+        except KeyboardInterrupt:
+            logger.warning("Interrupted; waiting for in-progress items to finish")
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+            raise
+        finally:
+            self._elapsed = time.perf_counter() - self._started
+        return self.summary()
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Wall-clock time, time until the last stage first produced a result, and
+        per-stage stats. The bottleneck is the stage with the most busy time per
+        worker: the one to give more workers.
+        """
+        utilization = {s.name: s.busy_seconds / max(1, s.workers) for s in self.stats}
+        last = self.stats[-1]
+        return {
+            "elapsed_seconds": round(self._elapsed, 3),
+            "first_result_seconds": round(last.first_output, 3) if last.first_output is not None else None,
+            "bottleneck": max(utilization, key=utilization.get),
+            "errors": len(self.errors),
+            "stages": [s.to_dict() for s in self.stats],
+        }
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Adaptive Retrieval Strategy Scheduler for Stanford Law Review
+Learns from past retrieval attempts which source to try first for each kind of
+citation, so the expected time until a PDF is found is as short as possible
+"""
+
+import json
+import logging
+import re
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Tuple
+
+PRIOR_SUCCESS = 0.5      # Success probability assumed for a strategy with no history
+PRIOR_WEIGHT = 2.0       # Pseudo-attempts the prior is worth
+DEFAULT_LATENCY = 5.0    # Seconds assumed for a strategy with no timing history
+MIN_LATENCY = 0.05       # Instant failures still cost something
+MIN_SAMPLES = 3          # Attempts needed before a context-specific estimate is used
+
+ANY = "*"
+
+CellKey = Tuple[str, str, str]  # (source type, court/reporter context, strategy)
+
+
+def retrieval_context(reporter: Optional[str] = None, court: Optional[str] = None) -> Optional[str]:
+    """Court/reporter bucket a citation's retrieval behavior is learned under ("f.supp.2d")"""
+    value = reporter or court
+    return re.sub(r"\s+", "", value).lower() if value else None
+
+
+@dataclass
+class StrategyStats:
+    """Success counts and latencies of one strategy in one context"""
+    attempts: int = 0
+    successes: int = 0
+    durations: List[float] = field(default_factory=list)
+
+    def add(self, success: bool, duration: float):
+        self.attempts += 1
+        self.successes += int(success)
+        self.durations.append(duration)
+
+    @property
+    def success_probability(self) -> float:
+        return (self.successes + PRIOR_SUCCESS * PRIOR_WEIGHT) / (self.attempts + PRIOR_WEIGHT)
+
+    @property
+    def mean_latency(self) -> float:
+        return max(MIN_LATENCY, sum(self.durations) / len(self.durations)) if self.durations else DEFAULT_LATENCY
+
+    def latency_percentile(self, pct: float) -> Optional[float]:
+        if not self.durations:
+            return None
+        ordered = sorted(self.durations)
+        return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+class StrategyScheduler:
+    """
+    Orders retrieval strategies by learned success probability per second.
+
+    Trying strategies in decreasing p/t order minimizes the expected time to the
+    first success when attempts are independent. Estimates back off from
+    (type, context) to (type) to all citations when a cell has too few attempts,
+    and strategies without history keep their static position on ties, so an
+    empty history reproduces the hard-coded Member Handbook order exactly.
+    """
+
+    def __init__(self, history_path: Optional[Path] = None, relearn_every: int = 25,
+                 max_history: int = 5000):
+        """
+        Args:
+            history_path: JSONL file of past attempts (appended to as attempts are
+                recorded, and rewritten with only the kept attempts once it holds
+                twice max_history lines)
+            relearn_every: Recorded attempts between re-learning the estimates
+            max_history: Most recent attempts kept, so estimates follow changes in source behavior
+        """
+        self.history_path = Path(history_path) if history_path else None
+        self.relearn_every = relearn_every
+        self.logger = logging.getLogger(__name__)
+
+        self.max_history = max_history
+        self._history: Deque[Dict] = deque(maxlen=max_history)
+        self._file_lines = 0
+        self._stats: Dict[CellKey, StrategyStats] = {}
+        self._since_learn = 0
+        self._lock = threading.Lock()
+
+        self._load_history()
+        self.learn()
+
+    def _load_history(self):
+        if not self.history_path or not self.history_path.exists():
+            return
+        with open(self.history_path, 'r') as f:
+            for line in f:
+                self._file_lines += 1
+                try:
+                    self._history.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue  # Partially written last line
+        self.logger.info(f"Loaded {len(self._history)} past retrieval attempts")
+
+    def learn(self):
+        """Rebuild the estimates from the retained history"""
+        stats: Dict[CellKey, StrategyStats] = {}
+        for entry in self._history:
+            source_type, context, strategy = entry["source_type"], entry["context"], entry["strategy"]
+            for key in {(source_type, context, strategy), (source_type, ANY, strategy), (ANY, ANY, strategy)}:
+                stats.setdefault(key, StrategyStats()).add(entry["success"], entry["duration"])
+        with self._lock:
+            self._stats = stats
+            self._since_learn = 0
+
+    def record(self, source_type: str, context: Optional[str], strategy: str,
+               success: bool, duration: float, timestamp: Optional[str] = None):
+        """Add one attempt to the history, re-learning every relearn_every attempts"""
+        entry = {
+            "source_type": source_type, "context": context or ANY, "strategy": strategy,
+            "success": success, "duration": round(duration, 3), "timestamp": timestamp
+        }
+        with self._lock:
+            self._history.append(entry)
+            self._since_learn += 1
+            due = self._since_learn >= self.relearn_every
+            if self.history_path:
+                self.history_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.history_path, 'a') as f:
+                    f.write(json.dumps(entry) + "\n")
+                self._file_lines += 1
+                if self._file_lines >= 2 * self.max_history:
+                    self._compact()
+        if due:
+            self.learn()
+
+    def _compact(self):
+        """Rewrite the history file with only the retained attempts (caller holds the lock)"""
+        tmp_path = self.history_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            for entry in self._history:
+                f.write(json.dumps(entry) + "\n")
+        tmp_path.replace(self.history_path)
+        self._file_lines = len(self._history)
+
+    def estimate(self, source_type: str, context: Optional[str], strategy: str) -> StrategyStats:
+        """Most specific statistics with enough attempts, or an empty (prior-only) record"""
+        for key in ((source_type, context or ANY, strategy), (source_type, ANY, strategy), (ANY, ANY, strategy)):
+            stats = self._stats.get(key)
+            if stats is not None and stats.attempts >= MIN_SAMPLES:
+                return stats
+        return StrategyStats()
+
+    def order(self, source_type: str, context: Optional[str], default_order: List[str]) -> List[str]:
+        """Reorder the static strategy list by expected success per second"""
+        if not self._stats:
+            return list(default_order)
+
+        def score(item: Tuple[int, str]) -> Tuple[float, int]:
+            position, strategy = item
+            stats = self.estimate(source_type, context, strategy)
+            return (-stats.success_probability / stats.mean_latency, position)
+
+        ordered = [strategy for _, strategy in sorted(enumerate(default_order), key=score)]
+        if ordered != list(default_order):
+            self.logger.debug(f"  Strategy order for {source_type}/{context or ANY}: {ordered}")
+        return ordered
+
+    def summary(self) -> Dict[str, Dict]:
+        """Learned success rates and latencies per source type and strategy"""
+        report = {}
+        for (source_type, context, strategy), stats in sorted(self._stats.items()):
+            if source_type == ANY or context != ANY:
+                continue
+            report.setdefault(source_type, {})[strategy] = {
+                "attempts": stats.attempts,
+                "success_rate": f"{(stats.successes / stats.attempts * 100):.1f}%",
+                "mean_latency": round(stats.mean_latency, 2),
+                "p90_latency": stats.latency_percentile(90),
+            }
+        return report
@@ -21,6 +21,7 @@ except ImportError:
     print("Warning: Google Sheets API not available. Install with: pip install google-api-python-client google-auth")
 
 from src.core.retrieval_framework import RetrievalRecord, SourceType
+from src.integration.sheets_sync import SheetMirror
 
 logger = logging.getLogger(__name__)
 
@@ -54,18 +55,22 @@ class SourcepullSpreadsheet:
         'Check',           # Validation checkmark
     ]
     
-    def __init__(self, spreadsheet_id: Optional[str] = None, credentials_file: Optional[str] = None):
+    def __init__(self, spreadsheet_id: Optional[str] = None, credentials_file: Optional[str] = None,
+                 service=None, sheet_name: str = "Sourcepull"):
         """
         Initialize connection to Google Sheets
         
         Args:
             spreadsheet_id: Google Sheets ID (from URL)
             credentials_file: Path to service account credentials JSON
+            service: Pre-built Sheets service (e.g. sheets_sync.FakeSheetsService)
+            sheet_name: Tab holding the sourcepull rows
         """
         self.spreadsheet_id = spreadsheet_id
-        self.service = None
+        self.service = service
+        self.sheet_name = sheet_name
         
-        if SHEETS_AVAILABLE and credentials_file and os.path.exists(credentials_file):
+        if self.service is None and SHEETS_AVAILABLE and credentials_file and os.path.exists(credentials_file):
             try:
                 creds = service_account.Credentials.from_service_account_file(
                     credentials_file,
@@ -79,32 +84,45 @@ class SourcepullSpreadsheet:
         # Local cache of spreadsheet data
         self.local_data = []
         self.next_source_number = 1
+        
+        # Mirror of the sheet; edits accumulate here until sync()
+        self.mirror: Optional[SheetMirror] = None
+    
+    def _get_mirror(self) -> Optional[SheetMirror]:
+        """Load the sheet into the local mirror on first use"""
+        if self.mirror is None and self.service and self.spreadsheet_id:
+            try:
+                self.mirror = SheetMirror(self.service, self.spreadsheet_id,
+                                          self.sheet_name, self.COLUMNS).load()
+            except Exception as e:
+                logger.error(f"Failed to read spreadsheet: {e}")
+                return None
+            
+            # Continue numbering after the sources already in the sheet
+            numbers = [int(row[0]) for row in self.mirror.rows[1:] if str(row[0]).isdigit()]
+            if numbers:
+                self.next_source_number = max(self.next_source_number, max(numbers) + 1)
+        return self.mirror
     
-    def initialize_spreadsheet(self, sheet_name: str = "Sourcepull"):
+    def initialize_spreadsheet(self, sheet_name: Optional[str] = None):
         """Initialize a new sourcepull spreadsheet with headers"""
-        if not self.service or not self.spreadsheet_id:
+        if sheet_name and sheet_name != self.sheet_name:
+            self.sheet_name = sheet_name
+            self.mirror = None
+        
+        mirror = self._get_mirror()
+        if mirror is None:
             logger.warning("Cannot initialize spreadsheet - no connection")
             return False
         
         try:
-            # Create header row
-            values = [self.COLUMNS]
-            
-            body = {
-                'values': values
-            }
-            
-            result = self.service.spreadsheets().values().update(
-                spreadsheetId=self.spreadsheet_id,
-                range=f"{sheet_name}!A1:S1",
-                valueInputOption='USER_ENTERED',
-                body=body
-            ).execute()
+            mirror.rows[0] = list(self.COLUMNS)
+            self.sync()
             
             logger.info(f"Initialized spreadsheet with {len(self.COLUMNS)} columns")
             
             # Format header row (would need additional API calls for formatting)
-            self._format_header_row(sheet_name)
+            self._format_header_row(self.sheet_name)
             
             return True
         except Exception as e:
@@ -122,7 +140,8 @@ class SourcepullSpreadsheet:
         Returns:
             Dictionary of spreadsheet row data
         """
-        # Generate source number
+        # Generate source number (after any rows already in the sheet)
+        self._get_mirror()
         source_num = f"{self.next_source_number:03d}"
         self.next_source_number += 1
         
@@ -174,9 +193,8 @@ class SourcepullSpreadsheet:
         # Store locally
         self.local_data.append(row_data)
         
-        # Update Google Sheets if connected
-        if self.service and self.spreadsheet_id:
-            self._update_sheet_row(row_data)
+        # Stage the row for the next sync
+        self._update_sheet_row(row_data)
         
         return row_data
     
@@ -218,31 +236,29 @@ class SourcepullSpreadsheet:
         return f"=HYPERLINK(\"drive/path/{filename}\", \"📎\")"
     
     def _update_sheet_row(self, row_data: Dict[str, Any]):
-        """Update a row in the Google Sheet"""
-        if not self.service or not self.spreadsheet_id:
+        """Stage a row in the local mirror; sync() sends it"""
+        mirror = self._get_mirror()
+        if mirror is None:
             return
         
+        # Rows are keyed by Source #, so the row number comes from the sheet itself
+        mirror.upsert(row_data)
+    
+    def sync(self) -> int:
+        """
+        Push all staged changes to the Google Sheet in one batchUpdate
+        
+        Returns:
+            Number of ranges written (0 if nothing changed or not connected)
+        """
+        if self.mirror is None:
+            return 0
+        
         try:
-            # Convert dict to list in column order
-            values = [[row_data.get(col, "") for col in self.COLUMNS]]
-            
-            # Find next empty row (simplified - would need to query sheet)
-            next_row = len(self.local_data) + 1  # +1 for header
-            
-            body = {
-                'values': values
-            }
-            
-            result = self.service.spreadsheets().values().append(
-                spreadsheetId=self.spreadsheet_id,
-                range=f"Sourcepull!A{next_row}",
-                valueInputOption='USER_ENTERED',
-                body=body
-            ).execute()
-            
-            logger.info(f"Added row {next_row} to spreadsheet")
+            return self.mirror.flush()
         except Exception as e:
             logger.error(f"Failed to update sheet: {e}")
+            return 0
     
     def _format_header_row(self, sheet_name: str):
         """Apply formatting to header row"""
@@ -255,18 +271,24 @@ class SourcepullSpreadsheet:
         for row in self.local_data:
             if row['Source #'] == source_number:
                 row['Redboxed'] = "Yes" if redboxed else "No"
-                if self.service:
-                    self._update_sheet_row(row)
+                self._update_sheet_row(row)
                 break
+        else:
+            # Source added in an earlier run; only the sheet has it
+            if self._get_mirror():
+                self.mirror.set_cell(source_number, 'Redboxed', "Yes" if redboxed else "No")
     
     def update_physical_location(self, source_number: str, shelf: str):
         """Update physical location for a book"""
         for row in self.local_data:
             if row['Source #'] == source_number:
                 row['Physical Location'] = shelf
-                if self.service:
-                    self._update_sheet_row(row)
+                self._update_sheet_row(row)
                 break
+        else:
+            # Source added in an earlier run; only the sheet has it
+            if self._get_mirror():
+                self.mirror.set_cell(source_number, 'Physical Location', shelf)
     
     def export_to_csv(self, filepath: str):
         """Export local data to CSV format"""
@@ -373,6 +395,9 @@ def test_spreadsheet():
         row = sheet.add_source(record, "Test System")
         print(f"Added FN{fn}: {row['Short Name']} - {row['Status']}")
     
+    # Push everything in one batch
+    sheet.sync()
+    
     # Export to files
     sheet.export_to_csv("sourcepull_test.csv")
     sheet.export_to_json("sourcepull_test.json")
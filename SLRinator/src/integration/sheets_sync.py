@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+Batched Google Sheets sync for Stanford Law Review Sourcepull
+Keeps a local mirror of a tab and flushes cell-level diffs in one batchUpdate
+"""
+
+import re
+import copy
+import time
+import random
+import logging
+from typing import Dict, List, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# HTTP statuses worth retrying: quota exceeded and transient backend errors
+RETRYABLE_STATUSES = {429, 500, 502, 503}
+
+NUMBER_RE = re.compile(r'[+-]?\d+(?:\.\d+)?')
+
+
+def column_letter(col: int) -> str:
+    """1-based column index -> A1 column letters (1 -> A, 27 -> AA)"""
+    letters = ''
+    while col > 0:
+        col, rem = divmod(col - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def column_index(letters: str) -> int:
+    """A1 column letters -> 1-based column index"""
+    col = 0
+    for ch in letters.upper():
+        col = col * 26 + (ord(ch) - 64)
+    return col
+
+
+def parse_a1(a1: str) -> Tuple[str, int, int, Optional[int], Optional[int]]:
+    """
+    Parse 'Sheet!B3:D5' into (sheet, start_row, start_col, end_row, end_col).
+    Open-ended ranges ('Sheet!A1:S') leave the missing bounds as None.
+    """
+    sheet, _, cells = a1.rpartition('!')
+    start, _, end = cells.partition(':')
+
+    def split(ref: str) -> Tuple[Optional[int], Optional[int]]:
+        letters = ''.join(ch for ch in ref if ch.isalpha())
+        digits = ''.join(ch for ch in ref if ch.isdigit())
+        return (int(digits) if digits else None, column_index(letters) if letters else None)
+
+    start_row, start_col = split(start)
+    end_row, end_col = split(end) if end else (start_row, start_col)
+    return sheet.strip("'"), start_row or 1, start_col or 1, end_row, end_col
+
+
+def normalize_key(value: Any) -> str:
+    """
+    Row key as written or as read back: USER_ENTERED turns "001" into the
+    number 1, which the API returns as "1", so numeric keys drop leading zeros
+    """
+    text = str(value).strip()
+    return str(int(text)) if text.isdigit() else text
+
+
+def _status_of(error: Exception) -> Optional[int]:
+    """HTTP status of a googleapiclient HttpError (or anything shaped like one)"""
+    status = getattr(getattr(error, 'resp', None), 'status', None)
+    if status is None:
+        status = getattr(error, 'status_code', None)
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+class SheetMirror:
+    """
+    Local mirror of one tab of a Google Sheet
+
+    Reads the tab once, applies edits locally, and on flush() sends only the
+    cells that differ from the last synced state. Adjacent changed cells in a
+    row are coalesced into one range, and all ranges go out in a single
+    values().batchUpdate call.
+    """
+
+    def __init__(self, service, spreadsheet_id: str, sheet_name: str, columns: List[str],
+                 max_retries: int = 5, base_delay: float = 1.0):
+        self.service = service
+        self.spreadsheet_id = spreadsheet_id
+        self.sheet_name = sheet_name
+        self.columns = list(columns)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+
+        self.rows: List[List[Any]] = []     # Current local state, row 0 is the header
+        self._synced: List[List[Any]] = []  # Last state known to be on the server
+        self._key_index: Dict[str, int] = {}
+        self.api_calls = 0
+
+    # ------------------------------------------------------------------
+    # Loading and local edits
+    # ------------------------------------------------------------------
+
+    def load(self) -> 'SheetMirror':
+        """Read the whole tab in one call and index rows by the first column"""
+        last_col = column_letter(len(self.columns))
+        response = self._execute(lambda: self.service.spreadsheets().values().get(
+            spreadsheetId=self.spreadsheet_id,
+            range=f"{self.sheet_name}!A1:{last_col}"
+        ))
+        values = response.get('values', [])
+
+        self.rows = [self._pad(row) for row in values] or [list(self.columns)]
+        self._synced = copy.deepcopy(self.rows) if values else []
+        self._key_index = {normalize_key(row[0]): i for i, row in enumerate(self.rows) if i > 0 and row[0] != ''}
+        return self
+
+    def _pad(self, row: List[Any]) -> List[Any]:
+        row = list(row)[:len(self.columns)]
+        return row + [''] * (len(self.columns) - len(row))
+
+    def row_dict(self, key: str) -> Optional[Dict[str, Any]]:
+        """Current values of the row whose first column is key"""
+        index = self._key_index.get(normalize_key(key))
+        if index is None:
+            return None
+        return dict(zip(self.columns, self.rows[index]))
+
+    def upsert(self, row_data: Dict[str, Any]) -> int:
+        """Insert or update a row keyed by its first column; returns the 1-based sheet row"""
+        key = normalize_key(row_data.get(self.columns[0], ''))
+        index = self._key_index.get(key)
+        if index is None:
+            index = len(self.rows)
+            self.rows.append([''] * len(self.columns))
+            if key:
+                self._key_index[key] = index
+
+        row = self.rows[index]
+        for col, name in enumerate(self.columns):
+            if name in row_data:
+                row[col] = '' if row_data[name] is None else row_data[name]
+        return index + 1
+
+    def set_cell(self, key: str, column: str, value: Any) -> bool:
+        """Set one cell of the row keyed by key"""
+        index = self._key_index.get(normalize_key(key))
+        if index is None or column not in self.columns:
+            return False
+        self.rows[index][self.columns.index(column)] = value
+        return True
+
+    # ------------------------------------------------------------------
+    # Diffing and flushing
+    # ------------------------------------------------------------------
+
+    def diff(self) -> List[Dict[str, Any]]:
+        """
+        Changed cells as coalesced A1 ranges: [{'range': ..., 'values': [[...]]}]
+
+        New rows are sent whole; changed runs of adjacent cells within an
+        existing row become one range each.
+        """
+        data = []
+        new_rows_start = None
+
+        for i, row in enumerate(self.rows):
+            synced = self._synced[i] if i < len(self._synced) else None
+            if synced is None:
+                if new_rows_start is None:
+                    new_rows_start = i
+                continue
+
+            col = 0
+            while col < len(row):
+                if row[col] == synced[col]:
+                    col += 1
+                    continue
+                start = col
+                while col < len(row) and row[col] != synced[col]:
+                    col += 1
+                data.append({
+                    'range': f"{self.sheet_name}!{column_letter(start + 1)}{i + 1}:{column_letter(col)}{i + 1}",
+                    'values': [row[start:col]]
+                })
+
+        # All appended rows are contiguous at the end: one block
+        if new_rows_start is not None:
+            block = self.rows[new_rows_start:]
+            data.append({
+                'range': (f"{self.sheet_name}!A{new_rows_start + 1}:"
+                          f"{column_letter(len(self.columns))}{len(self.rows)}"),
+                'values': [list(r) for r in block]
+            })
+
+        return data
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self.diff())
+
+    def flush(self) -> int:
+        """
+        Send all pending changes in a single batchUpdate.
+
+        Returns:
+            Number of ranges written (0 if nothing changed)
+        """
+        data = self.diff()
+        if not data:
+            return 0
+
+        self._execute(lambda: self.service.spreadsheets().values().batchUpdate(
+            spreadsheetId=self.spreadsheet_id,
+            body={'valueInputOption': 'USER_ENTERED', 'data': data}
+        ))
+        self._synced = copy.deepcopy(self.rows)
+        logger.info(f"Synced {len(data)} range(s) to {self.sheet_name}")
+        return len(data)
+
+    def _execute(self, make_request):
+        """Execute a request, backing off exponentially on quota/transient errors"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.api_calls += 1
+                return make_request().execute()
+            except Exception as e:
+                status = _status_of(e)
+                if status not in RETRYABLE_STATUSES or attempt == self.max_retries:
+                    raise
+                delay = self.base_delay * (2 ** attempt) + random.uniform(0, self.base_delay)
+                logger.warning(f"Sheets API returned {status}; retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+
+class FakeSheetsError(Exception):
+    """Error raised by FakeSheetsService, shaped like googleapiclient's HttpError"""
+
+    class _Resp:
+        def __init__(self, status: int):
+            self.status = status
+
+    def __init__(self, status: int, message: str = ''):
+        super().__init__(message or f"HTTP {status}")
+        self.resp = self._Resp(status)
+
+
+class _FakeRequest:
+    def __init__(self, fake: 'FakeSheetsService', method: str, handler):
+        self.fake = fake
+        self.method = method
+        self.handler = handler
+
+    def execute(self):
+        self.fake.calls.append(self.method)
+        if self.fake.fail_next:
+            status = self.fake.fail_next.pop(0)
+            raise FakeSheetsError(status)
+        return self.handler()
+
+
+class _FakeValues:
+    def __init__(self, fake: 'FakeSheetsService'):
+        self.fake = fake
+
+    def get(self, spreadsheetId: str, range: str, **kwargs):
+        return _FakeRequest(self.fake, 'get', lambda: {'values': self.fake.read(range)})
+
+    def update(self, spreadsheetId: str, range: str, body: Dict, valueInputOption: str = 'RAW', **kwargs):
+        return _FakeRequest(self.fake, 'update', lambda: self.fake.write(range, body['values'], valueInputOption))
+
+    def append(self, spreadsheetId: str, range: str, body: Dict, valueInputOption: str = 'RAW', **kwargs):
+        def handler():
+            sheet = parse_a1(range)[0]
+            grid = self.fake.sheets.setdefault(sheet, [])
+            return self.fake.write(f"{sheet}!A{len(grid) + 1}", body['values'], valueInputOption)
+        return _FakeRequest(self.fake, 'append', handler)
+
+    def batchUpdate(self, spreadsheetId: str, body: Dict, **kwargs):
+        def handler():
+            for item in body['data']:
+                self.fake.write(item['range'], item['values'], body.get('valueInputOption', 'RAW'))
+            return {'totalUpdatedRanges': len(body['data'])}
+        return _FakeRequest(self.fake, 'batchUpdate', handler)
+
+
+class _FakeSpreadsheets:
+    def __init__(self, fake: 'FakeSheetsService'):
+        self.fake = fake
+
+    def values(self):
+        return _FakeValues(self.fake)
+
+
+class FakeSheetsService:
+    """
+    In-memory stand-in for the Sheets v4 service object
+
+    Supports the values() get/update/append/batchUpdate calls used here,
+    records every executed call in .calls, and can inject HTTP errors via
+    .fail_next (e.g. [429, 429] to simulate quota exhaustion). Like the real
+    API, USER_ENTERED writes store numeric strings as numbers ("001" -> 1),
+    and reads return formatted strings.
+    """
+
+    def __init__(self, sheets: Optional[Dict[str, List[List[Any]]]] = None):
+        self.sheets: Dict[str, List[List[Any]]] = sheets or {}
+        self.calls: List[str] = []
+        self.fail_next: List[int] = []
+
+    def spreadsheets(self):
+        return _FakeSpreadsheets(self)
+
+    def read(self, a1: str) -> List[List[Any]]:
+        sheet, start_row, start_col, end_row, end_col = parse_a1(a1)
+        grid = self.sheets.get(sheet, [])
+        end_row = end_row or len(grid)
+        rows = []
+        for row in grid[start_row - 1:end_row]:
+            cells = row[start_col - 1:end_col] if end_col else row[start_col - 1:]
+            rows.append([self._formatted(value) for value in cells])
+        # Like the real API, trailing empty cells and rows are dropped
+        rows = [self._trim(row) for row in rows]
+        while rows and not rows[-1]:
+            rows.pop()
+        return rows
+
+    @staticmethod
+    def _formatted(value: Any) -> Any:
+        """FORMATTED_VALUE rendering: numbers come back as text"""
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return f"{value:g}" if isinstance(value, float) else str(value)
+        return value
+
+    @staticmethod
+    def _user_entered(value: Any) -> Any:
+        """What the Sheets UI would store if value were typed into a cell"""
+        if isinstance(value, str) and NUMBER_RE.fullmatch(value.strip()):
+            number = float(value)
+            return int(number) if number.is_integer() and '.' not in value else number
+        return value
+
+    @staticmethod
+    def _trim(row: List[Any]) -> List[Any]:
+        while row and row[-1] in ('', None):
+            row = row[:-1]
+        return row
+
+    def write(self, a1: str, values: List[List[Any]], value_input_option: str = 'RAW') -> Dict[str, Any]:
+        sheet, start_row, start_col, _, _ = parse_a1(a1)
+        grid = self.sheets.setdefault(sheet, [])
+        for r, row_values in enumerate(values):
+            row_num = start_row - 1 + r
+            while len(grid) <= row_num:
+                grid.append([])
+            row = grid[row_num]
+            for c, value in enumerate(row_values):
+                col_num = start_col - 1 + c
+                while len(row) <= col_num:
+                    row.append('')
+                row[col_num] = self._user_entered(value) if value_input_option == 'USER_ENTERED' else value
+        return {'updatedRange': a1, 'updatedRows': len(values)}
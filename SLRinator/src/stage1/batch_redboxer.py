@@ -0,0 +1,315 @@
+"""
+Batch Redboxer for Stanford Law Review
+Redboxes retrieved PDFs across a process pool, appending the boxes to a copy
+of each source with an incremental save, and skips PDFs already boxed for the
+same citation
+"""
+
+import json
+import time
+import shutil
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
+
+import fitz  # PyMuPDF
+
+try:
+    from pdf_redboxer import SmartRedboxer
+except ImportError:
+    from src.stage1.pdf_redboxer import SmartRedboxer
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = ".redbox_manifest.json"
+# Extracted page words, kept with the redbox output rather than beside the sources
+TEXT_CACHE_NAME = ".text_models"
+
+
+@dataclass
+class RedboxJob:
+    """One PDF to redbox for one citation"""
+    input_path: str
+    output_path: str
+    citation_type: str
+    citation_data: Dict[str, Any] = field(default_factory=dict)
+    add_metadata: bool = True
+    text_cache_dir: Optional[str] = None
+
+
+def save_and_close(doc: fitz.Document, path: str):
+    """
+    Save doc back to the file it was opened from, then close it.
+
+    Changes are appended with an incremental save where the file allows it.
+    Repaired or otherwise unsuitable files, and incremental saves that fail,
+    fall back to a full rewrite through <path>.tmp.
+    """
+    tmp_path = Path(f"{path}.tmp")
+    # A .tmp left by an interrupted save must not be taken for this one
+    tmp_path.unlink(missing_ok=True)
+    try:
+        if doc.can_save_incrementally():
+            try:
+                doc.save(path, incremental=True, encryption=fitz.PDF_ENCRYPT_KEEP)
+                return
+            except Exception as e:
+                logger.debug(f"Incremental save of {path} failed ({e}); rewriting it")
+        doc.save(str(tmp_path), garbage=1)
+    finally:
+        doc.close()
+    tmp_path.replace(path)
+
+
+def redbox_job(job: RedboxJob) -> Dict[str, Any]:
+    """
+    Redbox one PDF (safe to run in a worker process).
+
+    The source is copied to the output path and the boxes are appended to the
+    copy, so large PDFs are never fully rewritten.
+    """
+    start = time.time()
+    result = {
+        'input_path': job.input_path,
+        'output_path': job.output_path,
+        'success': False,
+        'pages': 0,
+        'redboxes': 0,
+        'elapsed': 0.0,
+        'error': None
+    }
+
+    try:
+        redboxer = SmartRedboxer(text_cache_dir=job.text_cache_dir)
+        search_terms = redboxer.build_search_terms(job.citation_type, job.citation_data)
+
+        Path(job.output_path).parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(job.input_path, job.output_path)
+
+        doc = fitz.open(job.output_path)
+        try:
+            elements = redboxer._find_elements(doc, search_terms, source_path=job.input_path)
+            redboxer._add_redboxes(doc, elements)
+            if job.add_metadata:
+                redboxer._add_metadata_page(doc, elements, search_terms)
+            result['pages'] = len(doc)
+            result['redboxes'] = len(elements)
+        except Exception:
+            doc.close()
+            raise
+        save_and_close(doc, job.output_path)
+
+        result['success'] = True
+
+    except Exception as e:
+        result['error'] = str(e)
+
+    result['elapsed'] = time.time() - start
+    return result
+
+
+class BatchRedboxer:
+    """
+    Redboxes PDFs across a process pool, skipping work that is already done.
+
+    Finished jobs are recorded in a manifest keyed by the PDF's SHA-256 and
+    the citation components. redbox() may be called from several threads (the
+    workflow's redbox stage); redbox_batch() boxes a list at once and
+    redbox_folder() a whole Retrieved folder.
+    """
+
+    def __init__(self, config: Dict[str, Any] = None, manifest_path: Optional[str] = None):
+        self.config = config or {}
+        self.max_workers = self.config.get('redbox_workers', 4)
+        self.manifest_path = Path(manifest_path) if manifest_path else None
+        self._manifest = self._load_manifest(self.manifest_path) if self.manifest_path else {}
+        self._hashes: Dict[Tuple[str, int, float], str] = {}
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.stats = {'processed': 0, 'skipped': 0, 'failed': 0, 'pages': 0, 'busy_seconds': 0.0}
+
+    def _pdf_hash(self, pdf_path: Path) -> str:
+        """SHA-256 of a PDF, memoized by path/size/mtime"""
+        st = pdf_path.stat()
+        memo_key = (str(pdf_path.resolve()), st.st_size, st.st_mtime)
+        with self._lock:
+            if memo_key in self._hashes:
+                return self._hashes[memo_key]
+        digest = hashlib.sha256()
+        with open(pdf_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        with self._lock:
+            self._hashes[memo_key] = digest.hexdigest()
+        return self._hashes[memo_key]
+
+    def job_key(self, job: RedboxJob) -> str:
+        """Identity of a job: the PDF's content plus the citation components"""
+        components = json.dumps([job.citation_type, job.citation_data, job.add_metadata],
+                                sort_keys=True, default=str)
+        digest = hashlib.sha256(components.encode('utf-8')).hexdigest()[:16]
+        return f"{self._pdf_hash(Path(job.input_path))}:{digest}"
+
+    def _load_manifest(self, manifest_path: Path) -> Dict[str, Any]:
+        if manifest_path.exists():
+            try:
+                with open(manifest_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable redbox manifest {manifest_path}: {e}")
+        return {}
+
+    def _save_manifest(self):
+        if not self.manifest_path:
+            return
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._manifest, f, indent=2)
+        tmp_path.replace(self.manifest_path)
+
+    def _run(self, job: RedboxJob) -> Dict[str, Any]:
+        if self.max_workers <= 0:
+            return redbox_job(job)
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            pool = self._pool
+        return pool.submit(redbox_job, job).result()
+
+    def redbox(self, job: RedboxJob) -> Dict[str, Any]:
+        """Redbox one PDF, or return the manifest entry if it was already boxed for this citation"""
+        try:
+            key = self.job_key(job)
+        except OSError as e:
+            with self._lock:
+                self.stats['failed'] += 1
+            return {'input_path': job.input_path, 'output_path': job.output_path, 'success': False, 'error': str(e)}
+
+        with self._lock:
+            done = self._manifest.get(key)
+        if done and done['output_path'] == job.output_path and Path(done['output_path']).exists():
+            with self._lock:
+                self.stats['skipped'] += 1
+            return {**done, 'success': True, 'skipped': True}
+
+        result = self._run(job)
+        with self._lock:
+            self.stats['busy_seconds'] += result['elapsed']
+            if result['success']:
+                self.stats['processed'] += 1
+                self.stats['pages'] += result['pages']
+                self._manifest[key] = {
+                    'input_path': result['input_path'],
+                    'output_path': result['output_path'],
+                    'pages': result['pages'],
+                    'redboxes': result['redboxes'],
+                    'boxed_at': datetime.now().isoformat()
+                }
+                self._save_manifest()
+            else:
+                self.stats['failed'] += 1
+                logger.error(f"Redboxing failed for {result['input_path']}: {result['error']}")
+        return result
+
+    def redbox_batch(self, jobs: List[RedboxJob]) -> Dict[str, Any]:
+        """
+        Redbox a list of PDFs across the pool.
+
+        Returns:
+            Summary with per-file results and pages/second throughput
+        """
+        start = time.time()
+        before = dict(self.stats)
+        threads = max(1, min(self.max_workers, len(jobs)))
+        results: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+        order = iter(range(len(jobs)))
+        order_lock = threading.Lock()
+
+        def work():
+            while True:
+                with order_lock:
+                    index = next(order, None)
+                if index is None:
+                    return
+                results[index] = self.redbox(jobs[index])
+
+        workers = [threading.Thread(target=work) for _ in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        elapsed = time.time() - start
+        summary = {key: self.stats[key] - before[key] for key in ('processed', 'skipped', 'failed', 'pages')}
+        summary.update({
+            'total': len(jobs),
+            'elapsed': elapsed,
+            'pages_per_second': summary['pages'] / elapsed if elapsed > 0 else 0.0,
+            'results': results
+        })
+        logger.info(
+            f"Redboxed {summary['processed']} PDFs ({summary['pages']} pages) in "
+            f"{elapsed:.1f}s - {summary['pages_per_second']:.1f} pages/sec; "
+            f"{summary['skipped']} skipped, {summary['failed']} failed"
+        )
+        return summary
+
+    def redbox_folder(self, retrieved_dir: str, output_dir: str,
+                      citations: Dict[str, Tuple[str, Dict[str, Any]]],
+                      add_metadata: bool = True) -> Dict[str, Any]:
+        """
+        Redbox every PDF in a Retrieved folder into output_dir.
+
+        Args:
+            retrieved_dir: Folder of retrieved source PDFs
+            output_dir: Folder for the boxed copies (same file names)
+            citations: (citation type, citation data) per PDF, keyed by file
+                name or stem; PDFs with no entry are left alone
+
+        Returns:
+            redbox_batch() summary, plus the PDFs that had no citation
+        """
+        retrieved_dir, output_dir = Path(retrieved_dir), Path(output_dir)
+        jobs, unmatched = [], []
+        for pdf in sorted(retrieved_dir.iterdir()):
+            if not pdf.is_file() or pdf.suffix.lower() != '.pdf':
+                continue
+            citation = citations.get(pdf.name) or citations.get(pdf.stem)
+            if citation is None:
+                unmatched.append(str(pdf))
+                continue
+            citation_type, citation_data = citation
+            jobs.append(RedboxJob(
+                input_path=str(pdf),
+                output_path=str(output_dir / pdf.name),
+                citation_type=citation_type,
+                citation_data=citation_data,
+                add_metadata=add_metadata,
+                text_cache_dir=str(output_dir / TEXT_CACHE_NAME)
+            ))
+
+        if unmatched:
+            logger.warning(f"No citation for {len(unmatched)} PDF(s) in {retrieved_dir}; not redboxed")
+        summary = self.redbox_batch(jobs)
+        summary['unmatched'] = unmatched
+        return summary
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals so far, with throughput per second of worker time"""
+        with self._lock:
+            stats = dict(self.stats)
+        busy = stats.pop('busy_seconds')
+        stats['pages_per_second'] = round(stats['pages'] / busy, 1) if busy > 0 else 0.0
+        return stats
+
+    def close(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
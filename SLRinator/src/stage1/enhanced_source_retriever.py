@@ -9,7 +9,6 @@ import time
 import json
 import logging
 import hashlib
-import requests
 from pathlib import Path
 from typing import Optional, Dict, List, Tuple, Any, Union
 from dataclasses import dataclass
@@ -22,6 +21,8 @@ from urllib.parse import urljoin, quote
 from bs4 import BeautifulSoup
 from tenacity import retry, stop_after_attempt, wait_exponential
 
+from src.utils.retrieval_guard import GuardedSession, NegativeCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -81,13 +82,16 @@ class EnhancedSourceRetriever:
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
-        # HTTP session setup
-        self.session = requests.Session()
+        # HTTP session setup (circuit breaker per host)
+        self.session = GuardedSession()
         self.session.headers.update({
             'User-Agent': 'Stanford Law Review Editorial System/2.0',
             'Accept': 'application/pdf, application/json, text/html, */*'
         })
         
+        # Strategies that recently failed for a source, skipped until their TTL expires
+        self.negative_cache = NegativeCache(self.cache_dir / "negative_cache.json")
+        
         # Statistics
         self.stats = {
             'total_retrieved': 0,
@@ -212,34 +216,49 @@ class EnhancedSourceRetriever:
                 message=f"Unsupported source type: {source.source_type}"
             )
     
+    def _guarded(self, strategy: str, try_method, source: LegalSource) -> RetrievalResult:
+        """Run one _try_* method unless it is known to fail for this source"""
+        known_failure = self.negative_cache.get(strategy, source.citation)
+        if known_failure:
+            return RetrievalResult(source_id=source.id, status="failed",
+                                   message=self.negative_cache.describe(known_failure))
+        
+        self.session.begin_attempt()
+        result = try_method(source)
+        if result.status in ("success", "partial"):
+            self.negative_cache.discard(strategy, source.citation)
+        else:
+            self.negative_cache.put(strategy, source.citation, self.session.attempt_failure())
+        return result
+    
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
     def _retrieve_case_document(self, source: LegalSource) -> RetrievalResult:
         """Retrieve Supreme Court case documents"""
         metadata = source.metadata
         
         # Strategy 1: Try Supreme Court website directly
-        result = self._try_supremecourt_gov(source)
+        result = self._guarded('supremecourt_gov', self._try_supremecourt_gov, source)
         if result.status == "success":
             return result
         
         # Strategy 2: Try CourtListener API
         if self.courtlistener_api:
-            result = self._try_courtlistener_api(source)
+            result = self._guarded('courtlistener_api', self._try_courtlistener_api, source)
             if result.status == "success":
                 return result
         
         # Strategy 3: Try Justia for Supreme Court cases
-        result = self._try_justia_supreme_court(source)
+        result = self._guarded('justia_supreme_court', self._try_justia_supreme_court, source)
         if result.status == "success":
             return result
         
         # Strategy 4: Try Case.law (Harvard)
-        result = self._try_caselaw_harvard(source)
+        result = self._guarded('caselaw_harvard', self._try_caselaw_harvard, source)
         if result.status in ["success", "partial"]:
             return result
         
         # Strategy 5: Try Google Scholar as last resort
-        result = self._try_google_scholar_case(source)
+        result = self._guarded('google_scholar_case', self._try_google_scholar_case, source)
         if result.status in ["success", "partial"]:
             return result
         
@@ -450,17 +469,17 @@ class EnhancedSourceRetriever:
         
         # Try GovInfo API first
         if self.govinfo_api:
-            result = self._try_govinfo_usc(source)
+            result = self._guarded('govinfo_usc', self._try_govinfo_usc, source)
             if result.status == "success":
                 return result
         
         # Try uscode.house.gov
-        result = self._try_uscode_house_gov(source)
+        result = self._guarded('uscode_house_gov', self._try_uscode_house_gov, source)
         if result.status in ["success", "partial"]:
             return result
         
         # Try Legal Information Institute (Cornell)
-        result = self._try_cornell_lii_usc(source)
+        result = self._guarded('cornell_lii_usc', self._try_cornell_lii_usc, source)
         if result.status in ["success", "partial"]:
             return result
         
@@ -595,17 +614,17 @@ class EnhancedSourceRetriever:
         metadata = source.metadata
         
         # Try SSRN first for academic articles
-        result = self._try_ssrn_article(source)
+        result = self._guarded('ssrn_article', self._try_ssrn_article, source)
         if result.status == "success":
             return result
         
         # Try Google Scholar
-        result = self._try_google_scholar_article(source)
+        result = self._guarded('google_scholar_article', self._try_google_scholar_article, source)
         if result.status in ["success", "partial"]:
             return result
         
         # Try law review's own website
-        result = self._try_law_review_website(source)
+        result = self._guarded('law_review_website', self._try_law_review_website, source)
         if result.status in ["success", "partial"]:
             return result
         
@@ -0,0 +1,250 @@
+"""
+OCR Service Module for Stanford Law Review
+Runs page OCR in a process pool with image and result caching
+"""
+
+import io
+import json
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, Future
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+import fitz  # PyMuPDF
+
+logger = logging.getLogger(__name__)
+
+# PDF content hashes remembered per (path, size, mtime)
+HASH_MEMO_SIZE = 256
+
+try:
+    import pytesseract
+    from PIL import Image
+    OCR_AVAILABLE = True
+except ImportError:
+    OCR_AVAILABLE = False
+
+
+def _tesseract_tsv(png_bytes: bytes, config: str) -> str:
+    """Worker: OCR a PNG image and return Tesseract TSV output"""
+    img = Image.open(io.BytesIO(png_bytes))
+    return pytesseract.image_to_data(img, config=config)
+
+
+def parse_tsv_words(tsv: str, zoom: float, origin: Tuple[float, float] = (0.0, 0.0)) -> List[Dict[str, Any]]:
+    """Convert Tesseract TSV into word dicts with page-space coordinates"""
+    rows = tsv.splitlines()
+    if not rows:
+        return []
+
+    header = rows[0].split('\t')
+    col = {name: i for i, name in enumerate(header)}
+    words = []
+
+    for row in rows[1:]:
+        parts = row.split('\t')
+        if len(parts) < len(header) or not parts[col['text']].strip():
+            continue
+        x0 = int(parts[col['left']]) / zoom + origin[0]
+        y0 = int(parts[col['top']]) / zoom + origin[1]
+        words.append({
+            'text': parts[col['text']].strip(),
+            'conf': float(parts[col['conf']]) / 100.0,
+            'x0': x0,
+            'y0': y0,
+            'x1': x0 + int(parts[col['width']]) / zoom,
+            'y1': y0 + int(parts[col['height']]) / zoom,
+        })
+
+    return words
+
+
+class OCRService:
+    """Process-pool OCR with a pixmap cache and persistent results"""
+
+    def __init__(self, config: Dict[str, Any] = None):
+        self.config = config or {}
+        self.cache_dir = Path(self.config.get('ocr_cache_dir', './cache/ocr'))
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_workers = self.config.get('ocr_workers', 2)
+        self.max_pending = self.config.get('ocr_max_pending', 8)
+        self.pixmap_cache_size = self.config.get('ocr_pixmap_cache_size', 16)
+
+        self.executor = ProcessPoolExecutor(max_workers=self.max_workers) if self.max_workers > 0 else None
+        self._slots = threading.BoundedSemaphore(max(1, self.max_pending))
+        self._pixmaps = OrderedDict()
+        self._lock = threading.Lock()
+        self._hashes = OrderedDict()
+        # Counters are bumped from every thread that OCRs
+        self._stats_lock = threading.Lock()
+
+        self.db = sqlite3.connect(str(self.cache_dir / "ocr_pages.db"), check_same_thread=False)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS ocr_pages (
+                key TEXT PRIMARY KEY,
+                words TEXT,
+                created_at REAL
+            )
+        """)
+        self.db.commit()
+
+        self.stats = {'pages_requested': 0, 'cache_hits': 0, 'tesseract_calls': 0}
+
+    def pdf_hash(self, pdf_path: str) -> str:
+        """SHA-256 of the PDF file, memoized by path/size/mtime"""
+        path = Path(pdf_path)
+        st = path.stat()
+        memo_key = (str(path.resolve()), st.st_size, st.st_mtime)
+        with self._lock:
+            if memo_key in self._hashes:
+                self._hashes.move_to_end(memo_key)
+                return self._hashes[memo_key]
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        with self._lock:
+            self._hashes[memo_key] = digest.hexdigest()
+            while len(self._hashes) > HASH_MEMO_SIZE:
+                self._hashes.popitem(last=False)
+        return digest.hexdigest()
+
+    def doc_hash(self, doc: fitz.Document) -> str:
+        """SHA-256 of an open document: its file's, or its bytes' when it has no file"""
+        if doc.name and Path(doc.name).is_file():
+            return self.pdf_hash(doc.name)
+        return hashlib.sha256(doc.tobytes(no_new_id=True)).hexdigest()
+
+    def _count(self, name: str, n: int = 1):
+        with self._stats_lock:
+            self.stats[name] += n
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            return dict(self.stats)
+
+    def _key(self, pdf_hash: str, page_xref: int, dpi: int, clip: Optional[fitz.Rect]) -> str:
+        # Pages are keyed by xref, which survives deletion of other pages during cleaning
+        clip_key = ','.join(f"{v:.1f}" for v in clip) if clip is not None else 'page'
+        return f"{pdf_hash}:{page_xref}:{dpi}:{clip_key}"
+
+    def _load(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            row = self.db.execute("SELECT words FROM ocr_pages WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _save(self, key: str, words: List[Dict[str, Any]]):
+        with self._lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO ocr_pages (key, words, created_at) VALUES (?, ?, ?)",
+                (key, json.dumps(words), time.time())
+            )
+            self.db.commit()
+
+    def _render(self, page: fitz.Page, pdf_hash: str, dpi: int,
+                clip: Optional[fitz.Rect]) -> Tuple[bytes, Tuple[float, float]]:
+        """
+        Rasterize a page (or clip) to PNG, cropping from a cached render of
+        the whole page. Returns the PNG and the page-space origin of its
+        top-left pixel.
+        """
+        zoom = dpi / 72
+        key = (pdf_hash, page.xref, dpi)
+        with self._lock:
+            pix = self._pixmaps.get(key)
+            if pix is not None:
+                self._pixmaps.move_to_end(key)
+
+        if pix is None:
+            pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+            with self._lock:
+                self._pixmaps[key] = pix
+                while len(self._pixmaps) > self.pixmap_cache_size:
+                    self._pixmaps.popitem(last=False)
+
+        if clip is None:
+            return pix.tobytes("png"), (0.0, 0.0)
+        irect = (fitz.Rect(clip) * fitz.Matrix(zoom, zoom)).irect & pix.irect
+        if irect.is_empty:
+            raise ValueError(f"Clip {clip} lies outside the page")
+        cropped = fitz.Pixmap(pix.colorspace, irect, pix.alpha)
+        cropped.copy(pix, irect)
+        return cropped.tobytes("png"), (irect.x0 / zoom, irect.y0 / zoom)
+
+    def submit_page(self, doc: fitz.Document, page_num: int, dpi: int = 144,
+                    clip: Optional[fitz.Rect] = None) -> Future:
+        """
+        Queue OCR for a page and return a Future resolving to its words.
+        Blocks while the pending queue is full.
+        """
+        future = Future()
+        if not OCR_AVAILABLE:
+            future.set_exception(RuntimeError("pytesseract not available"))
+            return future
+
+        self._count('pages_requested')
+        try:
+            page = doc[page_num]
+            pdf_hash = self.doc_hash(doc)
+            key = self._key(pdf_hash, page.xref, dpi, clip)
+
+            cached = self._load(key)
+            if cached is not None:
+                self._count('cache_hits')
+                future.set_result(cached)
+                return future
+
+            png, origin = self._render(page, pdf_hash, dpi, clip)
+        except Exception as e:
+            future.set_exception(e)
+            return future
+        self._count('tesseract_calls')
+
+        def finish(tsv: str) -> List[Dict[str, Any]]:
+            words = parse_tsv_words(tsv, dpi / 72, origin)
+            self._save(key, words)
+            return words
+
+        if self.executor is None:
+            try:
+                future.set_result(finish(_tesseract_tsv(png, '')))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
+        def on_done(f: Future):
+            try:
+                future.set_result(finish(f.result()))
+            except Exception as e:
+                future.set_exception(e)
+
+        self._submit(png, '').add_done_callback(on_done)
+        return future
+
+    def _submit(self, png: bytes, config: str) -> Future:
+        """Queue a Tesseract run in the pool, blocking while max_pending runs are queued"""
+        self._slots.acquire()
+        try:
+            future = self.executor.submit(_tesseract_tsv, png, config)
+        except BaseException:
+            # A run that was never queued must not keep its slot
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def ocr_page(self, doc: fitz.Document, page_num: int, dpi: int = 144) -> List[Dict[str, Any]]:
+        """OCR a page synchronously (cached)"""
+        return self.submit_page(doc, page_num, dpi).result()
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+        self.db.close()
@@ -0,0 +1,271 @@
+"""
+Page Text Model for Stanford Law Review
+Extracts each PDF's words once and answers term searches from an index
+"""
+
+import re
+import json
+import hashlib
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Dict, Tuple, Optional
+
+try:
+    import fitz  # PyMuPDF
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Punctuation stripped from token edges; "U.S.," and "u.s" index the same
+EDGE_PUNCT = '.,;:!?()[]{}"\'“”‘’'
+WORD_PART = re.compile(r'[^\W_]+')
+
+WHITESPACE = re.compile(r'\s+')
+
+MODEL_VERSION = 1
+MEMORY_CACHE_SIZE = 32
+
+
+def normalize_token(text: str) -> str:
+    """Normalize a word for lookup"""
+    return text.lower().strip(EDGE_PUNCT)
+
+
+@dataclass
+class PageWord:
+    """A word on a page with its bounding box"""
+    text: str
+    x0: float
+    y0: float
+    x1: float
+    y1: float
+    line: Tuple[int, int]  # (block, line) from MuPDF
+    norm: str = ''
+    keys: Tuple[str, ...] = field(default=(), repr=False)
+
+    def __post_init__(self):
+        if not self.norm:
+            self.norm = normalize_token(self.text)
+        # Index keys: the normalized word plus its leading word part ("101(a)" -> "101")
+        part = WORD_PART.match(self.norm)
+        if part and part.group() != self.norm:
+            self.keys = (self.norm, part.group())
+        else:
+            self.keys = (self.norm,)
+
+
+class PageTextModel:
+    """Words of one page with an inverted index from token to word positions"""
+
+    def __init__(self, words: List[PageWord]):
+        self.words = words
+        self._compact: Optional[Tuple[str, List[int], List[int]]] = None
+        self.index: Dict[str, List[int]] = defaultdict(list)
+        for i, word in enumerate(words):
+            for key in word.keys:
+                self.index[key].append(i)
+
+    @property
+    def text(self) -> str:
+        return ' '.join(word.text for word in self.words)
+
+    def _matches(self, pos: int, token: str) -> bool:
+        return pos < len(self.words) and token in self.words[pos].keys
+
+    def find(self, term: str, max_hits: Optional[int] = None) -> List[Tuple[float, float, float, float]]:
+        """
+        Find a term as a phrase of consecutive words.
+
+        Returns one rectangle per line covered by each hit, like page.search_for.
+        When no phrase matches, falls back to a spacing-insensitive match inside
+        the indexed words, so "Jones" is found in "Smith-Jones" and "§ 1983" in
+        "§1983". The page itself is never consulted.
+        """
+        tokens = [normalize_token(t) for t in term.split()]
+        tokens = [t for t in tokens if t]
+        if not tokens:
+            return []
+
+        rects = []
+        hits = 0
+        for start in self.index.get(tokens[0], ()):
+            if all(self._matches(start + i, tok) for i, tok in enumerate(tokens[1:], 1)):
+                rects.extend(self._line_rects(start, start + len(tokens)))
+                hits += 1
+                if max_hits is not None and hits >= max_hits:
+                    break
+        if rects:
+            return rects
+
+        return self._find_compact(term, max_hits)
+
+    def _find_compact(self, term: str, max_hits: Optional[int]) -> List[Tuple[float, float, float, float]]:
+        """Match the term with all spacing removed against the page's run of words"""
+        needle = WHITESPACE.sub('', term.lower()).strip(EDGE_PUNCT)
+        if not needle:
+            return []
+        if self._compact is None:
+            lowered = [word.text.lower() for word in self.words]
+            owners, starts = [], []
+            for i, text in enumerate(lowered):
+                starts.append(len(owners))
+                owners.extend([i] * len(text))
+            self._compact = (''.join(lowered), owners, starts)
+        haystack, owners, starts = self._compact
+
+        rects = []
+        hits = 0
+        pos = haystack.find(needle)
+        while pos != -1:
+            end = pos + len(needle)
+            first, last = owners[pos], owners[end - 1]
+            # A match inside a word covers the matched share of the word's width
+            rects.extend(self._line_rects(first, last + 1, pos - starts[first], end - starts[last]))
+            hits += 1
+            if max_hits is not None and hits >= max_hits:
+                break
+            pos = haystack.find(needle, end)
+        return rects
+
+    def _line_rects(self, start: int, end: int, start_offset: int = 0,
+                    end_offset: Optional[int] = None) -> List[Tuple[float, float, float, float]]:
+        """
+        Union of word boxes per line for words[start:end]
+
+        start_offset and end_offset trim the first and last word to a
+        character range, with the word's width split evenly across its
+        characters.
+        """
+        lines: Dict[Tuple[int, int], List[float]] = {}
+        for i in range(start, end):
+            word = self.words[i]
+            x0, x1 = word.x0, word.x1
+            length = len(word.text.lower())
+            if length:
+                char_width = (word.x1 - word.x0) / length
+                if i == start:
+                    x0 = word.x0 + start_offset * char_width
+                if i == end - 1 and end_offset is not None:
+                    x1 = word.x0 + end_offset * char_width
+            box = lines.get(word.line)
+            if box is None:
+                lines[word.line] = [x0, word.y0, x1, word.y1]
+            else:
+                box[0] = min(box[0], x0)
+                box[1] = min(box[1], word.y0)
+                box[2] = max(box[2], x1)
+                box[3] = max(box[3], word.y1)
+        return [tuple(box) for box in lines.values()]
+
+
+class DocumentTextModel:
+    """Dehyphenated words for every page of a PDF, extracted once"""
+
+    _memory_cache: Dict[Tuple[str, int, float], 'DocumentTextModel'] = {}
+
+    def __init__(self, pages: List[PageTextModel]):
+        self.pages = pages
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def __getitem__(self, page_num: int) -> PageTextModel:
+        return self.pages[page_num]
+
+    def find(self, term: str, max_hits_per_page: Optional[int] = None) -> Dict[int, List[Tuple[float, float, float, float]]]:
+        """Find a term on every page; returns {page_num: rects} for pages with hits"""
+        results = {}
+        for page_num, page in enumerate(self.pages):
+            rects = page.find(term, max_hits_per_page)
+            if rects:
+                results[page_num] = rects
+        return results
+
+    @classmethod
+    def from_document(cls, doc: 'fitz.Document') -> 'DocumentTextModel':
+        """Build the model from an open document (reflects in-memory edits)"""
+        pages = []
+        for page in doc:
+            raw = page.get_text("words", flags=fitz.TEXTFLAGS_WORDS | fitz.TEXT_DEHYPHENATE)
+            pages.append(PageTextModel([
+                PageWord(text=w[4], x0=w[0], y0=w[1], x1=w[2], y1=w[3], line=(w[5], w[6]))
+                for w in raw
+            ]))
+        return cls(pages)
+
+    @staticmethod
+    def _sidecar_path(cache_dir: Path, pdf_path: Path) -> Path:
+        digest = hashlib.sha1(str(pdf_path).encode('utf-8')).hexdigest()[:16]
+        return cache_dir / f"{pdf_path.stem}.{digest}.words.json"
+
+    @classmethod
+    def for_pdf(cls, pdf_path: Optional[str], doc: Optional['fitz.Document'] = None,
+                cache_dir: Optional[str] = None) -> 'DocumentTextModel':
+        """
+        Get the model for a PDF file, reusing the in-memory or on-disk copy.
+
+        The on-disk copy is a JSON file in cache_dir (none when cache_dir is
+        None), valid while the PDF's size and mtime are unchanged. A document
+        with no file behind it (in-memory or unnamed) is never cached.
+        """
+        path = Path(pdf_path) if pdf_path else None
+        if path is None or not path.is_file():
+            if doc is None:
+                raise FileNotFoundError(f"No PDF at {pdf_path!r} and no open document")
+            return cls.from_document(doc)
+
+        path = path.resolve()
+        st = path.stat()
+        memo_key = (str(path), st.st_size, st.st_mtime)
+
+        model = cls._memory_cache.get(memo_key)
+        if model is not None:
+            return model
+
+        sidecar = cls._sidecar_path(Path(cache_dir), path) if cache_dir else None
+        if sidecar is not None and sidecar.exists():
+            try:
+                with open(sidecar, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if (data.get('version') == MODEL_VERSION and data.get('size') == st.st_size
+                        and data.get('mtime') == st.st_mtime):
+                    model = cls([
+                        PageTextModel([PageWord(text=w[4], x0=w[0], y0=w[1], x1=w[2], y1=w[3], line=(w[5], w[6]))
+                                       for w in page])
+                        for page in data['pages']
+                    ])
+            except (OSError, ValueError, KeyError, IndexError) as e:
+                logger.warning(f"Ignoring unreadable text model {sidecar}: {e}")
+
+        if model is None:
+            if doc is None:
+                with fitz.open(str(path)) as opened:
+                    model = cls.from_document(opened)
+            else:
+                model = cls.from_document(doc)
+
+            if sidecar is not None:
+                tmp_path = sidecar.with_suffix('.tmp')
+                try:
+                    sidecar.parent.mkdir(parents=True, exist_ok=True)
+                    with open(tmp_path, 'w', encoding='utf-8') as f:
+                        json.dump({
+                            'version': MODEL_VERSION,
+                            'source': str(path),
+                            'size': st.st_size,
+                            'mtime': st.st_mtime,
+                            'pages': [[[w.x0, w.y0, w.x1, w.y1, w.text, w.line[0], w.line[1]]
+                                       for w in page.words] for page in model.pages]
+                        }, f)
+                    tmp_path.replace(sidecar)
+                except OSError as e:
+                    logger.warning(f"Could not save text model for {path.name}: {e}")
+
+        cls._memory_cache[memo_key] = model
+        while len(cls._memory_cache) > MEMORY_CACHE_SIZE:
+            cls._memory_cache.pop(next(iter(cls._memory_cache)))
+        return model
@@ -9,12 +9,13 @@ import logging
 from pathlib import Path
 from typing import List, Tuple, Optional, Dict, Any
 from dataclasses import dataclass
+from concurrent.futures import Future, ProcessPoolExecutor
 import fitz  # PyMuPDF
-import pytesseract
-from PIL import Image
-import io
 
+from batch_redboxer import save_and_close
 from citation_parser import Citation, CitationType
+from ocr_service import OCRService
+from page_text_model import DocumentTextModel, PageTextModel
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +43,14 @@ class PDFProcessor:
         self.ocr_threshold = self.config.get('ocr_threshold', 0.7)
         self.redbox_color = (1, 0, 0)  # Red in RGB (0-1 scale)
         self.redbox_width = 2
+        self._ocr_service = None
+    
+    @property
+    def ocr_service(self) -> OCRService:
+        """Shared OCR service, created on first use"""
+        if self._ocr_service is None:
+            self._ocr_service = OCRService(self.config)
+        return self._ocr_service
         
     def process_pdf(self, input_path: str, citation: Citation, output_path: str = None) -> Dict[str, Any]:
         """Main entry point for processing a PDF"""
@@ -176,15 +185,32 @@ class PDFProcessor:
         
         # Define what to search for based on citation type
         search_terms = self._get_search_terms(citation)
+        ocr_pages = []
         
-        for page_num, page in enumerate(doc):
+        # Built from the cleaned document, so it is not persisted next to the source
+        text_model = DocumentTextModel.from_document(doc)
+        
+        for page_num, page_text in enumerate(text_model.pages):
             # Try text-based search first
-            page_elements = self._search_page_text(page, page_num, search_terms)
+            page_elements = self._search_page_text(page_text, page_num, search_terms)
             elements.extend(page_elements)
             
-            # If no results and OCR is enabled, try OCR
+            # If no results and OCR is enabled, queue the page for OCR
             if not page_elements and self.config.get('enable_ocr', True):
-                ocr_elements = self._search_page_ocr(page, page_num, search_terms, result)
+                ocr_pages.append(page_num)
+        
+        # Submit every OCR page before waiting so they run across the process pool
+        if ocr_pages:
+            futures = []
+            for page_num in ocr_pages:
+                try:
+                    futures.append((page_num, self.ocr_service.submit_page(doc, page_num, dpi=144)))
+                except Exception as e:
+                    logger.error(f"OCR failed on page {page_num}: {e}")
+                    result['errors'].append(f"OCR error on page {page_num}: {str(e)}")
+            
+            for page_num, future in futures:
+                ocr_elements = self._search_page_ocr(future, page_num, search_terms, result)
                 elements.extend(ocr_elements)
         
         return elements
@@ -246,23 +272,23 @@ class PDFProcessor:
         
         return terms
     
-    def _search_page_text(self, page: fitz.Page, page_num: int, search_terms: Dict[str, List[str]]) -> List[RedboxElement]:
+    def _search_page_text(self, page_text: PageTextModel, page_num: int, search_terms: Dict[str, List[str]]) -> List[RedboxElement]:
         """Search for terms in page text"""
         elements = []
         
         for element_type, terms in search_terms.items():
             for term in terms:
                 # Search for the term
-                rects = page.search_for(term, hit_max=10)
+                rects = page_text.find(term, max_hits=10)
                 
-                for rect in rects:
+                for x0, y0, x1, y1 in rects:
                     element = RedboxElement(
                         text=term,
                         page_num=page_num,
-                        x0=rect.x0,
-                        y0=rect.y0,
-                        x1=rect.x1,
-                        y1=rect.y1,
+                        x0=x0,
+                        y0=y0,
+                        x1=x1,
+                        y1=y1,
                         element_type=element_type,
                         confidence=1.0
                     )
@@ -270,53 +296,33 @@ class PDFProcessor:
         
         return elements
     
-    def _search_page_ocr(self, page: fitz.Page, page_num: int, search_terms: Dict[str, List[str]], result: Dict) -> List[RedboxElement]:
-        """Use OCR to search for terms in page"""
+    def _search_page_ocr(self, ocr_future: Future, page_num: int, search_terms: Dict[str, List[str]], result: Dict) -> List[RedboxElement]:
+        """Search for terms in a page's OCR results"""
         elements = []
         
         try:
-            # Convert page to image
-            mat = fitz.Matrix(2, 2)  # 2x zoom for better OCR
-            pix = page.get_pixmap(matrix=mat)
-            img_data = pix.tobytes("png")
-            
-            # Convert to PIL Image
-            img = Image.open(io.BytesIO(img_data))
-            
-            # Perform OCR with bounding boxes
-            ocr_data = pytesseract.image_to_data(img, output_type=pytesseract.Output.DICT)
-            
-            # Search for terms in OCR results
-            n_boxes = len(ocr_data['text'])
+            # Words come back in page coordinates (2x zoom OCR, cached per page)
+            ocr_words = ocr_future.result()
             
             for element_type, terms in search_terms.items():
                 for term in terms:
                     term_lower = term.lower()
                     
                     # Search through OCR text
-                    for i in range(n_boxes):
-                        text = ocr_data['text'][i]
-                        conf = float(ocr_data['conf'][i]) / 100.0
-                        
-                        if conf < self.ocr_threshold:
+                    for word in ocr_words:
+                        if word['conf'] < self.ocr_threshold:
                             continue
                         
-                        if term_lower in text.lower():
-                            # Get bounding box (scaled back from 2x zoom)
-                            x0 = ocr_data['left'][i] / 2
-                            y0 = ocr_data['top'][i] / 2
-                            x1 = x0 + ocr_data['width'][i] / 2
-                            y1 = y0 + ocr_data['height'][i] / 2
-                            
+                        if term_lower in word['text'].lower():
                             element = RedboxElement(
-                                text=text,
+                                text=word['text'],
                                 page_num=page_num,
-                                x0=x0,
-                                y0=y0,
-                                x1=x1,
-                                y1=y1,
+                                x0=word['x0'],
+                                y0=word['y0'],
+                                x1=word['x1'],
+                                y1=word['y1'],
                                 element_type=element_type,
-                                confidence=conf
+                                confidence=word['conf']
                             )
                             elements.append(element)
             
@@ -366,15 +372,28 @@ class PDFProcessor:
         """Process multiple PDFs
         Args:
             pdf_citations: List of tuples (input_path, citation, output_path)
-        """
-        results = []
-        
-        for input_path, citation, output_path in pdf_citations:
-            logger.info(f"Processing PDF: {input_path}")
-            result = self.process_pdf(input_path, citation, output_path)
-            results.append(result)
         
-        return results
+        With config['batch_workers'] > 1 the PDFs are processed across a
+        process pool; results keep the input order either way.
+        """
+        workers = self.config.get('batch_workers', 1)
+        
+        if workers <= 1 or len(pdf_citations) <= 1:
+            results = []
+            for input_path, citation, output_path in pdf_citations:
+                logger.info(f"Processing PDF: {input_path}")
+                result = self.process_pdf(input_path, citation, output_path)
+                results.append(result)
+            return results
+        
+        # Workers OCR inline rather than each starting its own OCR pool
+        worker_config = dict(self.config, ocr_workers=0)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_process_pdf_job, worker_config, input_path, citation, output_path)
+                for input_path, citation, output_path in pdf_citations
+            ]
+            return [future.result() for future in futures]
     
     def merge_pdfs(self, pdf_paths: List[str], output_path: str) -> bool:
         """Merge multiple PDFs into one"""
@@ -438,10 +457,17 @@ class PDFProcessor:
                 point = fitz.Point(x1 + 5, y0)
                 page.insert_text(point, label, fontsize=8, color=color or self.redbox_color)
             
-            doc.save(pdf_path)
-            doc.close()
+            # Append to the existing file where possible instead of rewriting it
+            save_and_close(doc, pdf_path)
             return True
         
         except Exception as e:
             logger.error(f"Failed to add custom redbox: {e}")
-            return False
\ No newline at end of file
+            return False
+
+
+def _process_pdf_job(config: Dict[str, Any], input_path: str, citation: Citation,
+                     output_path: str) -> Dict[str, Any]:
+    """Process one PDF in a worker process"""
+    logger.info(f"Processing PDF: {input_path}")
+    return PDFProcessor(config).process_pdf(input_path, citation, output_path)
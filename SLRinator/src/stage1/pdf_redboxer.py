@@ -16,6 +16,14 @@ except ImportError:
     PYMUPDF_AVAILABLE = False
     print("⚠️ PyMuPDF not installed. Install with: pip install PyMuPDF")
 
+try:
+    from page_text_model import DocumentTextModel
+except ImportError:
+    try:
+        from stage1.page_text_model import DocumentTextModel
+    except ImportError:
+        from src.stage1.page_text_model import DocumentTextModel
+
 
 @dataclass
 class RedboxElement:
@@ -32,7 +40,9 @@ class RedboxElement:
 class PDFRedboxer:
     """Add red boxes to PDFs for Stanford Law Review editorial review"""
     
-    def __init__(self):
+    def __init__(self, text_cache_dir: Optional[str] = None):
+        # Where extracted page words are kept between runs (None: memory only)
+        self.text_cache_dir = text_cache_dir
         self.redbox_color = (1, 0, 0)  # Red in RGB
         self.redbox_width = 2.0  # Line width
         self.high_priority_width = 2.0
@@ -81,49 +91,41 @@ class PDFRedboxer:
             print(f"Error redboxing PDF: {e}")
             return False
             
-    def _find_elements(self, doc: fitz.Document, search_terms: List[str]) -> List[RedboxElement]:
-        """Find all instances of search terms in the document"""
+    def _find_elements(self, doc: fitz.Document, search_terms: List[str],
+                       source_path: Optional[str] = None) -> List[RedboxElement]:
+        """Find all instances of search terms in the document
+        
+        source_path names the original PDF when doc is a working copy of it,
+        so the cached text model of the original is reused.
+        """
         elements = []
         
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            
+        # Words are extracted (dehyphenated) once per PDF and searched by index
+        text_model = DocumentTextModel.for_pdf(source_path or doc.name, doc,
+                                               cache_dir=self.text_cache_dir)
+        
+        for page_num, page_text in enumerate(text_model.pages):
             for term in search_terms:
                 if not term:
                     continue
                     
                 # Search for the term
-                text_instances = page.search_for(term)
+                text_instances = page_text.find(term)
                 
-                for inst in text_instances:
+                for x0, y0, x1, y1 in text_instances:
                     # Determine priority based on term type
                     priority = self._determine_priority(term)
                     
                     element = RedboxElement(
                         text=term,
                         page_num=page_num,
-                        x0=inst.x0,
-                        y0=inst.y0,
-                        x1=inst.x1,
-                        y1=inst.y1,
+                        x0=x0,
+                        y0=y0,
+                        x1=x1,
+                        y1=y1,
                         priority=priority
                     )
                     elements.append(element)
-                    
-                # Also try case-insensitive search
-                if not text_instances:
-                    text_instances = page.search_for(term, flags=fitz.TEXT_DEHYPHENATE)
-                    for inst in text_instances:
-                        element = RedboxElement(
-                            text=term,
-                            page_num=page_num,
-                            x0=inst.x0,
-                            y0=inst.y0,
-                            x1=inst.x1,
-                            y1=inst.y1,
-                            priority='medium'
-                        )
-                        elements.append(element)
                         
         return elements
         
@@ -242,6 +244,21 @@ class SmartRedboxer(PDFRedboxer):
         Returns:
             True if successful
         """
+        search_terms = self.build_search_terms(citation_type, citation_data)
+        
+        return self.redbox_pdf(input_path, output_path, search_terms)
+        
+    def build_search_terms(self, citation_type: str, citation_data: Dict) -> List[str]:
+        """
+        Build the terms to redbox for a citation
+        
+        Args:
+            citation_type: Type of citation (case, statute, article)
+            citation_data: Dictionary with citation components
+            
+        Returns:
+            List of non-empty search terms
+        """
         search_terms = []
         
         if citation_type == 'case':
@@ -285,9 +302,7 @@ class SmartRedboxer(PDFRedboxer):
                 search_terms.append(str(citation_data['year']))
                 
         # Remove empty strings
-        search_terms = [t for t in search_terms if t]
-        
-        return self.redbox_pdf(input_path, output_path, search_terms)
+        return [t for t in search_terms if t]
 
 
 def test_redboxer():
@@ -22,6 +22,7 @@ from tenacity import retry, stop_after_attempt, wait_exponential
 from datetime import datetime
 
 from citation_parser import Citation, CitationType
+from utils.retrieval_guard import GuardedSession, NegativeCache
 
 logger = logging.getLogger(__name__)
 
@@ -59,8 +60,11 @@ class SourceRetriever:
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
-        # Initialize session for HTTP requests
-        self.session = requests.Session()
+        # Initialize session for HTTP requests (circuit breaker per host)
+        self.session = GuardedSession()
+        
+        # Strategies that recently failed for a citation, skipped until their TTL expires
+        self.negative_cache = NegativeCache(self.cache_dir / "negative_cache.json")
         self.session.headers.update({
             'User-Agent': 'Stanford Law Review Editorial System/1.0'
         })
@@ -136,6 +140,22 @@ class SourceRetriever:
         
         return RetrievalResult(status=RetrievalStatus.FAILED)
     
+    def _guarded(self, strategy: str, try_method, citation: Citation) -> RetrievalResult:
+        """Run one _try_* method unless it is known to fail for this citation"""
+        cache_key = self._generate_cache_key(citation)
+        known_failure = self.negative_cache.get(strategy, cache_key)
+        if known_failure:
+            return RetrievalResult(status=RetrievalStatus.FAILED,
+                                   message=self.negative_cache.describe(known_failure))
+        
+        self.session.begin_attempt()
+        result = try_method(citation)
+        if result.status == RetrievalStatus.SUCCESS:
+            self.negative_cache.discard(strategy, cache_key)
+        else:
+            self.negative_cache.put(strategy, cache_key, self.session.attempt_failure())
+        return result
+    
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
     def _retrieve_case(self, citation: Citation) -> RetrievalResult:
         """Retrieve case documents"""
@@ -143,17 +163,17 @@ class SourceRetriever:
         
         # Try CourtListener API first
         if self.apis.get('courtlistener'):
-            result = self._try_courtlistener(citation)
+            result = self._guarded('courtlistener', self._try_courtlistener, citation)
             if result.status == RetrievalStatus.SUCCESS:
                 return result
         
         # Try Google Scholar
-        result = self._try_google_scholar_case(citation)
+        result = self._guarded('google_scholar_case', self._try_google_scholar_case, citation)
         if result.status == RetrievalStatus.SUCCESS:
             return result
         
         # Try Case.law (Harvard)
-        result = self._try_caselaw(citation)
+        result = self._guarded('caselaw', self._try_caselaw, citation)
         if result.status == RetrievalStatus.SUCCESS:
             return result
         
@@ -333,12 +353,12 @@ class SourceRetriever:
         
         # Try GovInfo API
         if 'U.S.C.' in metadata.reporter:
-            result = self._try_govinfo_usc(citation)
+            result = self._guarded('govinfo_usc', self._try_govinfo_usc, citation)
             if result.status == RetrievalStatus.SUCCESS:
                 return result
         
         # Try U.S. Code website
-        result = self._try_uscode_house_gov(citation)
+        result = self._guarded('uscode_house_gov', self._try_uscode_house_gov, citation)
         if result.status == RetrievalStatus.SUCCESS:
             return result
         
@@ -452,12 +472,12 @@ class SourceRetriever:
         metadata = citation.metadata
         
         # Try eCFR
-        result = self._try_ecfr(citation)
+        result = self._guarded('ecfr', self._try_ecfr, citation)
         if result.status == RetrievalStatus.SUCCESS:
             return result
         
         # Try GovInfo for CFR
-        result = self._try_govinfo_cfr(citation)
+        result = self._guarded('govinfo_cfr', self._try_govinfo_cfr, citation)
         if result.status == RetrievalStatus.SUCCESS:
             return result
         
@@ -506,17 +526,17 @@ class SourceRetriever:
         metadata = citation.metadata
         
         # Try CrossRef first
-        result = self._try_crossref(citation)
+        result = self._guarded('crossref', self._try_crossref, citation)
         if result.status == RetrievalStatus.SUCCESS:
             return result
         
         # Try SSRN
-        result = self._try_ssrn(citation)
+        result = self._guarded('ssrn', self._try_ssrn, citation)
         if result.status == RetrievalStatus.SUCCESS:
             return result
         
         # Try Google Scholar
-        result = self._try_google_scholar_article(citation)
+        result = self._guarded('google_scholar_article', self._try_google_scholar_article, citation)
         if result.status == RetrievalStatus.SUCCESS:
             return result
         
@@ -657,17 +677,17 @@ class SourceRetriever:
         metadata = citation.metadata
         
         # Try Google Books
-        result = self._try_google_books(citation)
+        result = self._guarded('google_books', self._try_google_books, citation)
         if result.status == RetrievalStatus.SUCCESS:
             return result
         
         # Try HathiTrust
-        result = self._try_hathitrust(citation)
+        result = self._guarded('hathitrust', self._try_hathitrust, citation)
         if result.status == RetrievalStatus.SUCCESS:
             return result
         
         # Try OpenLibrary
-        result = self._try_openlibrary(citation)
+        result = self._guarded('openlibrary', self._try_openlibrary, citation)
         if result.status == RetrievalStatus.SUCCESS:
             return result
         
@@ -799,12 +819,12 @@ class SourceRetriever:
         metadata = citation.metadata
         
         # Try Congress.gov API
-        result = self._try_congress_gov(citation)
+        result = self._guarded('congress_gov', self._try_congress_gov, citation)
         if result.status == RetrievalStatus.SUCCESS:
             return result
         
         # Try GovInfo for legislative materials
-        result = self._try_govinfo_legislative(citation)
+        result = self._guarded('govinfo_legislative', self._try_govinfo_legislative, citation)
         if result.status == RetrievalStatus.SUCCESS:
             return result
         
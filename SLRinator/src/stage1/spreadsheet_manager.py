@@ -4,8 +4,10 @@ Handles reading and writing to Excel Master Sheet
 """
 
 import logging
+import importlib.util
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Tuple, Dict, Any, Optional
+from typing import List, Tuple, Dict, Any, Optional, Iterator
 from datetime import datetime
 import pandas as pd
 import openpyxl
@@ -16,6 +18,101 @@ from openpyxl.worksheet.hyperlink import Hyperlink
 logger = logging.getLogger(__name__)
 
 
+def _normalize_source_id(value: Any) -> Optional[str]:
+    """Source IDs are stored as 1, 1.0 or '001'; compare them as '001'"""
+    if value is None or value == '':
+        return None
+    try:
+        return f"{int(float(value)):03d}"
+    except (ValueError, TypeError):
+        return str(value).strip()
+
+
+class WorkbookSession:
+    """
+    One loaded copy of the master sheet shared by every update.
+    
+    Column positions and row lookups are indexed once per tab, and the
+    workbook is written back a single time by commit().
+    """
+    
+    def __init__(self, path: Path):
+        self.path = path
+        self.wb = openpyxl.load_workbook(path)
+        self._columns: Dict[str, Dict[str, int]] = {}
+        self._source_rows: Dict[str, Dict[str, int]] = {}
+        self._cc_rows: Dict[str, Dict[Tuple[str, str], int]] = {}
+        self.dirty = False
+    
+    def sheet(self, name: str):
+        return self.wb[name]
+    
+    def columns(self, name: str, column_mapping: Dict[str, str]) -> Dict[str, int]:
+        """Header name -> column index for a tab, read once"""
+        if name not in self._columns:
+            columns = {}
+            lookup = {col_name: key for key, col_name in column_mapping.items()}
+            header = next(self.wb[name].iter_rows(min_row=1, max_row=1, values_only=True), ())
+            for col, value in enumerate(header, start=1):
+                if value is not None:
+                    key = lookup.get(str(value).strip())
+                    if key and key not in columns:
+                        columns[key] = col
+            self._columns[name] = columns
+        return self._columns[name]
+    
+    def source_row(self, name: str, source_id: str, source_col: int) -> Optional[int]:
+        """Row for a source ID on the Sourcepull tab"""
+        if name not in self._source_rows:
+            index = {}
+            for row_num, (value,) in enumerate(
+                    self.wb[name].iter_rows(min_row=2, min_col=source_col, max_col=source_col, values_only=True),
+                    start=2):
+                key = _normalize_source_id(value)
+                if key is not None:
+                    index.setdefault(key, row_num)
+                    index.setdefault(str(value), row_num)
+            self._source_rows[name] = index
+        return self._source_rows[name].get(str(source_id))
+    
+    def cc_row(self, name: str, footnote_num: Any, source_id: Any, fn_col: int, src_col: int) -> Optional[int]:
+        """Row for a (footnote, source) pair on a CC tab"""
+        return self._cc_index(name, fn_col, src_col).get((str(footnote_num), str(source_id)))
+    
+    def add_cc_row(self, name: str, footnote_num: Any, source_id: Any, fn_col: int, src_col: int) -> int:
+        """Append a row for a (footnote, source) pair and index it"""
+        ws = self.wb[name]
+        row_num = ws.max_row + 1
+        ws.cell(row=row_num, column=fn_col).value = footnote_num
+        ws.cell(row=row_num, column=src_col).value = source_id
+        self._cc_index(name, fn_col, src_col)[(str(footnote_num), str(source_id))] = row_num
+        return row_num
+    
+    def _cc_index(self, name: str, fn_col: int, src_col: int) -> Dict[Tuple[str, str], int]:
+        if name not in self._cc_rows:
+            index = {}
+            for row_num, row in enumerate(self.wb[name].iter_rows(min_row=2, values_only=True), start=2):
+                fn_value = row[fn_col - 1] if len(row) >= fn_col else None
+                src_value = row[src_col - 1] if len(row) >= src_col else None
+                index.setdefault((str(fn_value), str(src_value)), row_num)
+            self._cc_rows[name] = index
+        return self._cc_rows[name]
+    
+    def invalidate(self, name: str):
+        """Forget cached lookups for a tab (after it is recreated)"""
+        self._columns.pop(name, None)
+        self._source_rows.pop(name, None)
+        self._cc_rows.pop(name, None)
+    
+    def commit(self):
+        if self.dirty:
+            self.wb.save(self.path)
+            self.dirty = False
+    
+    def close(self):
+        self.wb.close()
+
+
 class SpreadsheetManager:
     """Manages Excel spreadsheet operations for the SLR system"""
     
@@ -51,6 +148,74 @@ class SpreadsheetManager:
             'bluebook_compliance': 'Bluebook Compliance',
             'page_found': 'Page Found'
         }
+        
+        self._session: Optional[WorkbookSession] = None
+        
+        # calamine/pyarrow reads are faster but type cells differently
+        # (pyarrow strings, no openpyxl date handling), so they are opt-in
+        self.fast_excel_reader = config.get('preferences', {}).get('fast_excel_reader', False)
+    
+    @contextmanager
+    def session(self) -> Iterator[WorkbookSession]:
+        """
+        Load the workbook once for a group of updates.
+        
+        Updates made inside the block share the loaded workbook and its
+        indexes; the file is saved once when the block exits cleanly and left
+        untouched if it raises. Nested calls reuse the outer session.
+        """
+        if self._session is not None:
+            yield self._session
+            return
+        
+        self._session = WorkbookSession(self.master_sheet_path)
+        try:
+            yield self._session
+            self._session.commit()
+        finally:
+            self._session.close()
+            self._session = None
+    
+    def apply_stage_results(self,
+                            sourcepull_results: Optional[List[Tuple[Any, Any]]] = None,
+                            citechecking_results: Optional[Dict[int, List[Dict[str, Any]]]] = None,
+                            bluebook_violations: Optional[List[Dict[str, Any]]] = None,
+                            create_summary: bool = True) -> bool:
+        """Apply results from every stage as one transaction with a single save
+        
+        Args:
+            sourcepull_results: (citation, result) pairs from sourcepull
+            citechecking_results: Footnote results keyed by CC round number
+            bluebook_violations: Bluebook compliance violations
+            create_summary: Rebuild the Summary tab from the updated data
+        """
+        try:
+            with self.session() as session:
+                if sourcepull_results:
+                    self._apply_sourcepull_results(session, sourcepull_results)
+                for round_num, results in (citechecking_results or {}).items():
+                    self._apply_citechecking_results(session, results, round_num)
+                if bluebook_violations:
+                    self._apply_bluebook_results(session, bluebook_violations)
+                if create_summary:
+                    self._apply_summary_sheet(session)
+            
+            logger.info("Applied all stage results to spreadsheet")
+            return True
+        
+        except Exception as e:
+            logger.error(f"Error applying stage results: {e}")
+            return False
+    
+    def _read_sheet(self, sheet_name: Optional[str], **kwargs):
+        """Read tab(s) with pandas; with the fast_excel_reader preference, use
+        the calamine engine and pyarrow dtypes when those packages are installed"""
+        if self.fast_excel_reader:
+            if importlib.util.find_spec('python_calamine') is not None:
+                kwargs.setdefault('engine', 'calamine')
+            if importlib.util.find_spec('pyarrow') is not None:
+                kwargs.setdefault('dtype_backend', 'pyarrow')
+        return pd.read_excel(self.master_sheet_path, sheet_name=sheet_name, **kwargs)
     
     def load_sourcepull_citations(self) -> List[Tuple[str, str, str]]:
         """Load citations from the Sourcepull tab
@@ -64,14 +229,11 @@ class SpreadsheetManager:
                 return citations
             
             # Read the Sourcepull sheet
-            df = pd.read_excel(
-                self.master_sheet_path,
-                sheet_name=self.sourcepull_sheet,
-                dtype=str
-            )
+            df = self._read_sheet(self.sourcepull_sheet, dtype=str)
             
             # Clean column names
             df.columns = df.columns.str.strip()
+            df = df.fillna('')
             
             # Extract citation data
             for idx, row in df.iterrows():
@@ -104,76 +266,8 @@ class SpreadsheetManager:
     def update_sourcepull_results(self, results: List[Tuple[Any, Any]]) -> bool:
         """Update the Sourcepull tab with retrieval results"""
         try:
-            # Load workbook
-            wb = openpyxl.load_workbook(self.master_sheet_path)
-            ws = wb[self.sourcepull_sheet]
-            
-            # Find column indices
-            header_row = 1
-            columns = {}
-            for col in range(1, ws.max_column + 1):
-                cell_value = ws.cell(row=header_row, column=col).value
-                if cell_value:
-                    cell_value = str(cell_value).strip()
-                    for key, col_name in self.sourcepull_columns.items():
-                        if col_name == cell_value:
-                            columns[key] = col
-                            break
-            
-            # Update each result
-            for citation, result in results:
-                # Find the row for this source
-                source_id = citation.source_id
-                row_num = self._find_source_row(ws, source_id, columns.get('source_id', 1))
-                
-                if row_num:
-                    # Update completed status
-                    if 'completed' in columns:
-                        if result.status.value in ['success', 'cached']:
-                            ws.cell(row=row_num, column=columns['completed']).value = 'Yes'
-                            # Apply green fill
-                            ws.cell(row=row_num, column=columns['completed']).fill = PatternFill(
-                                start_color="90EE90", end_color="90EE90", fill_type="solid"
-                            )
-                        else:
-                            ws.cell(row=row_num, column=columns['completed']).value = 'No'
-                            # Apply red fill for manual required
-                            if result.status.value == 'manual_required':
-                                ws.cell(row=row_num, column=columns['completed']).fill = PatternFill(
-                                    start_color="FFB6C1", end_color="FFB6C1", fill_type="solid"
-                                )
-                    
-                    # Update file location
-                    if 'location' in columns and result.file_path:
-                        ws.cell(row=row_num, column=columns['location']).value = result.file_path
-                    
-                    # Update file name
-                    if 'file_name' in columns and result.file_path:
-                        file_name = Path(result.file_path).name
-                        ws.cell(row=row_num, column=columns['file_name']).value = file_name
-                        
-                        # Add hyperlink if file exists
-                        if Path(result.file_path).exists():
-                            cell = ws.cell(row=row_num, column=columns['file_name'])
-                            cell.hyperlink = f"file:///{Path(result.file_path).absolute()}"
-                            cell.font = Font(color="0000FF", underline="single")
-                    
-                    # Update problems/comments
-                    if 'problems' in columns:
-                        if result.message:
-                            ws.cell(row=row_num, column=columns['problems']).value = result.message
-                    
-                    # Update retrieved date
-                    if 'retrieved_date' in columns:
-                        ws.cell(row=row_num, column=columns['retrieved_date']).value = datetime.now().strftime("%Y-%m-%d")
-                    
-                    # Update source type
-                    if 'source_type' in columns:
-                        ws.cell(row=row_num, column=columns['source_type']).value = citation.type.value
-            
-            # Save workbook
-            wb.save(self.master_sheet_path)
-            wb.close()
+            with self.session() as session:
+                self._apply_sourcepull_results(session, results)
             
             logger.info("Successfully updated Sourcepull results in spreadsheet")
             return True
@@ -182,16 +276,71 @@ class SpreadsheetManager:
             logger.error(f"Error updating spreadsheet: {e}")
             return False
     
+    def _apply_sourcepull_results(self, session: WorkbookSession, results: List[Tuple[Any, Any]]):
+        ws = session.sheet(self.sourcepull_sheet)
+        
+        # Find column indices
+        columns = session.columns(self.sourcepull_sheet, self.sourcepull_columns)
+        
+        # Update each result
+        for citation, result in results:
+            # Find the row for this source
+            source_id = citation.source_id
+            row_num = session.source_row(self.sourcepull_sheet, source_id, columns.get('source_id', 1))
+            
+            if row_num:
+                # Update completed status
+                if 'completed' in columns:
+                    if result.status.value in ['success', 'cached']:
+                        ws.cell(row=row_num, column=columns['completed']).value = 'Yes'
+                        # Apply green fill
+                        ws.cell(row=row_num, column=columns['completed']).fill = PatternFill(
+                            start_color="90EE90", end_color="90EE90", fill_type="solid"
+                        )
+                    else:
+                        ws.cell(row=row_num, column=columns['completed']).value = 'No'
+                        # Apply red fill for manual required
+                        if result.status.value == 'manual_required':
+                            ws.cell(row=row_num, column=columns['completed']).fill = PatternFill(
+                                start_color="FFB6C1", end_color="FFB6C1", fill_type="solid"
+                            )
+                
+                # Update file location
+                if 'location' in columns and result.file_path:
+                    ws.cell(row=row_num, column=columns['location']).value = result.file_path
+                
+                # Update file name
+                if 'file_name' in columns and result.file_path:
+                    file_name = Path(result.file_path).name
+                    ws.cell(row=row_num, column=columns['file_name']).value = file_name
+                    
+                    # Add hyperlink if file exists
+                    if Path(result.file_path).exists():
+                        cell = ws.cell(row=row_num, column=columns['file_name'])
+                        cell.hyperlink = f"file:///{Path(result.file_path).absolute()}"
+                        cell.font = Font(color="0000FF", underline="single")
+                
+                # Update problems/comments
+                if 'problems' in columns:
+                    if result.message:
+                        ws.cell(row=row_num, column=columns['problems']).value = result.message
+                
+                # Update retrieved date
+                if 'retrieved_date' in columns:
+                    ws.cell(row=row_num, column=columns['retrieved_date']).value = datetime.now().strftime("%Y-%m-%d")
+                
+                # Update source type
+                if 'source_type' in columns:
+                    ws.cell(row=row_num, column=columns['source_type']).value = citation.type.value
+        
+        session.dirty = True
+    
     def load_citechecking_data(self, round_num: int = 1) -> pd.DataFrame:
         """Load citechecking data from CC sheet"""
         sheet_name = self.cc_round1_sheet if round_num == 1 else self.cc_round2_sheet
         
         try:
-            df = pd.read_excel(
-                self.master_sheet_path,
-                sheet_name=sheet_name,
-                dtype=str
-            )
+            df = self._read_sheet(sheet_name, dtype=str)
             return df
         except Exception as e:
             logger.error(f"Error loading CC data: {e}")
@@ -199,64 +348,9 @@ class SpreadsheetManager:
     
     def update_citechecking_results(self, results: List[Dict[str, Any]], round_num: int = 1) -> bool:
         """Update citechecking results in the appropriate CC sheet"""
-        sheet_name = self.cc_round1_sheet if round_num == 1 else self.cc_round2_sheet
-        
         try:
-            wb = openpyxl.load_workbook(self.master_sheet_path)
-            
-            # Create sheet if it doesn't exist
-            if sheet_name not in wb.sheetnames:
-                ws = wb.create_sheet(sheet_name)
-                self._create_cc_headers(ws)
-            else:
-                ws = wb[sheet_name]
-            
-            # Find column indices
-            columns = self._get_column_indices(ws, self.cc_columns)
-            
-            # Update results
-            for result in results:
-                footnote_num = result.get('footnote_num')
-                
-                for cite_result in result.get('citations', []):
-                    source_id = cite_result.get('source_id')
-                    row_num = self._find_cc_row(ws, footnote_num, source_id, columns)
-                    
-                    if not row_num:
-                        # Add new row
-                        row_num = ws.max_row + 1
-                        ws.cell(row=row_num, column=columns['footnote_num']).value = footnote_num
-                        ws.cell(row=row_num, column=columns['source_id']).value = source_id
-                    
-                    # Update support status
-                    if 'supported' in columns:
-                        supported = cite_result.get('supported', 'Unknown')
-                        ws.cell(row=row_num, column=columns['supported']).value = supported
-                        
-                        # Apply color coding
-                        if supported == 'Yes':
-                            fill = PatternFill(start_color="90EE90", end_color="90EE90", fill_type="solid")
-                        elif supported == 'No':
-                            fill = PatternFill(start_color="FFB6C1", end_color="FFB6C1", fill_type="solid")
-                        else:
-                            fill = PatternFill(start_color="FFFFE0", end_color="FFFFE0", fill_type="solid")
-                        
-                        ws.cell(row=row_num, column=columns['supported']).fill = fill
-                    
-                    # Update issues
-                    if 'issues' in columns and cite_result.get('issues'):
-                        ws.cell(row=row_num, column=columns['issues']).value = ', '.join(cite_result['issues'])
-                    
-                    # Update notes
-                    if 'notes' in columns and cite_result.get('notes'):
-                        ws.cell(row=row_num, column=columns['notes']).value = cite_result['notes']
-                    
-                    # Update page found
-                    if 'page_found' in columns and cite_result.get('page_found'):
-                        ws.cell(row=row_num, column=columns['page_found']).value = str(cite_result['page_found'])
-            
-            wb.save(self.master_sheet_path)
-            wb.close()
+            with self.session() as session:
+                self._apply_citechecking_results(session, results, round_num)
             
             logger.info(f"Successfully updated CC Round {round_num} results")
             return True
@@ -265,49 +359,69 @@ class SpreadsheetManager:
             logger.error(f"Error updating CC results: {e}")
             return False
     
-    def update_bluebook_results(self, violations: List[Dict[str, Any]]) -> bool:
-        """Update Bluebook compliance results"""
-        try:
-            wb = openpyxl.load_workbook(self.master_sheet_path)
-            
-            # Create Bluebook sheet if it doesn't exist
-            sheet_name = 'Bluebook_Check'
-            if sheet_name not in wb.sheetnames:
-                ws = wb.create_sheet(sheet_name)
-                # Add headers
-                headers = ['Footnote #', 'Citation', 'Violation Type', 'Issue', 'Suggestion', 'Severity']
-                for col, header in enumerate(headers, 1):
-                    ws.cell(row=1, column=col).value = header
-                    ws.cell(row=1, column=col).font = Font(bold=True)
-            else:
-                ws = wb[sheet_name]
+    def _apply_citechecking_results(self, session: WorkbookSession, results: List[Dict[str, Any]], round_num: int):
+        sheet_name = self.cc_round1_sheet if round_num == 1 else self.cc_round2_sheet
+        wb = session.wb
+        
+        # Create sheet if it doesn't exist
+        if sheet_name not in wb.sheetnames:
+            ws = wb.create_sheet(sheet_name)
+            self._create_cc_headers(ws)
+            session.invalidate(sheet_name)
+        else:
+            ws = wb[sheet_name]
+        
+        # Find column indices
+        columns = session.columns(sheet_name, self.cc_columns)
+        fn_col = columns.get('footnote_num', 1)
+        src_col = columns.get('source_id', 3)
+        
+        # Update results
+        for result in results:
+            footnote_num = result.get('footnote_num')
             
-            # Add violations
-            row = ws.max_row + 1
-            for violation in violations:
-                ws.cell(row=row, column=1).value = violation.get('footnote_num', '')
-                ws.cell(row=row, column=2).value = violation.get('citation', '')
-                ws.cell(row=row, column=3).value = violation.get('type', '')
-                ws.cell(row=row, column=4).value = violation.get('issue', '')
-                ws.cell(row=row, column=5).value = violation.get('suggestion', '')
-                ws.cell(row=row, column=6).value = violation.get('severity', 'Medium')
+            for cite_result in result.get('citations', []):
+                source_id = cite_result.get('source_id')
+                row_num = session.cc_row(sheet_name, footnote_num, source_id, fn_col, src_col)
                 
-                # Apply color based on severity
-                severity = violation.get('severity', 'Medium')
-                if severity == 'High':
-                    fill = PatternFill(start_color="FF6B6B", end_color="FF6B6B", fill_type="solid")
-                elif severity == 'Medium':
-                    fill = PatternFill(start_color="FFD93D", end_color="FFD93D", fill_type="solid")
-                else:
-                    fill = PatternFill(start_color="6BCF7F", end_color="6BCF7F", fill_type="solid")
+                if not row_num:
+                    # Add new row
+                    row_num = session.add_cc_row(sheet_name, footnote_num, source_id, fn_col, src_col)
                 
-                for col in range(1, 7):
-                    ws.cell(row=row, column=col).fill = fill
+                # Update support status
+                if 'supported' in columns:
+                    supported = cite_result.get('supported', 'Unknown')
+                    ws.cell(row=row_num, column=columns['supported']).value = supported
+                    
+                    # Apply color coding
+                    if supported == 'Yes':
+                        fill = PatternFill(start_color="90EE90", end_color="90EE90", fill_type="solid")
+                    elif supported == 'No':
+                        fill = PatternFill(start_color="FFB6C1", end_color="FFB6C1", fill_type="solid")
+                    else:
+                        fill = PatternFill(start_color="FFFFE0", end_color="FFFFE0", fill_type="solid")
+                    
+                    ws.cell(row=row_num, column=columns['supported']).fill = fill
                 
-                row += 1
-            
-            wb.save(self.master_sheet_path)
-            wb.close()
+                # Update issues
+                if 'issues' in columns and cite_result.get('issues'):
+                    ws.cell(row=row_num, column=columns['issues']).value = ', '.join(cite_result['issues'])
+                
+                # Update notes
+                if 'notes' in columns and cite_result.get('notes'):
+                    ws.cell(row=row_num, column=columns['notes']).value = cite_result['notes']
+                
+                # Update page found
+                if 'page_found' in columns and cite_result.get('page_found'):
+                    ws.cell(row=row_num, column=columns['page_found']).value = str(cite_result['page_found'])
+        
+        session.dirty = True
+    
+    def update_bluebook_results(self, violations: List[Dict[str, Any]]) -> bool:
+        """Update Bluebook compliance results"""
+        try:
+            with self.session() as session:
+                self._apply_bluebook_results(session, violations)
             
             logger.info("Successfully updated Bluebook results")
             return True
@@ -316,57 +430,52 @@ class SpreadsheetManager:
             logger.error(f"Error updating Bluebook results: {e}")
             return False
     
-    def create_summary_sheet(self) -> bool:
-        """Create a summary sheet with overall statistics"""
-        try:
-            wb = openpyxl.load_workbook(self.master_sheet_path)
-            
-            # Create or get summary sheet
-            sheet_name = 'Summary'
-            if sheet_name in wb.sheetnames:
-                wb.remove(wb[sheet_name])
-            ws = wb.create_sheet(sheet_name, 0)  # Insert at beginning
-            
-            # Add title
-            ws.merge_cells('A1:D1')
-            ws['A1'] = 'Stanford Law Review Editorial Automation Summary'
-            ws['A1'].font = Font(size=16, bold=True)
-            ws['A1'].alignment = Alignment(horizontal='center')
-            
-            # Add timestamp
-            ws['A3'] = 'Generated:'
-            ws['B3'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-            # Calculate statistics
-            stats = self._calculate_statistics(wb)
-            
-            # Add statistics
-            row = 5
-            ws[f'A{row}'] = 'Sourcepull Statistics'
-            ws[f'A{row}'].font = Font(bold=True, size=12)
-            row += 1
+    def _apply_bluebook_results(self, session: WorkbookSession, violations: List[Dict[str, Any]]):
+        wb = session.wb
+        
+        # Create Bluebook sheet if it doesn't exist
+        sheet_name = 'Bluebook_Check'
+        if sheet_name not in wb.sheetnames:
+            ws = wb.create_sheet(sheet_name)
+            # Add headers
+            headers = ['Footnote #', 'Citation', 'Violation Type', 'Issue', 'Suggestion', 'Severity']
+            for col, header in enumerate(headers, 1):
+                ws.cell(row=1, column=col).value = header
+                ws.cell(row=1, column=col).font = Font(bold=True)
+        else:
+            ws = wb[sheet_name]
+        
+        # Add violations
+        row = ws.max_row + 1
+        for violation in violations:
+            ws.cell(row=row, column=1).value = violation.get('footnote_num', '')
+            ws.cell(row=row, column=2).value = violation.get('citation', '')
+            ws.cell(row=row, column=3).value = violation.get('type', '')
+            ws.cell(row=row, column=4).value = violation.get('issue', '')
+            ws.cell(row=row, column=5).value = violation.get('suggestion', '')
+            ws.cell(row=row, column=6).value = violation.get('severity', 'Medium')
+            
+            # Apply color based on severity
+            severity = violation.get('severity', 'Medium')
+            if severity == 'High':
+                fill = PatternFill(start_color="FF6B6B", end_color="FF6B6B", fill_type="solid")
+            elif severity == 'Medium':
+                fill = PatternFill(start_color="FFD93D", end_color="FFD93D", fill_type="solid")
+            else:
+                fill = PatternFill(start_color="6BCF7F", end_color="6BCF7F", fill_type="solid")
             
-            for key, value in stats['sourcepull'].items():
-                ws[f'A{row}'] = key
-                ws[f'B{row}'] = value
-                row += 1
+            for col in range(1, 7):
+                ws.cell(row=row, column=col).fill = fill
             
             row += 1
-            ws[f'A{row}'] = 'Citechecking Statistics'
-            ws[f'A{row}'].font = Font(bold=True, size=12)
-            row += 1
-            
-            for key, value in stats['citechecking'].items():
-                ws[f'A{row}'] = key
-                ws[f'B{row}'] = value
-                row += 1
-            
-            # Format columns
-            ws.column_dimensions['A'].width = 30
-            ws.column_dimensions['B'].width = 15
-            
-            wb.save(self.master_sheet_path)
-            wb.close()
+        
+        session.dirty = True
+    
+    def create_summary_sheet(self) -> bool:
+        """Create a summary sheet with overall statistics"""
+        try:
+            with self.session() as session:
+                self._apply_summary_sheet(session)
             
             logger.info("Successfully created summary sheet")
             return True
@@ -375,33 +484,55 @@ class SpreadsheetManager:
             logger.error(f"Error creating summary sheet: {e}")
             return False
     
-    def _find_source_row(self, ws, source_id: str, source_col: int) -> Optional[int]:
-        """Find the row number for a given source ID"""
-        for row in range(2, ws.max_row + 1):
-            cell_value = ws.cell(row=row, column=source_col).value
-            if cell_value:
-                # Handle both string and numeric source IDs
-                try:
-                    if f"{int(float(cell_value)):03d}" == source_id or str(cell_value) == source_id:
-                        return row
-                except (ValueError, TypeError):
-                    if str(cell_value) == source_id:
-                        return row
-        return None
-    
-    def _find_cc_row(self, ws, footnote_num: str, source_id: str, columns: Dict[str, int]) -> Optional[int]:
-        """Find the row for a specific footnote and source combination"""
-        fn_col = columns.get('footnote_num', 1)
-        src_col = columns.get('source_id', 3)
+    def _apply_summary_sheet(self, session: WorkbookSession):
+        wb = session.wb
         
-        for row in range(2, ws.max_row + 1):
-            fn_value = ws.cell(row=row, column=fn_col).value
-            src_value = ws.cell(row=row, column=src_col).value
-            
-            if str(fn_value) == str(footnote_num) and str(src_value) == str(source_id):
-                return row
+        # Create or get summary sheet
+        sheet_name = 'Summary'
+        if sheet_name in wb.sheetnames:
+            wb.remove(wb[sheet_name])
+        ws = wb.create_sheet(sheet_name, 0)  # Insert at beginning
         
-        return None
+        # Add title
+        ws.merge_cells('A1:D1')
+        ws['A1'] = 'Stanford Law Review Editorial Automation Summary'
+        ws['A1'].font = Font(size=16, bold=True)
+        ws['A1'].alignment = Alignment(horizontal='center')
+        
+        # Add timestamp
+        ws['A3'] = 'Generated:'
+        ws['B3'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        
+        # Calculate statistics
+        stats = self._calculate_statistics(wb)
+        
+        # Add statistics
+        row = 5
+        ws[f'A{row}'] = 'Sourcepull Statistics'
+        ws[f'A{row}'].font = Font(bold=True, size=12)
+        row += 1
+        
+        for key, value in stats['sourcepull'].items():
+            ws[f'A{row}'] = key
+            ws[f'B{row}'] = value
+            row += 1
+        
+        row += 1
+        ws[f'A{row}'] = 'Citechecking Statistics'
+        ws[f'A{row}'].font = Font(bold=True, size=12)
+        row += 1
+        
+        for key, value in stats['citechecking'].items():
+            ws[f'A{row}'] = key
+            ws[f'B{row}'] = value
+            row += 1
+        
+        # Format columns
+        ws.column_dimensions['A'].width = 30
+        ws.column_dimensions['B'].width = 15
+        
+        session.invalidate('Summary')
+        session.dirty = True
     
     def _get_column_indices(self, ws, column_mapping: Dict[str, str]) -> Dict[str, int]:
         """Get column indices from header row"""
@@ -444,8 +575,8 @@ class SpreadsheetManager:
             
             columns = self._get_column_indices(ws, self.sourcepull_columns)
             if 'completed' in columns:
-                for row in range(2, ws.max_row + 1):
-                    value = ws.cell(row=row, column=columns['completed']).value
+                col = columns['completed']
+                for (value,) in ws.iter_rows(min_row=2, min_col=col, max_col=col, values_only=True):
                     if value and str(value).lower() in ['yes', 'y', 'true', '1']:
                         completed += 1
             
@@ -467,8 +598,8 @@ class SpreadsheetManager:
                     supported = 0
                     unsupported = 0
                     
-                    for row in range(2, ws.max_row + 1):
-                        value = ws.cell(row=row, column=columns['supported']).value
+                    col = columns['supported']
+                    for (value,) in ws.iter_rows(min_row=2, min_col=col, max_col=col, values_only=True):
                         if value:
                             if str(value).lower() in ['yes', 'y', 'true', '1']:
                                 supported += 1
@@ -488,11 +619,10 @@ class SpreadsheetManager:
             output_path = Path(output_dir)
             output_path.mkdir(parents=True, exist_ok=True)
             
-            # Read all sheets
-            xl_file = pd.ExcelFile(self.master_sheet_path)
+            # Read all sheets in one pass over the workbook
+            sheets = self._read_sheet(None)
             
-            for sheet_name in xl_file.sheet_names:
-                df = pd.read_excel(xl_file, sheet_name=sheet_name)
+            for sheet_name, df in sheets.items():
                 csv_path = output_path / f"{sheet_name}.csv"
                 df.to_csv(csv_path, index=False)
                 logger.info(f"Exported {sheet_name} to {csv_path}")
@@ -4,16 +4,17 @@ Verifies quotes against source PDFs
 """
 
 import re
+import hashlib
 import logging
+from collections import OrderedDict
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
 import fitz  # PyMuPDF
-from fuzzywuzzy import fuzz
-from fuzzywuzzy import process
 import difflib
 
 from stage3.footnote_processor import Footnote
+from stage3.quote_index import QuoteIndex
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +41,8 @@ class QuoteChecker:
         self.min_confidence = self.config.get('min_quote_confidence', 0.85)
         self.context_chars = self.config.get('context_chars', 100)
         self.fuzzy_threshold = self.config.get('fuzzy_threshold', 80)
+        self.quote_index_cache_size = self.config.get('quote_index_cache_size', 16)
+        self._quote_indexes: "OrderedDict[Tuple, QuoteIndex]" = OrderedDict()
         
     def check_footnote(self, footnote: Footnote, sources: Dict[str, str]) -> Dict[str, Any]:
         """Check all quotes in a footnote against available sources"""
@@ -242,36 +245,13 @@ class QuoteChecker:
         if len(search_words) < 3:  # Too short for fuzzy matching
             return result
         
-        best_match = None
-        best_score = 0
-        best_page = None
+        location = self._get_quote_index(doc).locate(search_text)
+        if location is None:
+            return result
         
-        for page_num, page in enumerate(doc):
-            page_text = page.get_text()
-            
-            # Split into sentences for better matching
-            sentences = self._split_into_sentences(page_text)
-            
-            for sentence in sentences:
-                # Calculate similarity
-                score = fuzz.partial_ratio(search_text.lower(), sentence.lower())
-                
-                if score > best_score and score >= self.fuzzy_threshold:
-                    best_score = score
-                    best_match = sentence
-                    best_page = page_num + 1
-            
-            # Also try sliding window approach for longer quotes
-            if len(search_text) > 100:
-                windows = self._create_text_windows(page_text, len(search_text))
-                
-                for window in windows:
-                    score = fuzz.ratio(search_text.lower(), window.lower())
-                    
-                    if score > best_score and score >= self.fuzzy_threshold:
-                        best_score = score
-                        best_match = window
-                        best_page = page_num + 1
+        best_match = location.text
+        best_score = location.score
+        best_page = location.page_index + 1
         
         if best_match and best_score >= self.fuzzy_threshold:
             result['found'] = True
@@ -289,6 +269,40 @@ class QuoteChecker:
         
         return result
     
+    def _get_quote_index(self, doc: fitz.Document) -> QuoteIndex:
+        """Get the quote index for a PDF, building it on first use (LRU-cached)"""
+        key = self._quote_index_key(doc)
+        if key is None:
+            return QuoteIndex([page.get_text() for page in doc])
+        
+        index = self._quote_indexes.get(key)
+        if index is None:
+            index = QuoteIndex([page.get_text() for page in doc])
+            self._quote_indexes[key] = index
+            while len(self._quote_indexes) > self.quote_index_cache_size:
+                self._quote_indexes.popitem(last=False)
+        else:
+            self._quote_indexes.move_to_end(key)
+        
+        return index
+    
+    def _quote_index_key(self, doc: fitz.Document) -> Optional[Tuple]:
+        """Cache key for a document: its file's identity, else a hash of its bytes"""
+        if doc.name and not doc.is_dirty:
+            try:
+                path = Path(doc.name).resolve()
+                st = path.stat()
+                return ('file', str(path), st.st_size, st.st_mtime)
+            except OSError:
+                pass
+        
+        # No file behind the document, or unsaved edits: key by content
+        try:
+            return ('content', hashlib.sha256(doc.tobytes(no_new_id=True)).hexdigest())
+        except (RuntimeError, ValueError) as e:
+            logger.debug(f"Not caching quote index for {doc.name or 'unnamed document'}: {e}")
+            return None
+    
     def _clean_quote(self, quote: str) -> str:
         """Clean quote for searching"""
         # Remove footnote numbers
@@ -303,30 +317,6 @@ class QuoteChecker:
         
         return cleaned
     
-    def _split_into_sentences(self, text: str) -> List[str]:
-        """Split text into sentences"""
-        # Simple sentence splitting
-        sentences = re.split(r'[.!?]+', text)
-        
-        # Clean and filter
-        sentences = [s.strip() for s in sentences if len(s.strip()) > 20]
-        
-        return sentences
-    
-    def _create_text_windows(self, text: str, window_size: int) -> List[str]:
-        """Create sliding windows of text"""
-        windows = []
-        words = text.split()
-        
-        # Adjust window size to word count
-        window_words = len(self._clean_quote(text[:window_size]).split())
-        
-        for i in range(len(words) - window_words + 1):
-            window = ' '.join(words[i:i + window_words])
-            windows.append(window)
-        
-        return windows
-    
     def _find_differences(self, original: str, found: str) -> List[str]:
         """Find differences between original quote and found text"""
         differences = []
@@ -0,0 +1,222 @@
+"""
+Quote Index Module for Stanford Law Review
+Locates quotes in source text using shingle lookup and bit-parallel alignment
+"""
+
+import re
+import logging
+from bisect import bisect_right
+from collections import defaultdict
+from typing import List, Dict, Optional, Tuple
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r'\S+')
+
+
+@dataclass
+class QuoteLocation:
+    """Best alignment of a quote within the indexed source"""
+    page_index: int
+    text: str
+    score: float  # 0-100, same scale as fuzz.ratio
+    distance: int
+
+
+def best_alignment_end(pattern: str, text: str) -> Tuple[int, int]:
+    """
+    Find the minimum edit distance of pattern against any substring of text.
+
+    Uses Myers' bit-parallel algorithm; Python ints serve as the bit vectors,
+    so the pattern length is unbounded. Returns (distance, end index in text),
+    with end -1 if text is empty.
+    """
+    m = len(pattern)
+    if m == 0:
+        return 0, -1
+
+    peq: Dict[str, int] = {}
+    for i, ch in enumerate(pattern):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+
+    full = (1 << m) - 1
+    high = 1 << (m - 1)
+    pv, mv = full, 0
+    score = m
+    best, best_end = m, -1
+
+    for j, ch in enumerate(text):
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        # No carry-in: a match may start anywhere in the text
+        ph = (ph << 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+        if score < best:
+            best, best_end = score, j
+
+    return best, best_end
+
+
+def align(pattern: str, text: str) -> Tuple[int, int, int]:
+    """
+    Locate the best approximate occurrence of pattern in text.
+
+    Returns (distance, start, end) with end exclusive. The start is recovered
+    by aligning the reversed pattern against the reversed prefix ending at
+    the best end position.
+    """
+    distance, end = best_alignment_end(pattern, text)
+    if end < 0:
+        return distance, 0, 0
+    prefix = text[:end + 1]
+    _, rev_end = best_alignment_end(pattern[::-1], prefix[::-1])
+    start = end - rev_end
+    return distance, start, end + 1
+
+
+class QuoteIndex:
+    """
+    Shingle index over the text of one source document.
+
+    Built once per PDF; each lookup votes for candidate positions using
+    word n-gram hits, then runs a full alignment only on those windows.
+    """
+
+    def __init__(self, page_texts: List[str], shingle_size: int = 3,
+                 max_candidates: int = 5):
+        self.shingle_size = shingle_size
+        self.max_candidates = max_candidates
+        self.page_texts = page_texts
+
+        # Token i lives on page token_pages[i] at token_spans[i] of that page's text
+        self.token_pages: List[int] = []
+        self.token_spans: List[Tuple[int, int]] = []
+        words: List[str] = []
+        for page_index, page_text in enumerate(page_texts):
+            for match in TOKEN_PATTERN.finditer(page_text):
+                self.token_pages.append(page_index)
+                self.token_spans.append(match.span())
+                words.append(self._normalize_word(match.group()))
+        self.words = words
+
+        # Normalized text is the words joined by single spaces
+        self.word_offsets: List[int] = []
+        offset = 0
+        for word in words:
+            self.word_offsets.append(offset)
+            offset += len(word) + 1
+        self.text = ' '.join(words)
+
+        self.shingles: Dict[int, List[int]] = defaultdict(list)
+        self.unigrams: Dict[str, List[int]] = defaultdict(list)
+        for i in range(len(words)):
+            self.unigrams[words[i]].append(i)
+            if i + shingle_size <= len(words):
+                self.shingles[hash(tuple(words[i:i + shingle_size]))].append(i)
+
+    @staticmethod
+    def _normalize_word(word: str) -> str:
+        return word.lower()
+
+    def normalize(self, text: str) -> str:
+        """Normalize text the same way indexed words are normalized"""
+        return ' '.join(self._normalize_word(w) for w in TOKEN_PATTERN.findall(text))
+
+    def _candidate_starts(self, quote_words: List[str]) -> List[int]:
+        """Vote for quote start positions (in word offsets) from shingle hits"""
+        k = self.shingle_size
+        votes: Dict[int, int] = defaultdict(int)
+
+        for i in range(len(quote_words) - k + 1):
+            for pos in self.shingles.get(hash(tuple(quote_words[i:i + k])), ()):
+                votes[pos - i] += 1
+
+        # OCR noise can break every shingle; fall back to rarer single words
+        if not votes:
+            for i, word in enumerate(quote_words):
+                positions = self.unigrams.get(word, ())
+                if len(word) >= 4 and 0 < len(positions) <= 50:
+                    for pos in positions:
+                        votes[pos - i] += 1
+
+        if not votes:
+            return []
+
+        # Merge nearby diagonals so insertions/deletions don't split the vote
+        bucket = max(2, len(quote_words) // 10)
+        merged: Dict[int, int] = defaultdict(int)
+        for start, count in votes.items():
+            merged[start // bucket] += count
+
+        ranked = sorted(merged.items(), key=lambda item: -item[1])[:self.max_candidates]
+        candidates = []
+        for key, _ in ranked:
+            in_bucket = [s for s in votes if s // bucket == key]
+            candidates.append(max(in_bucket, key=lambda s: votes[s]))
+        return candidates
+
+    def locate(self, quote: str) -> Optional[QuoteLocation]:
+        """Find the best approximate location of a quote"""
+        pattern = self.normalize(quote)
+        quote_words = pattern.split()
+        if not quote_words or not self.words:
+            return None
+
+        slack = max(3, len(quote_words) // 4)
+        best: Optional[Tuple[int, int, int]] = None
+
+        for start_word in self._candidate_starts(quote_words):
+            first = max(0, start_word - slack)
+            last = min(len(self.words), start_word + len(quote_words) + slack)
+            if first >= last:
+                continue
+            char_start = self.word_offsets[first]
+            char_end = self.word_offsets[last - 1] + len(self.words[last - 1])
+
+            distance, start, end = align(pattern, self.text[char_start:char_end])
+            if best is None or distance < best[0]:
+                best = (distance, char_start + start, char_start + end)
+            if distance == 0:
+                break
+
+        if best is None:
+            return None
+
+        distance, start, end = best
+        score = max(0.0, 100.0 * (1 - distance / len(pattern)))
+        return QuoteLocation(
+            page_index=self.token_pages[self._word_at(start)],
+            text=self._original_text(start, end),
+            score=score,
+            distance=distance
+        )
+
+    def _word_at(self, char_pos: int) -> int:
+        return max(0, bisect_right(self.word_offsets, char_pos) - 1)
+
+    def _original_text(self, start: int, end: int) -> str:
+        """Map a normalized span back to the source text, expanded to whole words"""
+        first = self._word_at(start)
+        last = self._word_at(max(start, end - 1))
+
+        parts = []
+        page = self.token_pages[first]
+        span_start = self.token_spans[first][0]
+        for i in range(first, last + 1):
+            if self.token_pages[i] != page:
+                parts.append(self.page_texts[page][span_start:self.token_spans[i - 1][1]])
+                page = self.token_pages[i]
+                span_start = self.token_spans[i][0]
+        parts.append(self.page_texts[page][span_start:self.token_spans[last][1]])
+
+        return re.sub(r'\s+', ' ', ' '.join(parts)).strip()
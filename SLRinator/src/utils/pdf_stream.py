@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Streaming PDF Downloads
+Writes responses to a temporary file chunk by chunk, rejects HTML paywall
+pages and other non-PDFs from the first kilobyte, caps the size, and checks
+the trailer and cross-reference offset on completion instead of parsing the
+whole document
+"""
+
+import os
+import re
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+PDF_MAGIC = b"%PDF-"
+SNIFF_BYTES = 1024               # PDF header must appear within the first KB
+CHUNK_SIZE = 64 * 1024
+DEFAULT_MAX_BYTES = 300 * 1024 * 1024  # Supreme Court bound volumes run to a few hundred MB
+TRAILER_WINDOW = 4096            # startxref and %%EOF sit at the very end of the file
+MIN_PDF_BYTES = 1024
+
+STARTXREF_RE = re.compile(rb"startxref\s+(\d+)\s*%%EOF")
+XREF_AT_OFFSET_RE = re.compile(rb"\s*(?:xref|\d+\s+\d+\s+obj)")
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PDFDownload:
+    """Outcome of a streamed PDF download"""
+    success: bool
+    url: str
+    path: Optional[Path] = None
+    size_bytes: int = 0
+    status_code: Optional[int] = None
+    content_type: str = ""
+    reason: Optional[str] = None  # Why the download was rejected
+
+
+def sniff(head: bytes, content_type: str = "") -> Optional[str]:
+    """Reason the first bytes of a response are not a PDF, or None if they are"""
+    if PDF_MAGIC in head[:SNIFF_BYTES]:
+        return None
+    lowered = head[:SNIFF_BYTES].lstrip().lower()
+    if "html" in content_type.lower() or lowered.startswith((b"<!doctype html", b"<html")):
+        return "html page instead of PDF"
+    return f"not a PDF (Content-Type: {content_type or 'unknown'})"
+
+
+def check_pdf_structure(path: Path) -> Optional[str]:
+    """
+    Cheap completeness check of a downloaded PDF: header, %%EOF trailer and a
+    startxref offset inside the file. Returns the problem, or None if sound.
+    A startxref that points at the wrong place is tolerated (PDF readers rebuild
+    the table); a missing trailer means the download was cut short.
+    """
+    size = path.stat().st_size
+    if size < MIN_PDF_BYTES:
+        return f"file too small to be a document ({size} bytes)"
+
+    with open(path, 'rb') as f:
+        if PDF_MAGIC not in f.read(SNIFF_BYTES):
+            return "missing %PDF header"
+        f.seek(max(0, size - TRAILER_WINDOW))
+        tail = f.read()
+
+        matches = list(STARTXREF_RE.finditer(tail))
+        if not matches:
+            return "truncated (no startxref/%%EOF trailer)"
+        offset = int(matches[-1].group(1))
+        if offset >= size:
+            return f"truncated (startxref {offset} beyond end of file)"
+
+        f.seek(offset)
+        if not XREF_AT_OFFSET_RE.match(f.read(64)):
+            logger.debug(f"{path.name}: startxref {offset} does not point at a cross-reference section")
+    return None
+
+
+def stream_pdf(session, url: str, dest_path: Path, max_bytes: int = DEFAULT_MAX_BYTES,
+               **request_kwargs) -> PDFDownload:
+    """
+    Download url to dest_path only if it is a complete PDF.
+
+    Args:
+        session: requests.Session (or GuardedSession) to fetch with
+        url: Document URL
+        dest_path: Where the PDF is saved; nothing is written there on rejection
+        max_bytes: Abort once the body (or its declared Content-Length) exceeds this
+        **request_kwargs: Passed to session.get (headers, timeout, verify, ...)
+    """
+    dest_path = Path(dest_path)
+    tmp_path = dest_path.with_name(dest_path.name + ".part")
+    result = PDFDownload(success=False, url=url)
+
+    try:
+        with session.get(url, stream=True, **request_kwargs) as response:
+            result.status_code = response.status_code
+            result.content_type = response.headers.get("Content-Type", "")
+            if response.status_code != 200:
+                result.reason = f"HTTP {response.status_code}"
+                return result
+
+            declared = response.headers.get("Content-Length")
+            if declared and declared.isdigit() and int(declared) > max_bytes:
+                result.reason = f"too large ({int(declared)} bytes declared)"
+                return result
+
+            chunks = response.iter_content(chunk_size=CHUNK_SIZE)
+            head = b""
+            for chunk in chunks:
+                head += chunk
+                if len(head) >= SNIFF_BYTES:
+                    break
+
+            result.reason = sniff(head, result.content_type)
+            if result.reason:
+                return result  # Closing the response drops the rest of the body
+
+            dest_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                f.write(head)
+                size = len(head)
+                for chunk in chunks:
+                    size += len(chunk)
+                    if size > max_bytes:
+                        result.reason = f"too large (over {max_bytes} bytes)"
+                        return result
+                    f.write(chunk)
+            result.size_bytes = size
+
+        result.reason = check_pdf_structure(tmp_path)
+        if result.reason:
+            return result
+
+        os.replace(tmp_path, dest_path)
+        result.path = dest_path
+        result.success = True
+        return result
+    finally:
+        if not result.success and tmp_path.exists():
+            tmp_path.unlink()
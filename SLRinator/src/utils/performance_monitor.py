@@ -5,6 +5,7 @@ Tracks system performance and provides optimization recommendations
 
 import time
 import psutil
+import itertools
 import logging
 import functools
 from typing import Dict, Any, Callable, Optional, Tuple
@@ -46,6 +47,7 @@ class PerformanceMonitor:
     def __init__(self, max_history: int = 1000):
         self.metrics_history = deque(maxlen=max_history)
         self.current_operations = {}
+        self._operation_ids = itertools.count(1)
         self.lock = threading.Lock()
         self.start_time = time.time()
         
@@ -67,7 +69,8 @@ class PerformanceMonitor:
     
     def start_operation(self, operation_name: str, metadata: Dict[str, Any] = None) -> str:
         """Start tracking an operation"""
-        operation_id = f"{operation_name}_{time.time()}"
+        # A counter, not a timestamp: operations started in the same clock tick must not collide
+        operation_id = f"{operation_name}_{next(self._operation_ids)}"
         
         metrics = PerformanceMetrics(
             operation=operation_name,
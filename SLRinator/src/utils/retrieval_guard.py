@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Retrieval Guard
+Per-host circuit breakers and a negative-result cache, so a source that is
+down, or a citation a source simply does not have, is skipped immediately
+instead of waiting on timeouts every footnote and every run
+"""
+
+import json
+import time
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.exceptions import RequestException, Timeout, ConnectionError as RequestsConnectionError
+
+from .retry_handler import CircuitBreaker, CircuitOpenError
+
+# Error classes, most transient last
+NOT_FOUND = "not_found"          # 404/410
+FORBIDDEN = "forbidden"          # 401/403: credentials or access, never cached
+SERVER_ERROR = "server_error"    # 5xx, 429
+TIMEOUT = "timeout"              # Timeouts and refused/reset connections
+CIRCUIT_OPEN = "circuit_open"    # Host skipped by its circuit breaker
+
+# How long a failed (strategy, citation) pair is skipped, by error class (seconds).
+# Classes not listed here (forbidden, circuit_open) are not cached.
+NEGATIVE_TTLS = {
+    NOT_FOUND: 7 * 24 * 3600,
+    SERVER_ERROR: 30 * 60,
+    TIMEOUT: 10 * 60,
+}
+
+SEVERITY = {NOT_FOUND: 0, FORBIDDEN: 1, SERVER_ERROR: 2, TIMEOUT: 3, CIRCUIT_OPEN: 4}
+
+
+class _ServerErrorResponse(Exception):
+    """Carries a 5xx/429 response through CircuitBreaker.call as a failure"""
+
+    def __init__(self, response: requests.Response):
+        super().__init__(f"HTTP {response.status_code}")
+        self.response = response
+
+
+class HostCircuitBreakers:
+    """One CircuitBreaker per host, created on first use"""
+
+    def __init__(self, failure_threshold: int = 3, recovery_timeout: float = 120.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, host: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    failure_threshold=self.failure_threshold,
+                    recovery_timeout=self.recovery_timeout,
+                    expected_exception=(RequestException, _ServerErrorResponse)
+                )
+                self._breakers[host] = breaker
+            return breaker
+
+    def open_hosts(self) -> Dict[str, int]:
+        """Hosts currently skipped, with their consecutive failure counts"""
+        with self._lock:
+            return {host: b.failure_count for host, b in self._breakers.items() if b.state == 'open'}
+
+
+class GuardedSession(requests.Session):
+    """
+    requests.Session whose calls go through a per-host circuit breaker.
+
+    Between begin_attempt() and attempt_failure(), the session also records the
+    worst failure class seen by the calling thread, so a retrieval strategy that
+    swallows exceptions can still be classified for the negative cache.
+    """
+
+    def __init__(self, breakers: Optional[HostCircuitBreakers] = None):
+        super().__init__()
+        self.breakers = breakers or HostCircuitBreakers()
+        self._attempt = threading.local()
+
+    def begin_attempt(self):
+        self._attempt.failure = None
+        self._attempt.requests = 0
+
+    def attempt_failure(self) -> Optional[str]:
+        """
+        Worst failure class noted during the current attempt, or None. Only an
+        explicit 404/410 is NOT_FOUND; a 200 the strategy could not use, or an
+        exception it swallowed without a request error, stays unclassified so
+        it is never cached as a miss.
+        """
+        return getattr(self._attempt, 'failure', None)
+
+    def _note(self, error_class: str):
+        current = getattr(self._attempt, 'failure', None)
+        if current is None or SEVERITY[error_class] > SEVERITY[current]:
+            self._attempt.failure = error_class
+
+    def _request_or_raise(self, method, url, *args, **kwargs) -> requests.Response:
+        response = super().request(method, url, *args, **kwargs)
+        if response.status_code >= 500 or response.status_code == 429:
+            raise _ServerErrorResponse(response)
+        return response
+
+    def request(self, method, url, *args, **kwargs):
+        breaker = self.breakers.get(urlsplit(url).netloc.lower())
+        self._attempt.requests = getattr(self._attempt, 'requests', 0) + 1
+        try:
+            response = breaker.call(self._request_or_raise, method, url, *args, **kwargs)
+        except CircuitOpenError:
+            self._note(CIRCUIT_OPEN)
+            raise
+        except _ServerErrorResponse as e:
+            self._note(SERVER_ERROR)
+            return e.response
+        except (Timeout, RequestsConnectionError):
+            self._note(TIMEOUT)
+            raise
+        except RequestException:
+            self._note(SERVER_ERROR)
+            raise
+
+        if response.status_code in (404, 410):
+            self._note(NOT_FOUND)
+        elif response.status_code in (401, 403):
+            self._note(FORBIDDEN)
+        return response
+
+
+class NegativeCache:
+    """
+    Failed (strategy, citation) pairs with an expiry per error class, persisted
+    as JSON so later runs skip them too
+    """
+
+    def __init__(self, path: Optional[Path] = None, ttls: Optional[Dict[str, float]] = None):
+        self.path = Path(path) if path else None
+        self.ttls = dict(NEGATIVE_TTLS, **(ttls or {}))
+        self.logger = logging.getLogger(__name__)
+        self._entries: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+
+        if self.path and self.path.exists():
+            try:
+                with open(self.path, 'r') as f:
+                    entries = json.load(f)
+                now = time.time()
+                self._entries = {k: v for k, v in entries.items() if v["expires_at"] > now}
+            except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+                self.logger.warning(f"Ignoring unreadable negative cache {self.path}: {e}")
+
+    @staticmethod
+    def _key(strategy: str, citation_key: str) -> str:
+        return f"{strategy}|{citation_key}"
+
+    def get(self, strategy: str, citation_key: Optional[str]) -> Optional[Dict]:
+        """Unexpired failure entry for this pair, if any"""
+        if not citation_key:
+            return None
+        key = self._key(strategy, citation_key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry["expires_at"] <= time.time():
+                del self._entries[key]
+                return None
+            self.hits += 1
+            return entry
+
+    def put(self, strategy: str, citation_key: Optional[str], error_class: Optional[str]):
+        """Remember a failure; forbidden, circuit-open and unclassified failures are not cached"""
+        if not citation_key or error_class not in self.ttls:
+            return
+        with self._lock:
+            self._entries[self._key(strategy, citation_key)] = {
+                "error_class": error_class,
+                "expires_at": time.time() + self.ttls[error_class],
+            }
+            self._save()
+
+    def discard(self, strategy: str, citation_key: Optional[str]):
+        if not citation_key:
+            return
+        with self._lock:
+            if self._entries.pop(self._key(strategy, citation_key), None) is not None:
+                self._save()
+
+    def _save(self):
+        if not self.path:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self._entries, f)
+        tmp_path.replace(self.path)
+
+    @staticmethod
+    def describe(entry: Dict) -> str:
+        remaining = max(0, int(entry["expires_at"] - time.time()))
+        return f"Skipped: known {entry['error_class']} (retry in {remaining // 60} min)"
@@ -7,6 +7,10 @@ Handles API failures and network errors gracefully
 import time
 import random
 import logging
+import threading
+import contextvars
+from collections import OrderedDict, defaultdict, deque
+from contextlib import contextmanager
 from typing import Callable, Any, Optional, Dict, List
 from functools import wraps
 import requests
@@ -276,6 +280,10 @@ class CircuitOpenError(Exception):
 class APIRateLimiter:
     """
     Rate limiter for API calls
+    
+    Callers waiting for a token are served in turn per tenant (see
+    rate_limit_tenant), so when several documents share a limiter one
+    document's backlog of requests cannot starve the others.
     """
     
     def __init__(self, 
@@ -293,6 +301,9 @@ class APIRateLimiter:
         self.tokens = burst_size
         self.last_update = time.time()
         self.logger = logging.getLogger(__name__)
+        self._cond = threading.Condition()  # Shared by worker threads
+        self._waiting: "OrderedDict[str, deque]" = OrderedDict()  # Tenant -> tickets; first tenant has the turn
+        self.granted: Dict[str, int] = defaultdict(int)
     
     def acquire(self, timeout: float = None) -> bool:
         """
@@ -304,46 +315,102 @@ class APIRateLimiter:
         Returns:
             True if acquired, False if timeout
         """
-        start_time = time.time()
+        tenant = _tenant.get()
+        deadline = None if timeout is None else time.time() + timeout
+        ticket = object()
         
-        while True:
-            # Update tokens
-            now = time.time()
-            elapsed = now - self.last_update
-            self.tokens = min(
-                self.burst_size,
-                self.tokens + elapsed * self.calls_per_second
-            )
-            self.last_update = now
-            
-            # Check if token available
-            if self.tokens >= 1:
-                self.tokens -= 1
-                return True
-            
-            # Check timeout
-            if timeout is not None:
-                if time.time() - start_time >= timeout:
+        with self._cond:
+            tickets = self._waiting.setdefault(tenant, deque())
+            tickets.append(ticket)
+            while True:
+                # Update tokens
+                now = time.time()
+                elapsed = now - self.last_update
+                self.tokens = min(
+                    self.burst_size,
+                    self.tokens + elapsed * self.calls_per_second
+                )
+                self.last_update = now
+                
+                # Token available and this tenant's turn: served, its other calls go to the back
+                turn = next(iter(self._waiting))
+                if turn == tenant and tickets[0] is ticket and self.tokens >= 1:
+                    self.tokens -= 1
+                    tickets.popleft()
+                    del self._waiting[tenant]
+                    if tickets:
+                        self._waiting[tenant] = tickets
+                    self.granted[tenant] += 1
+                    self._cond.notify_all()
+                    return True
+                
+                # Check timeout
+                if deadline is not None and now >= deadline:
+                    tickets.remove(ticket)
+                    if not tickets:
+                        del self._waiting[tenant]
+                    self._cond.notify_all()
                     return False
-            
-            # Calculate wait time
-            wait_time = (1 - self.tokens) / self.calls_per_second
-            wait_time = min(wait_time, 0.1)  # Cap at 100ms
-            
-            self.logger.debug(f"Rate limit reached, waiting {wait_time:.3f}s")
-            time.sleep(wait_time)
+                
+                # Calculate wait time
+                wait_time = (1 - self.tokens) / self.calls_per_second if self.tokens < 1 else 0.1
+                wait_time = min(wait_time, 0.1)  # Cap at 100ms
+                if deadline is not None:
+                    wait_time = min(wait_time, deadline - now)
+                
+                self.logger.debug(f"Rate limit reached, waiting {wait_time:.3f}s")
+                self._cond.wait(wait_time)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Calls granted and waiting per tenant"""
+        with self._cond:
+            return {
+                "calls_per_second": self.calls_per_second,
+                "burst_size": self.burst_size,
+                "granted": dict(self.granted),
+                "waiting": {tenant: len(tickets) for tenant, tickets in self._waiting.items()},
+            }
+
+
+# Tenant whose calls the current context makes; worker threads inherit it
+# when started through contextvars.copy_context()
+DEFAULT_TENANT = "default"
+_tenant: contextvars.ContextVar = contextvars.ContextVar("rate_limit_tenant", default=DEFAULT_TENANT)
+
+
+@contextmanager
+def rate_limit_tenant(name: str):
+    """Attribute rate-limited calls made in this context to tenant name (e.g. a daemon job's user)"""
+    token = _tenant.set(name or DEFAULT_TENANT)
+    try:
+        yield
+    finally:
+        _tenant.reset(token)
+
+
+def current_tenant() -> str:
+    return _tenant.get()
 
 
 # Global instances for common APIs
 _rate_limiters: Dict[str, APIRateLimiter] = {}
+_rate_limiters_lock = threading.Lock()
 
 def get_rate_limiter(api_name: str, 
                     calls_per_second: float = 1.0,
                     burst_size: int = 10) -> APIRateLimiter:
-    """Get or create rate limiter for API"""
-    if api_name not in _rate_limiters:
-        _rate_limiters[api_name] = APIRateLimiter(calls_per_second, burst_size)
-    return _rate_limiters[api_name]
+    """Get or create rate limiter for API (shared by every caller in the process)"""
+    with _rate_limiters_lock:
+        if api_name not in _rate_limiters:
+            _rate_limiters[api_name] = APIRateLimiter(calls_per_second, burst_size)
+        return _rate_limiters[api_name]
+
+
+def rate_limiter_stats() -> Dict[str, Dict[str, Any]]:
+    """stats() of every shared rate limiter"""
+    with _rate_limiters_lock:
+        limiters = dict(_rate_limiters)
+    return {name: limiter.stats() for name, limiter in limiters.items()}
 
 
 # Example usage functions
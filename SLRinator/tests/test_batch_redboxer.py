@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Test batch redboxing: incremental saves, the full-save fallback, stale temp
+files, skipping PDFs already boxed and boxing a whole Retrieved folder
+"""
+
+import sys
+import os
+import tempfile
+from pathlib import Path
+
+import fitz
+
+# Add SLRinator root and stage1 (its modules import each other by bare name) to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'stage1'))
+
+from src.stage1.batch_redboxer import BatchRedboxer, RedboxJob, redbox_job, MANIFEST_NAME, TEXT_CACHE_NAME
+
+CASE = {"party1": "Alice Corp.", "party2": "CLS Bank", "volume": "573", "reporter": "U.S.", "page": "208"}
+
+
+def _make_pdf(path: Path, pages: int = 2) -> Path:
+    doc = fitz.open()
+    for n in range(pages):
+        doc.new_page().insert_text((72, 72), f"Alice Corp. v. CLS Bank, 573 U.S. 208 (2014). Page {n + 1}")
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+def _make_repaired_pdf(path: Path) -> Path:
+    """A PDF whose startxref is wrong, so PyMuPDF repairs it and cannot save it incrementally"""
+    _make_pdf(path)
+    data = path.read_bytes()
+    start = data.rindex(b"startxref") + len(b"startxref\n")
+    end = data.index(b"\n", start)
+    path.write_bytes(data[:start] + b"999" + data[end:])
+    return path
+
+
+def test_batch_redboxer():
+    """Boxes are appended where possible and rewritten where not; boxed PDFs are skipped"""
+    print("\n" + "="*60)
+    print("Testing Batch Redboxer")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        source = _make_pdf(tmp / "SP-001.pdf")
+        original = source.read_bytes()
+
+        result = redbox_job(RedboxJob(str(source), str(tmp / "out" / "SP-001.pdf"), "case", CASE))
+        output = (tmp / "out" / "SP-001.pdf").read_bytes()
+        assert result["success"] and result["redboxes"] >= 4 and result["pages"] == 3, result
+        assert output.startswith(original) and len(output) > len(original)
+        assert source.read_bytes() == original
+        print(f"✓ {result['redboxes']} boxes appended to a copy with an incremental save")
+
+        # Repaired file: incremental save impossible; a stale .tmp from a killed run is not used
+        repaired = _make_repaired_pdf(tmp / "SP-002.pdf")
+        stale = tmp / "out" / "SP-002.pdf.tmp"
+        stale.write_bytes(b"stale")
+        result = redbox_job(RedboxJob(str(repaired), str(tmp / "out" / "SP-002.pdf"), "case", CASE))
+        assert result["success"], result
+        assert not stale.exists()
+        with fitz.open(str(tmp / "out" / "SP-002.pdf")) as doc:
+            assert len(doc) == 3
+        print("✓ Repaired PDF rewritten in full; stale temp file discarded")
+
+        # An incremental save that fails falls back to a full save
+        save = fitz.Document.save
+
+        def failing_save(doc, filename, *args, **kwargs):
+            if kwargs.get("incremental"):
+                raise RuntimeError("incremental save refused")
+            return save(doc, filename, *args, **kwargs)
+
+        fitz.Document.save = failing_save
+        try:
+            result = redbox_job(RedboxJob(str(source), str(tmp / "out" / "SP-003.pdf"), "case", CASE))
+        finally:
+            fitz.Document.save = save
+        assert result["success"], result
+        with fitz.open(str(tmp / "out" / "SP-003.pdf")) as doc:
+            assert len(doc) == 3
+        print("✓ Failed incremental save falls back to a full save")
+
+        # PDFProcessor.add_custom_redbox writes back to the file it opened
+        from pdf_processor import PDFProcessor
+        custom = _make_repaired_pdf(tmp / "custom.pdf")
+        assert PDFProcessor().add_custom_redbox(str(custom), 0, 50, 50, 200, 100, label="check")
+        with fitz.open(str(custom)) as doc:
+            assert doc[0].get_drawings()
+        print("✓ Custom redbox saved to a repaired PDF")
+
+        # Batch across the pool; a second run skips everything already boxed
+        jobs = [RedboxJob(str(_make_pdf(tmp / f"SP-01{n}.pdf", pages=n + 1)),
+                          str(tmp / "boxed" / f"SP-01{n}.pdf"), "case", CASE) for n in range(3)]
+        redboxer = BatchRedboxer({"redbox_workers": 2}, str(tmp / "boxed" / MANIFEST_NAME))
+        try:
+            summary = redboxer.redbox_batch(jobs)
+        finally:
+            redboxer.close()
+        assert summary["processed"] == 3 and summary["pages"] == 2 + 3 + 4, summary
+        assert summary["pages_per_second"] > 0
+        assert [r["output_path"] for r in summary["results"]] == [job.output_path for job in jobs]
+
+        redboxer = BatchRedboxer({"redbox_workers": 0}, str(tmp / "boxed" / MANIFEST_NAME))
+        summary = redboxer.redbox_batch(jobs + [RedboxJob(jobs[0].input_path, jobs[0].output_path, "case",
+                                                          dict(CASE, page="209"))])
+        assert summary["skipped"] == 3 and summary["processed"] == 1, summary
+        print("✓ Batch of 3 boxed, then skipped on rerun; a changed citation is boxed again")
+
+
+def test_redbox_folder():
+    """Every PDF in a Retrieved folder with a citation is boxed; the rest are reported"""
+    print("\n" + "="*60)
+    print("Testing Retrieved Folder Redboxing")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        retrieved = tmp / "Retrieved"
+        retrieved.mkdir()
+        for name in ("SP-001.pdf", "SP-002.PDF", "SP-003.pdf"):
+            _make_pdf(retrieved / name)
+        (retrieved / "notes.txt").write_text("not a PDF")
+        boxed = tmp / "Redboxed"
+        citations = {"SP-001.pdf": ("case", CASE), "SP-002": ("case", dict(CASE, page="209"))}
+
+        redboxer = BatchRedboxer({"redbox_workers": 2}, str(boxed / MANIFEST_NAME))
+        try:
+            summary = redboxer.redbox_folder(str(retrieved), str(boxed), citations)
+        finally:
+            redboxer.close()
+        assert summary["processed"] == 2 and summary["total"] == 2 and summary["pages"] == 6, summary
+        assert summary["unmatched"] == [str(retrieved / "SP-003.pdf")]
+        assert sorted(p.name for p in boxed.iterdir() if p.is_file()) == [MANIFEST_NAME, "SP-001.pdf", "SP-002.PDF"]
+        assert list((boxed / TEXT_CACHE_NAME).glob("*.words.json"))
+        print("✓ Matched PDFs boxed by file name or stem; unmatched and non-PDF files left alone")
+
+        summary = BatchRedboxer({"redbox_workers": 0}, str(boxed / MANIFEST_NAME)).redbox_folder(
+            str(retrieved), str(boxed), citations)
+        assert summary["skipped"] == 2 and summary["processed"] == 0, summary
+        print("✓ Rerun over the folder skips everything already boxed")
+
+
+def test_workflow_redbox_stage():
+    """The workflow's redbox stage boxes each retrieved PDF through BatchRedboxer"""
+    import slrinator_workflow as workflow
+    from src.core.sourcepull_queue import SourcepullQueue, DONE
+    from src.core.sourcepull_system import SourcepullSystem, SourcepullResult
+    from src.core.source_identifier import SourceType, CitationComponents
+
+    cwd = os.getcwd()
+    originals = (workflow.extract_footnotes_from_docx, workflow.retrieve_source)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+
+        def retrieve(system, job, logger):
+            pdf = _make_pdf(Path(tmp) / f"SP-{job.job_id:03d}.pdf")
+            return DONE, SourcepullResult(
+                footnote_number=job.footnote_number, citation_text=job.citation_text,
+                source_type=SourceType.SUPREME_COURT,
+                components=CitationComponents(volume="573", reporter="U.S.", page="208"),
+                retrieval_attempts=[], final_status="success", final_file_path=str(pdf), reasoning="test"
+            ).to_dict()
+
+        workflow.extract_footnotes_from_docx = lambda path: {
+            1: "Alice Corp. v. CLS Bank Int'l, 573 U.S. 208 (2014).",
+            2: "Bilski v. Kappos, 561 U.S. 593 (2010)."
+        }
+        workflow.retrieve_source = retrieve
+        try:
+            system = SourcepullSystem(config_path=os.path.join(tmp, "missing.json"))
+            queue = SourcepullQueue(Path(tmp) / "doc.queue.db")
+            settings = workflow.StreamSettings(redbox=True, redbox_workers=2)
+            statistics = workflow.stream_document(queue, system, "doc.docx", None, False, tmp,
+                                                  60, settings, workflow.logging.getLogger("test"))
+            assert sorted(p.name for p in (Path(tmp) / "Redboxed").glob("*.pdf")) == ["SP-001.pdf", "SP-002.pdf"]
+            assert statistics["redbox"]["processed"] == 2 and statistics["redbox"]["failed"] == 0
+            assert (Path(tmp) / "Redboxed" / MANIFEST_NAME).exists()
+            print(f"✓ Workflow redbox stage: 2 PDFs at {statistics['redbox']['pages_per_second']} pages/sec")
+        finally:
+            workflow.extract_footnotes_from_docx, workflow.retrieve_source = originals
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    test_batch_redboxer()
+    test_redbox_folder()
+    test_workflow_redbox_stage()
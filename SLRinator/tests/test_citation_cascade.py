@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test the citation cascade: which tier settles each footnote, escalation to
+packed and single GPT requests, and the GPT memo across runs
+"""
+
+import sys
+import os
+import json
+import tempfile
+from pathlib import Path
+
+# Add SLRinator root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.citation_cascade import CascadingCitationParser
+from src.core.gpt_citation_parser import GPTCitationParser
+
+FOOTNOTES = {
+    1: "Id. at 5.",
+    2: "See Marbury v. Madison, 5 U.S. 137 (1803).",
+    3: "Letter from Thomas Jefferson to James Madison (Sept. 6, 1789).",
+    4: "Brief for Petitioner at 3, Doe v. Roe, No. 12-345 (2019).",
+    5: "The framers disagreed about this.",
+}
+ESCALATED = [3, 4, 5]
+
+
+class FakeGPT(GPTCitationParser):
+    """GPTCitationParser whose API calls are answered locally and recorded"""
+
+    def __init__(self, omit=()):
+        super().__init__(api_key="test")
+        self.omit = set(omit)
+        self.requests = []
+
+    @staticmethod
+    def entry(text):
+        return {"citations": [{"citation_text": text, "citation_type": "other"}]}
+
+    def _post_chat(self, system_prompt, user_content, max_tokens, timeout, log_text):
+        header, body = user_content.split("\n", 1)
+        if header == "Parse these footnotes:":
+            footnotes = json.loads(body)
+            self.requests.append(sorted(int(n) for n in footnotes))
+            return json.dumps({"footnotes": {n: self.entry(text) for n, text in footnotes.items()
+                                             if int(n) not in self.omit}})
+        self.requests.append(body)
+        return json.dumps(self.entry(body))
+
+
+def test_tier_escalation():
+    """Deterministic tiers settle what they can; the rest go to GPT, packed first"""
+    print("\n" + "="*60)
+    print("Testing Cascade Tier Escalation")
+    print("="*60)
+
+    # 5 is left out of the packed response and retried on its own
+    gpt = FakeGPT(omit=[5])
+    parser = CascadingCitationParser(gpt, memo_path=None)
+    parsed = parser.parse_footnotes_batch(FOOTNOTES)
+    stats = parser.get_statistics()
+
+    assert list(parsed) == [1, 2, 3, 4, 5]
+    assert parsed[1].citations[0].is_short_form and parsed[2].citations[0].case_name == "Marbury v. Madison"
+    assert all(parsed[n].citations[0].citation_text == FOOTNOTES[n] for n in ESCALATED)
+    assert stats["tier_hits"] == {"short_form": 1, "rules": 1, "memo": 0, "gpt": 3, "basic": 0}
+    assert gpt.requests == [ESCALATED, FOOTNOTES[5]] and stats["gpt_calls"] == 2
+    print("✓ Id. and a full case cite parsed locally; 3 footnotes escalated, 1 retried alone")
+
+    # Without GPT, escalated footnotes fall back to the best local parse
+    parser = CascadingCitationParser(FakeGPT(), use_gpt=False, memo_path=None)
+    parsed = parser.parse_footnotes_batch(FOOTNOTES)
+    assert parser.get_statistics()["tier_hits"]["basic"] == 3 and parser.gpt_parser.requests == []
+    assert all(parsed[n].citations for n in (3, 4))
+    print("✓ GPT disabled: escalated footnotes fall back without a request")
+
+    # A single footnote escalates to a single request, and a GPT failure falls back too
+    gpt = FakeGPT()
+    parser = CascadingCitationParser(gpt, memo_path=None)
+    assert parser.parse_footnote(4, FOOTNOTES[4]).citations[0].citation_text == FOOTNOTES[4]
+    gpt._post_chat = lambda *args, **kwargs: "not json"
+    parser.parse_footnote(5, FOOTNOTES[5])
+    assert gpt.requests == [FOOTNOTES[4]] and parser.get_statistics()["tier_hits"]["basic"] == 1
+    print("✓ Single footnote sent unpacked; unparseable GPT reply falls back")
+
+
+def test_memo():
+    """GPT results are memoized by normalized text and reused by later runs"""
+    print("\n" + "="*60)
+    print("Testing Cascade GPT Memo")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        memo_path = Path(tmp) / "cache" / "gpt_citation_memo.json"
+
+        gpt = FakeGPT()
+        CascadingCitationParser(gpt, memo_path=str(memo_path)).parse_footnotes_batch(FOOTNOTES)
+        assert len(json.loads(memo_path.read_text())) == 3 and gpt.requests == [ESCALATED]
+        print("✓ Escalated footnotes memoized on disk")
+
+        # Same footnotes with different spacing and case: all memo hits
+        restyled = {n: "  " + text.replace("Letter", "LETTER").replace(" ", "  ") for n, text in FOOTNOTES.items()}
+        gpt = FakeGPT()
+        parser = CascadingCitationParser(gpt, memo_path=str(memo_path))
+        parsed = parser.parse_footnotes_batch(restyled)
+        stats = parser.get_statistics()
+        assert gpt.requests == [] and stats["tier_hits"]["memo"] == 3 and stats["gpt_calls"] == 0
+        assert parsed[3].citations[0].citation_text == FOOTNOTES[3]
+        assert stats["gpt_calls_saved"] == 5
+        print("✓ Restyled footnotes served from the memo with no GPT calls")
+
+        # A footnote not in the memo misses and is added to it
+        gpt = FakeGPT()
+        parser = CascadingCitationParser(gpt, memo_path=str(memo_path))
+        parser.parse_footnotes_batch({6: "Tweet by @user (Jan. 2, 2021).", 3: FOOTNOTES[3]})
+        assert gpt.requests == ["Tweet by @user (Jan. 2, 2021)."]
+        assert parser.get_statistics()["tier_hits"]["memo"] == 1
+        assert len(json.loads(memo_path.read_text())) == 4
+        print("✓ Memo miss escalated and saved alongside earlier entries")
+
+        # An unreadable memo is ignored rather than fatal
+        memo_path.write_text("{broken")
+        assert CascadingCitationParser(FakeGPT(), memo_path=str(memo_path)).memo == {}
+        print("✓ Unreadable memo file ignored")
+
+
+if __name__ == "__main__":
+    test_tier_escalation()
+    test_memo()
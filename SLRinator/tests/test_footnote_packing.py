@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test packed GPT requests: grouping, footnote-number tagging, splitting the
+JSON response back into footnotes, and concurrent sends
+"""
+
+import sys
+import os
+import json
+import threading
+
+# Add SLRinator root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.footnote_packing import (
+    pack_footnotes, packed_user_message, extract_packed_entries, run_packed_requests
+)
+from src.utils.retry_handler import rate_limit_tenant, current_tenant
+
+GROUP = [(3, "See 42 U.S.C. § 1983."), (4, "Id."), (7, "Marbury v. Madison, 5 U.S. 137 (1803).")]
+
+
+def _valid(entry):
+    return isinstance(entry.get("citations"), list)
+
+
+def test_packing():
+    """Footnotes are grouped in order and tagged with their numbers"""
+    print("\n" + "="*60)
+    print("Testing Footnote Packing")
+    print("="*60)
+
+    footnotes = [(n, "x" * 40) for n in range(1, 8)] + [(8, "y" * 500), (9, "z")]
+    groups = pack_footnotes(footnotes, max_chars=100, max_footnotes=2)
+    assert [[n for n, _ in group] for group in groups] == [[1, 2], [3, 4], [5, 6], [7], [8], [9]]
+    assert pack_footnotes([]) == []
+    print("✓ Groups capped by size and count; an oversized footnote goes alone")
+
+    message = packed_user_message(GROUP + [(9, "Brown v. Bd. of Educ. — “separate”")])
+    assert message.startswith("Parse these footnotes:\n")
+    tagged = json.loads(message.split("\n", 1)[1])
+    assert list(tagged) == ["3", "4", "7", "9"] and tagged["4"] == "Id."
+    assert "“separate”" in message
+    print("✓ Each footnote tagged with its number, non-ASCII text kept as is")
+
+
+def test_extraction():
+    """Responses are split by footnote number; missing, garbled and extra ids are handled"""
+    print("\n" + "="*60)
+    print("Testing Packed Response Extraction")
+    print("="*60)
+
+    wrapped = json.dumps({"footnotes": {"3": {"citations": [{"text": "42 U.S.C. § 1983"}]},
+                                        "4": {"citations": []},
+                                        "7": {"citations": []}}})
+    entries, missing = extract_packed_entries(wrapped, GROUP, _valid)
+    assert sorted(entries) == [3, 4, 7] and not missing
+    assert entries[3]["citations"][0]["text"] == "42 U.S.C. § 1983"
+    print("✓ Wrapped response split into every footnote")
+
+    bare = json.dumps({"3": {"citations": []}, "4": {"citations": []}, "7": {"citations": []}})
+    assert sorted(extract_packed_entries(bare, GROUP, _valid)[0]) == [3, 4, 7]
+    print("✓ Response without the footnotes wrapper accepted")
+
+    # 4 is missing, 7 fails validation, 12 and 99 were never asked for
+    partial = json.dumps({"footnotes": {"3": {"citations": []}, "7": {"citations": "none"},
+                                        "12": {"citations": []}, "99": "junk"}})
+    entries, missing = extract_packed_entries(partial, GROUP, _valid)
+    assert list(entries) == [3] and missing == [4, 7]
+    print("✓ Missing and invalid footnotes reported; extra ids ignored")
+
+    for garbled in ("not json", '{"footnotes": {"3": ', None, "[1, 2]", '{"footnotes": ["3"]}'):
+        assert extract_packed_entries(garbled, GROUP, _valid) == ({}, [3, 4, 7]), garbled
+    print("✓ Unparseable or misshapen responses mark every footnote missing")
+
+
+def test_run_packed_requests():
+    """Groups are sent concurrently as the caller's tenant; failures are yielded, not raised"""
+    print("\n" + "="*60)
+    print("Testing Packed Requests")
+    print("="*60)
+
+    groups = pack_footnotes([(n, "text") for n in range(1, 11)], max_footnotes=3)
+    tenants = []
+    lock = threading.Lock()
+
+    class Limiter:
+        calls = 0
+
+        def acquire(self):
+            with lock:
+                Limiter.calls += 1
+
+    def request(group):
+        with lock:
+            tenants.append(current_tenant())
+        if group[0][0] == 4:
+            raise RuntimeError("timeout")
+        return json.dumps({str(n): {"citations": []} for n, _ in group})
+
+    with rate_limit_tenant("alice"):
+        outcomes = list(run_packed_requests(groups, request, max_workers=3, rate_limiter=Limiter()))
+
+    assert len(outcomes) == len(groups) == 4 and Limiter.calls == 4
+    assert tenants == ["alice"] * 4
+    failed = [group for group, response, error in outcomes if error is not None]
+    assert [[n for n, _ in group] for group in failed] == [[4, 5, 6]]
+    assert all((response is None) != (error is None) for _, response, error in outcomes)
+    print("✓ 4 groups sent as alice through the limiter; the failed one yielded with its error")
+
+
+if __name__ == "__main__":
+    test_packing()
+    test_extraction()
+    test_run_packed_requests()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test the OCR service's caching and bookkeeping with Tesseract replaced by a
+canned result: documents with no file, page renders shared by clips, bounded
+memos, counters under concurrent use, and queue slots when the process pool
+refuses work
+"""
+
+import sys
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+import fitz
+
+# Add SLRinator root and stage1 (its modules import each other by bare name) to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'stage1'))
+
+from src.stage1 import ocr_service
+from src.stage1.ocr_service import OCRService
+
+TSV = ("level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\tleft\ttop\twidth\theight\tconf\ttext\n"
+       "5\t1\t1\t1\t1\t1\t144\t144\t100\t30\t96\tMarbury\n")
+
+
+images = []
+
+
+def _fake_tesseract(png_bytes, config):
+    pix = fitz.Pixmap(png_bytes)
+    images.append((pix.width, pix.height))
+    return TSV
+
+
+class _RefusingPool:
+    def submit(self, *args):
+        raise RuntimeError("pool is shut down")
+
+
+def _page_doc():
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), "Marbury v. Madison")
+    return doc
+
+
+def test_ocr_service():
+    """OCR results are cached and counted exactly, and refused work frees its slot"""
+    print("\n" + "="*60)
+    print("Testing OCR Service")
+    print("="*60)
+
+    originals = (ocr_service.OCR_AVAILABLE, ocr_service._tesseract_tsv, ocr_service.HASH_MEMO_SIZE)
+    ocr_service.OCR_AVAILABLE, ocr_service._tesseract_tsv = True, _fake_tesseract
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            service = OCRService({'ocr_cache_dir': tmp, 'ocr_workers': 0})
+
+            # A document built in memory has no file to hash; its bytes are hashed instead
+            doc = _page_doc()
+            words = service.ocr_page(doc, 0, dpi=144)
+            assert [w['text'] for w in words] == ['Marbury'] and words[0]['x0'] == 72.0
+            assert service.ocr_page(doc, 0, dpi=144) == words
+            assert service.get_stats() == {'pages_requested': 2, 'cache_hits': 1, 'tesseract_calls': 1}
+            print("✓ Unnamed document OCR'd once, then served from the cache")
+
+            # A clip is cropped from the page render already in memory
+            images.clear()
+            clipped = service.submit_page(doc, 0, dpi=144, clip=fitz.Rect(36, 36, 300, 200)).result()
+            assert images == [(528, 328)] and len(service._pixmaps) == 1
+            assert (clipped[0]['x0'], clipped[0]['y0']) == (108.0, 108.0)
+            print("✓ Clip cropped from the cached page render; words placed on the page")
+
+            def request_pages():
+                for _ in range(200):
+                    service.submit_page(doc, 0, dpi=144).result()
+
+            threads = [threading.Thread(target=request_pages) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert service.get_stats() == {'pages_requested': 1603, 'cache_hits': 1601, 'tesseract_calls': 2}
+            print("✓ Counters exact across 8 threads")
+
+            # Remembered file hashes are capped
+            ocr_service.HASH_MEMO_SIZE = 2
+            for i in range(3):
+                path = Path(tmp) / f"copy{i}.pdf"
+                doc.save(str(path))
+                service.pdf_hash(str(path))
+            assert [Path(key[0]).name for key in service._hashes] == ["copy1.pdf", "copy2.pdf"]
+            print("✓ File hash memo bounded")
+            service.close()
+
+            # Each refused submission gives its queue slot back, so later calls do not block
+            service = OCRService({'ocr_cache_dir': tmp, 'ocr_workers': 1, 'ocr_max_pending': 2})
+            service.executor.shutdown(wait=True)
+            service.executor = _RefusingPool()
+            for dpi in (100, 110, 120):
+                try:
+                    service.submit_page(doc, 0, dpi=dpi)
+                    assert False, "submission should have been refused"
+                except RuntimeError:
+                    pass
+            assert service._slots.acquire(blocking=False) and service._slots.acquire(blocking=False)
+            print("✓ Queue slots released when the pool refuses work")
+            service.executor = None
+            service.close()
+            doc.close()
+    finally:
+        ocr_service.OCR_AVAILABLE, ocr_service._tesseract_tsv, ocr_service.HASH_MEMO_SIZE = originals
+
+
+if __name__ == "__main__":
+    test_ocr_service()
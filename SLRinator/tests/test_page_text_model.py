@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Test the page text model: phrase search, the fallbacks for terms that do not
+line up with PDF words, and where the extracted words are cached
+"""
+
+import sys
+import os
+import tempfile
+from pathlib import Path
+
+import fitz
+
+# Add SLRinator root and stage1 (its modules import each other by bare name) to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src', 'stage1'))
+
+from src.stage1.page_text_model import DocumentTextModel
+from src.stage1.pdf_redboxer import PDFRedboxer
+
+TEXT = "Claims under 42 U.S.C. §1983 against Smith-Jones, 573 U.S. 208 (2014)."
+
+
+def _make_pdf(path: Path) -> Path:
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), TEXT, fontsize=10)
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+def test_find():
+    """Phrases match by token; hyphenated and unspaced text is still found"""
+    print("\n" + "="*60)
+    print("Testing Page Text Search")
+    print("="*60)
+
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), TEXT, fontsize=10)
+    model = DocumentTextModel.from_document(doc)
+    page_text = model[0]
+
+    assert len(page_text.find("573 U.S. 208")) == 1
+    assert page_text.find("U.S.") and page_text.find("u.s")
+    assert not page_text.find("Marbury")
+    print("✓ Phrases matched by token, punctuation ignored at word edges")
+
+    # "Jones" is inside the word "Smith-Jones"; only its share of the word is boxed
+    jones = page_text.find("Jones")
+    whole = page_text.find("Smith-Jones")
+    assert len(jones) == 1 and whole[0][0] < jones[0][0] < jones[0][2] <= whole[0][2]
+    expected = doc[0].search_for("Jones")[0]
+    # Widths are split evenly across characters, so allow about one character of error
+    assert abs(jones[0][0] - expected.x0) < 3 and abs(jones[0][2] - expected.x1) < 3
+    print("✓ Part of a hyphenated word found and boxed")
+
+    # The cite spaces the section symbol; the PDF does not
+    for term in ("U.S.C. § 1983", "42 U.S.C. § 1983", "§ 1983"):
+        assert page_text.find(term), term
+    assert len(page_text.find("U.S.C. § 1983")) == 1
+    print("✓ Spacing differences around § do not hide a section")
+
+    # Hits and misses are answered from the stored words: the page is read once
+    # to build them, never per term
+    touched = []
+    originals = fitz.Page.search_for, fitz.Page.get_text
+    fitz.Page.search_for = lambda *args, **kwargs: touched.append("search_for") or []
+    fitz.Page.get_text = lambda *args, **kwargs: touched.append("get_text") or originals[1](*args, **kwargs)
+    try:
+        assert not page_text.find("Marbury") and not page_text.find("1984")
+        assert touched == []
+        terms = ["Marbury v. Madison", "Jones", "1984", "Brown"]
+        assert len(PDFRedboxer()._find_elements(doc, terms)) == 1
+    finally:
+        fitz.Page.search_for, fitz.Page.get_text = originals
+    assert touched == ["get_text"]
+    print("✓ Absent terms miss without touching the page")
+    doc.close()
+
+
+def test_caching():
+    """Only real files are cached, and only in the cache directory given"""
+    print("\n" + "="*60)
+    print("Testing Text Model Caching")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        sources = tmp / "sources"
+        sources.mkdir()
+        pdf = _make_pdf(sources / "SP-001.pdf")
+        cache_dir = tmp / "out" / ".text_models"
+
+        # A new document has no name; it must not be looked up against the cwd
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            doc = fitz.open()
+            doc.new_page().insert_text((72, 72), TEXT, fontsize=10)
+            assert DocumentTextModel.for_pdf(doc.name, doc, cache_dir=str(cache_dir))[0].find("Smith-Jones")
+            doc.close()
+        finally:
+            os.chdir(cwd)
+        assert not cache_dir.exists() and not any(tmp.glob(".*.json"))
+        print("✓ Unnamed document searched without touching any cache")
+
+        DocumentTextModel._memory_cache.clear()
+        with fitz.open(str(pdf)) as doc:
+            first = DocumentTextModel.for_pdf(str(pdf), doc, cache_dir=str(cache_dir))
+        assert sorted(p.name for p in sources.iterdir()) == ["SP-001.pdf"]
+        assert len(list(cache_dir.glob("*.words.json"))) == 1
+        assert DocumentTextModel.for_pdf(str(pdf)) is first
+        print("✓ Words cached in the cache directory, nothing written next to the PDF")
+
+        DocumentTextModel._memory_cache.clear()
+        reloaded = DocumentTextModel.for_pdf(str(pdf), cache_dir=str(cache_dir))
+        assert reloaded is not first and reloaded[0].text == first[0].text
+        print("✓ Words reloaded from the cache directory")
+
+        # Both redboxers and the processor search the same way
+        out = tmp / "out" / "boxed.pdf"
+        assert PDFRedboxer().redbox_pdf(str(pdf), str(out), ["Jones", "U.S.C. § 1983"], add_metadata=False)
+        with fitz.open(str(out)) as doc:
+            assert len(doc[0].get_drawings()) == 2
+        print("✓ Redboxer boxes terms found through the fallbacks")
+
+
+if __name__ == "__main__":
+    test_find()
+    test_caching()
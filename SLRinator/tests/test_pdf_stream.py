@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Test streaming PDF downloads against a local HTTP server
+"""
+
+import sys
+import os
+import tempfile
+import threading
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+# Add SLRinator root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.pdf_stream import stream_pdf, check_pdf_structure
+
+
+def _minimal_pdf(padding: int = 4096) -> bytes:
+    """Small PDF with a correct cross-reference table and trailer"""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] >>",
+    ]
+    out = b"%PDF-1.4\n%" + b"x" * padding + b"\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return out
+
+
+PDF = _minimal_pdf()
+HTML = b"<!DOCTYPE html><html><body>Please log in to continue" + b" " * 200000 + b"</body></html>"
+
+ROUTES = {
+    "/case.pdf": ("application/pdf", PDF),
+    "/octet.pdf": ("application/octet-stream", PDF),
+    "/paywall": ("text/html; charset=utf-8", HTML),
+    "/truncated.pdf": ("application/pdf", PDF[:len(PDF) - 200]),
+    "/huge.pdf": ("application/pdf", PDF + b"%" + b"0" * 300000),
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    bytes_sent = {}
+
+    def do_GET(self):
+        if self.path not in ROUTES:
+            self.send_response(404)
+            self.end_headers()
+            return
+        content_type, body = ROUTES[self.path]
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.end_headers()  # No Content-Length: the size cap must work on the stream
+        sent = 0
+        try:
+            for i in range(0, len(body), 8192):
+                self.wfile.write(body[i:i + 8192])
+                sent += 8192
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        _Handler.bytes_sent[self.path] = min(sent, len(body))
+
+    def log_message(self, *args):
+        pass
+
+
+def test_stream_pdf():
+    """Only complete PDFs are saved; bad responses are abandoned early"""
+    print("\n" + "="*60)
+    print("Testing Streaming PDF Downloads")
+    print("="*60)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    session = requests.Session()
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(tmp)
+
+            for route in ("/case.pdf", "/octet.pdf"):
+                download = stream_pdf(session, base + route, out / "ok.pdf", timeout=5)
+                assert download.success, download.reason
+                assert (out / "ok.pdf").read_bytes() == PDF
+                assert check_pdf_structure(out / "ok.pdf") is None
+            print(f"✓ Valid PDF saved ({download.size_bytes} bytes), regardless of Content-Type")
+
+            download = stream_pdf(session, base + "/paywall", out / "paywall.pdf", timeout=5)
+            assert not download.success and "html" in download.reason
+            assert not (out / "paywall.pdf").exists()
+            print(f"✓ HTML page rejected: {download.reason}")
+
+            download = stream_pdf(session, base + "/truncated.pdf", out / "cut.pdf", timeout=5)
+            assert not download.success and "truncated" in download.reason
+            assert not (out / "cut.pdf").exists() and not (out / "cut.pdf.part").exists()
+            print(f"✓ Truncated PDF rejected: {download.reason}")
+
+            download = stream_pdf(session, base + "/huge.pdf", out / "huge.pdf", max_bytes=100000, timeout=5)
+            assert not download.success and "too large" in download.reason
+            assert not (out / "huge.pdf").exists()
+            print(f"✓ Size cap enforced: {download.reason}")
+
+            download = stream_pdf(session, base + "/gone.pdf", out / "gone.pdf", timeout=5)
+            assert not download.success and download.status_code == 404
+            print("✓ HTTP errors reported without writing a file")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    test_stream_pdf()
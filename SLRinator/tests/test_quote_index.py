@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Test the quote index: Myers alignment, shingle candidate lookup, locating
+near-miss, line-spanning and absent quotes, and the checker's index cache
+"""
+
+import sys
+import os
+import gc
+import tempfile
+from pathlib import Path
+
+import fitz
+
+# Add SLRinator root and src (stage3 modules import each other as stage3.*) to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from stage3.quote_index import QuoteIndex, best_alignment_end, align
+from stage3.quote_checker import QuoteChecker
+
+PAGES = [
+    "Marbury v. Madison, 5 U.S. 137 (1803).\nThe Government of the United States has been "
+    "emphatically termed a government of laws, and not of men.",
+    "It is emphatically the province and duty of the judicial\ndepartment to say what the law is. "
+    "Those who apply the rule to particular cases must of\nnecessity expound and interpret that rule.",
+    "So if a law be in opposition to the Constitution, the Court must determine which of these "
+    "conflicting rules governs the case. This is of the very essence of judicial duty.",
+]
+
+
+def _make_doc(pages):
+    doc = fitz.open()
+    for text in pages:
+        doc.new_page().insert_textbox(fitz.Rect(72, 72, 540, 720), text, fontsize=10)
+    return doc
+
+
+def test_alignment():
+    """Semi-global alignment finds the closest substring and its span"""
+    print("\n" + "="*60)
+    print("Testing Myers Alignment")
+    print("="*60)
+
+    text = "marbury v. madison, 5 u.s. 137"
+    assert best_alignment_end("madison", text) == (0, text.index("madison") + 6)
+    distance, start, end = align("madisen", text)
+    assert distance == 1 and text[start:end] == "madison"
+    assert best_alignment_end("", text) == (0, -1) and best_alignment_end("abc", "") == (3, -1)
+    assert align("abc", "") == (3, 0, 0)
+    print("✓ Exact and one-edit matches located; empty inputs handled")
+
+    # Patterns longer than a machine word still align
+    long_text = "x" * 50 + PAGES[1].lower() + "y" * 50
+    pattern = PAGES[1].lower()[:150].replace("province", "provence")
+    distance, start, end = align(pattern, long_text)
+    assert distance == 1 and start == 50 and end == 200
+    print("✓ 150-character pattern aligned with one edit")
+
+
+def test_index_lookup():
+    """Shingles vote for the right start; near misses, line breaks and page breaks are found"""
+    print("\n" + "="*60)
+    print("Testing Quote Index Lookup")
+    print("="*60)
+
+    index = QuoteIndex(PAGES)
+    quote = "the province and duty of the judicial department to say what the law is"
+    quote_words = index.normalize(quote).split()
+    first = index.words.index("province") - 1
+    assert index._candidate_starts(quote_words)[0] == first
+    print("✓ Shingle votes rank the true start first")
+
+    # The source breaks the line after "judicial"
+    location = index.locate(quote)
+    assert location.distance == 0 and location.score == 100.0 and location.page_index == 1
+    assert location.text == "the province and duty of the judicial department to say what the law is."
+    print("✓ Quote spanning a line break found exactly")
+
+    near = index.locate("emphatically the provence and duty of the judical department")
+    assert near.page_index == 1 and near.distance == 2 and 95 < near.score < 100
+    assert near.text.startswith("emphatically the province")
+    print("✓ Near-miss quote found with its edit distance")
+
+    # Every shingle is broken; the rare word "emphatically" still anchors the lookup
+    noisy = index.locate("emphatically the provinse and dutie of the judicia1 departmint")
+    assert noisy is not None and noisy.page_index == 1 and noisy.score > 85
+    print("✓ OCR-damaged quote found through single-word votes")
+
+    across = index.locate("expound and interpret that rule. So if a law be in opposition")
+    assert across.distance == 0 and across.page_index == 1
+    assert across.text == "expound and interpret that rule. So if a law be in opposition"
+    print("✓ Quote running onto the next page mapped back to both pages")
+
+    assert index.locate("the quick brown fox jumps over the lazy dog") is None
+    assert index.locate("  ") is None and QuoteIndex([]).locate(quote) is None
+    print("✓ Absent and empty quotes return no location")
+
+
+def test_checker_cache():
+    """Indexes are reused per file or content, bounded, and never confused between documents"""
+    print("\n" + "="*60)
+    print("Testing Quote Index Cache")
+    print("="*60)
+
+    checker = QuoteChecker({'quote_index_cache_size': 2})
+    near_miss = "emphatically the provence and duty of the judical department"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(3):
+            path = Path(tmp) / f"SP-00{i + 1}.pdf"
+            doc = _make_doc(PAGES if i == 0 else [f"Unrelated source number {i} about other matters."])
+            doc.save(str(path))
+            doc.close()
+            paths.append(path)
+
+        with fitz.open(str(paths[0])) as doc:
+            result = checker._search_fuzzy_quote(near_miss, doc)
+            first = checker._get_quote_index(doc)
+        assert result['found'] and result['page'] == 2 and result['confidence'] > 0.95
+        assert result['differences']
+        with fitz.open(str(paths[0])) as doc:
+            assert checker._get_quote_index(doc) is first
+        print("✓ Near miss found through the checker; reopened file reuses its index")
+
+        for path in paths[1:]:
+            with fitz.open(str(path)) as doc:
+                checker._get_quote_index(doc)
+        assert len(checker._quote_indexes) == 2
+        with fitz.open(str(paths[0])) as doc:
+            assert checker._get_quote_index(doc) is not first
+        print("✓ Least recently used index evicted at the cache size")
+
+        # The file disappears while open: no stat error, keyed by content instead
+        doc = fitz.open(str(paths[1]))
+        paths[1].unlink()
+        assert checker._get_quote_index(doc).locate("Unrelated source number 1 about") is not None
+        doc.close()
+        print("✓ Document whose file is gone indexed without error")
+
+    # Unnamed documents are keyed by content, so a reused id cannot return a stale index
+    checker = QuoteChecker()
+    for i in range(5):
+        doc = _make_doc([f"Draft {i}: the legislature acted within its enumerated powers here."])
+        location = checker._get_quote_index(doc).locate(f"Draft {i}: the legislature acted")
+        assert location is not None and location.distance == 0, i
+        doc.close()
+        del doc
+        gc.collect()
+    same = _make_doc([PAGES[0]])
+    again = _make_doc([PAGES[0]])
+    assert checker._get_quote_index(same) is checker._get_quote_index(again)
+    print("✓ In-memory documents cached by content, never by object id")
+
+
+if __name__ == "__main__":
+    test_alignment()
+    test_index_lookup()
+    test_checker_cache()
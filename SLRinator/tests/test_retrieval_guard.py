@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Test per-host circuit breakers and the negative-result cache against a local HTTP server
+"""
+
+import sys
+import os
+import time
+import tempfile
+import threading
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add SLRinator root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.retrieval_guard import (
+    GuardedSession, HostCircuitBreakers, NegativeCache,
+    NOT_FOUND, FORBIDDEN, SERVER_ERROR, TIMEOUT, CIRCUIT_OPEN
+)
+from src.utils.retry_handler import CircuitOpenError
+
+
+class _Handler(BaseHTTPRequestHandler):
+    hits = 0
+
+    def do_GET(self):
+        _Handler.hits += 1
+        status = {"/ok": 200, "/html": 200, "/missing": 404, "/forbidden": 403, "/down": 503}.get(self.path, 404)
+        self.send_response(status)
+        self.end_headers()
+        self.wfile.write(b"%PDF-1.4" if self.path == "/ok" else b"<html>error</html>")
+
+    def log_message(self, *args):
+        pass
+
+
+def test_retrieval_guard():
+    """Dead hosts and known misses are skipped without a request"""
+    print("\n" + "="*60)
+    print("Testing Retrieval Guard")
+    print("="*60)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    try:
+        session = GuardedSession(HostCircuitBreakers(failure_threshold=3, recovery_timeout=60))
+
+        # Error classes seen by an attempt
+        session.begin_attempt()
+        assert session.attempt_failure() is None
+        session.get(f"{base}/ok", timeout=5)
+        assert session.attempt_failure() is None
+        session.begin_attempt()
+        assert session.get(f"{base}/missing", timeout=5).status_code == 404
+        assert session.attempt_failure() == NOT_FOUND
+
+        # A login wall or an HTML page in place of the PDF is not a known miss
+        cache = NegativeCache()
+        session.begin_attempt()
+        assert session.get(f"{base}/forbidden", timeout=5).status_code == 403
+        assert session.attempt_failure() == FORBIDDEN
+        cache.put("heinonline", "cite:573 u.s. 208", session.attempt_failure())
+        session.begin_attempt()
+        assert not session.get(f"{base}/html", timeout=5).content.startswith(b"%PDF")
+        assert session.attempt_failure() is None
+        cache.put("justia", "cite:573 u.s. 208", session.attempt_failure())
+        assert cache.get("heinonline", "cite:573 u.s. 208") is None
+        assert cache.get("justia", "cite:573 u.s. 208") is None
+        print("✓ 403 and 200 non-PDF responses are not cached")
+
+        # Server errors (three in a row open the host's circuit)
+        session.begin_attempt()
+        assert session.get(f"{base}/down", timeout=5).status_code == 503
+        assert session.attempt_failure() == SERVER_ERROR
+        print("✓ Failures classified as not_found / server_error")
+
+        # Two more 5xx open the host's circuit; later calls never reach the server
+        session.get(f"{base}/down", timeout=5)
+        session.get(f"{base}/down", timeout=5)
+        hits = _Handler.hits
+        session.begin_attempt()
+        started = time.perf_counter()
+        try:
+            session.get(f"{base}/ok", timeout=5)
+            raise AssertionError("circuit should be open")
+        except CircuitOpenError:
+            pass
+        elapsed_us = (time.perf_counter() - started) * 1e6
+        assert _Handler.hits == hits
+        assert session.attempt_failure() == CIRCUIT_OPEN
+        assert f"127.0.0.1:{server.server_port}" in session.breakers.open_hosts()
+        print(f"✓ Open circuit skips the host in {elapsed_us:.0f} µs")
+
+        # Unreachable host counts as a timeout
+        session.begin_attempt()
+        try:
+            session.get("http://127.0.0.1:9/", timeout=1)
+        except Exception:
+            pass
+        assert session.attempt_failure() == TIMEOUT
+        print("✓ Refused connection classified as timeout")
+    finally:
+        server.shutdown()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "negative_cache.json"
+        cache = NegativeCache(path, ttls={SERVER_ERROR: 0.2})
+        cache.put("justia", "cite:573 u.s. 208", NOT_FOUND)
+        cache.put("courtlistener", "cite:573 u.s. 208", SERVER_ERROR)
+        cache.put("govinfo", "cite:573 u.s. 208", CIRCUIT_OPEN)   # Breaker's job, not cached
+        cache.put("westlaw", "cite:573 u.s. 208", None)           # Never contacted, not cached
+
+        assert cache.get("justia", "cite:573 u.s. 208")["error_class"] == NOT_FOUND
+        assert cache.get("govinfo", "cite:573 u.s. 208") is None
+        assert cache.get("westlaw", "cite:573 u.s. 208") is None
+        assert cache.get("justia", "usc:35 101") is None
+        print(f"✓ {cache.describe(cache.get('justia', 'cite:573 u.s. 208'))}")
+
+        time.sleep(0.25)
+        assert cache.get("courtlistener", "cite:573 u.s. 208") is None
+        print("✓ Server errors expire sooner than not-found results")
+
+        reloaded = NegativeCache(path)
+        assert reloaded.get("justia", "cite:573 u.s. 208") is not None
+        reloaded.discard("justia", "cite:573 u.s. 208")
+        assert NegativeCache(path).get("justia", "cite:573 u.s. 208") is None
+        print("✓ Entries persist across runs and clear on success")
+
+
+if __name__ == "__main__":
+    test_retrieval_guard()
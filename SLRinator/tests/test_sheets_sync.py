@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test batched Google Sheets sync against the in-memory fake Sheets API
+"""
+
+import sys
+import os
+
+# Add SLRinator root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.integration.sheets_sync import SheetMirror, FakeSheetsService
+from src.integration.google_sheets import SourcepullSpreadsheet
+from src.core.retrieval_framework import RetrievalRecord, CitationComponents, SourceType
+
+COLUMNS = SourcepullSpreadsheet.COLUMNS
+
+
+def _record(footnote: int, party1: str) -> RetrievalRecord:
+    citation = CitationComponents(raw_text=f"{party1} v. United States, 1 U.S. {footnote} (2000)",
+                                  type=SourceType.CASE, party1=party1)
+    record = RetrievalRecord(footnote_number=footnote, citation=citation)
+    record.final_status = "success"
+    record.final_file_path = f"output/data/Sourcepull/SP-{footnote:03d}.pdf"
+    return record
+
+
+def test_batched_sync():
+    """Hundreds of sources and later edits cost a handful of API calls"""
+    print("\n" + "="*60)
+    print("Testing Batched Sheets Sync")
+    print("="*60)
+
+    fake = FakeSheetsService()
+    sheet = SourcepullSpreadsheet(spreadsheet_id="fake", service=fake)
+    assert sheet.initialize_spreadsheet()
+
+    for fn in range(1, 301):
+        sheet.add_source(_record(fn, f"Party{fn}"), "Test System")
+    sheet.mark_source_redboxed("007")
+    sheet.update_physical_location("010", "KF 1 .A2")
+    sheet.sync()
+
+    grid = fake.sheets["Sourcepull"]
+    assert grid[0] == COLUMNS
+    assert len(grid) == 301
+    assert grid[7][COLUMNS.index('Redboxed')] == "Yes"
+    assert grid[10][COLUMNS.index('Physical Location')] == "KF 1 .A2"
+    print(f"✓ 300 sources written with calls: {fake.calls}")
+    assert fake.calls == ['get', 'batchUpdate', 'batchUpdate']
+
+    # Later edits are sent as coalesced cell ranges, not whole rows
+    sheet.mark_source_redboxed("001")
+    sheet.mark_source_redboxed("002")
+    ranges = sheet.mirror.diff()
+    assert [r['range'] for r in ranges] == ["Sourcepull!M2:M2", "Sourcepull!M3:M3"]
+    sheet.sync()
+    assert sheet.sync() == 0  # Nothing left to send
+    assert fake.calls.count('batchUpdate') == 3
+    print("✓ Cell-level diffs flushed in one batchUpdate")
+
+
+def test_resume_from_existing_sheet():
+    """A new session reads the sheet once and continues numbering"""
+    fake = FakeSheetsService({"Sourcepull": [list(COLUMNS), ["001", "1", "Alice"], ["002", "2", "Bob"]]})
+    sheet = SourcepullSpreadsheet(spreadsheet_id="fake", service=fake)
+
+    row = sheet.add_source(_record(3, "Carol"))
+    assert row['Source #'] == "003"
+    sheet.mark_source_redboxed("001")  # Not added in this session
+    sheet.sync()
+
+    grid = fake.sheets["Sourcepull"]
+    assert grid[3][0] == 3    # USER_ENTERED stores "003" as a number
+    assert grid[1][COLUMNS.index('Redboxed')] == "Yes"
+    assert fake.calls == ['get', 'batchUpdate']
+    print("✓ Existing sheet resumed with one read and one write")
+
+
+def test_user_entered_keys():
+    """Source numbers the sheet stored as numbers ("007" -> 7) are still found by their text"""
+    fake = FakeSheetsService()
+    sheet = SourcepullSpreadsheet(spreadsheet_id="fake", service=fake)
+    for fn in range(1, 11):
+        sheet.add_source(_record(fn, f"Party{fn}"))
+    sheet.sync()
+    assert fake.read("Sourcepull!A8")[0][0] == "7"
+
+    later = SourcepullSpreadsheet(spreadsheet_id="fake", service=fake)
+    later.mark_source_redboxed("007")
+    later.update_physical_location("010", "KF 1 .A2")
+    assert later.mirror.row_dict("007")['Short Name'] == later.mirror.row_dict(7)['Short Name']
+    assert later.add_source(_record(11, "Party11"))['Source #'] == "011"
+    assert later.sync() == 3
+
+    grid = fake.sheets["Sourcepull"]
+    assert len(grid) == 12
+    assert grid[7][COLUMNS.index('Redboxed')] == "Yes"
+    assert grid[10][COLUMNS.index('Physical Location')] == "KF 1 .A2"
+    print("✓ Rows keyed by coerced source numbers found and updated in a later session")
+
+
+def test_quota_retry():
+    """429 responses are retried with backoff"""
+    fake = FakeSheetsService()
+    mirror = SheetMirror(fake, "fake", "Sourcepull", COLUMNS, base_delay=0.01).load()
+    mirror.upsert({'Source #': '001', 'Short Name': 'Alice'})
+
+    fake.fail_next = [429, 503]
+    assert mirror.flush() == 1
+    assert fake.calls == ['get', 'batchUpdate', 'batchUpdate', 'batchUpdate']
+    assert fake.sheets["Sourcepull"][1][2] == 'Alice'
+    print("✓ Quota errors retried")
+
+
+def main():
+    test_batched_sync()
+    test_resume_from_existing_sheet()
+    test_user_entered_keys()
+    test_quota_retry()
+    print("\nAll sheets sync tests passed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Test the sourcepull daemon: per-user fair rate limiting, tenant propagation
+into pipeline threads, and documents served from one warm system
+"""
+
+import sys
+import os
+import time
+import tempfile
+import threading
+from pathlib import Path
+
+# Add SLRinator root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.retry_handler import APIRateLimiter, rate_limit_tenant, current_tenant
+from src.core.stage_pipeline import Stage, StagePipeline
+
+
+def test_fair_rate_limiter():
+    """A user arriving later is served in turn, not after the first user's backlog"""
+    print("\n" + "="*60)
+    print("Testing Fair Rate Limiter")
+    print("="*60)
+
+    limiter = APIRateLimiter(calls_per_second=100, burst_size=1)
+    order = []
+
+    def calls(user, count):
+        with rate_limit_tenant(user):
+            for _ in range(count):
+                assert limiter.acquire(timeout=10)
+                order.append(user)
+
+    big = [threading.Thread(target=calls, args=("alice", 10)) for _ in range(3)]
+    for thread in big:
+        thread.start()
+    time.sleep(0.05)
+    small = threading.Thread(target=calls, args=("bob", 3))
+    small.start()
+    for thread in big + [small]:
+        thread.join()
+    last_bob = max(i for i, user in enumerate(order) if user == "bob")
+    assert last_bob < 20, order
+    assert limiter.stats()["granted"] == {"alice": 30, "bob": 3}
+    print(f"✓ Bob's 3 calls done by call #{last_bob + 1} of 33 despite Alice's 30 queued")
+
+    # A timed-out caller leaves the line without blocking the others
+    limiter = APIRateLimiter(calls_per_second=1, burst_size=1)
+    assert limiter.acquire(timeout=0.1)
+    assert not limiter.acquire(timeout=0.05)
+    assert not limiter.stats()["waiting"]
+    print("✓ Timeout returns False and frees the caller's place")
+
+    # Stage workers inherit the tenant of the thread running the pipeline
+    seen = []
+    with rate_limit_tenant("carol"):
+        StagePipeline([Stage("parse", lambda item: seen.append(current_tenant()), workers=3)]).run(range(6))
+    assert seen == ["carol"] * 6
+    print("✓ Pipeline workers make their calls as the job's user")
+
+
+def test_daemon():
+    """Documents submitted over HTTP run on one warm system, each with its own output"""
+    import slrinator_workflow as workflow
+    from sourcepull_daemon import SourcepullDaemon, run_document, request
+    from src.core.sourcepull_queue import DONE
+    from src.core.sourcepull_system import SourcepullSystem, SourcepullResult
+    from src.core.source_identifier import SourceType, CitationComponents
+
+    print("\n" + "="*60)
+    print("Testing Sourcepull Daemon")
+    print("="*60)
+
+    sessions = []
+
+    def retrieve(system, job, logger):
+        sessions.append(system.session)
+        return DONE, SourcepullResult(
+            footnote_number=job.footnote_number, citation_text=job.citation_text,
+            source_type=SourceType.FEDERAL_STATUTE, components=CitationComponents(),
+            retrieval_attempts=[], final_status="success", reasoning="test"
+        ).to_dict()
+
+    cwd = os.getcwd()
+    originals = (workflow.extract_footnotes_from_docx, workflow.retrieve_source)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        workflow.extract_footnotes_from_docx = lambda path: {n: f"{n} U.S.C. § {100 + n} (2018)." for n in range(1, 6)}
+        workflow.retrieve_source = retrieve
+        try:
+            for name in ("first.docx", "second.docx"):
+                Path(name).write_bytes(b"")
+            system = SourcepullSystem(config_path=os.path.join(tmp, "missing.json"))
+            daemon = SourcepullDaemon(run_document(system), max_jobs=2)
+            daemon.bind(port=0)
+            port = daemon.server.server_address[1]
+            threading.Thread(target=daemon.serve_forever, daemon=True).start()
+
+            statuses = [request("POST", "/jobs", {"docx": name, "user": user, "use_gpt": False,
+                                                  "output": "out"}, port=port)[0]
+                        for name, user in (("first.docx", "alice"), ("second.docx", "bob"))]
+            assert statuses == [202, 202], statuses
+            assert request("POST", "/jobs", {"docx": "nope.docx"}, port=port)[0] == 400
+
+            deadline = time.time() + 30
+            while daemon.queue.counts()["done"] + daemon.queue.counts()["failed"] < 2 and time.time() < deadline:
+                time.sleep(0.05)
+            _, body = request("GET", "/jobs", port=port)
+            jobs = body["jobs"]
+            assert [job["state"] for job in jobs] == ["done", "done"], jobs
+            assert all(job["result"]["successful_retrievals"] == 5 for job in jobs)
+            assert Path("out/first/sourcepull_report.json").exists() and Path("out/second/sourcepull_report.json").exists()
+            assert len(sessions) == 10 and all(session is system.session for session in sessions)
+            _, status = request("GET", "/status", port=port)
+            assert status["jobs"]["done"] == 2 and "rate_limiters" in status
+            print("✓ Two documents from two users served by one warm session, reports kept apart")
+
+            daemon.server.shutdown()
+            daemon.close()
+        finally:
+            workflow.extract_footnotes_from_docx, workflow.retrieve_source = originals
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    test_fair_rate_limiter()
+    test_daemon()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Test the durable sourcepull queue: resumption, leases and several worker processes
+"""
+
+import sys
+import os
+import time
+import tempfile
+import multiprocessing
+from pathlib import Path
+
+# Add SLRinator root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.sourcepull_queue import (
+    SourcepullQueue, enqueue_citations, queued_results, queue_report,
+    DONE, MANUAL, FAILED, PENDING, IN_FLIGHT
+)
+from src.core.sourcepull_system import SourcepullSystem, SourcepullResult, RetrievalAttempt
+from src.core.source_identifier import SourceType, CitationComponents
+
+
+def _result(footnote_number: int, citation_text: str, worker: str) -> dict:
+    return SourcepullResult(
+        footnote_number=footnote_number,
+        citation_text=citation_text,
+        source_type=SourceType.SUPREME_COURT,
+        components=CitationComponents(volume="573", reporter="U.S.", page="208"),
+        retrieval_attempts=[RetrievalAttempt(source="courtlistener", timestamp="t", success=True,
+                                             message=worker, duration=0.01)],
+        final_status="success",
+        reasoning="test"
+    ).to_dict()
+
+
+def _drain_worker(db_path: str, worker_id: str):
+    def handle(job):
+        time.sleep(0.01)
+        return DONE, _result(job.footnote_number, job.citation_text, worker_id)
+    SourcepullQueue(Path(db_path)).drain(handle, worker_id=worker_id)
+
+
+def test_sourcepull_queue():
+    """Jobs survive interruption, are never finished twice, and report at any time"""
+    print("\n" + "="*60)
+    print("Testing Sourcepull Queue")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "article.queue.db"
+        queue = SourcepullQueue(db_path, max_attempts=2)
+
+        jobs = [(f"cite:{n}", n, f"Citation {n}", {}) for n in range(1, 41)]
+        assert queue.enqueue(jobs) == 40
+        assert queue.enqueue(jobs) == 0
+        assert [j.job_id for j in queue.jobs()] == list(range(1, 41))
+        print("✓ Enqueueing the same input twice adds nothing")
+
+        # A worker stops after two citations (Ctrl-C); nothing it finished is redone
+        done = []
+
+        def interrupted(job):
+            if len(done) == 2:
+                raise KeyboardInterrupt
+            done.append(job.footnote_number)
+            return DONE, _result(job.footnote_number, job.citation_text, "first")
+        try:
+            queue.drain(interrupted, worker_id="first")
+        except KeyboardInterrupt:
+            pass
+        counts = queue.counts()
+        assert counts[DONE] == 2 and counts[PENDING] == 38 and counts[IN_FLIGHT] == 0
+        assert queue.jobs((PENDING,))[0].attempts == 0  # Released without using an attempt
+        print("✓ Interrupted run keeps finished citations and releases the current one")
+
+        # A worker that dies holding a lease: its job is reclaimed once the lease expires
+        crashed = queue.claim("crashed", lease_seconds=0.2)
+        assert queue.claim("other", lease_seconds=60).job_id != crashed.job_id
+        time.sleep(0.3)
+        reclaimed = queue.claim("other", lease_seconds=60)
+        assert reclaimed.job_id == crashed.job_id and reclaimed.attempts == 2
+        assert not queue.complete(crashed, DONE, {})  # Stale owner cannot overwrite
+        assert queue.complete(reclaimed, MANUAL, _result(reclaimed.footnote_number, "x", "other"))
+        print("✓ Expired lease is reclaimed; the stale worker's write is rejected")
+
+        # Several processes drain the rest; each job is finished exactly once
+        queue.requeue((IN_FLIGHT,))
+        processes = [multiprocessing.Process(target=_drain_worker, args=(str(db_path), f"w{i}"))
+                     for i in range(4)]
+        for p in processes:
+            p.start()
+        for p in processes:
+            p.join(timeout=60)
+        counts = queue.counts()
+        assert counts[PENDING] == 0 and counts[IN_FLIGHT] == 0
+        assert counts[DONE] + counts[MANUAL] == 40
+        workers = {r.retrieval_attempts[0].message for r in queued_results(queue)}
+        assert all(j.attempts <= 2 for j in queue.jobs())
+        print(f"✓ 4 processes drained the queue ({len(workers & {'w0', 'w1', 'w2', 'w3'})} took jobs)")
+
+        # Errors are retried up to max_attempts, then the job is marked failed
+        queue.enqueue([("cite:bad", 99, "Bad citation", {})])
+
+        def broken(job):
+            raise ValueError("unparseable")
+        queue.drain(broken, worker_id="w")
+        bad = queue.jobs((FAILED,))[0]
+        assert bad.attempts == 2 and "unparseable" in bad.error
+        print(f"✓ Failing citation given up after {bad.attempts} attempts: {bad.error}")
+
+    # Repeats of a source are one job; the report is built from the queue alone
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            system = SourcepullSystem(config_path=os.path.join(tmp, "missing.json"))
+            queue = SourcepullQueue(Path(tmp) / "doc.queue.db")
+            added = enqueue_citations(queue, system, [
+                (1, "Alice Corp. v. CLS Bank Int'l, 573 U.S. 208, 216 (2014)", {}),
+                (2, "35 U.S.C. § 101 (2018)", {}),
+                (3, "Alice Corp. v. CLS Bank Int'l, 573 U.S. 208, 221 (2014)", {}),
+            ])
+            assert added == 2
+            assert queue.jobs()[0].payload["repeats"][0]["footnote"] == 3
+
+            # Queued a footnote at a time: later citations still join the first job
+            assert enqueue_citations(queue, system, [(4, "Alice Corp. v. CLS Bank Int'l, 573 U.S. 208, 225 (2014)", {})]) == 0
+            assert enqueue_citations(queue, system, [(4, "Alice Corp. v. CLS Bank Int'l, 573 U.S. 208, 225 (2014)", {})]) == 0
+            assert [r["footnote"] for r in queue.jobs()[0].payload["repeats"]] == [3, 4]
+
+            job = queue.claim("w")
+            queue.complete(job, DONE, _result(job.footnote_number, job.citation_text, "w"))
+            report = queue_report(queue, system)
+            assert report["summary"]["total_sources"] == 3  # FN1 and its repeats FN3, FN4
+            assert report["queue"]["remaining"] == 1
+            assert report["deduplication"]["reused_retrievals"] == 2
+            restored = queued_results(queue)[1]
+            assert restored.footnote_number == 3 and restored.reused_from == 1
+            assert restored.source_type == SourceType.SUPREME_COURT
+            print("✓ Mid-run report from queue state (repeat citations share one job)")
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    test_sourcepull_queue()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test the master sheet round trip: stage results written in one session are
+read back by openpyxl and by SpreadsheetManager's own loaders
+"""
+
+import sys
+import os
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+import openpyxl
+
+# Add SLRinator root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.stage1 import spreadsheet_manager
+from src.stage1.spreadsheet_manager import SpreadsheetManager
+
+
+def _make_master_sheet(path: Path):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = 'Sourcepull'
+    ws.append(['Source ID', 'Short Name', 'Full Citation', 'Completed?', 'Location',
+               'File Name', 'Problems/Comments', 'Retrieved Date', 'Source Type'])
+    ws.append([1, 'Alice', 'Alice Corp. v. CLS Bank Int\'l, 573 U.S. 208 (2014).', 'No'])
+    ws.append([2.0, 'Bilski', 'Bilski v. Kappos, 561 U.S. 593 (2010).', ''])
+    ws.append(['003', 'Mayo', 'Mayo Collaborative Servs. v. Prometheus Labs., 566 U.S. 66 (2012).', 'Yes'])
+    wb.save(path)
+
+
+def _sourcepull_result(source_id, status, file_path=None, message=''):
+    citation = SimpleNamespace(source_id=source_id, type=SimpleNamespace(value='case'))
+    result = SimpleNamespace(status=SimpleNamespace(value=status), file_path=file_path, message=message)
+    return citation, result
+
+
+def test_round_trip():
+    """Every stage's results land in the workbook with one save and read back"""
+    print("\n" + "="*60)
+    print("Testing Master Sheet Round Trip")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        master = tmp / 'master.xlsx'
+        _make_master_sheet(master)
+        pdf = tmp / 'SP-001.pdf'
+        pdf.write_bytes(b'%PDF-1.4')
+        manager = SpreadsheetManager({'paths': {'master_sheet': str(master)}})
+
+        # Reads use pandas' default engine and dtypes unless asked otherwise
+        calls = []
+        original = spreadsheet_manager.pd.read_excel
+        spreadsheet_manager.pd.read_excel = lambda *args, **kwargs: calls.append(kwargs) or original(*args, **kwargs)
+        try:
+            citations = manager.load_sourcepull_citations()
+        finally:
+            spreadsheet_manager.pd.read_excel = original
+        assert 'engine' not in calls[0] and 'dtype_backend' not in calls[0]
+        assert [(source_id, name) for _, source_id, name in citations] == [('001', 'Alice'), ('002', 'Bilski')]
+        print("✓ Default reader used; numeric and padded source IDs load alike")
+
+        saves = []
+        original_save = openpyxl.Workbook.save
+        openpyxl.Workbook.save = lambda wb, path: saves.append(path) or original_save(wb, path)
+        try:
+            assert manager.apply_stage_results(
+                sourcepull_results=[_sourcepull_result('001', 'success', str(pdf)),
+                                    _sourcepull_result('002', 'manual_required', message='Paywalled')],
+                citechecking_results={1: [{'footnote_num': 4, 'citations': [
+                    {'source_id': '001', 'supported': 'Yes', 'page_found': 216},
+                    {'source_id': '002', 'supported': 'No', 'issues': ['pin cite', 'parenthetical']}]}]},
+                bluebook_violations=[{'footnote_num': 4, 'citation': 'Alice', 'type': 'case name',
+                                      'issue': 'Int\'l not abbreviated', 'severity': 'High'}]
+            )
+        finally:
+            openpyxl.Workbook.save = original_save
+        assert len(saves) == 1
+        print("✓ Sourcepull, citechecking, Bluebook and summary applied with one save")
+
+        wb = openpyxl.load_workbook(master)
+        sourcepull = [row[:9] for row in wb['Sourcepull'].iter_rows(min_row=2, values_only=True)]
+        assert sourcepull[0][3] == 'Yes' and sourcepull[0][5] == 'SP-001.pdf' and sourcepull[0][8] == 'case'
+        assert sourcepull[1][3] == 'No' and sourcepull[1][6] == 'Paywalled'
+        assert sourcepull[2][3] == 'Yes' and sourcepull[2][7] is None
+        cc = list(wb['CC_Round1'].iter_rows(min_row=2, values_only=True))
+        assert [(row[0], row[2], row[4]) for row in cc] == [(4, '001', 'Yes'), (4, '002', 'No')]
+        assert cc[0][8] == '216' and cc[1][5] == 'pin cite, parenthetical'
+        assert list(wb['Bluebook_Check'].iter_rows(min_row=2, values_only=True))[0][3] == 'Int\'l not abbreviated'
+        summary = {row[0]: row[1] for row in wb['Summary'].iter_rows(values_only=True) if row[0]}
+        assert wb.sheetnames[0] == 'Summary' and summary['Completed'] == 2 and summary['Round 1 Supported'] == 1
+        wb.close()
+        print("✓ Written values read back with openpyxl")
+
+        assert [source_id for _, source_id, _ in manager.load_sourcepull_citations()] == ['002']
+        assert list(manager.load_citechecking_data(1)['Supported?']) == ['Yes', 'No']
+        print("✓ Retrieved sources skipped and CC results loaded on the next read")
+
+        # A failing stage leaves the file as it was
+        before = master.read_bytes()
+        bad = (SimpleNamespace(source_id='001', type=None), None)
+        assert not manager.apply_stage_results(sourcepull_results=[bad], create_summary=True)
+        assert master.read_bytes() == before
+        print("✓ Failed update leaves the workbook untouched")
+
+
+if __name__ == "__main__":
+    test_round_trip()
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Test the staged pipeline: overlapping stages, backpressure, errors, and the
+streaming workflow's footnote-ordered queueing
+"""
+
+import sys
+import os
+import time
+import tempfile
+import threading
+from pathlib import Path
+
+# Add SLRinator root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.stage_pipeline import Stage, StagePipeline
+
+
+def _sleeper(seconds: float):
+    def handle(item):
+        time.sleep(seconds)
+        return [item]
+    return handle
+
+
+def test_stage_pipeline():
+    """Stages overlap, bounded queues hold back fast stages, errors stay local"""
+    print("\n" + "="*60)
+    print("Testing Stage Pipeline")
+    print("="*60)
+
+    # Three 20 ms stages over 20 items: 1.2 s in phases, ~0.45 s streamed
+    pipeline = StagePipeline([
+        Stage("extract", _sleeper(0.02)),
+        Stage("parse", _sleeper(0.02)),
+        Stage("retrieve", _sleeper(0.02)),
+    ])
+    summary = pipeline.run(range(20))
+    assert [s["processed"] for s in summary["stages"]] == [20, 20, 20]
+    assert summary["elapsed_seconds"] < 0.8, summary["elapsed_seconds"]
+    assert summary["first_result_seconds"] < 0.2
+    print(f"✓ Stages overlap: {summary['elapsed_seconds']:.2f}s vs 1.2s phased, "
+          f"first result after {summary['first_result_seconds']:.2f}s")
+
+    # A slow stage with more workers stops being the bottleneck
+    summary = StagePipeline([
+        Stage("parse", _sleeper(0.01)),
+        Stage("retrieve", _sleeper(0.05), workers=5),
+    ]).run(range(20))
+    assert summary["elapsed_seconds"] < 0.6, summary["elapsed_seconds"]
+    print(f"✓ 5 retrieval workers: {summary['elapsed_seconds']:.2f}s vs 1.0s with one")
+
+    # Backpressure: a fast producer never runs more than the queues ahead of a slow consumer
+    read = []
+
+    def source():
+        for n in range(30):
+            read.append(n)
+            yield n
+    lead = []
+
+    def slow(item):
+        lead.append(len(read) - item)
+        time.sleep(0.01)
+    pipeline = StagePipeline([Stage("fast", lambda item: [item], capacity=2),
+                              Stage("slow", slow, capacity=2)])
+    pipeline.run(source())
+    assert max(lead) <= 7, max(lead)
+    assert all(s["max_queued"] <= 2 for s in pipeline.summary()["stages"])
+    print(f"✓ Backpressure: producer at most {max(lead)} items ahead with queues of 2")
+
+    # A failing item is recorded; the rest still flow
+    def picky(item):
+        if item == 3:
+            raise ValueError("bad footnote")
+        return [item]
+    collected = []
+    summary = StagePipeline([Stage("parse", picky), Stage("collect", collected.append)]).run(range(6))
+    assert sorted(collected) == [0, 1, 2, 4, 5] and summary["errors"] == 1
+    print(f"✓ Error in one item: {summary['stages'][0]['errors']} recorded, 5 items through")
+
+    # Injected work (an interrupted run's leftovers) goes straight to its stage
+    collected = []
+    StagePipeline([Stage("parse", lambda item: [item * 10], workers=2),
+                   Stage("collect", collected.append, workers=3)]).run(range(3), {"collect": ["left"]})
+    assert sorted(collected, key=str) == [0, 10, 20, "left"]
+    print("✓ Leftover work injected into a later stage")
+
+
+def test_streaming_workflow():
+    """Parsed batches finishing out of order are still queued in footnote order"""
+    import slrinator_workflow as workflow
+    from src.core.sourcepull_queue import SourcepullQueue, DONE
+    from src.core.sourcepull_system import SourcepullSystem, SourcepullResult
+    from src.core.source_identifier import SourceType, CitationComponents
+
+    footnotes = {n: f"{n} U.S.C. § {100 + n} (2018)." for n in range(1, 31)}
+    footnotes[25] = "Title 1 U.S.C. § 101 (2018)."   # Repeat of footnote 1's source
+    retrieved = []
+    lock = threading.Lock()
+
+    def retrieve(system, job, logger):
+        time.sleep(0.02)
+        with lock:
+            retrieved.append((time.perf_counter(), job.job_id))
+        return DONE, SourcepullResult(
+            footnote_number=job.footnote_number, citation_text=job.citation_text,
+            source_type=SourceType.FEDERAL_STATUTE, components=CitationComponents(),
+            retrieval_attempts=[], final_status="success", reasoning="test"
+        ).to_dict()
+
+    cwd = os.getcwd()
+    originals = (workflow.extract_footnotes_from_docx, workflow.retrieve_source)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        workflow.extract_footnotes_from_docx = lambda path: dict(footnotes)
+        workflow.retrieve_source = retrieve
+        try:
+            system = SourcepullSystem(config_path=os.path.join(tmp, "missing.json"))
+            queue = SourcepullQueue(Path(tmp) / "doc.queue.db")
+            settings = workflow.StreamSettings(parse_workers=3, parse_batch=4, retrieve_workers=3, queue_size=4)
+            started = time.perf_counter()
+            statistics = workflow.stream_document(queue, system, "doc.docx", None, False, tmp,
+                                                  60, settings, workflow.logging.getLogger("test"))
+            jobs = queue.jobs()
+            assert [j.footnote_number for j in jobs] == [n for n in range(1, 31) if n != 25]
+            assert jobs[0].payload["repeats"][0]["footnote"] == 25
+            assert all(j.state == DONE for j in jobs) and len(retrieved) == 29
+            assert statistics["footnote_range"] == "all" and statistics["total_footnotes"] == 30
+            first = min(t for t, _ in retrieved) - started
+            print(f"✓ 30 footnotes streamed: SP numbers in footnote order, first source after {first:.2f}s, "
+                  f"bottleneck {statistics['pipeline']['bottleneck']}")
+
+            # Resumed run: nothing parsed again, nothing retrieved twice
+            statistics = workflow.stream_document(queue, system, "doc.docx", None, False, tmp,
+                                                  60, settings, workflow.logging.getLogger("test"), parse=False)
+            assert len(retrieved) == 29 and statistics["total_footnotes"] == 30
+            print("✓ Resumed run retrieves nothing twice")
+        finally:
+            workflow.extract_footnotes_from_docx, workflow.retrieve_source = originals
+            os.chdir(cwd)
+
+
+def test_failed_parse_batch():
+    """A batch that fails to parse does not hold back the batches after it"""
+    import slrinator_workflow as workflow
+    from src.core.sourcepull_queue import SourcepullQueue, DONE
+    from src.core.sourcepull_system import SourcepullSystem, SourcepullResult
+    from src.core.source_identifier import SourceType, CitationComponents
+
+    def retrieve(system, job, logger):
+        return DONE, SourcepullResult(
+            footnote_number=job.footnote_number, citation_text=job.citation_text,
+            source_type=SourceType.FEDERAL_STATUTE, components=CitationComponents(),
+            retrieval_attempts=[], final_status="success", reasoning="test"
+        ).to_dict()
+
+    parse_batch = workflow.CascadingCitationParser.parse_footnotes_batch
+
+    def failing_parse(parser, batch):
+        if 5 in batch:
+            raise RuntimeError("parser crashed")
+        return parse_batch(parser, batch)
+
+    cwd = os.getcwd()
+    originals = (workflow.extract_footnotes_from_docx, workflow.retrieve_source)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        workflow.extract_footnotes_from_docx = lambda path: {n: f"{n} U.S.C. § {100 + n} (2018)." for n in range(1, 13)}
+        workflow.retrieve_source = retrieve
+        workflow.CascadingCitationParser.parse_footnotes_batch = failing_parse
+        try:
+            system = SourcepullSystem(config_path=os.path.join(tmp, "missing.json"))
+            queue = SourcepullQueue(Path(tmp) / "doc.queue.db")
+            settings = workflow.StreamSettings(parse_workers=2, parse_batch=4, retrieve_workers=2, queue_size=2)
+            statistics = workflow.stream_document(queue, system, "doc.docx", None, False, tmp,
+                                                  60, settings, workflow.logging.getLogger("test"))
+            assert [j.footnote_number for j in queue.jobs()] == [1, 2, 3, 4, 9, 10, 11, 12]
+            assert all(j.state == DONE for j in queue.jobs())
+            assert "footnote_range" not in statistics   # Parsed again on the next run
+            print("✓ Failed parse batch skipped; the batches after it are still queued and retrieved")
+        finally:
+            workflow.CascadingCitationParser.parse_footnotes_batch = parse_batch
+            workflow.extract_footnotes_from_docx, workflow.retrieve_source = originals
+            os.chdir(cwd)
+
+
+
+def test_changed_document():
+    """An edited document is parsed again instead of resuming the old queue"""
+    import slrinator_workflow as workflow
+    from src.core.sourcepull_queue import SourcepullQueue, DONE
+    from src.core.sourcepull_system import SourcepullSystem, SourcepullResult
+    from src.core.source_identifier import SourceType, CitationComponents
+
+    def retrieve(system, job, logger):
+        return DONE, SourcepullResult(
+            footnote_number=job.footnote_number, citation_text=job.citation_text,
+            source_type=SourceType.FEDERAL_STATUTE, components=CitationComponents(),
+            retrieval_attempts=[], final_status="success", reasoning="test"
+        ).to_dict()
+
+    footnotes = {n: f"{n} U.S.C. § {100 + n} (2018)." for n in range(1, 4)}
+    extracted = []
+
+    def extract(path):
+        extracted.append(path)
+        return dict(footnotes)
+
+    cwd = os.getcwd()
+    originals = (workflow.extract_footnotes_from_docx, workflow.retrieve_source)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        workflow.extract_footnotes_from_docx = extract
+        workflow.retrieve_source = retrieve
+        try:
+            system = SourcepullSystem(config_path=os.path.join(tmp, "missing.json"))
+            settings = workflow.StreamSettings(redbox=False)
+            Path("article.docx").write_bytes(b"first draft")
+            workflow.process_document("article.docx", use_gpt=False, output_dir="out", settings=settings, system=system)
+            workflow.process_document("article.docx", use_gpt=False, output_dir="out", settings=settings, system=system)
+            assert len(extracted) == 1
+            print("✓ Unchanged document resumes without parsing again")
+
+            Path("article.docx").write_bytes(b"second draft")
+            footnotes.pop(2)
+            footnotes[4] = "35 U.S.C. § 101 (2018)."
+            report = workflow.process_document("article.docx", use_gpt=False, output_dir="out",
+                                               settings=settings, system=system)
+            queue = SourcepullQueue(Path("out") / "article.queue.db")
+            assert len(extracted) == 2
+            assert [j.citation_text for j in queue.jobs()] == [footnotes[1], footnotes[3], footnotes[4]]
+            assert [j.job_id for j in queue.jobs()] == [1, 2, 3]
+            assert report["statistics"]["total_footnotes"] == 3 and report["queue"]["remaining"] == 0
+            assert queue.get_meta("document_hash") == workflow.document_hash("article.docx")
+            print("✓ Edited document resets the queue and is parsed again")
+        finally:
+            workflow.extract_footnotes_from_docx, workflow.retrieve_source = originals
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    test_stage_pipeline()
+    test_streaming_workflow()
+    test_failed_parse_batch()
+    test_changed_document()
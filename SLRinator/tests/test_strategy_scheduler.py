@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test adaptive retrieval strategy ordering learned from attempt history
+"""
+
+import sys
+import os
+import json
+import random
+import tempfile
+from pathlib import Path
+
+# Add SLRinator root to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.core.strategy_scheduler import StrategyScheduler, retrieval_context
+
+HANDBOOK_ORDER = ["supreme_court_website", "courtlistener", "justia", "google_scholar"]
+
+# Simulated sources: (success probability, seconds per attempt) per reporter
+SOURCES = {
+    "u.s.": {"supreme_court_website": (0.3, 6.0), "courtlistener": (0.9, 1.0),
+             "justia": (0.8, 2.0), "google_scholar": (0.2, 4.0)},
+    "f.3d": {"supreme_court_website": (0.0, 3.0), "courtlistener": (0.4, 1.0),
+             "justia": (0.9, 1.5), "google_scholar": (0.2, 4.0)},
+}
+
+
+def _time_to_pdf(order, reporter, rng):
+    """Simulated seconds until the first success (or all strategies exhausted)"""
+    elapsed = 0.0
+    for strategy in order:
+        p, seconds = SOURCES[reporter][strategy]
+        elapsed += seconds
+        if rng.random() < p:
+            break
+    return elapsed
+
+
+def test_scheduler():
+    """Learned ordering beats the static order and survives a restart"""
+    print("\n" + "="*60)
+    print("Testing Strategy Scheduler")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        history = Path(tmp) / "retrieval_history.jsonl"
+        scheduler = StrategyScheduler(history, relearn_every=10)
+
+        # No history: the handbook order is used unchanged
+        assert scheduler.order("supreme_court", "u.s.", HANDBOOK_ORDER) == HANDBOOK_ORDER
+        print("✓ Empty history keeps the static order")
+
+        rng = random.Random(7)
+        for _ in range(200):
+            reporter = rng.choice(sorted(SOURCES))
+            for strategy in HANDBOOK_ORDER:
+                p, seconds = SOURCES[reporter][strategy]
+                success = rng.random() < p
+                scheduler.record("supreme_court", reporter, strategy, success, seconds)
+                if success:
+                    break
+
+        learned_us = scheduler.order("supreme_court", "u.s.", HANDBOOK_ORDER)
+        learned_f3d = scheduler.order("supreme_court", "f.3d", HANDBOOK_ORDER)
+        print(f"  U.S. order:  {learned_us}")
+        print(f"  F.3d order:  {learned_f3d}")
+        assert learned_us[0] == "courtlistener"
+        assert learned_f3d[0] == "justia"
+        assert learned_f3d[-1] == "supreme_court_website"
+
+        for reporter, learned in (("u.s.", learned_us), ("f.3d", learned_f3d)):
+            static = sum(_time_to_pdf(HANDBOOK_ORDER, reporter, random.Random(i)) for i in range(500))
+            adaptive = sum(_time_to_pdf(learned, reporter, random.Random(i)) for i in range(500))
+            print(f"✓ {reporter}: mean time-to-PDF {static / 500:.2f}s -> {adaptive / 500:.2f}s")
+            assert adaptive < static
+
+        # A new process learns the same order from the history file
+        restarted = StrategyScheduler(history)
+        assert restarted.order("supreme_court", "u.s.", HANDBOOK_ORDER) == learned_us
+        print("✓ History reloaded after restart")
+
+        # Unseen context backs off to the source type's overall statistics
+        assert restarted.order("supreme_court", "s.ct.", HANDBOOK_ORDER)[0] in ("courtlistener", "justia")
+        print("✓ Unseen reporter falls back to type-level estimates")
+
+    assert retrieval_context("F. Supp. 2d", "D. Del.") == "f.supp.2d"
+    assert retrieval_context(None, None) is None
+
+
+def test_history_compaction():
+    """The history file is cut back to the retained attempts instead of growing forever"""
+    print("\n" + "="*60)
+    print("Testing Strategy History Compaction")
+    print("="*60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        history = Path(tmp) / "retrieval_history.jsonl"
+        scheduler = StrategyScheduler(history, max_history=10)
+        for i in range(45):
+            scheduler.record("supreme_court", "u.s.", "justia", i % 2 == 0, 1.0, timestamp=str(i))
+            assert len(history.read_text().splitlines()) < 20
+
+        kept = [json.loads(line)["timestamp"] for line in history.read_text().splitlines()]
+        assert kept[-10:] == [str(i) for i in range(35, 45)]
+        assert not (Path(tmp) / "retrieval_history.tmp").exists()
+        print(f"✓ 45 attempts recorded, {len(kept)} lines on disk")
+
+        restarted = StrategyScheduler(history, max_history=10)
+        assert [entry["timestamp"] for entry in restarted._history] == [str(i) for i in range(35, 45)]
+        print("✓ Restart loads the most recent attempts")
+
+
+if __name__ == "__main__":
+    test_scheduler()
+    test_history_compaction()
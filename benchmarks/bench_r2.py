@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Run the R2 pipeline over a synthetic article against the mock OpenAI server
+and write its metrics as JSON.
+
+Started by run_benchmarks.py in its own process with OPENAI_BASE_URL pointing
+at the mock; settings are redirected to the synthetic inputs and a scratch
+output directory before main.py is imported.
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+R2_ROOT = BENCH_DIR.parent / "r2_pipeline"
+sys.path.insert(0, str(BENCH_DIR))
+sys.path.insert(0, str(R2_ROOT))
+
+from metrics import StageTimer, peak_rss_mb  # noqa: E402
+
+# Pipeline methods timed per call, by stage name
+STAGES = {
+    "_extract_citations_from_word": "extract_footnotes",
+    "_process_single_citation": "citation",
+    "_find_r1_pdf_for_citation": "find_r1_pdf",
+    "_process_r1_pdf": "pdf_processing",
+    "_validate_with_reuse": "citation_validation",
+    "_apply_citation_result": "apply_result",
+    "_save_outputs": "save_outputs",
+}
+
+
+def configure(inputs: dict, workdir: Path):
+    """Point config.settings at the synthetic inputs before any pipeline module reads it."""
+    from config import settings
+
+    output = workdir / "output"
+    settings.OUTPUT_DIR = output
+    settings.R2_PDF_DIR = output / "r2_pdfs"
+    settings.LOG_DIR = output / "logs"
+    settings.REPORT_DIR = output / "reports"
+    settings.CACHE_DIR = output / "cache"
+    settings.OCR_CACHE_DIR = settings.CACHE_DIR / "ocr"
+    for path in (settings.R2_PDF_DIR, settings.LOG_DIR, settings.REPORT_DIR, settings.OCR_CACHE_DIR):
+        path.mkdir(parents=True, exist_ok=True)
+
+    settings.WORD_DOC_PATH = Path(inputs["word_doc"])
+    settings.R1_PDF_DIR = Path(inputs["r1_pdf_dir"])
+    settings.SPREADSHEET_PATH = Path(inputs["spreadsheet"])
+    settings.OPENAI_API_KEY = "sk-bench"
+    settings.VECTOR_STORE_CACHE = workdir / "no_vector_store.json"  # Plain chat completions, no assistant
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--inputs", type=Path, required=True, help="JSON with word_doc, r1_pdf_dir, spreadsheet")
+    parser.add_argument("--workdir", type=Path, required=True)
+    parser.add_argument("--workers", type=int, default=5)
+    parser.add_argument("--out", type=Path, required=True, help="Where to write the metrics JSON")
+    args = parser.parse_args()
+
+    configure(json.loads(args.inputs.read_text()), args.workdir)
+    import main as r2_main
+
+    timer = StageTimer()
+    pipeline = r2_main.R2Pipeline(batch_name="benchmark")
+    for attr, stage in STAGES.items():
+        timer.wrap(pipeline, attr, stage)
+    timer.wrap(pipeline.support_checker, "check_support", "support_check")
+    timer.wrap(pipeline.quote_verifier, "verify_quote", "quote_verification")
+    timer.wrap(r2_main.R2Generator, "save_r2_pdf", "r2_pdf_write")
+
+    started = time.perf_counter()
+    pipeline.run(parallel=args.workers > 1, max_workers=args.workers, incremental=False)
+    elapsed = time.perf_counter() - started
+
+    citations = len(pipeline.full_log)
+    llm = pipeline.llm.get_stats()
+    args.out.write_text(json.dumps({
+        "pipeline": "r2",
+        "citations": citations,
+        "elapsed_s": round(elapsed, 3),
+        "citations_per_min": round(citations / elapsed * 60, 1) if elapsed else 0.0,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "stages": timer.summary(),
+        "llm": {"calls": llm["total_calls"], "tokens": llm["total_tokens"],
+                "tokens_per_citation": round(llm["total_tokens"] / max(citations, 1), 1)},
+        "needs_review": len(pipeline.human_review_queue),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Run SLRinator's SourcepullSystem over synthetic citations against the mock
+CourtListener/GovInfo server and write its metrics as JSON.
+
+Started by run_benchmarks.py in its own process (SLRinator and r2_pipeline
+both have a top-level ``src`` package, and each pipeline gets its own peak RSS).
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from requests.adapters import HTTPAdapter
+
+BENCH_DIR = Path(__file__).resolve().parent
+SLRINATOR_ROOT = BENCH_DIR.parent / "SLRinator"
+sys.path.insert(0, str(BENCH_DIR))
+sys.path.insert(0, str(SLRINATOR_ROOT))
+
+from metrics import StageTimer, peak_rss_mb  # noqa: E402
+from synthetic import make_footnotes, sourcepull_citations  # noqa: E402
+
+
+class LocalRoute(HTTPAdapter):
+    """Sends every request to the mock server as /<host>/<path>, keeping the original URL in the breaker's view."""
+
+    def __init__(self, base_url: str):
+        super().__init__()
+        self.base_url = base_url.rstrip("/")
+
+    def send(self, request, **kwargs):
+        scheme, _, rest = request.url.partition("://")
+        request.url = f"{self.base_url}/{rest}"
+        return super().send(request, **kwargs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--footnotes", type=int, required=True)
+    parser.add_argument("--seed", type=int, default=78)
+    parser.add_argument("--sources-url", required=True)
+    parser.add_argument("--workdir", type=Path, required=True)
+    parser.add_argument("--out", type=Path, required=True, help="Where to write the metrics JSON")
+    args = parser.parse_args()
+
+    args.workdir.mkdir(parents=True, exist_ok=True)
+    os.chdir(args.workdir)  # SourcepullSystem writes under ./output
+    config = args.workdir / "api_keys.json"
+    config.write_text(json.dumps({
+        "courtlistener": {"enabled": True, "token": "bench"},
+        "govinfo": {"enabled": True, "api_key": "bench"},
+    }))
+
+    from src.core.sourcepull_system import SourcepullSystem
+
+    timer = StageTimer()
+    system = SourcepullSystem(config_path=str(config))
+    route = LocalRoute(args.sources_url)
+    system.session.mount("https://", route)
+    system.session.mount("http://", route)
+    timer.wrap(system.identifier, "identify", "identify")
+
+    citations = sourcepull_citations(make_footnotes(args.footnotes, args.seed))
+    results = []
+    started = time.perf_counter()
+    for footnote_number, text in citations:
+        with timer.stage("citation"):
+            result = system.process_citation(footnote_number, text)
+        results.append(result)
+        for attempt in result.retrieval_attempts:
+            if attempt.duration is not None:
+                timer.record(f"strategy.{attempt.source}", attempt.duration)
+    elapsed = time.perf_counter() - started
+
+    report = system.generate_report(results)
+    args.out.write_text(json.dumps({
+        "pipeline": "sourcepull",
+        "citations": len(citations),
+        "elapsed_s": round(elapsed, 3),
+        "citations_per_min": round(len(citations) / elapsed * 60, 1) if elapsed else 0.0,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "stages": timer.summary(),
+        "outcomes": report.get("summary", {}),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Stage timers and resource measurements shared by the benchmark runners.
+"""
+import sys
+import math
+import time
+import resource
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, List
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile; 0.0 for no samples"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process (ru_maxrss is bytes on macOS, KB on Linux)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class StageTimer:
+    """Collects wall-clock samples per pipeline stage; safe to use from worker threads."""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            self.samples.setdefault(stage, []).append(seconds)
+
+    @contextmanager
+    def stage(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def wrap(self, obj, attr: str, stage: str):
+        """Replace obj.attr with a version that times every call under stage"""
+        original = getattr(obj, attr)
+
+        @wraps(original)
+        def timed(*args, **kwargs):
+            with self.stage(stage):
+                return original(*args, **kwargs)
+        setattr(obj, attr, timed)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            samples = {name: list(values) for name, values in self.samples.items()}
+        return {
+            name: {
+                "count": len(values),
+                "p50_ms": round(percentile(values, 50) * 1000, 2),
+                "p95_ms": round(percentile(values, 95) * 1000, 2),
+                "mean_ms": round(sum(values) / len(values) * 1000, 2),
+                "total_s": round(sum(values), 3),
+            }
+            for name, values in sorted(samples.items())
+        }
@@ -0,0 +1,190 @@
+"""
+Local HTTP servers standing in for OpenAI, CourtListener and GovInfo.
+
+Latency and the OpenAI 429 rate are configurable so a benchmark can show how
+the pipelines behave under slow or rate-limited APIs without spending money
+or hitting real services.
+"""
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from synthetic import GOVINFO_TITLES, minimal_pdf
+
+
+class MockServer:
+    """Threaded HTTP server on an ephemeral localhost port; use as a context manager."""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, seed: int = 78):
+        self.latency = latency
+        self.jitter = jitter
+        self.stats: Counter = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        owner = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                owner._dispatch(self, "GET")
+
+            def do_HEAD(self):
+                owner._dispatch(self, "HEAD")
+
+            def do_POST(self):
+                owner._dispatch(self, "POST")
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _random(self) -> float:
+        with self._lock:
+            return self._rng.random()
+
+    def _delay(self):
+        if self.latency or self.jitter:
+            time.sleep(max(0.0, self.latency + (self._random() * 2 - 1) * self.jitter))
+
+    def _dispatch(self, handler: BaseHTTPRequestHandler, method: str):
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = handler.rfile.read(length) if length else b""
+        status, headers, payload = self.handle(method, handler.path, body)
+        with self._lock:
+            self.stats[status] += 1
+        self._delay()
+        if isinstance(payload, (dict, list)):
+            payload = json.dumps(payload).encode("utf-8")
+            headers = dict({"Content-Type": "application/json"}, **headers)
+        handler.send_response(status)
+        for name, value in headers.items():
+            handler.send_header(name, value)
+        handler.send_header("Content-Length", str(len(payload)))
+        handler.end_headers()
+        if method != "HEAD":
+            handler.wfile.write(payload)
+
+    def handle(self, method: str, path: str, body: bytes) -> Tuple[int, Dict[str, str], object]:
+        raise NotImplementedError
+
+
+class MockOpenAI(MockServer):
+    """
+    Chat Completions and Responses endpoints answering the R2 prompts.
+
+    Support prompts get a support verdict and citation prompts a validation
+    verdict; a seeded fraction of calls get a 429 with retry-after-ms so the
+    client's retry path is exercised too.
+    """
+
+    def __init__(self, latency: float = 0.5, jitter: float = 0.1, rate_limit: float = 0.0, seed: int = 78):
+        super().__init__(latency, jitter, seed)
+        self.rate_limit = rate_limit
+        self.tokens = Counter()
+
+    def handle(self, method, path, body):
+        if method != "POST" or not path.rstrip("/").endswith(("/chat/completions", "/responses")):
+            return 404, {}, {"error": {"message": f"Unknown endpoint {path}"}}
+        if self.rate_limit and self._random() < self.rate_limit:
+            return 429, {"retry-after-ms": "200"}, {"error": {"message": "Rate limit reached", "type": "requests"}}
+
+        request = json.loads(body or b"{}")
+        if "messages" in request:
+            prompt = "\n".join(str(m.get("content", "")) for m in request["messages"])
+        else:
+            prompt = json.dumps(request.get("input", ""))
+        verdict = self._verdict(prompt)
+        prompt_tokens, completion_tokens = max(1, len(prompt) // 4), max(1, len(verdict) // 4)
+        with self._lock:
+            self.tokens["prompt"] += prompt_tokens
+            self.tokens["completion"] += completion_tokens
+
+        if path.rstrip("/").endswith("/responses"):
+            return 200, {}, {
+                "id": "resp_bench", "object": "response", "created_at": int(time.time()),
+                "model": request.get("model", "gpt-4o-mini"), "status": "completed",
+                "output": [{"type": "message", "id": "msg_bench", "role": "assistant", "status": "completed",
+                            "content": [{"type": "output_text", "text": verdict, "annotations": []}]}],
+                "usage": {"input_tokens": prompt_tokens, "output_tokens": completion_tokens,
+                          "total_tokens": prompt_tokens + completion_tokens},
+            }
+        return 200, {}, {
+            "id": "chatcmpl-bench", "object": "chat.completion", "created": int(time.time()),
+            "model": request.get("model", "gpt-4o-mini"),
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": verdict}}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                      "total_tokens": prompt_tokens + completion_tokens},
+        }
+
+    @staticmethod
+    def _verdict(prompt: str) -> str:
+        if "MAIN TEXT PROPOSITION" in prompt:
+            return json.dumps({"support_level": "yes", "confidence": 0.9,
+                               "reasoning": "The redboxed passage states the proposition directly.",
+                               "supported_elements": [], "unsupported_elements": [],
+                               "suggested_action": "approve"})
+        return json.dumps({"is_correct": True, "errors": [], "corrected_version": None,
+                           "confidence": 0.9, "notes": "Citation conforms to Bluebook form."})
+
+
+class MockSources(MockServer):
+    """
+    CourtListener and GovInfo, reached through URLs rewritten to
+    /<original host>/<original path> by the sourcepull benchmark.
+
+    Every other source host answers 404, as a real site does for a
+    citation it does not carry.
+    """
+
+    def __init__(self, latency: float = 0.1, jitter: float = 0.02, seed: int = 78):
+        super().__init__(latency, jitter, seed)
+        self.pdf = minimal_pdf("Synthetic opinion", padding=64 * 1024)
+
+    def handle(self, method, path, body):
+        parts = urlsplit(path)
+        host, _, rest = parts.path.lstrip("/").partition("/")
+        rest = "/" + rest
+        query = parse_qs(parts.query)
+
+        if host == "www.courtlistener.com":
+            if rest.startswith("/api/rest/v3/search/"):
+                q = query.get("q", [""])[0]
+                return 200, {}, {"count": 1, "results": [{"id": zlib.crc32(q.encode()) % 100000, "caseName": q}]}
+            if re.match(r"/api/rest/v3/opinions/\d+/pdf/", rest):
+                return 200, {"Content-Type": "application/pdf"}, self.pdf
+        elif host == "api.govinfo.gov":
+            if rest.startswith("/collections/USCODE"):
+                return 200, {}, {"count": len(GOVINFO_TITLES), "packages": [
+                    {"packageId": f"USCODE-2018-title{title}"} for title in GOVINFO_TITLES]}
+            match = re.match(r"/packages/([\w-]+)$", rest)
+            if match:
+                return 200, {}, {"packageId": match.group(1), "download": {
+                    "pdfLink": f"https://api.govinfo.gov/packages/{match.group(1)}/pdf"}}
+            if re.match(r"/packages/[\w-]+/pdf$", rest):
+                return 200, {"Content-Type": "application/pdf"}, self.pdf
+        return 404, {"Content-Type": "text/html"}, b"<html><body>Not Found</body></html>"
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+End-to-end performance benchmark for the R2 pipeline and SLRinator sourcepull.
+
+Generates a synthetic article, starts mock OpenAI and source servers, runs
+each pipeline in its own process and reports throughput, per-stage p50/p95
+latency, peak RSS and LLM tokens. Results are appended to a history file and
+compared with the previous run of the same configuration.
+
+Usage:
+  python benchmarks/run_benchmarks.py --footnotes 100
+  python benchmarks/run_benchmarks.py --pipelines sourcepull --source-latency 0.3
+  python benchmarks/run_benchmarks.py --llm-429-rate 0.1 --fail-on-regression
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+BENCH_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(BENCH_DIR))
+
+from mock_servers import MockOpenAI, MockSources  # noqa: E402
+from synthetic import write_fixtures  # noqa: E402
+
+PIPELINES = ("r2", "sourcepull")
+DEFAULT_HISTORY = BENCH_DIR / "results" / "history.jsonl"
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_pipeline(name: str, args: argparse.Namespace, workdir: Path, env: Dict[str, str],
+                 servers: Dict[str, str], inputs: Optional[dict]) -> dict:
+    out = workdir / f"{name}.json"
+    if name == "r2":
+        inputs_path = workdir / "r2_inputs.json"
+        inputs_path.write_text(json.dumps(inputs))
+        cmd = [sys.executable, str(BENCH_DIR / "bench_r2.py"), "--inputs", str(inputs_path),
+               "--workdir", str(workdir / "r2"), "--workers", str(args.workers), "--out", str(out)]
+    else:
+        cmd = [sys.executable, str(BENCH_DIR / "bench_sourcepull.py"), "--footnotes", str(args.footnotes),
+               "--seed", str(args.seed), "--sources-url", servers["sources"],
+               "--workdir", str(workdir / "sourcepull"), "--out", str(out)]
+
+    log_path = workdir / f"{name}.log"
+    with open(log_path, "w") as log:
+        completed = subprocess.run(cmd, env=env, stdout=log, stderr=subprocess.STDOUT)
+    if completed.returncode != 0 or not out.exists():
+        tail = log_path.read_text(errors="replace")[-2000:]
+        return {"pipeline": name, "error": f"exit code {completed.returncode}", "log_tail": tail}
+    return json.loads(out.read_text())
+
+
+def config_of(args: argparse.Namespace) -> dict:
+    """Settings that make two runs comparable"""
+    return {
+        "footnotes": args.footnotes, "seed": args.seed, "workers": args.workers,
+        "llm_latency": args.llm_latency, "llm_429_rate": args.llm_429_rate,
+        "source_latency": args.source_latency,
+    }
+
+
+def previous_run(history: Path, config: dict) -> Optional[dict]:
+    if not history.exists():
+        return None
+    previous = None
+    with open(history, "r") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if entry.get("config") == config:
+                previous = entry
+    return previous
+
+
+def regressions(current: dict, previous: dict, tolerance: float) -> List[str]:
+    """Metrics that got worse than the previous run by more than tolerance (a fraction)"""
+    found = []
+    for name, result in current["results"].items():
+        before = previous["results"].get(name)
+        if not before or "error" in result or "error" in before:
+            continue
+        if result["citations_per_min"] < before["citations_per_min"] * (1 - tolerance):
+            found.append(f"{name}: citations/min {before['citations_per_min']} -> {result['citations_per_min']}")
+        if result["peak_rss_mb"] > before["peak_rss_mb"] * (1 + tolerance):
+            found.append(f"{name}: peak RSS {before['peak_rss_mb']} MB -> {result['peak_rss_mb']} MB")
+        for stage, stats in result["stages"].items():
+            old = before["stages"].get(stage)
+            # Sub-millisecond stages are timer noise
+            if old and old["p95_ms"] >= 1.0 and stats["p95_ms"] > old["p95_ms"] * (1 + tolerance):
+                found.append(f"{name}: {stage} p95 {old['p95_ms']} ms -> {stats['p95_ms']} ms")
+        old_tokens = before.get("llm", {}).get("tokens_per_citation")
+        new_tokens = result.get("llm", {}).get("tokens_per_citation")
+        if old_tokens and new_tokens and new_tokens > old_tokens * (1 + tolerance):
+            found.append(f"{name}: tokens/citation {old_tokens} -> {new_tokens}")
+    return found
+
+
+def print_results(entry: dict):
+    for name, result in entry["results"].items():
+        print(f"\n{name.upper()}")
+        print("-" * 72)
+        if "error" in result:
+            print(f"  FAILED ({result['error']})\n{result['log_tail']}")
+            continue
+        print(f"  {result['citations']} citations in {result['elapsed_s']}s "
+              f"= {result['citations_per_min']} citations/min, peak RSS {result['peak_rss_mb']} MB")
+        if "llm" in result:
+            print(f"  LLM: {result['llm']['calls']} calls, {result['llm']['tokens']:,} tokens "
+                  f"({result['llm']['tokens_per_citation']}/citation)")
+        print(f"  {'stage':<32}{'count':>7}{'p50 ms':>11}{'p95 ms':>11}{'total s':>10}")
+        for stage, stats in result["stages"].items():
+            print(f"  {stage:<32}{stats['count']:>7}{stats['p50_ms']:>11}{stats['p95_ms']:>11}{stats['total_s']:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the R2 and sourcepull pipelines against mock APIs',
+                                     formatter_class=argparse.RawDescriptionHelpFormatter, epilog=__doc__)
+    parser.add_argument('--footnotes', type=int, default=50, help='Footnotes in the synthetic article')
+    parser.add_argument('--seed', type=int, default=78, help='Seed for the synthetic article')
+    parser.add_argument('--pipelines', default=','.join(PIPELINES), help='Comma-separated: r2,sourcepull')
+    parser.add_argument('--workers', type=int, default=5, help='R2 parallel workers (1 = sequential)')
+    parser.add_argument('--llm-latency', type=float, default=0.5, help='Mock OpenAI seconds per call')
+    parser.add_argument('--llm-429-rate', type=float, default=0.0, help='Fraction of OpenAI calls rate limited')
+    parser.add_argument('--source-latency', type=float, default=0.1, help='Mock source server seconds per request')
+    parser.add_argument('--history', type=Path, default=DEFAULT_HISTORY, help='JSONL file of past results')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed slowdown before flagging (fraction)')
+    parser.add_argument('--fail-on-regression', action='store_true', help='Exit 1 if a metric regressed')
+    parser.add_argument('--keep', action='store_true', help='Keep the scratch directory')
+    args = parser.parse_args()
+
+    pipelines = [p.strip() for p in args.pipelines.split(',') if p.strip()]
+    unknown = set(pipelines) - set(PIPELINES)
+    if unknown:
+        parser.error(f"Unknown pipeline(s): {', '.join(sorted(unknown))}")
+
+    workdir = Path(tempfile.mkdtemp(prefix="slr_bench_"))
+    print(f"Generating {args.footnotes}-footnote synthetic article in {workdir}")
+    _, inputs = write_fixtures(workdir / "inputs", args.footnotes, args.seed, r2="r2" in pipelines)
+
+    entry = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "revision": git_revision(),
+        "config": config_of(args),
+        "results": {},
+    }
+    with MockOpenAI(latency=args.llm_latency, jitter=args.llm_latency * 0.2,
+                    rate_limit=args.llm_429_rate, seed=args.seed) as llm, \
+            MockSources(latency=args.source_latency, jitter=args.source_latency * 0.2, seed=args.seed) as sources:
+        env = dict(os.environ, OPENAI_BASE_URL=f"{llm.url}/v1", OPENAI_API_KEY="sk-bench")
+        servers = {"llm": llm.url, "sources": sources.url}
+        for name in pipelines:
+            print(f"Running {name}...")
+            entry["results"][name] = run_pipeline(name, args, workdir, env, servers, inputs)
+        entry["mock_stats"] = {
+            "llm_responses": dict(llm.stats), "llm_tokens": dict(llm.tokens),
+            "source_responses": dict(sources.stats),
+        }
+
+    print_results(entry)
+
+    previous = previous_run(args.history, entry["config"])
+    found = regressions(entry, previous, args.tolerance) if previous else []
+    args.history.parent.mkdir(parents=True, exist_ok=True)
+    with open(args.history, "a") as f:
+        f.write(json.dumps(entry) + "\n")
+
+    print()
+    if previous is None:
+        print(f"No earlier run with this configuration in {args.history}; recorded as baseline")
+    elif found:
+        print(f"REGRESSIONS vs {previous.get('revision')} ({previous['timestamp']}):")
+        for line in found:
+            print(f"  - {line}")
+    else:
+        print(f"No regressions vs {previous.get('revision')} ({previous['timestamp']}, tolerance {args.tolerance:.0%})")
+
+    if not args.keep:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    failed = any("error" in r for r in entry["results"].values())
+    sys.exit(1 if failed or (found and args.fail_on_regression) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+"""
+Synthetic benchmark fixtures: a Word article with N footnotes, R1 PDFs with
+redbox annotations, the R2 master spreadsheet, and sourcepull citation lists.
+
+Everything is generated from a seed, so two runs with the same settings
+process byte-identical inputs.
+"""
+import random
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+# Titles the mock GovInfo collection lists (it only returns five packages)
+GOVINFO_TITLES = (15, 17, 35, 42, 47)
+
+PARTIES = [
+    "Alder", "Birch", "Cedar", "Dogwood", "Elm", "Fir", "Ginkgo", "Hazel", "Ironwood", "Juniper",
+    "Larch", "Maple", "Nutmeg", "Oak", "Pine", "Quince", "Rowan", "Spruce", "Tamarack", "Walnut",
+]
+COMPANIES = ["Corp.", "Inc.", "LLC", "Co.", "Holdings, Inc."]
+TOPICS = ["Patent Eligibility", "Fair Use", "Platform Liability", "Data Privacy", "Antitrust Remedies",
+          "Copyright Management Information", "Standing", "Machine Learning", "Open Source Licensing"]
+JOURNALS = ["Stan. L. Rev.", "Harv. L. Rev.", "Yale L.J.", "Colum. L. Rev.", "Berkeley Tech. L.J."]
+SENTENCES = [
+    "The court held that the claims were directed to an abstract idea.",
+    "Congress intended the provision to reach removal of identifying information.",
+    "Liability attaches only where the defendant knew of the infringement.",
+    "The statute imposes a heightened pleading standard on such claims.",
+    "Courts have consistently declined to extend the doctrine to new technologies.",
+    "The agency's interpretation is entitled to no special deference.",
+]
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+
+@dataclass
+class SyntheticFootnote:
+    number: int
+    text: str                 # Footnote text with *italic* markers
+    proposition: str          # Main-text sentence the footnote supports
+    source_text: str          # Text inside the R1 redbox
+    has_pdf: bool             # First citations of a source get an R1 PDF; Id. and repeats reuse it
+
+
+def _case(rng: random.Random, index: int) -> Tuple[str, str]:
+    p1, p2 = rng.sample(PARTIES, 2)
+    name = f"{p1} {rng.choice(COMPANIES)} v. {p2} {rng.choice(COMPANIES)}"
+    volume, page = 500 + index % 100, 100 + (index * 37) % 800
+    return f"*{name}*", f"{volume} U.S. {page}"
+
+
+def make_footnotes(count: int, seed: int = 78) -> List[SyntheticFootnote]:
+    """Cases, statutes and articles, with repeat citations and Id. at realistic rates."""
+    rng = random.Random(seed)
+    footnotes: List[SyntheticFootnote] = []
+    sources: List[Tuple[str, str, int]] = []   # (name, cite, year)
+    for number in range(1, count + 1):
+        proposition = rng.choice(SENTENCES)
+        source_text = f"{proposition} {rng.choice(SENTENCES)} {rng.choice(SENTENCES)}"
+        pin = rng.randint(101, 999)
+        roll = rng.random()
+
+        if footnotes and roll < 0.10:
+            text, has_pdf = f"*Id.* at {pin}.", False
+        elif sources and roll < 0.30:
+            name, cite, year = rng.choice(sources)
+            text, has_pdf = f"*See* {name}, {cite}, {pin} ({year}).", False
+        else:
+            kind = rng.random()
+            year = rng.randint(1990, 2024)
+            if kind < 0.5:
+                name, cite = _case(rng, number)
+                sources.append((name, cite, year))
+                text = f"*See* {name}, {cite}, {pin} ({year})."
+            elif kind < 0.8:
+                text = f"{rng.choice(GOVINFO_TITLES)} U.S.C. § {rng.randint(101, 1299)} (2018)."
+            else:
+                author = " ".join(rng.sample(PARTIES, 2))
+                volume, page = rng.randint(60, 78), rng.randint(1, 1500)
+                text = (f"{author}, *{rng.choice(TOPICS)} After {rng.choice(PARTIES)}*, "
+                        f"{volume} {rng.choice(JOURNALS)} {page}, {page + pin % 40} ({year}).")
+            has_pdf = True
+        footnotes.append(SyntheticFootnote(number, text, proposition, source_text, has_pdf))
+    return footnotes
+
+
+def _runs(text: str) -> str:
+    """WordprocessingML runs for text with *italic* markers"""
+    runs = []
+    for i, part in enumerate(text.split("*")):
+        if not part:
+            continue
+        props = "<w:rPr><w:i/></w:rPr>" if i % 2 else ""
+        runs.append(f'<w:r>{props}<w:t xml:space="preserve">{escape(part)}</w:t></w:r>')
+    return "".join(runs)
+
+
+def write_article(path: Path, footnotes: List[SyntheticFootnote]):
+    """
+    Minimal .docx with one main-text paragraph per footnote. Footnote N has
+    XML id N + 1 (ids 0 and 1 are Word's separators), as in real articles.
+    """
+    body = "".join(
+        f'<w:p>{_runs(fn.proposition)}<w:r><w:rPr><w:vertAlign w:val="superscript"/></w:rPr>'
+        f'<w:footnoteReference w:id="{fn.number + 1}"/></w:r></w:p>'
+        for fn in footnotes
+    )
+    notes = "".join(
+        f'<w:footnote w:id="{fn.number + 1}"><w:p>{_runs(fn.text)}</w:p></w:footnote>'
+        for fn in footnotes
+    )
+    parts = {
+        "[Content_Types].xml": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/word/document.xml" ContentType="application/'
+            'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+            '<Override PartName="/word/footnotes.xml" ContentType="application/'
+            'vnd.openxmlformats-officedocument.wordprocessingml.footnotes+xml"/>'
+            '</Types>'),
+        "_rels/.rels": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+            'relationships/officeDocument" Target="word/document.xml"/></Relationships>'),
+        "word/_rels/document.xml.rels": (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+            'relationships/footnotes" Target="footnotes.xml"/></Relationships>'),
+        "word/document.xml": (
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            f'<w:document xmlns:w="{W_NS}"><w:body>{body}</w:body></w:document>'),
+        "word/footnotes.xml": (
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><w:footnotes xmlns:w="{W_NS}">'
+            f'<w:footnote w:type="separator" w:id="0"><w:p><w:r><w:separator/></w:r></w:p></w:footnote>'
+            f'<w:footnote w:type="continuationSeparator" w:id="1"><w:p><w:r><w:continuationSeparator/>'
+            f'</w:r></w:p></w:footnote>{notes}</w:footnotes>'),
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as docx:
+        for name, xml in parts.items():
+            docx.writestr(name, xml)
+
+
+def write_r1_pdfs(directory: Path, footnotes: List[SyntheticFootnote], pages: int = 3):
+    """One R1 PDF per first citation, with the supporting passage redboxed on the last page."""
+    import fitz  # PyMuPDF, as used by the R2 pipeline
+
+    directory.mkdir(parents=True, exist_ok=True)
+    for fn in footnotes:
+        if not fn.has_pdf:
+            continue
+        doc = fitz.open()
+        for page_num in range(pages):
+            page = doc.new_page()
+            filler = " ".join(SENTENCES) * 4
+            page.insert_textbox(fitz.Rect(72, 72, 540, 360), filler, fontsize=10)
+            if page_num == pages - 1:
+                box = fitz.Rect(72, 420, 540, 520)
+                page.insert_textbox(box, fn.source_text, fontsize=11)
+                annot = page.add_rect_annot(box + (-4, -4, 4, 4))
+                annot.set_colors(stroke=(1, 0, 0))
+                annot.update()
+        doc.save(str(directory / f"R1-{fn.number:03d}-01-Bench.pdf"))
+        doc.close()
+
+
+def write_spreadsheet(path: Path, footnotes: List[SyntheticFootnote]):
+    """Master sheet with the R1 and R2 Fn#/Cite# columns the spreadsheet updater indexes."""
+    from openpyxl import Workbook
+
+    wb = Workbook()
+    sheet = wb.active
+    sheet.title = f"CC (nn. 78-{78 + len(footnotes)}); HC"
+    headers = {1: "Fn#", 2: "Cite#", 3: "Citation", 17: "Fn#", 18: "Cite#",
+               19: "Supports?", 20: "Citation Elements", 21: "MEM Comments"}
+    for col, header in headers.items():
+        sheet.cell(row=2, column=col, value=header)
+    for row, fn in enumerate(footnotes, start=4):
+        sheet.cell(row=row, column=1, value=fn.number)
+        sheet.cell(row=row, column=2, value=1)
+        sheet.cell(row=row, column=3, value=fn.text)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    wb.save(path)
+
+
+def sourcepull_citations(footnotes: List[SyntheticFootnote]) -> List[Tuple[int, str]]:
+    """Plain-text citations for sourcepull (short forms are not retrieved)"""
+    return [(fn.number, fn.text.replace("*", "")) for fn in footnotes if not fn.text.startswith("*Id.*")]
+
+
+def minimal_pdf(text: str = "Synthetic source", padding: int = 2048) -> bytes:
+    """Small well-formed PDF (header, xref and trailer) served by the mock source servers"""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] >>",
+    ]
+    out = b"%PDF-1.4\n%" + text.encode("latin-1", "replace") + b" " * padding + b"\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return out
+
+
+def write_fixtures(directory: Path, count: int, seed: int = 78,
+                   r2: bool = True) -> Tuple[List[SyntheticFootnote], Optional[dict]]:
+    """Generate all inputs under directory; returns the footnotes and the R2 input paths."""
+    footnotes = make_footnotes(count, seed)
+    if not r2:
+        return footnotes, None
+    paths = {
+        "word_doc": directory / "article.docx",
+        "r1_pdf_dir": directory / "r1",
+        "spreadsheet": directory / "master_sheet.xlsx",
+    }
+    write_article(paths["word_doc"], footnotes)
+    write_r1_pdfs(paths["r1_pdf_dir"], footnotes)
+    write_spreadsheet(paths["spreadsheet"], footnotes)
+    return footnotes, {k: str(v) for k, v in paths.items()}
@@ -21,9 +21,12 @@ R2_PDF_DIR = OUTPUT_DIR / "r2_pdfs"
 LOG_DIR = OUTPUT_DIR / "logs"
 REPORT_DIR = OUTPUT_DIR / "reports"
 VECTOR_STORE_CACHE = PROJECT_ROOT / "config" / "vector_store_cache.json"
+CACHE_DIR = OUTPUT_DIR / "cache"
+OCR_CACHE_DIR = CACHE_DIR / "ocr"
+RULE_SNAPSHOT_PATH = CACHE_DIR / "bluebook_rules.snapshot"  # Compiled from BLUEBOOK_JSON_PATH on first use
 
 # Create directories if they don't exist
-for dir_path in [R2_PDF_DIR, LOG_DIR, REPORT_DIR]:
+for dir_path in [R2_PDF_DIR, LOG_DIR, REPORT_DIR, OCR_CACHE_DIR]:
     dir_path.mkdir(parents=True, exist_ok=True)
 
 # GPT Configuration
@@ -39,13 +42,31 @@ except FileNotFoundError:
 GPT_MODEL = "gpt-4o-mini"  # Cost-effective, reliable; vector assistant also uses 4o-mini
 GPT_TEMPERATURE = 0.1  # Low temperature for consistency
 GPT_MAX_TOKENS = 4000
+LLM_CALLS_PER_SECOND = 2.0  # Requests started per second, shared by every run in the process (None = no cap)
+LLM_BURST = 4  # Requests that may start back to back before the rate applies
 
 # Processing options
 CONFIDENCE_THRESHOLD = 0.85  # Below this, flag for human review
 AUTO_APPROVE_HIGH_CONFIDENCE = True  # Auto-approve if > 0.95 confidence
 ENABLE_QUOTE_FUZZY_MATCH = True  # Allow minor whitespace differences
 ENABLE_PARALLEL_PROCESSING = False  # Set True if you have API quota
+EVIDENCE_TOKEN_BUDGET = 1500  # Most source tokens per support check (best-ranked passages only)
+EVIDENCE_PASSAGE_WORDS = 80  # Target passage length when splitting redbox and page text
+EVIDENCE_NEIGHBOR_PAGES = 1  # Pages either side of a redbox also searched for evidence
+SPREADSHEET_STREAMING = False  # read_only/write_only openpyxl for huge master sheets (drops styles)
+
+# OCR service
+OCR_MAX_WORKERS = 2  # Tesseract processes (0 = OCR inline in the calling thread)
+OCR_MAX_PENDING = 8  # Max queued OCR jobs before callers block
+OCR_PIXMAP_CACHE_SIZE = 8  # Rendered pages kept in memory (~25 MB each at 300 DPI)
+
+# Daemon (daemon.py): one warm process serving several articles
+DAEMON_HOST = "127.0.0.1"
+DAEMON_PORT = 8765
+DAEMON_MAX_JOBS = 2  # Articles processed at once; more wait in the queue, taken in turn per user
+DAEMON_PDF_CACHE_SIZE = 256  # Processed R1 PDFs kept in memory between runs
 
 # Logging
 LOG_LEVEL = "INFO"  # DEBUG, INFO, WARNING, ERROR
 SAVE_DETAILED_LOGS = True
+TRACING_ENABLED = False  # Nested stage spans -> LOG_DIR/trace_<batch>.json (same as --trace)
@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+"""
+Long-running R2 citecheck daemon.
+
+`python main.py` starts cold for every article: it maps the rule snapshot,
+loads the Bluebook assistant, opens a new OpenAI client and processes every
+R1 PDF again, and two editors running at once each pace their own LLM
+requests against the same quota. The daemon keeps one warm set of
+PipelineServices and accepts articles as jobs over local HTTP (TCP on
+localhost or a Unix socket):
+
+    python daemon.py serve [--socket /tmp/r2.sock | --port 8765] [--jobs 2]
+    python daemon.py submit --word-doc A.docx --spreadsheet A.xlsx --r1-dir R1/ [--footnotes 1-50]
+    python daemon.py status [JOB_ID]
+
+Endpoints: POST /jobs (JSON job spec, see job_from_spec), GET /jobs,
+GET /jobs/<id>, GET /status.
+
+Up to --jobs articles run at once; queued articles start in turn per user,
+so one editor's backlog does not hold up another's article. All runs share
+the process-wide LLM rate limiter (src/rate_limiter.py), which serves
+waiting requests in turn per user. Each article writes its logs, reports,
+R2 PDFs and edited document under data/output/articles/<article>/.
+"""
+import getpass
+import http.client
+import json
+import logging
+import re
+import socket
+import socketserver
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import settings
+from src import rate_limiter
+
+logger = logging.getLogger("r2.daemon")
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+class ProcessedPdfCache:
+    """LRU of process_r1_pdf results shared by every run; each PDF is processed once at a time."""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Any, Dict]" = OrderedDict()
+        self._locks: Dict[Any, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, compute: Callable[[], Dict]) -> Dict:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            key_lock = self._locks.setdefault(key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                if key in self._entries:  # Processed by another run while this one waited
+                    self.hits += 1
+                    return self._entries[key]
+            value = compute()
+            with self._lock:
+                self.misses += 1
+                self._entries[key] = value
+                while len(self._entries) > self.max_entries:
+                    evicted, _ = self._entries.popitem(last=False)
+                    self._locks.pop(evicted, None)
+            return value
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"entries": len(self._entries), "max_entries": self.max_entries,
+                    "hits": self.hits, "misses": self.misses}
+
+
+@dataclass
+class Job:
+    """One article submitted to the daemon."""
+    job_id: int
+    user: str
+    article: str
+    spec: Dict
+    state: str = QUEUED
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    result: Dict = field(default_factory=dict)
+
+    def to_dict(self) -> Dict:
+        def stamp(value):
+            return datetime.fromtimestamp(value).isoformat(timespec="seconds") if value else None
+        return {
+            "id": self.job_id,
+            "user": self.user,
+            "article": self.article,
+            "state": self.state,
+            "spec": self.spec,
+            "submitted_at": stamp(self.submitted_at),
+            "started_at": stamp(self.started_at),
+            "finished_at": stamp(self.finished_at),
+            "seconds": round((self.finished_at or time.time()) - self.started_at, 1) if self.started_at else None,
+            "error": self.error,
+            "result": self.result,
+        }
+
+
+def job_from_spec(spec: Dict) -> Dict:
+    """
+    Validate a submitted job.
+
+    Keys: word_doc (required), spreadsheet, r1_pdf_dir (settings paths if
+    omitted), footnotes ("89-100,130" or a list), batch_name, workers,
+    full (reprocess unchanged citations), user, article (output folder name;
+    the Word document's name if omitted).
+
+    Raises:
+        ValueError: Missing or unreadable inputs
+    """
+    if not isinstance(spec, dict) or not spec.get("word_doc"):
+        raise ValueError("word_doc is required")
+    clean = {"word_doc": str(Path(spec["word_doc"]).expanduser().resolve())}
+    for key in ("spreadsheet", "r1_pdf_dir"):
+        if spec.get(key):
+            clean[key] = str(Path(spec[key]).expanduser().resolve())
+    for key in ("word_doc", "spreadsheet", "r1_pdf_dir"):
+        if key in clean and not Path(clean[key]).exists():
+            raise ValueError(f"{key} not found: {clean[key]}")
+
+    footnotes = spec.get("footnotes") or []
+    if isinstance(footnotes, str):
+        clean["footnotes"] = footnotes
+    elif isinstance(footnotes, list) and all(isinstance(n, int) for n in footnotes):
+        clean["footnotes"] = sorted(set(footnotes))
+    else:
+        raise ValueError("footnotes must be a range string or a list of numbers")
+    clean["workers"] = max(1, int(spec.get("workers", 1)))
+    clean["full"] = bool(spec.get("full", False))
+    if spec.get("batch_name"):
+        clean["batch_name"] = str(spec["batch_name"])
+    clean["user"] = str(spec.get("user") or rate_limiter.DEFAULT_TENANT)
+    clean["article"] = re.sub(r"[^\w.-]+", "_", str(spec.get("article") or Path(clean["word_doc"]).stem))
+    return clean
+
+
+class JobQueue:
+    """Runs submitted articles on max_jobs worker threads, starting queued ones in turn per user."""
+
+    def __init__(self, runner: Callable[[Job], Dict], max_jobs: int = 2):
+        """
+        Args:
+            runner: Processes one job and returns its result summary
+            max_jobs: Articles processed at once
+        """
+        self.runner = runner
+        self.max_jobs = max(1, max_jobs)
+        self._jobs: "OrderedDict[int, Job]" = OrderedDict()
+        self._started_per_user: Counter = Counter()
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._threads = [threading.Thread(target=self._work, name=f"job-{n + 1}", daemon=True)
+                         for n in range(self.max_jobs)]
+
+    def start(self):
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self, wait: bool = True):
+        """Stop taking queued jobs; with wait, let running ones finish first."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if wait:
+            for thread in self._threads:
+                if thread.is_alive():
+                    thread.join()
+
+    def submit(self, spec: Dict) -> Job:
+        """
+        Queue an article.
+
+        Raises:
+            ValueError: Invalid spec (see job_from_spec)
+            RuntimeError: The same article is already queued or running
+        """
+        spec = job_from_spec(spec)
+        with self._cond:
+            if self._stopping:
+                raise RuntimeError("daemon is shutting down")
+            for job in self._jobs.values():
+                if job.article == spec["article"] and job.state in (QUEUED, RUNNING):
+                    raise RuntimeError(f"article {spec['article']} is already {job.state} as job {job.job_id}")
+            job = Job(len(self._jobs) + 1, spec.pop("user"), spec.pop("article"), spec)
+            self._jobs[job.job_id] = job
+            self._cond.notify()
+        logger.info(f"Queued job {job.job_id}: {job.article} for {job.user}")
+        return job
+
+    def get(self, job_id: int) -> Optional[Job]:
+        with self._cond:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> List[Job]:
+        with self._cond:
+            return list(self._jobs.values())
+
+    def counts(self) -> Dict[str, int]:
+        with self._cond:
+            counts = Counter(job.state for job in self._jobs.values())
+        return {state: counts[state] for state in (QUEUED, RUNNING, DONE, FAILED)}
+
+    def _next_job(self) -> Optional[Job]:
+        """The queued job of the user with the fewest running, then fewest started, jobs."""
+        running = Counter(job.user for job in self._jobs.values() if job.state == RUNNING)
+        queued = [job for job in self._jobs.values() if job.state == QUEUED]
+        if not queued:
+            return None
+        return min(queued, key=lambda job: (running[job.user], self._started_per_user[job.user], job.job_id))
+
+    def _work(self):
+        while True:
+            with self._cond:
+                job = self._next_job()
+                while job is None and not self._stopping:
+                    self._cond.wait()
+                    job = self._next_job()
+                if self._stopping:
+                    return
+                job.state = RUNNING
+                job.started_at = time.time()
+                self._started_per_user[job.user] += 1
+
+            logger.info(f"Starting job {job.job_id}: {job.article} for {job.user}")
+            try:
+                with rate_limiter.tenant(job.user):
+                    result = self.runner(job)
+                state, error = DONE, None
+            except Exception as e:
+                logger.exception(f"Job {job.job_id} ({job.article}) failed")
+                result, state, error = {}, FAILED, f"{type(e).__name__}: {e}"
+
+            with self._cond:
+                job.result = result or {}
+                job.state, job.error = state, error
+                job.finished_at = time.time()
+                self._cond.notify_all()
+            logger.info(f"Job {job.job_id} {state} in {job.finished_at - job.started_at:.1f}s")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """JSON API over the daemon's JobQueue (self.server.daemon)."""
+
+    def do_GET(self):
+        daemon = self.server.daemon
+        parts = [part for part in self.path.split("?")[0].split("/") if part]
+        if parts == ["status"]:
+            return self._reply(200, daemon.status())
+        if parts == ["jobs"]:
+            return self._reply(200, {"jobs": [job.to_dict() for job in daemon.queue.jobs()]})
+        if len(parts) == 2 and parts[0] == "jobs" and parts[1].isdigit():
+            job = daemon.queue.get(int(parts[1]))
+            if job is None:
+                return self._reply(404, {"error": f"no job {parts[1]}"})
+            return self._reply(200, {"job": job.to_dict()})
+        self._reply(404, {"error": f"unknown path {self.path}"})
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/jobs":
+            return self._reply(404, {"error": f"unknown path {self.path}"})
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            job = self.server.daemon.queue.submit(json.loads(self.rfile.read(length) or b"{}"))
+        except ValueError as e:
+            return self._reply(400, {"error": str(e)})
+        except RuntimeError as e:
+            return self._reply(409, {"error": str(e)})
+        self._reply(202, {"job": job.to_dict()})
+
+    def _reply(self, status: int, body: Dict):
+        payload = json.dumps(body, indent=2).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        # Unix-socket clients have no address for the default access log
+        logger.debug(f"{self.command} {self.path}: " + format % args)
+
+
+class UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class CitecheckDaemon:
+    """A JobQueue served over local HTTP."""
+
+    def __init__(self, runner: Callable[[Job], Dict], max_jobs: int = 2,
+                 status: Optional[Callable[[], Dict]] = None):
+        """
+        Args:
+            runner: Processes one job (see run_article)
+            max_jobs: Articles processed at once
+            status: Extra fields for GET /status (warm caches, LLM usage)
+        """
+        self.queue = JobQueue(runner, max_jobs)
+        self.extra_status = status
+        self.started = time.time()
+        self.server = None
+
+    def status(self) -> Dict:
+        status = {
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "max_jobs": self.queue.max_jobs,
+            "jobs": self.queue.counts(),
+            "rate_limiter": rate_limiter.limiter.stats(),
+        }
+        if self.extra_status:
+            status.update(self.extra_status())
+        return status
+
+    def bind(self, host: str = settings.DAEMON_HOST, port: int = settings.DAEMON_PORT,
+             socket_path: Optional[str] = None):
+        """Listen on a Unix socket if socket_path is given, else on host:port."""
+        if socket_path:
+            Path(socket_path).unlink(missing_ok=True)
+            self.server = UnixHTTPServer(socket_path, _Handler)
+        else:
+            self.server = ThreadingHTTPServer((host, port), _Handler)
+        self.server.daemon = self
+        return self.server
+
+    def serve_forever(self):
+        self.queue.start()
+        address = self.server.server_address
+        logger.info(f"R2 daemon listening on {address if isinstance(address, str) else '%s:%s' % address[:2]}")
+        try:
+            self.server.serve_forever()
+        except KeyboardInterrupt:
+            logger.info("Shutting down; waiting for running jobs to finish")
+        finally:
+            self.close()
+
+    def close(self):
+        if self.server is not None:
+            self.server.server_close()
+            if isinstance(self.server, UnixHTTPServer):
+                Path(self.server.server_address).unlink(missing_ok=True)
+        self.queue.stop()
+
+
+def run_article(services) -> Callable[[Job], Dict]:
+    """Runner processing a job with R2Pipeline on the warm services."""
+    from main import R2Pipeline, _parse_footnote_range
+
+    def run(job: Job) -> Dict:
+        spec = job.spec
+        footnotes = spec["footnotes"]
+        if isinstance(footnotes, str):
+            footnotes = _parse_footnote_range(footnotes)
+        output_dir = settings.OUTPUT_DIR / "articles" / job.article
+        pipeline = R2Pipeline(
+            batch_name=spec.get("batch_name"), services=services,
+            word_doc_path=spec["word_doc"], spreadsheet_path=spec.get("spreadsheet"),
+            r1_pdf_dir=spec.get("r1_pdf_dir"), output_dir=output_dir,
+        )
+        pipeline.run(target_footnotes=footnotes, parallel=spec["workers"] > 1, max_workers=spec["workers"],
+                      incremental=not spec["full"])
+        return {
+            "batch_name": pipeline.batch_name,
+            "citations_processed": len(pipeline.full_log),
+            "carried_forward": pipeline.carried_forward,
+            "needs_review": len(pipeline.human_review_queue),
+            "output_dir": str(output_dir),
+            "edited_document": str(pipeline.edited_doc_path),
+            "review_report": str(pipeline.report_dir / "human_review_queue.html"),
+            "llm": pipeline.llm_usage.get_stats(),
+        }
+    return run
+
+
+def serve(args):
+    from main import PipelineServices
+
+    if args.llm_rate is not None:
+        rate_limiter.limiter.configure(args.llm_rate or None, args.llm_burst)
+    started = time.perf_counter()
+    pdf_cache = ProcessedPdfCache(settings.DAEMON_PDF_CACHE_SIZE)
+    services = PipelineServices(pdf_cache=pdf_cache)
+    logger.info(f"Services warm in {time.perf_counter() - started:.1f}s")
+
+    daemon = CitecheckDaemon(run_article(services), args.jobs,
+                             status=lambda: {"pdf_cache": pdf_cache.stats(), "llm": services.llm.get_stats()})
+    daemon.bind(args.host, args.port, args.socket)
+    daemon.serve_forever()
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: float = 30):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+def request(method: str, path: str, body: Optional[Dict] = None, host: str = settings.DAEMON_HOST,
+            port: int = settings.DAEMON_PORT, socket_path: Optional[str] = None):
+    """Call the daemon's API; returns (HTTP status, decoded JSON)."""
+    connection = _UnixHTTPConnection(socket_path) if socket_path else http.client.HTTPConnection(host, port, timeout=30)
+    try:
+        payload = json.dumps(body).encode("utf-8") if body is not None else None
+        connection.request(method, path, body=payload, headers={"Content-Type": "application/json"})
+        response = connection.getresponse()
+        return response.status, json.loads(response.read() or b"{}")
+    finally:
+        connection.close()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="R2 citecheck daemon")
+    parser.add_argument("--host", default=settings.DAEMON_HOST)
+    parser.add_argument("--port", type=int, default=settings.DAEMON_PORT)
+    parser.add_argument("--socket", default=None, help="Unix socket path (instead of host:port)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="Run the daemon")
+    serve_parser.add_argument("--jobs", type=int, default=settings.DAEMON_MAX_JOBS,
+                              help="Articles processed at once")
+    serve_parser.add_argument("--llm-rate", type=float, default=None,
+                              help="LLM requests per second shared by all jobs (0 = no cap; default from settings)")
+    serve_parser.add_argument("--llm-burst", type=int, default=settings.LLM_BURST)
+
+    submit_parser = commands.add_parser("submit", help="Queue an article")
+    submit_parser.add_argument("--word-doc", required=True)
+    submit_parser.add_argument("--spreadsheet", default=None)
+    submit_parser.add_argument("--r1-dir", dest="r1_pdf_dir", default=None)
+    submit_parser.add_argument("--footnotes", default=None, help='Footnote range, e.g. "89-100,130"')
+    submit_parser.add_argument("--article", default=None, help="Output folder name (default: document name)")
+    submit_parser.add_argument("--batch-name", default=None)
+    submit_parser.add_argument("--workers", type=int, default=1)
+    submit_parser.add_argument("--full", action="store_true", help="Reprocess unchanged citations")
+    submit_parser.add_argument("--user", default=getpass.getuser())
+
+    status_parser = commands.add_parser("status", help="Daemon status, or one job's")
+    status_parser.add_argument("job_id", nargs="?", type=int)
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        return serve(args)
+
+    connection = {"host": args.host, "port": args.port, "socket_path": args.socket}
+    if args.command == "submit":
+        spec = {key: value for key, value in vars(args).items()
+                if key in ("word_doc", "spreadsheet", "r1_pdf_dir", "footnotes", "article", "batch_name",
+                           "workers", "full", "user") and value is not None}
+        status, body = request("POST", "/jobs", spec, **connection)
+    else:
+        path = f"/jobs/{args.job_id}" if args.job_id else "/status"
+        status, body = request("GET", path, **connection)
+    print(json.dumps(body, indent=2))
+    return 0 if status < 400 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
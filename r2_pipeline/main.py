@@ -7,6 +7,7 @@ from pathlib import Path
 from typing import Dict, List, Optional
 import json
 import re
+import threading
 import fitz  # PyMuPDF
 import pandas as pd
 from docx import Document
@@ -21,16 +22,21 @@ colorama_init(autoreset=True)
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
 from config import settings
-from src.llm_interface import LLMInterface
+from src.llm_interface import LLMInterface, LLMUsage, track_usage
 from src.pdf_processor import process_r1_pdf
 from src.citation_parser import CitationParser
+from src.short_form_index import ShortFormIndex
+from src.citation_key import CitationRegistry
+from src.fingerprint import PriorResults, citation_fingerprint, file_digest
 from src.citation_validator import CitationValidator
 from src.support_checker import SupportChecker
+from src.evidence_selector import EvidenceSelector
 from src.quote_verifier import QuoteVerifier
 from src.r2_generator import R2Generator
 from src.spreadsheet_updater import SpreadsheetUpdater
 from src.markdown_utils import normalize_markdown_spacing
 from src.word_editor import WordEditor
+from src import tracing
 
 # Setup logging
 log_file_path = settings.LOG_DIR / "pipeline.log"
@@ -68,16 +74,62 @@ def _parse_footnote_range(range_str: str) -> List[int]:
                 logger.warning(f"Invalid single footnote number: {part}. Skipping.")
     return sorted(list(footnote_numbers))
 
-class R2Pipeline:
-    """Main class to orchestrate the R2 citecheck pipeline."""
-    
-    def __init__(self, batch_name: Optional[str] = None):
+class PipelineServices:
+    """Parts of the pipeline that do not depend on the article: the LLM client and
+    Bluebook assistant, the rule indexes and the prompt templates. One instance can
+    serve many runs; the daemon keeps one warm for every article it processes."""
+
+    def __init__(self, pdf_cache=None):
+        """
+        Args:
+            pdf_cache: Processed R1 PDFs kept across runs (anything with get(key, compute));
+                None processes them per run, sharing only those used by several citations
+        """
         self.llm = LLMInterface()
         self.citation_validator = CitationValidator(self.llm)
         self.support_checker = SupportChecker(self.llm)
+        self.evidence_selector = EvidenceSelector(settings.EVIDENCE_TOKEN_BUDGET, settings.EVIDENCE_PASSAGE_WORDS,
+                                                  settings.EVIDENCE_NEIGHBOR_PAGES)
+        self.pdf_cache = pdf_cache
+
+
+class R2Pipeline:
+    """Main class to orchestrate the R2 citecheck pipeline."""
+    
+    def __init__(self, batch_name: Optional[str] = None, services: Optional[PipelineServices] = None,
+                 word_doc_path: Optional[Path] = None, spreadsheet_path: Optional[Path] = None,
+                 r1_pdf_dir: Optional[Path] = None, output_dir: Optional[Path] = None):
+        """
+        Args:
+            batch_name: Name of this run (auto-generated from the time if None)
+            services: Warm shared components (built here if None)
+            word_doc_path, spreadsheet_path, r1_pdf_dir: The article's inputs (settings paths if None)
+            output_dir: Directory for this article's logs, reports, R2 PDFs and edited
+                document; None writes them to the settings directories
+        """
+        self.services = services or PipelineServices()
+        self.llm = self.services.llm
+        # This run's share of the LLM usage; the services' LLM may serve other runs at once
+        self.llm_usage = LLMUsage()
+        self.citation_validator = self.services.citation_validator
+        self.support_checker = self.services.support_checker
+        self.evidence_selector = self.services.evidence_selector
         self.quote_verifier = QuoteVerifier()
-        self.word_editor = WordEditor(settings.WORD_DOC_PATH)
-        self.spreadsheet_updater = SpreadsheetUpdater(settings.SPREADSHEET_PATH)
+
+        self.word_doc_path = Path(word_doc_path or settings.WORD_DOC_PATH)
+        self.r1_pdf_dir = Path(r1_pdf_dir or settings.R1_PDF_DIR)
+        if output_dir is None:
+            self.log_dir, self.report_dir, self.r2_pdf_dir = settings.LOG_DIR, settings.REPORT_DIR, settings.R2_PDF_DIR
+            self.edited_doc_path = settings.OUTPUT_DIR / "Bersh_R2_Edited.docx"
+        else:
+            output_dir = Path(output_dir)
+            self.log_dir, self.report_dir, self.r2_pdf_dir = output_dir / "logs", output_dir / "reports", output_dir / "r2_pdfs"
+            for dir_path in (self.log_dir, self.report_dir, self.r2_pdf_dir):
+                dir_path.mkdir(parents=True, exist_ok=True)
+            self.edited_doc_path = output_dir / f"{self.word_doc_path.stem}_R2_Edited.docx"
+        self.word_editor = WordEditor(self.word_doc_path)
+        self.spreadsheet_updater = SpreadsheetUpdater(Path(spreadsheet_path or settings.SPREADSHEET_PATH),
+                                                      streaming=settings.SPREADSHEET_STREAMING)
 
         # Set batch name (manual or auto-generated)
         if batch_name:
@@ -90,8 +142,27 @@ class R2Pipeline:
 
         self.human_review_queue = []
         self.full_log = []
+
+        # Antecedents for Id./supra, and processed R1 PDFs shared with short forms
+        self.short_forms = ShortFormIndex()
+        self.citation_keys = CitationRegistry(self.short_forms)
+        self._pdf_cache: Dict[str, Dict] = {}
+        self._pdf_locks: Dict[str, threading.Lock] = {}
+        self._pdf_cache_lock = threading.Lock()
+
+        # Inputs each citation's result depends on, for incremental re-runs
+        self.footnote_texts: Dict[int, str] = {}
+        self.fingerprints: Dict[tuple, str] = {}
+        self._pdf_digests: Dict[str, Optional[str]] = {}
+        self.carried_forward = 0
+        self._proposition_index = None
+        self._proposition_lock = threading.Lock()
+
+        if settings.TRACING_ENABLED:
+            tracing.enable()
     
 
+    @tracing.traced("docx.extract")
     def _extract_citations_from_word(self, target_footnotes: List[int] = None) -> List[Dict]:
         """Extract footnotes and parse them into citations.
 
@@ -101,7 +172,7 @@ class R2Pipeline:
         """
         logger.info("Extracting footnotes from Word document...")
 
-        doc = Document(settings.WORD_DOC_PATH)
+        doc = Document(self.word_doc_path)
         all_citations = []
 
         # Access footnotes through XML structure
@@ -138,10 +209,6 @@ class R2Pipeline:
                     # Displayed footnote number = XML ID - 1
                     footnote_num = int(fn_id) - 1
 
-                    # Skip if not in target list
-                    if target_footnotes and footnote_num not in target_footnotes:
-                        continue
-
                     # Extract text from all paragraphs in this footnote WITH formatting
                     footnote_text = ""
                     for para in footnote.findall('.//w:p', ns):
@@ -175,9 +242,19 @@ class R2Pipeline:
                     if footnote_text.strip():
                         # Normalize markdown spacing (move spaces outside formatting markers)
                         footnote_text = normalize_markdown_spacing(footnote_text.strip())
+                        self.footnote_texts[footnote_num] = footnote_text
                         logger.debug(f"DEBUG: Extracted raw footnote {footnote_num} text: {footnote_text[:200]}...")
-                        parser = CitationParser(footnote_text, footnote_num)
-                        parsed_citations = parser.parse()
+                        with tracing.span("parse", footnote=footnote_num):
+                            parsed_citations = CitationParser(footnote_text, footnote_num).parse()
+
+                        # Every footnote feeds the short-form index so Id./supra in the
+                        # target range can resolve to earlier footnotes
+                        self.short_forms.add_footnote(footnote_num, parsed_citations)
+                        for cit in parsed_citations:
+                            self.citation_keys.register(cit)
+                        if target_footnotes and footnote_num not in target_footnotes:
+                            continue
+
                         logger.debug(f"DEBUG: Footnote {footnote_num} parsed into {len(parsed_citations)} structured citations.")
                         for i, cit in enumerate(parsed_citations):
                             logger.debug(f"DEBUG:   Parsed citation {i+1} (FN{cit.footnote_num}, Cite{cit.citation_num}): {cit.full_text[:100]}...")
@@ -199,6 +276,7 @@ class R2Pipeline:
         logger.info(f"Extracted {len(all_citations)} citations from {len(target_footnotes) if target_footnotes else 0} footnotes.")
         return all_citations
 
+    @tracing.traced("pdf.find")
     def _find_r1_pdf_for_citation(self, citation: Dict) -> Optional[Path]:
         """Find the R1 PDF that corresponds to a given citation."""
         logger.info(f"  Searching for R1 PDF for FN {citation.footnote_num}...")
@@ -210,7 +288,7 @@ class R2Pipeline:
             pass
 
         # Look for PDF matching footnote number AND citation number pattern: R1-078-01-*
-        r1_dir = settings.R1_PDF_DIR
+        r1_dir = self.r1_pdf_dir
         pattern = f"R1-{citation.footnote_num:03d}-{citation.citation_num:02d}*.pdf"
 
         logger.debug(f"DEBUG: R1_PDF_DIR: {r1_dir}")
@@ -224,17 +302,108 @@ class R2Pipeline:
             logger.info(f"  -> Found matching PDF: {pdf_path.name}")
             return pdf_path
 
+        # Short forms usually share their antecedent's source
+        if citation.antecedent_footnote is not None:
+            pattern = f"R1-{citation.antecedent_footnote:03d}-{citation.antecedent_citation:02d}*.pdf"
+            matching_pdfs = list(r1_dir.glob(pattern))
+            if matching_pdfs:
+                logger.info(f"  -> Reusing antecedent PDF (FN {citation.antecedent_footnote}, "
+                            f"Cite {citation.antecedent_citation}): {matching_pdfs[0].name}")
+                return matching_pdfs[0]
+
+        # Repeat full citations share the first citation of the same source
+        first = self.citation_keys.first_occurrence(citation)
+        if first is not None:
+            pattern = f"R1-{first.footnote_num:03d}-{first.citation_num:02d}*.pdf"
+            matching_pdfs = list(r1_dir.glob(pattern))
+            if matching_pdfs:
+                logger.info(f"  -> Reusing PDF of {citation.canonical_key} (FN {first.footnote_num}, "
+                            f"Cite {first.citation_num}): {matching_pdfs[0].name}")
+                return matching_pdfs[0]
+
         logger.warning(f"  -> No matching R1 PDF found for FN {citation.footnote_num}, Cite {citation.citation_num}")
         return None
 
-    def run(self, target_footnotes: List[int] = None, parallel: bool = True, max_workers: int = 5):
+    def _process_r1_pdf(self, pdf_path: Path, citation) -> Dict:
+        """process_r1_pdf, memoized for PDFs shared between a citation and its short forms."""
+        if self.services.pdf_cache is not None:
+            # Kept across runs, keyed by size and mtime so an edited PDF is processed again
+            stat = pdf_path.stat()
+            return self.services.pdf_cache.get((str(pdf_path), stat.st_size, stat.st_mtime_ns),
+                                               lambda: process_r1_pdf(pdf_path))
+        if (citation.antecedent_footnote is None and not self.short_forms.is_antecedent(citation)
+                and not self.citation_keys.is_shared(citation)):
+            return process_r1_pdf(pdf_path)
+
+        key = str(pdf_path)
+        with self._pdf_cache_lock:
+            lock = self._pdf_locks.setdefault(key, threading.Lock())
+        with lock:
+            if key not in self._pdf_cache:
+                self._pdf_cache[key] = process_r1_pdf(pdf_path)
+            else:
+                logger.info(f"  -> Reusing processed PDF {pdf_path.name}")
+            return self._pdf_cache[key]
+
+    def _fingerprint(self, citation) -> str:
+        """Hash of the citation's footnote text, proposition, R1 PDF and antecedent."""
+        pdf_path = self._find_r1_pdf_for_citation(citation)
+        key = str(pdf_path)
+        with self._pdf_cache_lock:
+            if key not in self._pdf_digests:
+                self._pdf_digests[key] = file_digest(pdf_path)
+            pdf_digest = self._pdf_digests[key]
+        antecedent = self.short_forms.antecedent_of(citation)
+        return citation_fingerprint(
+            citation,
+            self.footnote_texts.get(citation.footnote_num, ""),
+            self._get_proposition_for_footnote(citation.footnote_num),
+            pdf_digest,
+            antecedent.full_text if antecedent is not None else None,
+        )
+
+    @tracing.traced("fingerprint")
+    def _carry_forward_unchanged(self, citations: List, incremental: bool = True) -> List:
+        """Fingerprint the citations and carry forward previous results for unchanged ones.
+
+        Fingerprints are logged even on full runs so the next run can be incremental.
+        Returns the citations that still need processing.
+        """
+        prior = PriorResults(self.log_dir / "full_pipeline_log.json") if incremental else None
+        changed, carried = [], []
+        for citation in citations:
+            fingerprint = self._fingerprint(citation)
+            self.fingerprints[(citation.footnote_num, citation.citation_num)] = fingerprint
+            result = prior.carry_forward(citation, fingerprint) if prior else None
+            if result is None:
+                changed.append(citation)
+            else:
+                carried.append(result)
+
+        if carried:
+            for result in carried:
+                self._apply_citation_result(result, save_log=False)
+            self._save_incremental_log(*carried)
+            self.carried_forward = len(carried)
+            logger.info(f"{Fore.CYAN}Incremental run: {len(changed)} changed citations to process, "
+                        f"{len(carried)} unchanged carried forward{Style.RESET_ALL}")
+        return changed
+
+    def run(self, target_footnotes: List[int] = None, parallel: bool = True, max_workers: int = 5,
+            incremental: bool = True):
         """Run the full R2 pipeline.
 
         Args:
             target_footnotes: A list of specific footnote numbers to process.
             parallel: Whether to process citations in parallel (default: True)
             max_workers: Maximum number of parallel workers (default: 5)
+            incremental: Reuse the previous results of citations whose footnote text,
+                proposition and R1 PDF are unchanged (default: True)
         """
+        with track_usage(self.llm_usage):
+            self._run(target_footnotes, parallel, max_workers, incremental)
+
+    def _run(self, target_footnotes: Optional[List[int]], parallel: bool, max_workers: int, incremental: bool):
         logger.info(f"{Fore.CYAN}Starting R2 Automated Citecheck Pipeline{Style.RESET_ALL}")
         logger.info(f"{Fore.YELLOW}Batch: {self.batch_name}{Style.RESET_ALL}")
 
@@ -243,9 +412,10 @@ class R2Pipeline:
         if not citations:
             logger.error("No citations found. Aborting.")
             return
+        citations = self._carry_forward_unchanged(citations, incremental)
 
         # 2. Process citations (parallel or sequential)
-        if parallel:
+        if parallel and citations:
             logger.info(f"{Fore.CYAN}Processing {len(citations)} citations in parallel (max {max_workers} workers){Style.RESET_ALL}")
             from concurrent.futures import ThreadPoolExecutor, as_completed
             import time
@@ -267,7 +437,7 @@ class R2Pipeline:
                         logger.info(f"Staggering worker {i+1}/{max_workers} - waiting 2 seconds...")
                         time.sleep(2)
                     citation = citations[citation_index]
-                    future = executor.submit(self._process_single_citation, citation)
+                    future = executor.submit(tracing.bind(self._process_single_citation), citation)
                     future_to_citation[future] = citation
                     citation_index += 1
 
@@ -318,7 +488,7 @@ class R2Pipeline:
                                 citation_index += 1
 
                             if next_citation:
-                                next_future = executor.submit(self._process_single_citation, next_citation)
+                                next_future = executor.submit(tracing.bind(self._process_single_citation), next_citation)
                                 future_to_citation[next_future] = next_citation
 
             # Safety check: warn if retry queue has unprocessed items
@@ -342,8 +512,12 @@ class R2Pipeline:
         self._save_outputs()
 
         logger.info(f"{Fore.GREEN}Pipeline finished!{Style.RESET_ALL}")
+        if tracing.enabled():
+            self._save_trace()
         self._print_summary()
 
+    @tracing.traced("citation", tags=lambda self, citation: {"footnote": citation.footnote_num,
+                                                             "cite": citation.citation_num})
     def _process_single_citation(self, citation: Dict):
         """Process one citation through all relevant pipeline stages.
         Returns the result dict instead of updating shared resources."""
@@ -365,6 +539,8 @@ class R2Pipeline:
             "r1_pdf_path": None,
             "r2_pdf_path": None
         }
+        if citation.antecedent_footnote is not None:
+            result_log["antecedent"] = f"{citation.antecedent_footnote}-{citation.antecedent_citation}"
 
         # STAGE 1: PDF Processing (find relevant PDF) - DO THIS FIRST so R2 PDFs can be generated even if validation fails
         r1_pdf_path = self._find_r1_pdf_for_citation(citation)
@@ -378,7 +554,12 @@ class R2Pipeline:
 
         # STAGE 2: Citation Format Validation (do this early but don't stop processing if it fails)
         logger.info("  Validating citation format...")
-        validation_result = self.citation_validator.validate_citation(citation)
+        if self.short_forms.is_bare(citation):
+            # Nothing here beyond the antecedent and a pinpoint; no LLM call needed
+            validation_result = self.citation_validator.validate_short_form(
+                citation, self.short_forms.errors_for(citation))
+        else:
+            validation_result = self._validate_with_reuse(citation)
 
         # Safely extract validation data - handle None case from API failures
         validation_data = None
@@ -408,7 +589,7 @@ class R2Pipeline:
             # DON'T return - continue processing to get support analysis and generate R2 PDF
 
         # STAGE 3: PDF Content Processing
-        pdf_data = process_r1_pdf(r1_pdf_path)
+        pdf_data = self._process_r1_pdf(r1_pdf_path, citation)
         if not pdf_data["success"]:
              logger.error(f"  -> PDF processing failed for {r1_pdf_path}")
              result_log["error"] = "PDF processing failed"
@@ -435,6 +616,7 @@ class R2Pipeline:
 
         # Combine redboxed text - filter out corrupted regions
         all_redbox_text = []
+        usable_regions = []
         corrupted_regions = []
 
         for i, region in enumerate(pdf_data["redboxed_regions"]):
@@ -449,6 +631,7 @@ class R2Pipeline:
 
             if text:  # Only skip completely empty text
                 all_redbox_text.append(f"[Region {i+1}, Page {region['page']}]: {text}")
+                usable_regions.append({"number": i+1, "page": region["page"], "text": text})
 
         if corrupted_regions:
             logger.warning(f"  -> Excluded {len(corrupted_regions)} corrupted region(s): {corrupted_regions}")
@@ -466,9 +649,16 @@ class R2Pipeline:
         # Get proposition from Word doc (simplified)
         proposition = self._get_proposition_for_footnote(fn_num)
 
+        # Only the passages most relevant to the proposition go to the support check
+        with tracing.span("evidence.select"):
+            evidence = self.evidence_selector.select(proposition, usable_regions, pdf_data["full_text"])
+        result_log["evidence"] = evidence.to_dict()
+        logger.info(f"  -> Sending {len(evidence.sent)} of {evidence.candidates} passages "
+                    f"(~{evidence.sent_tokens} of {evidence.source_tokens} tokens)")
+
         # STAGE 4: Support Verification
         logger.info("  Verifying if source supports proposition...")
-        support_result = self.support_checker.check_support(proposition, source_text, citation.full_text)
+        support_result = self.support_checker.check_support(proposition, evidence.text, citation.full_text)
 
         # Safely extract support analysis - handle None case from API failures
         if support_result and support_result.get("success"):
@@ -495,11 +685,11 @@ class R2Pipeline:
         # Generate R2 PDF immediately (before returning)
         if result_log.get("r1_pdf_path"):
             logger.info("  Generating R2 PDF...")
-            from src.r2_generator import R2Generator
-            r2_gen = R2Generator(result_log["r1_pdf_path"], settings.R2_PDF_DIR)
-            r2_gen.add_validation_annotations(result_log)
-            r2_pdf_path = r2_gen.save_r2_pdf()
-            r2_gen.close()
+            with tracing.span("output.r2_pdf"):
+                r2_gen = R2Generator(result_log["r1_pdf_path"], self.r2_pdf_dir)
+                r2_gen.add_validation_annotations(result_log)
+                r2_pdf_path = r2_gen.save_r2_pdf()
+                r2_gen.close()
             result_log["r2_pdf_path"] = str(r2_pdf_path)
             logger.info(f"  ✓ R2 PDF saved: {r2_pdf_path}")
         else:
@@ -507,11 +697,33 @@ class R2Pipeline:
 
         return result_log
 
-    def _apply_citation_result(self, result: Dict):
+    def _validate_with_reuse(self, citation) -> Dict:
+        """validate_citation, sharing one AI validation between repeat citations of a source."""
+        short_form_errors = self.short_forms.errors_for(citation)
+        if not self.citation_keys.can_share_validation(citation):
+            return self.citation_validator.validate_citation(citation, short_form_errors=short_form_errors)
+
+        with self.citation_keys.validation_lock(citation):
+            shared = self.citation_keys.shared_validation(citation)
+            if shared is not None:
+                logger.info(f"  -> Reusing format validation for {citation.canonical_key}")
+                return self.citation_validator.reuse_validation(citation, shared, short_form_errors)
+
+            result = self.citation_validator.validate_citation(citation, short_form_errors=short_form_errors)
+            validation = result.get("validation") if result and result.get("success") else None
+            if self.citation_validator.is_shareable(validation, citation):
+                self.citation_keys.store_validation(citation, validation)
+            return result
+
+    @tracing.traced("output.apply", tags=lambda self, result, *args, **kwargs: {"footnote": result["footnote"],
+                                                                                "cite": result["cite_num"]})
+    def _apply_citation_result(self, result: Dict, save_log: bool = True):
         """Apply the results of citation processing to shared resources (thread-safe)."""
 
         fn_num = result["footnote"]
         cite_num = result["cite_num"]
+        if (fn_num, cite_num) in self.fingerprints:
+            result["fingerprint"] = self.fingerprints[(fn_num, cite_num)]
 
         # Apply Word doc correction if needed
         if result.get("needs_word_correction") and result.get("corrected_text"):
@@ -545,11 +757,13 @@ class R2Pipeline:
         self.full_log.append(result)
 
         # Save log incrementally after each citation
-        self._save_incremental_log(result)
+        if save_log:
+            self._save_incremental_log(result)
 
-    def _save_incremental_log(self, new_entry: Dict):
-        """Append a single entry to the cumulative pipeline log."""
-        log_path = settings.LOG_DIR / "full_pipeline_log.json"
+    @tracing.traced("output.log")
+    def _save_incremental_log(self, *new_entries: Dict):
+        """Append entries to the cumulative pipeline log."""
+        log_path = self.log_dir / "full_pipeline_log.json"
 
         # Load existing log if it exists
         existing_log = []
@@ -564,78 +778,89 @@ class R2Pipeline:
                 logger.warning(f"Could not load existing log: {e}. Starting fresh.")
                 existing_log = []
 
-        # Append the new result
-        existing_log.append(new_entry)
+        # Append the new results
+        existing_log.extend(new_entries)
 
         # Save the updated cumulative log
         with open(log_path, 'w') as f:
             json.dump(existing_log, f, indent=2)
 
+    def _get_proposition_index(self):
+        """Main text with footnote markers and each footnote reference's position, built once."""
+        with self._proposition_lock:
+            if self._proposition_index is None:
+                self._proposition_index = self._build_proposition_index()
+            return self._proposition_index
+
+    def _build_proposition_index(self):
+        from lxml import etree
+
+        # Get document XML
+        doc = self.word_editor.doc
+
+        # Extract all text with footnote references
+        full_text_parts = []
+        footnote_positions = {}  # {footnote_num: position_in_text}
+        current_char_pos = 0
+
+        for para in doc.paragraphs:
+            para_text = []
+
+            # Parse paragraph XML to find footnote references in order
+            for run in para.runs:
+                run_element = run._element
+
+                # Check for formatting in this run
+                rPr = run_element.find('.//{http://schemas.openxmlformats.org/wordprocessingml/2006/main}rPr')
+                is_italic = False
+                is_bold = False
+                is_smallcaps = False
+
+                if rPr is not None:
+                    is_italic = rPr.find('.//{http://schemas.openxmlformats.org/wordprocessingml/2006/main}i') is not None
+                    is_bold = rPr.find('.//{http://schemas.openxmlformats.org/wordprocessingml/2006/main}b') is not None
+                    is_smallcaps = rPr.find('.//{http://schemas.openxmlformats.org/wordprocessingml/2006/main}smallCaps') is not None
+
+                # Process run children in order (text and footnote refs interspersed)
+                for child in run_element:
+                    # Check if it's a text element
+                    if child.tag == '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}t':
+                        if child.text:
+                            text = child.text
+                            # Wrap with formatting markers
+                            if is_italic:
+                                text = f"*{text}*"
+                            if is_bold:
+                                text = f"**{text}**"
+                            if is_smallcaps:
+                                text = f"[SC]{text}[/SC]"
+                            para_text.append(text)
+                    # Check if it's a footnote reference
+                    elif child.tag == '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}footnoteReference':
+                        fn_id = child.get('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}id')
+                        if fn_id:
+                            fn_num = int(fn_id)
+                            # Record position BEFORE adding marker
+                            current_pos = current_char_pos + len(''.join(para_text))
+                            footnote_positions[fn_num] = current_pos
+                            para_text.append(f"[FN{fn_num}]")  # Marker for footnote
+
+            para_combined = ''.join(para_text)
+            full_text_parts.append(para_combined)
+            # Add to character position (paragraph text + space separator)
+            current_char_pos += len(para_combined) + 1  # +1 for space between paragraphs
+
+        # Combine all paragraphs
+        combined_text = ' '.join(full_text_parts)
+        return combined_text, footnote_positions
+
     def _get_proposition_for_footnote(self, footnote_num: int) -> str:
         """
         Extract the proposition for a footnote.
         The proposition for FN N is the text between FN (N-1) and FN N.
         """
         try:
-            from lxml import etree
-
-            # Get document XML
-            doc = self.word_editor.doc
-
-            # Extract all text with footnote references
-            full_text_parts = []
-            footnote_positions = {}  # {footnote_num: position_in_text}
-            current_char_pos = 0
-
-            for para in doc.paragraphs:
-                para_text = []
-
-                # Parse paragraph XML to find footnote references in order
-                for run in para.runs:
-                    run_element = run._element
-
-                    # Check for formatting in this run
-                    rPr = run_element.find('.//{http://schemas.openxmlformats.org/wordprocessingml/2006/main}rPr')
-                    is_italic = False
-                    is_bold = False
-                    is_smallcaps = False
-
-                    if rPr is not None:
-                        is_italic = rPr.find('.//{http://schemas.openxmlformats.org/wordprocessingml/2006/main}i') is not None
-                        is_bold = rPr.find('.//{http://schemas.openxmlformats.org/wordprocessingml/2006/main}b') is not None
-                        is_smallcaps = rPr.find('.//{http://schemas.openxmlformats.org/wordprocessingml/2006/main}smallCaps') is not None
-
-                    # Process run children in order (text and footnote refs interspersed)
-                    for child in run_element:
-                        # Check if it's a text element
-                        if child.tag == '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}t':
-                            if child.text:
-                                text = child.text
-                                # Wrap with formatting markers
-                                if is_italic:
-                                    text = f"*{text}*"
-                                if is_bold:
-                                    text = f"**{text}**"
-                                if is_smallcaps:
-                                    text = f"[SC]{text}[/SC]"
-                                para_text.append(text)
-                        # Check if it's a footnote reference
-                        elif child.tag == '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}footnoteReference':
-                            fn_id = child.get('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}id')
-                            if fn_id:
-                                fn_num = int(fn_id)
-                                # Record position BEFORE adding marker
-                                current_pos = current_char_pos + len(''.join(para_text))
-                                footnote_positions[fn_num] = current_pos
-                                para_text.append(f"[FN{fn_num}]")  # Marker for footnote
-
-                para_combined = ''.join(para_text)
-                full_text_parts.append(para_combined)
-                # Add to character position (paragraph text + space separator)
-                current_char_pos += len(para_combined) + 1  # +1 for space between paragraphs
-
-            # Combine all paragraphs
-            combined_text = ' '.join(full_text_parts)
+            combined_text, footnote_positions = self._get_proposition_index()
 
             logger.debug(f"Found {len(footnote_positions)} footnote references in document")
             logger.debug(f"Footnote positions around {footnote_num}: {dict(sorted([(k,v) for k,v in footnote_positions.items() if abs(k-footnote_num) <= 2]))}")
@@ -708,25 +933,35 @@ class R2Pipeline:
         
         return "approve"
         
+    @tracing.traced("output.save")
     def _save_outputs(self):
         """Save logs, reports, and updated documents."""
         # Save spreadsheet
-        self.spreadsheet_updater.save()
-        self.spreadsheet_updater.close()
+        with tracing.span("output.spreadsheet"):
+            self.spreadsheet_updater.save()
+            self.spreadsheet_updater.close()
 
         # Save Word doc
-        self.word_editor.save(settings.OUTPUT_DIR / "Bersh_R2_Edited.docx")
+        with tracing.span("output.docx"):
+            self.word_editor.save(self.edited_doc_path)
 
         # Log completion
-        log_path = settings.LOG_DIR / "full_pipeline_log.json"
+        log_path = self.log_dir / "full_pipeline_log.json"
         logger.info(f"Batch '{self.batch_name}' processing complete. Full log at {log_path}")
 
         # Save human review queue
         self._generate_review_report()
 
+    def _save_trace(self):
+        """Write this batch's spans as a Chrome trace and a per-stage histogram."""
+        trace_path = self.log_dir / f"trace_{self.batch_name}.json"
+        tracing.tracer.write(trace_path, self.log_dir / f"trace_{self.batch_name}_stages.json")
+        print(f"Trace: {trace_path} (open in chrome://tracing or ui.perfetto.dev)")
+
+    @tracing.traced("output.report")
     def _generate_review_report(self):
         """Generate HTML report for human review queue."""
-        report_path = settings.REPORT_DIR / "human_review_queue.html"
+        report_path = self.report_dir / "human_review_queue.html"
         
         html = "<html><head><title>R2 Review Queue</title>"
         html += "<style>body { font-family: sans-serif; } .item { border: 1px solid #ccc; padding: 10px; margin-bottom: 10px; } </style>"
@@ -759,18 +994,32 @@ class R2Pipeline:
 
     def _print_summary(self):
         """Print summary of pipeline run."""
-        llm_stats = self.llm.get_stats()
+        llm_stats = self.llm_usage.get_stats()
 
         print("\n" + "="*50)
         print(f"{Fore.CYAN}PIPELINE SUMMARY{Style.RESET_ALL}")
         print("="*50)
         print(f"Total citations processed: {len(self.full_log)}")
+        if self.carried_forward:
+            print(f"Unchanged since last batch (carried forward): {self.carried_forward}")
         print(f"Items flagged for human review: {len(self.human_review_queue)}")
         print("\n--- LLM USAGE ---")
         print(f"Total GPT calls: {llm_stats['total_calls']}")
         print(f"Total tokens used: {llm_stats['total_tokens']}")
         print(f"Estimated cost: ${llm_stats['total_cost']:.4f}")
+        dedup = self.citation_keys.stats()
+        print("\n--- SOURCE DEDUPLICATION ---")
+        print(f"Unique sources: {dedup['unique_sources']} of {dedup['citations']} citations "
+              f"({dedup['dedup_ratio']} repeats)")
+        print(f"Format validations reused: {dedup['validations_reused']}")
+        if tracing.enabled():
+            stages = tracing.tracer.stage_histogram()
+            print("\n--- TIME BY STAGE (self time, top 8) ---")
+            for name, stats in sorted(stages.items(), key=lambda item: -item[1]["self_s"])[:8]:
+                print(f"{name:<22} {stats['self_s']:>9.2f}s  n={stats['count']:<5} "
+                      f"p50={stats['p50_ms']:.0f}ms p95={stats['p95_ms']:.0f}ms")
         print("="*50)
+        logger.info(f"Source deduplication: {dedup}")
         
 if __name__ == "__main__":
     import argparse
@@ -788,7 +1037,13 @@ if __name__ == "__main__":
                        help='Process citations sequentially')
     parser.add_argument('--workers', type=int, default=1,
                        help='Maximum number of parallel workers (default: 1, sequential)')
+    parser.add_argument('--full', dest='incremental', action='store_false',
+                       help='Reprocess every citation, even ones unchanged since the last batch')
+    parser.add_argument('--trace', action='store_true',
+                       help='Record stage timings and write a Chrome trace to the log directory')
     args = parser.parse_args()
+    if args.trace:
+        tracing.enable()
 
     target_footnotes = []
     if args.footnotes:
@@ -798,4 +1053,5 @@ if __name__ == "__main__":
     target_footnotes = sorted(list(set(target_footnotes))) # Remove duplicates and sort
 
     pipeline = R2Pipeline(batch_name=args.batch_name)
-    pipeline.run(target_footnotes=target_footnotes, parallel=args.parallel, max_workers=args.workers)
+    pipeline.run(target_footnotes=target_footnotes, parallel=args.parallel, max_workers=args.workers,
+                 incremental=args.incremental)
@@ -0,0 +1,184 @@
+"""
+Canonical keys for the authorities an article cites.
+
+A citation's key names its source independent of signal, pincite and
+parentheticals ("cite:573 u.s. 208", "usc:35 101", "doi:10.1000/xyz"). Repeat
+citations of a source share its R1 PDF, and repeat citations whose text only
+differs in the pincite share one LLM format validation.
+"""
+import re
+import logging
+import threading
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from src.citation_parser import Citation, CitationParser
+from src.short_form_index import REPORTER_ABBREVIATIONS, ShortFormIndex, plain_text
+
+logger = logging.getLogger(__name__)
+
+DOI_RE = re.compile(r'\b(10\.\d{4,9}/[^\s,;()"“”]+)', re.IGNORECASE)
+URL_RE = re.compile(r'https?://[^\s<>()"“”]+', re.IGNORECASE)
+USC_RE = re.compile(r'\b(\d+)\s+U\.S\.C\.(?:A\.)?\s*§+\s*([0-9A-Za-z]+(?:-[0-9A-Za-z]+)?)')
+CFR_RE = re.compile(r'\b(\d+)\s+C\.F\.R\.\s*§*\s*([0-9]+(?:\.[0-9A-Za-z-]+)?)')
+WESTLAW_RE = re.compile(r'\b(\d{4})\s+WL\s+(\d+)')
+REPORT_RE = re.compile(r'\b(S\.|H\.R\.)\s+Rep\.\s+No\.\s+(\d+-\d+)')
+# Volume, known case reporter, first page: "573 U.S. 208", "180 F. Supp. 2d 1072"
+CASE_REPORTER_RE = re.compile(r"\b(\d{1,4})\s+(" + REPORTER_ABBREVIATIONS + r")\s+(\d{1,6})\b")
+# Volume, abbreviated journal or other reporter, first page: "24 U. Denv. Sports & Ent. L.J. 75".
+# The title must end in an abbreviation, so "2019 Congress Passed 12" is not a source.
+REPORTER_RE = re.compile(
+    r"\b(\d{1,4})\s+((?:(?:[A-Z][A-Za-z0-9.'’]*|&|of|on|and|for|the|in|\d+(?:d|th))\s+){0,9}?"
+    r"(?:[A-Z][A-Za-z0-9'’]*\.[A-Za-z0-9.'’]*|\d+(?:d|th)))\s+(\d{1,6})\b")
+# Transcripts and briefs cite the case they were filed in; the document itself has no key
+FILING_RE = re.compile(r"^(?:Transcript|Brief)\b[^,]*?\bat\s+\*?\d+", re.IGNORECASE)
+
+# Pincites that vary between otherwise identical citations
+REPORTER_PINCITE_RE = re.compile(REPORTER_RE.pattern + r"(?:,\s*\*?\d+(?:[-–]\d+)?(?:\s*&\s*n\.\s*\d+|\s*n\.\s*\d+)?)+")
+AT_PINCITE_RE = re.compile(r",?\s+at\s+\*?\d+(?:[-–]\d+)?(?:\s*n\.\s*\d+)?")
+
+URL_TRAILING = '.,;:)]}"\'”’'
+
+
+def _squash(text: str) -> str:
+    return re.sub(r'\s+', '', text).lower()
+
+
+def normalize_url(url: str) -> str:
+    """Scheme-, www-, fragment- and trailing-slash-insensitive form of a URL"""
+    parts = urlsplit(url.strip().rstrip(URL_TRAILING))
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    query = f"?{parts.query}" if parts.query else ""
+    return f"{host}{parts.path.rstrip('/')}{query}"
+
+
+def _reporter_match(plain: str) -> Optional[re.Match]:
+    """First volume-reporter-page, from the known case reporters or an abbreviated title"""
+    case = CASE_REPORTER_RE.search(plain)
+    pos = 0
+    while True:
+        match = REPORTER_RE.search(plain, pos)
+        if match is None or (case and case.start() <= match.start()):
+            return case
+        if '.' in match.group(2):
+            return match
+        pos = match.start() + 1
+
+
+def canonical_key(text: str) -> Optional[str]:
+    """
+    Key of the first authority named in a citation, or None for short forms,
+    transcripts and briefs, and sources with nothing stable to key on.
+    """
+    plain = plain_text(text)
+    if FILING_RE.match(CitationParser.strip_signal(plain)):
+        return None
+    found = []
+
+    match = DOI_RE.search(plain)
+    if match:
+        found.append((match.start(), f"doi:{match.group(1).rstrip(URL_TRAILING).lower()}"))
+    match = USC_RE.search(plain)
+    if match:
+        # Subsections are pincites; the source is the section
+        found.append((match.start(), f"usc:{match.group(1)} {match.group(2).lower()}"))
+    match = CFR_RE.search(plain)
+    if match:
+        found.append((match.start(), f"cfr:{match.group(1)} {match.group(2).lower()}"))
+    match = WESTLAW_RE.search(plain)
+    if match:
+        found.append((match.start(), f"wl:{match.group(1)} {match.group(2)}"))
+    match = REPORT_RE.search(plain)
+    if match:
+        found.append((match.start(), f"report:{match.group(1).lower()} {match.group(2)}"))
+    match = _reporter_match(plain)
+    if match:
+        found.append((match.start(), f"cite:{match.group(1)} {_squash(match.group(2))} {match.group(3)}"))
+    match = URL_RE.search(plain)
+    if match:
+        found.append((match.start(), f"url:{normalize_url(match.group(0))}"))
+
+    # Earliest authority wins; on a tie, the more specific pattern (checked first)
+    return min(found, key=lambda item: item[0])[1] if found else None
+
+
+def invariant_text(text: str) -> str:
+    """Citation text with its pincites removed ("180 F.3d 1072, 1073" -> "180 F.3d 1072")"""
+    text = REPORTER_PINCITE_RE.sub(lambda m: f"{m.group(1)} {m.group(2)} {m.group(3)}", text)
+    return AT_PINCITE_RE.sub('', text).strip()
+
+
+class CitationRegistry:
+    """Canonical keys for every citation in the article, with shared format validations."""
+
+    def __init__(self, short_forms: ShortFormIndex):
+        self.short_forms = short_forms
+        self.first_by_key: Dict[str, Citation] = {}
+        self.occurrences: Dict[str, int] = {}
+        self.citations = 0
+        self.repeats = 0
+        self.validations_reused = 0
+
+        self._validations: Dict[Tuple[str, str], Dict] = {}
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def register(self, citation: Citation):
+        """Key a citation; call after ShortFormIndex.add_footnote() so short forms inherit theirs."""
+        key = canonical_key(citation.full_text)
+        antecedent = self.short_forms.antecedent_of(citation)
+        if antecedent is not None:
+            key = antecedent.canonical_key or key
+        citation.canonical_key = key
+
+        self.citations += 1
+        if key is None:
+            return
+        if key in self.first_by_key:
+            self.repeats += 1
+        else:
+            self.first_by_key[key] = citation
+        self.occurrences[key] = self.occurrences.get(key, 0) + 1
+
+    def first_occurrence(self, citation: Citation) -> Optional[Citation]:
+        """The earlier citation of the same source, if this is a repeat."""
+        first = self.first_by_key.get(citation.canonical_key) if citation.canonical_key else None
+        return first if first is not None and first is not citation else None
+
+    def is_shared(self, citation: Citation) -> bool:
+        return bool(citation.canonical_key) and self.occurrences.get(citation.canonical_key, 0) > 1
+
+    def can_share_validation(self, citation: Citation) -> bool:
+        """Full citations of a repeated source; short forms are validated on their own."""
+        return citation.antecedent_footnote is None and self.is_shared(citation)
+
+    def _validation_key(self, citation: Citation) -> Tuple[str, str]:
+        return citation.canonical_key, invariant_text(citation.full_text)
+
+    def validation_lock(self, citation: Citation) -> threading.Lock:
+        """Held while validating so a concurrent repeat waits for the result instead of re-asking."""
+        key = self._validation_key(citation)
+        with self._lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def shared_validation(self, citation: Citation) -> Optional[Dict]:
+        with self._lock:
+            shared = self._validations.get(self._validation_key(citation))
+            if shared is not None:
+                self.validations_reused += 1
+            return shared
+
+    def store_validation(self, citation: Citation, validation: Dict):
+        with self._lock:
+            self._validations.setdefault(self._validation_key(citation), validation)
+
+    def stats(self) -> Dict:
+        return {
+            "citations": self.citations,
+            "unique_sources": len(self.first_by_key),
+            "repeat_citations": self.repeats,
+            "validations_reused": self.validations_reused,
+            "dedup_ratio": f"{(self.repeats / self.citations * 100):.1f}%" if self.citations else "0%"
+        }
@@ -3,12 +3,100 @@ Parse footnotes from Word doc and structure citation data.
 Uses regex and heuristics to identify citation components.
 """
 import re
-from typing import Dict, List, Optional
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Characters that open/close protected regions or separate citations.
+# The lexer only visits these positions instead of every character.
+DELIMITERS = re.compile('[()"\u201c\u201d\'\u2018\u2019;\n]')
+DOUBLE_QUOTES = ('"', '\u201c', '\u201d')
+SINGLE_QUOTES = ("'", '\u2018', '\u2019')
+
+
+def scan_delimiters(text: str) -> Tuple[List[int], List[int], List[int]]:
+    """
+    Single pass over the parenthesis, quote and separator characters of text.
+
+    Returns:
+        (separator positions, protected region starts, protected region ends)
+        Separators are semicolons/newlines outside parentheses and quotes.
+        Protected regions are closed (...) and quoted spans, merged into
+        sorted disjoint intervals for bisect lookup.
+        Apostrophes between letters (O'Neal) are not quote delimiters.
+    """
+    separators = []
+    regions = []
+    paren_depth = 0
+    paren_start = None
+    in_dq = False; dq_start = None
+    in_sq = False; sq_start = None
+    last = len(text) - 1
+
+    for match in DELIMITERS.finditer(text):
+        i = match.start()
+        ch = text[i]
+
+        if ch == ';' or ch == '\n':
+            if paren_depth == 0 and not in_dq and not in_sq:
+                separators.append(i)
+            continue
+
+        # parentheses (only when not inside quotes)
+        if not in_dq and not in_sq:
+            if ch == '(':
+                if paren_depth == 0:
+                    paren_start = i
+                paren_depth += 1
+                continue
+            if ch == ')':
+                if paren_depth > 0:
+                    paren_depth -= 1
+                    if paren_depth == 0 and paren_start is not None:
+                        regions.append((paren_start, i + 1))
+                        paren_start = None
+                continue
+
+        if ch in DOUBLE_QUOTES:
+            if in_dq:
+                if ch != '\u201c':   # closing
+                    in_dq = False
+                    regions.append((dq_start, i + 1))
+            elif ch != '\u201d':     # opening
+                in_dq = True
+                dq_start = i
+        elif ch in SINGLE_QUOTES:
+            if ch == "'" and 0 < i < last and text[i - 1].isalnum() and text[i + 1].isalnum():
+                continue  # apostrophe, not a quote delimiter
+            if in_sq:
+                if ch != '\u2018':   # closing
+                    in_sq = False
+                    regions.append((sq_start, i + 1))
+            elif ch != '\u2019':     # opening
+                in_sq = True
+                sq_start = i
+
+    # Quotes can sit inside parentheses; merge overlaps so bisect sees disjoint spans
+    starts: List[int] = []
+    ends: List[int] = []
+    for start, end in sorted(regions):
+        if ends and start < ends[-1]:
+            ends[-1] = max(ends[-1], end)
+        else:
+            starts.append(start)
+            ends.append(end)
+
+    return separators, starts, ends
+
+
+def in_regions(pos: int, starts: List[int], ends: List[int]) -> bool:
+    """Whether pos falls inside one of the sorted disjoint [start, end) intervals"""
+    i = bisect_right(starts, pos) - 1
+    return i >= 0 and pos < ends[i]
+
 @dataclass
 class Citation:
     """Structured representation of a citation."""
@@ -37,6 +125,18 @@ class Citation:
     parenthetical: Optional[str] = None
     quoted_text: Optional[str] = None
 
+    # Short forms: the name a supra/short case cite uses, a [hereinafter] label
+    # defined by a full cite, and the full cite a short form refers back to
+    # (filled in by ShortFormIndex)
+    short_name: Optional[str] = None
+    hereinafter: Optional[str] = None
+    antecedent_footnote: Optional[int] = None
+    antecedent_citation: Optional[int] = None
+
+    # Authority the citation points to ("cite:573 u.s. 208"), shared by repeat
+    # citations and short forms (filled in by CitationRegistry)
+    canonical_key: Optional[str] = None
+
     # Validation flags
     has_errors: bool = False
     error_messages: List[str] = field(default_factory=list)
@@ -81,6 +181,47 @@ class CitationParser:
     # Statute patterns
     STATUTE_PATTERN = r'\d+\s+U\.S\.C\.\s+§\s*\d+'
 
+    # --- Precompiled lexer patterns (built once per class, not per call) ---
+    SIGNALS_LOWER = tuple(sig.lower() for sig in SIGNALS)
+    SIGNALS_BY_LENGTH = tuple(sorted(SIGNALS_LOWER, key=len, reverse=True))
+
+    # All signals but 'with' in one alternation, longest first so the
+    # longest signal at a position wins (e.g., 'see also' over 'see').
+    # Italics/punctuation tolerant; the split point is after group 1.
+    SIGNAL_RE = re.compile(
+        r'(^|\s|\()\*?(?P<sig>'
+        + '|'.join(re.escape(sig) for sig in sorted(
+            (sig for sig in SIGNALS if sig != 'with'), key=len, reverse=True))
+        + r')\*?(?=[\s\*,;:\)]|$)',
+        re.IGNORECASE
+    )
+
+    # 'with' is only a signal after a comma, following 'compare'
+    WITH_RE = re.compile(r',\s*\*?(?P<sig>with)\*?(?=[\s\*,;:\)]|$)', re.IGNORECASE)
+
+    SUPPLEMENTAL_RE = re.compile(r'(supra|infra)\s+notes?\s+\d+')
+    FORMATTING_RE = re.compile(r'[\*_]')
+    SENTENCE_BOUNDARY_RE = re.compile(r'\.\s+[A-Z][a-z]')
+    LEADING_CASE_NAME_RE = re.compile(r'^[A-Z][a-zA-Z\.\s&-]+\s+v\.\s+[A-Z]')
+    CASE_NAME_RE = re.compile(r'\bv\.\s+[A-Z]')
+    REPORTER_RE = re.compile(REPORTER_PATTERN)
+    CITATION_START_CASE_RE = re.compile(r'^[A-Z][a-z]+[a-zA-Z\.\s&-]*?\s+v\.\s+[A-Z]')
+    CITATION_START_WL_RE = re.compile(r'^[A-Z][a-zA-Z\.\s&-]+,\s+\d{4}\s+WL\s+\d+')
+    HEREINAFTER_RE = re.compile(r'[\[\(]\s*hereinafter\s+([^\]\)]+?)\s*[\]\)]', re.IGNORECASE)
+    MAX_SHORT_NAME_LENGTH = 80
+    INFRA_RE = re.compile(r'\binfra\b')
+    SUPRA_NOTE_RE = re.compile(r'supra\s+notes?\s+(\d+)', re.IGNORECASE)
+    PINPOINT_RE = re.compile(r'\bat\s+\*?(\d+)')
+
+    CITATION_STARTS = SIGNALS_LOWER + ('id.',)
+    NARRATIVE_MARKERS = (' see ', ' id.', ' cf.', 'supra')
+    COMMON_ABBREVIATIONS = (
+        'inc.', 'corp.', 'ltd.', 'supp.', 'cir.', 'libr.', 'rsch.', 'info.',
+        'cal.', 'fla.', 'ill.', 'mass.', 'mich.', 'wash.', 'tex.', 'jan.', 'feb.', 'mar.',
+        'apr.', 'aug.', 'sept.', 'oct.', 'nov.', 'dec.', 'educ.', 'est.', 'auto.', 'tel.',
+        'v.'
+    )
+
     def __init__(self, footnote_text: str, footnote_num: int):
         self.footnote_text = footnote_text
         self.footnote_num = footnote_num
@@ -121,67 +262,17 @@ class CitationParser:
         # Check if this is a narrative footnote (no semicolons, multiple sentences with citations)
         if self._is_narrative_footnote(text):
             return self._split_narrative_footnote(text)
-        # First, do a simple split on semicolons and newlines
-        # Use apostrophe-aware quote detection (same as signal splitting)
-        citations = []
-        current = ""
-        paren_depth = 0
-        in_dq = False  # double quotes
-        in_sq = False  # single quotes
 
-        def is_apostrophe(i: int) -> bool:
-            """Check if character at position i is an apostrophe (between letters)."""
-            return (0 < i < len(text) - 1) and text[i-1].isalnum() and text[i+1].isalnum()
-
-        i = 0
-        while i < len(text):
-            char = text[i]
-
-            # Handle parentheses (only when not in quotes)
-            if not in_dq and not in_sq:
-                if char == '(':
-                    paren_depth += 1
-                elif char == ')':
-                    paren_depth = max(0, paren_depth - 1)
-
-            # Handle quotes with apostrophe detection
-            if char in ('"', '\u201c', '\u201d'):
-                if in_dq:
-                    if char in ('"', '\u201d'):  # closing
-                        in_dq = False
-                else:
-                    if char in ('"', '\u201c'):  # opening
-                        in_dq = True
-            elif char in ("'", '\u2018', '\u2019'):
-                # Skip if apostrophe (like O'Neal)
-                if char == "'" and is_apostrophe(i):
-                    current += char
-                    i += 1
-                    continue
-                if in_sq:
-                    if char in ("'", '\u2019'):  # closing
-                        in_sq = False
-                else:
-                    if char in ("'", '\u2018'):  # opening
-                        in_sq = True
-
-            # Check for citation separator: semicolons OR newlines
-            if (char == ';' or char == '\n') and paren_depth == 0 and not in_dq and not in_sq:
-                if current.strip():
-                    citations.append(current.strip())
-                current = ""
-                i += 1
-                # Skip whitespace after separator
-                while i < len(text) and text[i] in ' \t\n\r':
-                    i += 1
-                continue
-
-            current += char
-            i += 1
-
-        # Add last citation
-        if current.strip():
-            citations.append(current.strip())
+        # Split on semicolons and newlines outside parentheses/quotes
+        # (apostrophe-aware, same lexer as signal splitting)
+        separators, _, _ = scan_delimiters(text)
+        citations = []
+        last = 0
+        for pos in separators + [len(text)]:
+            chunk = text[last:pos].strip()
+            if chunk:
+                citations.append(chunk)
+            last = pos + 1
 
         # Second pass: merge supplemental supra references back with previous citation
         merged_citations = []
@@ -214,132 +305,40 @@ class CitationParser:
 
         Using regex ignores formatting marks (*) when matching signals.
         """
-        import re
-
-        # --- Build robust, italics/punctuation-tolerant patterns ---
-        # We capture the SIGNAL WORD in a named group (?P<sig>...) so we can split at the word, not at the prefix.
-        def compile_signal_patterns():
-            pats = []
-            for sig in self.SIGNALS:
-                if sig == 'with':
-                    # Require a preceding comma, but start split at 'with' (group 'sig'), not at the comma.
-                    pattern = r',\s*\*?(?P<sig>' + re.escape('with') + r')\*?(?=[\s\*,;:\)]|$)'
-                elif sig == 'compare':
-                    # Allow BOS/space/paren before, italics around the word, and punctuation/space after.
-                    pattern = r'(^|\s|\()\*?(?P<sig>' + re.escape('compare') + r')\*?(?=[\s\*,;:\)]|$)'
-                else:
-                    # Generic signals (e.g., 'see also', 'but cf.', 'cf.', 'e.g.,', 'see, e.g.,')
-                    pattern = r'(^|\s|\()\*?(?P<sig>' + re.escape(sig) + r')\*?(?=[\s\*,;:\)]|$)'
-                pats.append((sig, re.compile(pattern, re.IGNORECASE)))
-            return pats
-
-        signal_patterns = compile_signal_patterns()
-
-        # Track parentheses and quotes to avoid splitting inside them
-        def get_paren_quote_regions(txt: str):
-            """
-            Return (start, end) spans to protect (parentheses and *true* quoted regions).
-            IMPORTANT: do NOT treat apostrophes inside words (e.g., O'Neal) as quote delimiters.
-            """
-            regions = []
-            paren_depth = 0
-            paren_start = None
-            in_dq = False; dq_start = None          # " … "  or " … "
-            in_sq = False; sq_start = None          # ' … '  or ' … '
-
-            def is_apostrophe(i: int) -> bool:
-                return (0 < i < len(txt) - 1) and txt[i-1].isalnum() and txt[i+1].isalnum()
-
-            for i, ch in enumerate(txt):
-                # parentheses (only when not inside quotes)
-                if not in_dq and not in_sq:
-                    if ch == '(':
-                        if paren_depth == 0:
-                            paren_start = i
-                        paren_depth += 1
-                    elif ch == ')':
-                        if paren_depth > 0:
-                            paren_depth -= 1
-                            if paren_depth == 0 and paren_start is not None:
-                                regions.append((paren_start, i + 1))
-                                paren_start = None
-
-                # double quotes (straight or curly)
-                if ch in ('"', '\u201c', '\u201d'):
-                    if in_dq:
-                        if ch in ('"', '\u201d'):   # closing
-                            in_dq = False
-                            regions.append((dq_start, i + 1))
-                            dq_start = None
-                    else:
-                        if ch in ('"', '\u201c'):   # opening
-                            in_dq = True
-                            dq_start = i
-                    continue
-
-                # single quotes (straight or curly) — ignore apostrophes between letters
-                if ch in ("'", '\u2018', '\u2019'):
-                    if ch == "'" and is_apostrophe(i):
-                        continue  # treat as apostrophe, not a quote delimiter
-                    if in_sq:
-                        if ch in ("'", '\u2019'):   # closing
-                            in_sq = False
-                            regions.append((sq_start, i + 1))
-                            sq_start = None
-                    else:
-                        if ch in ("'", '\u2018'):   # opening
-                            in_sq = True
-                            sq_start = i
-
-            return regions
-
-        # Find all protected regions
-        protected_regions = get_paren_quote_regions(text)
-
-        def is_in_protected_region(pos):
-            """Check if position is inside parentheses or quotes."""
-            for start, end in protected_regions:
-                if start <= pos < end:
-                    return True
-            return False
+        _, region_starts, region_ends = scan_delimiters(text)
 
         # Collect candidate matches with the start at the signal word
         candidates = []
-        for signal, pattern in signal_patterns:
-            for match in pattern.finditer(text):
-                # Split after group 1 (whitespace/paren) to preserve any leading formatting like *
-                # This ensures *See becomes part of the new citation, not left behind
-                sig_start = match.end(1)  # Position after leading whitespace/paren, before *
-                sig_end   = match.end()    # End of full match including trailing *
-
-                # Skip if inside parentheses or quotes
-                if is_in_protected_region(sig_start):
+        compare_ends = []
+        for match in self.SIGNAL_RE.finditer(text):
+            # Split after group 1 (whitespace/paren) to preserve any leading formatting like *
+            # This ensures *See becomes part of the new citation, not left behind
+            sig_start = match.end(1)
+            if in_regions(sig_start, region_starts, region_ends):
+                continue
+            if match.group('sig').lower() == 'compare':
+                compare_ends.append(match.end())
+            candidates.append((sig_start, match.end()))
+
+        if compare_ends:
+            for match in self.WITH_RE.finditer(text):
+                # The split point for 'with' has always been just after the word
+                sig_start = match.end('sig')
+                if in_regions(sig_start, region_starts, region_ends):
                     continue
-
-                # Special handling for 'with' - only valid after 'compare'
-                if signal == 'with':
-                    # must have a preceding 'compare' in the same chunk with no semicolon between
-                    prior_compare = None
-                    for m2 in signal_patterns:
-                        if m2[0] == 'compare':
-                            for mc in m2[1].finditer(text[:sig_start]):
-                                c_start = mc.start('sig')
-                                if not is_in_protected_region(c_start):
-                                    prior_compare = mc
-                    if not prior_compare:
-                        continue
-                    if ';' in text[prior_compare.end():sig_start]:
-                        continue
-
-                candidates.append((sig_start, sig_end, signal))
+                # must have a preceding 'compare' in the same chunk with no semicolon between
+                k = bisect_left(compare_ends, sig_start) - 1
+                if k < 0 or ';' in text[compare_ends[k]:sig_start]:
+                    continue
+                candidates.append((sig_start, match.end()))
 
         # De-duplicate overlaps: prefer the longest signal at a given start (e.g., 'see also' over 'see')
         candidates.sort(key=lambda t: (t[0], -(t[1]-t[0])))
         matches = []
         last_end = -1
-        for s, e, sig in candidates:
+        for s, e in candidates:
             if s >= last_end:
-                matches.append((s, e, sig))
+                matches.append((s, e))
                 last_end = e
 
         # Split text at signal positions
@@ -349,7 +348,7 @@ class CitationParser:
         citations = []
         last_pos = 0
 
-        for start_pos, end_pos, signal in matches:
+        for start_pos, end_pos in matches:
             # Add text before this signal as a citation
             if start_pos > last_pos:
                 before_text = text[last_pos:start_pos].strip()
@@ -386,20 +385,18 @@ class CitationParser:
         - "infra notes X-Y"
         - Other cross-references without case names or reporters
         """
-        import re
-
         # Remove markdown formatting before checking
-        text_clean = re.sub(r'[\*_]', '', text).lower().strip()
+        text_clean = self.FORMATTING_RE.sub('', text).lower().strip()
 
         # Pattern 1: supra/infra notes X-Y and accompanying text
-        if re.match(r'(supra|infra)\s+notes?\s+\d+', text_clean):
+        if self.SUPPLEMENTAL_RE.match(text_clean):
             return True
 
         # Pattern 2: Just supra/infra without a full citation
         # (has supra/infra but no reporter citation)
         if text_clean.startswith(('supra', 'infra')):
             # Check if it has a reporter (indicates it's a full citation)
-            has_reporter = re.search(self.REPORTER_PATTERN, text)
+            has_reporter = self.REPORTER_RE.search(text)
             if not has_reporter:
                 return True
 
@@ -415,12 +412,10 @@ class CitationParser:
         Example narrative: "A court held X. See Case1. Another court held Y. See Case2."
         Example normal: "*See* Case1; Case2; *see also* Case3."
         """
-        import re
-
         # Must have multiple sentences (at least 3 periods that look like sentence boundaries)
         # This filters out normal citations which have periods in abbreviations
         # Pattern: period, space, capital letter followed by lowercase (not abbreviations like "L. Rev.")
-        sentence_boundaries = re.findall(r'\.\s+[A-Z][a-z]', text)
+        sentence_boundaries = self.SENTENCE_BOUNDARY_RE.findall(text)
         if len(sentence_boundaries) < 3:
             return False
 
@@ -435,11 +430,11 @@ class CitationParser:
         start_text = text[:150].lower()
 
         # If starts with signal, it's a traditional citation string
-        if any(start_text.strip().startswith(sig.lower()) for sig in self.SIGNALS):
+        if start_text.strip().startswith(self.SIGNALS_LOWER):
             return False
 
         # If starts with case name pattern (within first 50 chars), it's traditional
-        if re.match(r'^[A-Z][a-zA-Z\.\s&-]+\s+v\.\s+[A-Z]', text[:50]):
+        if self.LEADING_CASE_NAME_RE.match(text[:50]):
             return False
 
         # If starts with Id., it's traditional
@@ -448,13 +443,13 @@ class CitationParser:
 
         # Narrative footnotes have substantial prose before first citation
         # Check if there's at least 50 characters before first reporter/signal/v.
+        text_lower = text.lower()
         first_signal_pos = min(
-            [text.lower().find(sig.lower()) for sig in [' see ', ' id.', ' cf.', 'supra']
-             if sig.lower() in text.lower()] + [9999]
+            [text_lower.find(sig) for sig in self.NARRATIVE_MARKERS if sig in text_lower] + [9999]
         )
-        first_case_match = re.search(r'\bv\.\s+[A-Z]', text)
+        first_case_match = self.CASE_NAME_RE.search(text)
         first_case_pos = first_case_match.start() if first_case_match else 9999
-        first_reporter_match = re.search(self.REPORTER_PATTERN, text)
+        first_reporter_match = self.REPORTER_RE.search(text)
         first_reporter_pos = first_reporter_match.start() if first_reporter_match else 9999
 
         first_citation_pos = min(first_signal_pos, first_case_pos, first_reporter_pos)
@@ -473,8 +468,6 @@ class CitationParser:
 
         Each chunk includes the narrative context sentence before its citation.
         """
-        import re
-
         citations = []
         current = ""
         i = 0
@@ -487,46 +480,25 @@ class CitationParser:
             if pos > 0 and text[pos-1].isupper():
                 return True
 
-            # Pattern 2: Common multi-letter abbreviations
+            # Pattern 2: Common multi-letter abbreviations and "v." (versus)
             lookback = text[max(0, pos-15):pos+1].lower()
-            common_abbrs = [
-                'inc.', 'corp.', 'ltd.', 'supp.', 'cir.', 'libr.', 'rsch.', 'info.',
-                'cal.', 'fla.', 'ill.', 'mass.', 'mich.', 'wash.', 'tex.', 'jan.', 'feb.', 'mar.',
-                'apr.', 'aug.', 'sept.', 'oct.', 'nov.', 'dec.', 'educ.', 'est.', 'auto.', 'tel.'
-            ]
-            for abbr in common_abbrs:
-                if lookback.endswith(abbr):
-                    return True
-
-            # Pattern 3: "v." (versus) - very common in case names
-            if lookback.endswith('v.'):
-                return True
-
-            return False
+            return lookback.endswith(self.COMMON_ABBREVIATIONS)
 
         # Check if we're at the start of a citation
         def is_citation_start(txt):
             txt_lower = txt.lower().strip()
 
             # Pattern 1: Starts with a signal or Id.
-            for sig in self.SIGNALS + ['Id.', 'id.']:
-                if txt_lower.startswith(sig.lower()):
-                    return True
+            if txt_lower.startswith(self.CITATION_STARTS):
+                return True
 
             # Pattern 2: Starts with case name pattern (e.g., "Sanborn Libr. LLC v. ERIS")
-            if re.match(r'^[A-Z][a-z]+[a-zA-Z\.\s&-]*?\s+v\.\s+[A-Z]', txt.strip()):
+            if self.CITATION_START_CASE_RE.match(txt.strip()):
                 return True
 
             # Pattern 3: Short form citation (Case Name, Year WL...)
             # e.g., "Say It Visually, 2025 WL 933951"
-            if re.match(r'^[A-Z][a-zA-Z\.\s&-]+,\s+\d{4}\s+WL\s+\d+', txt.strip()):
-                return True
-
-            # Pattern 4: Standalone "Id." (very common)
-            if txt_lower.strip() == 'id.' or txt_lower.strip().startswith('id.'):
-                return True
-
-            return False
+            return bool(self.CITATION_START_WL_RE.match(txt.strip()))
 
         while i < len(text):
             char = text[i]
@@ -603,6 +575,11 @@ class CitationParser:
         # Extract parenthetical if present
         citation.parenthetical = self._extract_parenthetical(text)
 
+        # [hereinafter X] label for later short forms
+        hereinafter_match = self.HEREINAFTER_RE.search(self.FORMATTING_RE.sub('', text))
+        if hereinafter_match:
+            citation.hereinafter = hereinafter_match.group(1).strip()
+
         # Type-specific parsing
         if citation.type == 'case':
             self._parse_case(citation, text)
@@ -615,19 +592,30 @@ class CitationParser:
 
         return citation
 
+    @classmethod
+    def strip_signal(cls, text: str) -> str:
+        """Drop a leading signal ("See", "see also", ...) from unformatted text."""
+        text_lower = text.lower()
+        for sig in cls.SIGNALS_BY_LENGTH:
+            if text_lower.startswith(sig) and text_lower[len(sig):len(sig) + 1] in ('', ' ', ','):
+                return text[len(sig):].lstrip(' ,')
+        return text
+
     def _detect_type(self, text: str) -> str:
         """Detect the type of citation."""
         text_lower = text.lower()
+        # *Id.* and *supra* note are usually italicized
+        plain = self.strip_signal(self.FORMATTING_RE.sub('', text_lower).replace('\u00a0', ' ').strip())
 
-        if text_lower.strip().startswith('id'):
+        if plain.startswith('id.') or plain == 'id':
             return 'id'
-        elif 'supra note' in text_lower or 'supra at' in text_lower:
+        elif 'supra note' in plain or 'supra at' in plain:
             return 'supra'
-        elif 'infra' in text_lower:
+        elif self.INFRA_RE.search(plain):
             return 'infra'
         elif re.search(self.STATUTE_PATTERN, text):
             return 'statute'
-        elif re.search(self.REPORTER_PATTERN, text):
+        elif self.REPORTER_RE.search(text):
             return 'case'
         elif re.search(r'\d+\s+\w+\.\s+L\.\s+Rev\.', text):
             return 'article'
@@ -716,13 +704,27 @@ class CitationParser:
 
     def _parse_short_form(self, citation: Citation, text: str):
         """Parse short form citations (supra, id, infra)."""
+        # Italics can split "*supra* note", so match on the unformatted text
+        plain = self.FORMATTING_RE.sub('', text)
+
         if citation.type == 'supra':
-            note_match = re.search(r'supra note\s+(\d+)', text, re.IGNORECASE)
+            note_match = self.SUPRA_NOTE_RE.search(plain)
             if note_match:
                 citation.parenthetical = f"note {note_match.group(1)}"
 
+            # Author or [hereinafter] label before "supra"; a full citation that
+            # only mentions a supra note has a much longer lead
+            name = self.strip_signal(plain[:plain.lower().find('supra')].strip()).strip(' ,\u00a0')
+            if name and len(name) <= self.MAX_SHORT_NAME_LENGTH and ' v. ' not in name:
+                citation.short_name = name
+
             # Extract pinpoint
-            at_match = re.search(r'at\s+(\d+)', text)
+            at_match = self.PINPOINT_RE.search(plain)
+            if at_match:
+                citation.pinpoint = at_match.group(1)
+
+        elif citation.type == 'id':
+            at_match = self.PINPOINT_RE.search(plain)
             if at_match:
                 citation.pinpoint = at_match.group(1)
 
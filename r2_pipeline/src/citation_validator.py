@@ -9,10 +9,16 @@ from pathlib import Path
 from src.llm_interface import LLMInterface
 from src.citation_parser import Citation
 from src.rule_retrieval import BluebookRuleRetriever, RuleEvidenceValidator
-from config.settings import BLUEBOOK_JSON_PATH
+from src import tracing
+from config.settings import BLUEBOOK_JSON_PATH, RULE_SNAPSHOT_PATH
 
 logger = logging.getLogger(__name__)
 
+# Error types produced by the deterministic checks (re-run for every occurrence)
+DETERMINISTIC_ERROR_TYPES = {
+    "curly_quotes_error", "non_breaking_space_error", "parenthetical_capitalization_error"
+}
+
 class CitationValidator:
     """Validate citations against Bluebook rules using LLM.
     Prefers vector-assistant with File Search when available, falls back to direct LLM calls.
@@ -22,7 +28,7 @@ class CitationValidator:
         self.llm = llm
         self.prefer_vector_assistant = prefer_vector_assistant
         self.prompt_template = self._load_prompt_template()
-        self.bluebook_json_full = None  # Full Bluebook.json text for fallback
+        self._bluebook_json_full = None  # Full Bluebook.json text for fallback, read on first use
 
         # Initialize deterministic rule retrieval
         self.use_deterministic_retrieval = use_deterministic_retrieval
@@ -31,19 +37,25 @@ class CitationValidator:
 
         if use_deterministic_retrieval:
             try:
-                self.retriever = BluebookRuleRetriever(str(BLUEBOOK_JSON_PATH))
+                self.retriever = BluebookRuleRetriever(str(BLUEBOOK_JSON_PATH), str(RULE_SNAPSHOT_PATH))
                 self.evidence_validator = RuleEvidenceValidator(self.retriever)
-
-                # Load full Bluebook.json for fallback to regular GPT
-                with open(BLUEBOOK_JSON_PATH, 'r') as f:
-                    bluebook_data = json.load(f)
-                    self.bluebook_json_full = json.dumps(bluebook_data, indent=2)
-                logger.info(f"Loaded full Bluebook.json ({len(self.bluebook_json_full)} chars) for GPT fallback")
                 logger.info("Deterministic rule retrieval enabled")
             except Exception as e:
                 logger.warning(f"Failed to initialize rule retriever: {e}. Falling back to vector search only.")
                 self.use_deterministic_retrieval = False
 
+    @property
+    def bluebook_json_full(self) -> Optional[str]:
+        """Full Bluebook.json text for fallback to regular GPT (loaded on first access)."""
+        if self._bluebook_json_full is None and self.use_deterministic_retrieval:
+            try:
+                with open(BLUEBOOK_JSON_PATH, 'r') as f:
+                    self._bluebook_json_full = json.dumps(json.load(f), indent=2)
+                logger.info(f"Loaded full Bluebook.json ({len(self._bluebook_json_full)} chars) for GPT fallback")
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not load full Bluebook.json: {e}")
+        return self._bluebook_json_full
+
     def _load_prompt_template(self) -> str:
         """Load citation format prompt template."""
         prompt_path = Path(__file__).parent.parent / "prompts" / "citation_format.txt"
@@ -155,13 +167,21 @@ class CitationValidator:
 
         return errors
 
-    def validate_citation(self, citation: Citation, position: str = "middle") -> Dict:
-        """Validate a single citation using a hybrid deterministic and AI approach."""
+    def _deterministic_errors(self, text: str) -> list:
+        """Checks that depend only on this occurrence's text (quotes, spacing, parentheticals)."""
+        return (self._check_curly_quotes(text)
+                + self._check_non_breaking_spaces(text)
+                + self._check_parenthetical_capitalization(text))
+
+    @tracing.traced("validate")
+    def validate_citation(self, citation: Citation, position: str = "middle",
+                          short_form_errors: Optional[list] = None) -> Dict:
+        """Validate a single citation using a hybrid deterministic and AI approach.
+
+        short_form_errors: Antecedent checks for short forms (ShortFormIndex.errors_for())
+        """
         # Step 1: Deterministically check for errors that don't require AI.
-        quote_errors = self._check_curly_quotes(citation.full_text)
-        nbsp_errors = self._check_non_breaking_spaces(citation.full_text)
-        cap_errors = self._check_parenthetical_capitalization(citation.full_text)
-        deterministic_errors = quote_errors + nbsp_errors + cap_errors
+        deterministic_errors = self._deterministic_errors(citation.full_text) + list(short_form_errors or [])
 
         # Step 2: Retrieve relevant rules (if deterministic retrieval enabled)
         retrieved_rules = []
@@ -261,6 +281,62 @@ class CitationValidator:
 
         return {"success": True, "validation": validation, "error": None}
 
+    def validate_short_form(self, citation: Citation, short_form_errors: list) -> Dict:
+        """
+        Validate a bare Id./supra citation without an LLM call.
+
+        Args:
+            citation: Short form resolved by ShortFormIndex
+            short_form_errors: Antecedent checks from ShortFormIndex.errors_for()
+        """
+        errors = self._deterministic_errors(citation.full_text) + list(short_form_errors)
+
+        validation = {
+            "is_correct": not errors, "errors": errors, "corrected_version": None,
+            "notes": (f"Short form checked against its antecedent (FN {citation.antecedent_footnote}, "
+                      f"Cite {citation.antecedent_citation}) without AI validation."),
+            "citation_text_original": citation.full_text, "citation_type": citation.type,
+            "gpt_tokens": 0, "gpt_cost": 0, "coverage": {}, "rules_retrieved": 0
+        }
+        return {"success": True, "validation": validation, "error": None}
+
+    @staticmethod
+    def is_shareable(validation: Optional[Dict], citation: Citation) -> bool:
+        """
+        Whether an AI validation can stand in for repeat citations of the same source:
+        the model found nothing beyond the deterministic checks and proposed no rewrite.
+        """
+        if not validation or validation.get("evidence_validation_failed"):
+            return False
+        if validation.get("corrected_version") not in (None, "", citation.full_text):
+            return False
+        return all(error.get("error_type") in DETERMINISTIC_ERROR_TYPES
+                   for error in validation.get("errors") or [])
+
+    def reuse_validation(self, citation: Citation, shared: Dict,
+                         short_form_errors: Optional[list] = None) -> Dict:
+        """
+        Validate a repeat citation against the AI result of an earlier occurrence.
+
+        Only the deterministic checks are re-run, since they see the pincite and
+        parentheticals that differ between occurrences.
+
+        Args:
+            citation: Repeat citation (same canonical key and pincite-free text)
+            shared: Validation of the earlier occurrence, accepted by is_shareable()
+        """
+        errors = self._deterministic_errors(citation.full_text) + list(short_form_errors or [])
+
+        validation = dict(shared)
+        validation.update({
+            "is_correct": not errors, "errors": errors, "corrected_version": None,
+            "notes": (f"Format validation shared with an earlier citation of {citation.canonical_key}; "
+                      f"deterministic checks re-run for this occurrence."),
+            "citation_text_original": citation.full_text, "citation_type": citation.type,
+            "gpt_tokens": 0, "gpt_cost": 0, "reused_validation": True
+        })
+        return {"success": True, "validation": validation, "error": None}
+
     def _get_system_prompt_with_all_rules(self) -> str:
         """Get system prompt for GPT-5-nano with ALL 354 rules included."""
         return """You are an expert in Bluebook (21st edition) citation formatting for law journal validation.
@@ -0,0 +1,247 @@
+"""
+Select the evidence sent to the support check.
+
+Redboxed regions, and the text of the pages around them, are split into
+short passages and ranked against the proposition with BM25 plus plain term
+overlap. Only the best passages that fit a token budget are sent, so the
+support prompt stays the same size however long the redbox or the source
+is. The selection records which passages were sent, with their scores, for
+reviewers to audit.
+"""
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+import logging
+
+logger = logging.getLogger(__name__)
+
+# BM25 parameters
+K1 = 1.5
+B = 0.75
+
+# Score = BM25_WEIGHT * (bm25 / best bm25) + (1 - BM25_WEIGHT) * share of proposition terms present
+BM25_WEIGHT = 0.6
+REDBOX_BONUS = 0.15  # The editor boxed it; prefer it over surrounding page text
+
+# Page sentences mostly repeating the redbox are dropped (share of their word trigrams)
+DUPLICATE_SHINGLES = 0.8
+
+TERM = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+SENTENCE_END = re.compile(r'(?:(?<=[.!?])|(?<=[.!?]["”’)]))\s+(?=["“(\[]?[A-Z0-9§])')
+
+STOPWORDS = frozenset("""
+a an and are as at be been but by can could did do does for from had has have he her his if in into is it
+its may might must no not of on or our shall she should so such than that the their them then there these
+they this those to under upon was we were what when where whether which while who will with would you
+""".split())
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (same words * 1.3 estimate as the LLM interface)."""
+    return int(len(text.split()) * 1.3) + 1
+
+
+def _stem(word: str) -> str:
+    for suffix in ("ing", "ed", "es", "s"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 4 and not word.endswith("ss"):
+            return word[:-len(suffix)]
+    return word
+
+
+def terms(text: str) -> List[str]:
+    """Lowercased, stemmed content words."""
+    return [_stem(w) for w in TERM.findall(text.lower()) if w not in STOPWORDS]
+
+
+def _shingles(words: Sequence[str]) -> set:
+    return {tuple(words[i:i + 3]) for i in range(max(0, len(words) - 2))}
+
+
+@dataclass
+class Passage:
+    """A few sentences of redboxed or surrounding page text."""
+    passage_id: str        # "R2.1" = region 2, first passage; "P4.3" = page 4 context, third passage
+    source: str            # "redbox" | "context"
+    page: int
+    text: str
+    region: Optional[int] = None
+    score: float = 0.0
+    tokens: int = 0
+    terms: List[str] = field(default_factory=list, repr=False)
+
+    @property
+    def label(self) -> str:
+        if self.source == "redbox":
+            return f"[Region {self.region}, Page {self.page}]"
+        return f"[Page {self.page}, surrounding text]"
+
+
+@dataclass
+class EvidenceSelection:
+    """Passages chosen for one support check and what was left out."""
+    text: str
+    sent: List[Passage]
+    candidates: int
+    source_tokens: int
+    token_budget: int
+
+    @property
+    def sent_tokens(self) -> int:
+        return sum(p.tokens for p in self.sent)
+
+    def to_dict(self) -> Dict:
+        """Audit record for the citation's log entry."""
+        return {
+            "token_budget": self.token_budget,
+            "source_tokens": self.source_tokens,
+            "sent_tokens": self.sent_tokens,
+            "passages_considered": self.candidates,
+            "passages_sent": [
+                {"id": p.passage_id, "source": p.source, "page": p.page, "region": p.region,
+                 "score": round(p.score, 3), "tokens": p.tokens, "text": p.text}
+                for p in self.sent
+            ],
+        }
+
+
+class EvidenceSelector:
+    """Ranks redbox and neighbouring-page passages against a proposition."""
+
+    def __init__(self, token_budget: int = 1500, passage_words: int = 80, neighbor_pages: int = 1):
+        """
+        Args:
+            token_budget: Most source tokens sent to the support check
+            passage_words: Target passage length in words (sentences are kept whole when possible)
+            neighbor_pages: Pages either side of a redbox whose text is also considered
+        """
+        self.token_budget = token_budget
+        self.passage_words = passage_words
+        self.neighbor_pages = neighbor_pages
+
+    def split(self, text: str) -> List[str]:
+        """Split text into passages of about passage_words words along sentence boundaries."""
+        return self._pack(SENTENCE_END.split(" ".join(text.split())))
+
+    def _pack(self, sentences: List[str]) -> List[str]:
+        passages, current = [], []
+        for sentence in sentences:
+            words = sentence.split()
+            # An overlong sentence is cut into passage-sized pieces
+            while len(words) > self.passage_words:
+                if current:
+                    passages.append(" ".join(current))
+                    current = []
+                passages.append(" ".join(words[:self.passage_words]))
+                words = words[self.passage_words:]
+            if current and len(current) + len(words) > self.passage_words:
+                passages.append(" ".join(current))
+                current = []
+            current.extend(words)
+        if current:
+            passages.append(" ".join(current))
+        return passages
+
+    def passages(self, regions: List[Dict], pages: List[Dict]) -> List[Passage]:
+        """
+        Candidate passages: every redboxed region, then the text of the pages
+        around the redboxes minus the sentences the redboxes already contain.
+
+        Args:
+            regions: Usable redboxed regions ({"page", "text"} and optionally the
+                region's "number" in the PDF; otherwise numbered in order from 1)
+            pages: process_r1_pdf's full_text ({"page", "text"} per page)
+        """
+        candidates = []
+        boxed = set()
+        for number, region in enumerate(regions, 1):
+            number = region.get("number", number)
+            for n, text in enumerate(self.split(region["text"]), 1):
+                candidates.append(Passage(f"R{number}.{n}", "redbox", region["page"], text, region=number))
+            boxed |= _shingles(TERM.findall(region["text"].lower()))
+
+        wanted = {page + offset for page in {r["page"] for r in regions}
+                  for offset in range(-self.neighbor_pages, self.neighbor_pages + 1)}
+        for page in pages:
+            if page["page"] not in wanted or not page.get("text"):
+                continue
+            sentences = []
+            for sentence in SENTENCE_END.split(" ".join(page["text"].split())):
+                shingles = _shingles(TERM.findall(sentence.lower()))
+                if not shingles or len(shingles & boxed) / len(shingles) < DUPLICATE_SHINGLES:
+                    sentences.append(sentence)
+            for n, text in enumerate(self._pack(sentences), 1):
+                candidates.append(Passage(f"P{page['page']}.{n}", "context", page["page"], text))
+
+        for passage in candidates:
+            passage.terms = terms(passage.text)
+            passage.tokens = estimate_tokens(passage.text)
+        return candidates
+
+    def rank(self, proposition: str, candidates: List[Passage]) -> List[Passage]:
+        """Score passages (BM25 over the candidates plus term overlap); best first."""
+        query = set(terms(proposition))
+        if candidates:
+            average = sum(len(p.terms) for p in candidates) / len(candidates) or 1.0
+            document_frequency = Counter(t for p in candidates for t in set(p.terms))
+            bm25 = []
+            for passage in candidates:
+                counts = Counter(passage.terms)
+                norm = K1 * (1 - B + B * len(passage.terms) / average)
+                bm25.append(sum(
+                    math.log(1 + (len(candidates) - document_frequency[t] + 0.5) / (document_frequency[t] + 0.5))
+                    * counts[t] * (K1 + 1) / (counts[t] + norm)
+                    for t in query if counts[t]
+                ))
+            best = max(bm25) or 1.0
+            for passage, raw in zip(candidates, bm25):
+                overlap = len(query & set(passage.terms)) / len(query) if query else 0.0
+                passage.score = BM25_WEIGHT * raw / best + (1 - BM25_WEIGHT) * overlap
+                if passage.source == "redbox":
+                    passage.score += REDBOX_BONUS
+        # Ties (e.g. no proposition) keep redboxes first, in document order
+        return sorted(candidates, key=lambda p: -p.score)
+
+    def select(self, proposition: str, regions: List[Dict], pages: List[Dict]) -> EvidenceSelection:
+        """
+        The highest-ranked passages that fit the token budget, in document order.
+
+        Surrounding-page passages are only sent if they share a term with the
+        proposition; the best redbox passage is always sent (cut to the budget
+        if it alone exceeds it).
+        """
+        candidates = self.passages(regions, pages)
+        ranked = self.rank(proposition, candidates)
+        query = set(terms(proposition))
+
+        sent, used = [], 0
+        for passage in ranked:
+            if passage.source == "context" and not query & set(passage.terms):
+                continue
+            if used + passage.tokens <= self.token_budget:
+                sent.append(passage)
+                used += passage.tokens
+        if not sent and ranked:
+            # Nothing fits: cut down the best redbox passage, not a context passage that outranked it
+            best = next((p for p in ranked if p.source == "redbox"), ranked[0])
+            words = best.text.split()[:max(1, int(self.token_budget / 1.3) - 1)]
+            best.text = " ".join(words)
+            best.tokens = estimate_tokens(best.text)
+            sent.append(best)
+
+        # By identity: regions sharing a number give their passages the same id
+        order = {id(p): i for i, p in enumerate(candidates)}
+        sent.sort(key=lambda p: (p.page, p.source != "redbox", order[id(p)]))
+        blocks, previous = [], None
+        for passage in sent:
+            label = passage.label
+            blocks.append(passage.text if label == previous else f"{label}: {passage.text}")
+            previous = label
+        return EvidenceSelection(
+            text="\n\n".join(blocks),
+            sent=sent,
+            candidates=len(candidates),
+            source_tokens=sum(p.tokens for p in candidates),
+            token_budget=self.token_budget,
+        )
@@ -0,0 +1,89 @@
+"""
+Input fingerprints for incremental R2 re-runs.
+
+A citation's result depends on its footnote's formatted text, the proposition
+it supports, the R1 PDF and, for short forms, the antecedent it resolves to.
+Hashing those inputs lets a re-run after the editors revise the Word document
+reprocess only the citations whose inputs changed and carry the previous
+batch's results forward for the rest.
+"""
+import json
+import hashlib
+import logging
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Bump when prompts or checks change enough that earlier results should not be reused
+FINGERPRINT_VERSION = 2
+
+
+def file_digest(path: Optional[Path]) -> Optional[str]:
+    """SHA-256 of a file's bytes, or None if there is no file."""
+    if path is None or not Path(path).exists():
+        return None
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def citation_fingerprint(citation, footnote_text: str, proposition: str,
+                         pdf_digest: Optional[str], antecedent_text: Optional[str] = None) -> str:
+    """Hash of everything a citation's R2 result is computed from."""
+    inputs = {
+        "version": FINGERPRINT_VERSION,
+        "citation_num": citation.citation_num,
+        "citation": citation.full_text,
+        "footnote": footnote_text,
+        "proposition": proposition,
+        "pdf": pdf_digest,
+        "antecedent": antecedent_text,
+    }
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def is_reusable(entry: Dict) -> bool:
+    """Whether a logged result is a finished check rather than a transient failure."""
+    if str(entry.get("error", "")).startswith("Pipeline Error"):
+        return False
+    if entry.get("r1_pdf_path"):
+        # API failures leave these as None; a retry may succeed
+        if "citation_validation" in entry and entry["citation_validation"] is None:
+            return False
+        if "support_analysis" in entry and entry["support_analysis"] is None:
+            return False
+    if entry.get("r2_pdf_path") and not Path(entry["r2_pdf_path"]).exists():
+        return False
+    return True
+
+
+class PriorResults:
+    """Latest fingerprinted result per citation from the cumulative pipeline log."""
+
+    def __init__(self, log_path: Path):
+        self.latest: Dict[Tuple[int, int], Dict] = {}
+        if not log_path.exists():
+            return
+        try:
+            with open(log_path, 'r') as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read previous results from {log_path}: {e}")
+            return
+        if not isinstance(entries, list):
+            return
+        for entry in entries:  # Log is in processing order, so later batches win
+            if isinstance(entry, dict) and entry.get("fingerprint"):
+                self.latest[(entry["footnote"], entry["cite_num"])] = entry
+
+    def carry_forward(self, citation, fingerprint: str) -> Optional[Dict]:
+        """Copy of the previous result if the citation's inputs are unchanged."""
+        entry = self.latest.get((citation.footnote_num, citation.citation_num))
+        if entry is None or entry["fingerprint"] != fingerprint or not is_reusable(entry):
+            return None
+        carried = dict(entry)
+        carried["carried_forward_from"] = entry.get("carried_forward_from") or entry.get("batch_name")
+        return carried
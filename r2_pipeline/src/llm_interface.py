@@ -2,16 +2,69 @@
 Interface for GPT-5-nano API calls with rate limiting and error handling.
 GPT-5-nano: Ultra-fast, 3x cheaper than gpt-4o-mini, 272K token context window.
 """
+import contextlib
+import contextvars
 import json
+import threading
 import time
 from openai import OpenAI
 from typing import Dict, Any, Optional
 import logging
 from config.settings import OPENAI_API_KEY, GPT_MODEL, GPT_TEMPERATURE, GPT_MAX_TOKENS, VECTOR_STORE_CACHE
 from src.vector_store_manager import VectorStoreManager
+from src import tracing
+from src import rate_limiter
 
 logger = logging.getLogger(__name__)
 
+
+def _usage_stats(calls: int, tokens: int, cost: float) -> Dict[str, Any]:
+    return {
+        "total_calls": calls,
+        "total_tokens": tokens,
+        "total_cost": cost,
+        "avg_tokens_per_call": tokens / max(calls, 1),
+        "avg_cost_per_call": cost / max(calls, 1)
+    }
+
+
+class LLMUsage:
+    """Calls, tokens and cost of the LLM requests made by one run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.tokens = 0
+        self.cost = 0.0
+
+    def add(self, tokens: int, cost: float):
+        with self._lock:
+            self.calls += 1
+            self.tokens += tokens
+            self.cost += cost
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return _usage_stats(self.calls, self.tokens, self.cost)
+
+
+_usage: contextvars.ContextVar = contextvars.ContextVar("r2_llm_usage", default=None)
+
+
+@contextlib.contextmanager
+def track_usage(usage: LLMUsage):
+    """Also count LLM requests made in this context (and threads bound to it) in usage.
+
+    An LLMInterface shared by concurrent runs (the daemon's) totals every run;
+    each run reads its own share from its LLMUsage.
+    """
+    token = _usage.set(usage)
+    try:
+        yield usage
+    finally:
+        _usage.reset(token)
+
+
 class LLMInterface:
     # Class-level variables to track last API failure time (shared across all instances)
     _last_failure_time = None
@@ -30,6 +83,7 @@ class LLMInterface:
         self.total_tokens = 0
         self.total_cost = 0.0
         self.call_count = 0
+        self._stats_lock = threading.Lock()
 
         # Pricing per 1k tokens (approx; adjust by model family)
         if GPT_MODEL.startswith("gpt-4o"):
@@ -70,7 +124,7 @@ class LLMInterface:
             if elapsed < cls._failure_cooldown_seconds:
                 wait_time = cls._failure_cooldown_seconds - elapsed
                 logger.info(f"API cooldown: waiting {wait_time:.1f}s after recent failure")
-                time.sleep(wait_time)
+                tracing.traced_sleep(wait_time, "llm.wait", reason="cooldown")
                 current_time = time.time()  # Update after wait
 
         # Second, check if we're in stagger mode
@@ -81,7 +135,7 @@ class LLMInterface:
                 if time_since_last < cls._stagger_delay:
                     stagger_wait = cls._stagger_delay - time_since_last
                     logger.info(f"Stagger mode: waiting {stagger_wait:.1f}s between API calls")
-                    time.sleep(stagger_wait)
+                    tracing.traced_sleep(stagger_wait, "llm.wait", reason="stagger")
 
             # Update last staggered call time
             cls._last_staggered_call = time.time()
@@ -94,6 +148,13 @@ class LLMInterface:
         cls._stagger_until = time.time() + 60
         logger.info(f"API failure marked - 5s cooldown + 60s stagger mode (5s between calls) activated")
 
+    @staticmethod
+    def _wait_for_slot():
+        """Take a request slot from the process-wide limiter, shared in turn with other runs."""
+        with tracing.span("llm.wait", reason="rate_limit"):
+            rate_limiter.limiter.acquire()
+
+    @tracing.traced("llm.call", tags=lambda self, *args, **kwargs: {"model": GPT_MODEL})
     def call_gpt(self,
                  system_prompt: str,
                  user_prompt: str,
@@ -129,6 +190,8 @@ class LLMInterface:
 
         for attempt in range(max_retries):
             try:
+                self._wait_for_slot()
+
                 # Build prompts
                 messages = [
                     {"role": "system", "content": system_prompt},
@@ -154,7 +217,8 @@ class LLMInterface:
                     # Token limit for Responses API
                     resp_kwargs["max_output_tokens"] = GPT_MAX_TOKENS
 
-                    response = self.client.responses.create(**resp_kwargs)
+                    with tracing.span("llm.request", attempt=attempt + 1):
+                        response = self.client.responses.create(**resp_kwargs)
 
                     # Extract response text
                     content = getattr(response, "output_text", "") or ""
@@ -176,7 +240,8 @@ class LLMInterface:
                     if response_format == "json":
                         kwargs["response_format"] = {"type": "json_object"}
 
-                    response = self.client.chat.completions.create(**kwargs)
+                    with tracing.span("llm.request", attempt=attempt + 1):
+                        response = self.client.chat.completions.create(**kwargs)
 
                     # Extract response
                     content = response.choices[0].message.content or ""
@@ -202,9 +267,8 @@ class LLMInterface:
                     logger.info(f"Cache hit! {cached_tokens:,} tokens cached (saved ~${cached_tokens * self.input_cost_per_1k * 0.9 / 1000:.4f})")
 
                 # Update stats
-                self.total_tokens += input_tokens + output_tokens
-                self.total_cost += cost
-                self.call_count += 1
+                self._record_usage(input_tokens + output_tokens, cost)
+                tracing.tag(tokens=input_tokens + output_tokens, cached_tokens=cached_tokens)
 
                 # If content is empty for GPT-5, raise to trigger retry (no cross-model fallback)
                 if GPT_MODEL.startswith("gpt-5") and not content.strip():
@@ -245,7 +309,7 @@ class LLMInterface:
                         "tokens": 0,
                         "cost": 0
                     }
-                time.sleep(2 ** attempt)  # Exponential backoff
+                tracing.traced_sleep(2 ** attempt, "llm.wait", reason="backoff")  # Exponential backoff
 
             except Exception as e:
                 logger.error(f"API error on attempt {attempt + 1}: {e}")
@@ -258,8 +322,9 @@ class LLMInterface:
                         "tokens": 0,
                         "cost": 0
                     }
-                time.sleep(2 ** attempt)
+                tracing.traced_sleep(2 ** attempt, "llm.wait", reason="backoff")
 
+    @tracing.traced("llm.assistant", tags=lambda self, *args, **kwargs: {"model": GPT_MODEL})
     def call_assistant_with_search(self,
                                    query: str,
                                    max_wait_time: int = 120,
@@ -303,12 +368,14 @@ class LLMInterface:
         # Retry loop for failed runs
         for attempt in range(max_retries):
             try:
+                self._wait_for_slot()
+
                 # Create a thread
                 thread = self.client.beta.threads.create()
                 logger.info(f"Created thread: {thread.id} (attempt {attempt + 1}/{max_retries})")
 
                 # Delay between initial processing POSTs to reduce burst traffic
-                time.sleep(self._initial_post_delay)
+                tracing.traced_sleep(self._initial_post_delay, "llm.wait", reason="throttle")
 
                 # Add the user message to the thread with JSON instruction if needed
                 if response_format == "json":
@@ -324,7 +391,7 @@ class LLMInterface:
                 logger.info(f"Added message to thread")
 
                 # Delay before creating the run
-                time.sleep(self._initial_post_delay)
+                tracing.traced_sleep(self._initial_post_delay, "llm.wait", reason="throttle")
 
                 # Run the assistant
                 run = self.client.beta.threads.runs.create(
@@ -357,9 +424,7 @@ class LLMInterface:
                         estimated_cost = (estimated_tokens * self.input_cost_per_1k / 1000)
 
                         # Update stats
-                        self.total_tokens += int(estimated_tokens)
-                        self.total_cost += estimated_cost
-                        self.call_count += 1
+                        self._record_usage(int(estimated_tokens), estimated_cost)
 
                         # Parse JSON if requested
                         if response_format == "json":
@@ -406,13 +471,13 @@ class LLMInterface:
                     wait = self._polling_delay
                     
                     logger.debug(f"Status: {run.status}, polling again in {wait}s (poll #{poll_count})")
-                    time.sleep(wait)
+                    tracing.traced_sleep(wait, "llm.poll")
 
                 # If we're here, either timed out or run failed - retry if attempts remain
                 if attempt < max_retries - 1:
                     wait_time = self._processing_call_delay
                     logger.info(f"Retrying in {wait_time} seconds...")
-                    time.sleep(wait_time)
+                    tracing.traced_sleep(wait_time, "llm.wait", reason="backoff")
                 else:
                     # Final attempt failed
                     self._mark_api_failure()
@@ -431,7 +496,7 @@ class LLMInterface:
                 if attempt < max_retries - 1:
                     wait_time = 2 ** attempt
                     logger.info(f"Retrying in {wait_time} seconds...")
-                    time.sleep(wait_time)
+                    tracing.traced_sleep(wait_time, "llm.wait", reason="backoff")
                 else:
                     return {
                         "success": False,
@@ -441,12 +506,17 @@ class LLMInterface:
                         "cost": 0
                     }
 
+    def _record_usage(self, tokens: int, cost: float):
+        """Add one call to the totals and to the calling run's usage, if it tracks one."""
+        with self._stats_lock:
+            self.total_tokens += tokens
+            self.total_cost += cost
+            self.call_count += 1
+        usage = _usage.get()
+        if usage is not None:
+            usage.add(tokens, cost)
+
     def get_stats(self) -> Dict[str, Any]:
-        """Return statistics about API usage."""
-        return {
-            "total_calls": self.call_count,
-            "total_tokens": self.total_tokens,
-            "total_cost": self.total_cost,
-            "avg_tokens_per_call": self.total_tokens / max(self.call_count, 1),
-            "avg_cost_per_call": self.total_cost / max(self.call_count, 1)
-        }
+        """Return statistics about API usage (every run sharing this interface)."""
+        with self._stats_lock:
+            return _usage_stats(self.call_count, self.total_tokens, self.total_cost)
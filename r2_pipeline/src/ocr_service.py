@@ -0,0 +1,370 @@
+"""
+Shared OCR service for re-OCRing PDF regions with Tesseract.
+
+Rasterized page images are cached in memory, Tesseract runs in a process pool
+behind a bounded queue, and OCR results are persisted to disk so retries and
+later rounds never OCR the same region twice.
+"""
+import hashlib
+import io
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import fitz  # PyMuPDF
+
+from src import tracing
+
+from config.settings import (
+    OCR_CACHE_DIR,
+    OCR_MAX_WORKERS,
+    OCR_MAX_PENDING,
+    OCR_PIXMAP_CACHE_SIZE,
+)
+
+logger = logging.getLogger(__name__)
+
+# PDF content hashes remembered per (path, size, mtime)
+HASH_MEMO_SIZE = 256
+
+# Try to import OCR dependencies
+try:
+    from PIL import Image
+    import pytesseract
+    OCR_AVAILABLE = True
+except ImportError:
+    OCR_AVAILABLE = False
+
+
+def _run_tesseract_tsv(png_bytes: bytes, config: str) -> str:
+    """Run Tesseract on a PNG image and return its TSV output (process pool worker)."""
+    img = Image.open(io.BytesIO(png_bytes))
+    return pytesseract.image_to_data(img, config=config)
+
+
+def _parse_tsv(tsv: str, zoom: float, origin: Tuple[float, float]) -> List[Dict]:
+    """
+    Parse Tesseract TSV output into words with page-space bounding boxes.
+
+    Args:
+        tsv: Raw TSV from pytesseract.image_to_data
+        zoom: Rasterization zoom (dpi / 72) used for the image
+        origin: (x0, y0) of the clip rectangle in page coordinates
+
+    Returns:
+        List of word dicts with text, conf, bbox and line key
+    """
+    words = []
+    lines = tsv.splitlines()
+    if not lines:
+        return words
+
+    header = lines[0].split('\t')
+    col = {name: i for i, name in enumerate(header)}
+    for line in lines[1:]:
+        parts = line.split('\t')
+        if len(parts) < len(header):
+            continue
+        text = parts[col['text']].strip()
+        if not text:
+            continue
+        left = int(parts[col['left']]) / zoom + origin[0]
+        top = int(parts[col['top']]) / zoom + origin[1]
+        width = int(parts[col['width']]) / zoom
+        height = int(parts[col['height']]) / zoom
+        words.append({
+            "text": text,
+            "conf": float(parts[col['conf']]),
+            "bbox": (left, top, left + width, top + height),
+            "line": (int(parts[col['block_num']]), int(parts[col['par_num']]), int(parts[col['line_num']])),
+        })
+    return words
+
+
+def _words_to_text(words: List[Dict]) -> str:
+    """Join OCR words into text, one output line per Tesseract line."""
+    lines = OrderedDict()
+    for word in words:
+        lines.setdefault(word["line"], []).append(word["text"])
+    return "\n".join(" ".join(parts) for parts in lines.values())
+
+
+class OCRResultStore:
+    """SQLite-backed store of OCR results keyed by region."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS ocr_results (
+                key TEXT PRIMARY KEY,
+                text TEXT,
+                words TEXT,
+                created_at REAL
+            )
+        """)
+        self.conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        with self.lock:
+            row = self.conn.execute("SELECT text FROM ocr_results WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def put_many(self, entries: List[Tuple[str, str, List[Dict]]]):
+        with self.lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO ocr_results (key, text, words, created_at) VALUES (?, ?, ?, ?)",
+                [(key, text, json.dumps(words), time.time()) for key, text, words in entries]
+            )
+            self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class OCRService:
+    """
+    Process-pool OCR with page-image and result caching.
+
+    Each page is rendered once per DPI and kept in memory; regions are cropped
+    from that render (clipped to their union) and sent to Tesseract in a
+    single invocation. Words from the TSV output are then assigned back to
+    each region by position.
+    """
+
+    def __init__(self,
+                 cache_dir: Path = OCR_CACHE_DIR,
+                 max_workers: int = OCR_MAX_WORKERS,
+                 max_pending: int = OCR_MAX_PENDING,
+                 pixmap_cache_size: int = OCR_PIXMAP_CACHE_SIZE):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.store = OCRResultStore(self.cache_dir / "ocr_results.db")
+
+        self.max_workers = max_workers
+        self.executor = ProcessPoolExecutor(max_workers=max_workers) if max_workers > 0 else None
+        self._slots = threading.BoundedSemaphore(max(1, max_pending))
+
+        self.pixmap_cache_size = pixmap_cache_size
+        self._pixmaps: "OrderedDict[Tuple, fitz.Pixmap]" = OrderedDict()
+        self._pixmap_lock = threading.Lock()
+        self._hashes: "OrderedDict[Tuple, str]" = OrderedDict()
+
+        # Counters are bumped from every thread that OCRs
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            "regions_requested": 0,
+            "result_cache_hits": 0,
+            "pixmap_cache_hits": 0,
+            "tesseract_calls": 0,
+        }
+
+    def pdf_hash(self, pdf_path: Path) -> str:
+        """Content hash of a PDF, memoized by path, size and mtime."""
+        pdf_path = Path(pdf_path)
+        st = pdf_path.stat()
+        memo_key = (str(pdf_path.resolve()), st.st_size, st.st_mtime)
+        with self._pixmap_lock:
+            cached = self._hashes.get(memo_key)
+            if cached is not None:
+                self._hashes.move_to_end(memo_key)
+                return cached
+
+        digest = hashlib.sha256()
+        with open(pdf_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        with self._pixmap_lock:
+            self._hashes[memo_key] = digest.hexdigest()
+            while len(self._hashes) > HASH_MEMO_SIZE:
+                self._hashes.popitem(last=False)
+        return digest.hexdigest()
+
+    def doc_hash(self, doc: fitz.Document) -> str:
+        """Content hash of an open document: its file's, or its bytes' when it has no file."""
+        if doc.name and Path(doc.name).is_file():
+            return self.pdf_hash(Path(doc.name))
+        return hashlib.sha256(doc.tobytes(no_new_id=True)).hexdigest()
+
+    def _count(self, name: str, n: int = 1):
+        with self._stats_lock:
+            self.stats[name] += n
+
+    @staticmethod
+    def _rect_key(rect) -> Tuple[float, float, float, float]:
+        r = fitz.Rect(rect)
+        return (round(r.x0, 1), round(r.y0, 1), round(r.x1, 1), round(r.y1, 1))
+
+    def _region_key(self, pdf_hash: str, page_num: int, dpi: int, rect) -> str:
+        return f"{pdf_hash}:{page_num}:{dpi}:{','.join(str(v) for v in self._rect_key(rect))}"
+
+    def get_page_pixmap(self, doc: fitz.Document, pdf_hash: str, page_num: int, dpi: int) -> fitz.Pixmap:
+        """Render a whole page, cached by (pdf hash, page, dpi)."""
+        key = (pdf_hash, page_num, dpi)
+        with self._pixmap_lock:
+            pix = self._pixmaps.get(key)
+            if pix is not None:
+                self._pixmaps.move_to_end(key)
+        if pix is not None:
+            self._count("pixmap_cache_hits")
+            return pix
+
+        zoom = dpi / 72
+        with tracing.span("ocr.rasterize", page=page_num, dpi=dpi):
+            pix = doc[page_num].get_pixmap(matrix=fitz.Matrix(zoom, zoom))
+
+        with self._pixmap_lock:
+            self._pixmaps[key] = pix
+            while len(self._pixmaps) > self.pixmap_cache_size:
+                self._pixmaps.popitem(last=False)
+        return pix
+
+    def get_pixmap_png(self, doc: fitz.Document, pdf_hash: str, page_num: int,
+                       dpi: int, clip: Optional[fitz.Rect] = None) -> Tuple[bytes, Tuple[float, float]]:
+        """
+        Crop a clip from the cached page render and encode it as PNG.
+
+        Returns the PNG and the page-space position of its top-left pixel.
+        """
+        pix = self.get_page_pixmap(doc, pdf_hash, page_num, dpi)
+        if clip is None:
+            return pix.tobytes("png"), (0.0, 0.0)
+
+        zoom = dpi / 72
+        irect = (fitz.Rect(clip) * fitz.Matrix(zoom, zoom)).irect & pix.irect
+        if irect.is_empty:
+            raise ValueError(f"Clip {clip} lies outside page {page_num}")
+        cropped = fitz.Pixmap(pix.colorspace, irect, pix.alpha)
+        cropped.copy(pix, irect)
+        return cropped.tobytes("png"), (irect.x0 / zoom, irect.y0 / zoom)
+
+    def _submit(self, png: bytes, config: str) -> Future:
+        """Queue a Tesseract run in the pool, blocking while max_pending runs are queued."""
+        self._slots.acquire()
+        try:
+            future = self.executor.submit(_run_tesseract_tsv, png, config)
+        except BaseException:
+            # A run that was never queued must not keep its slot
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def _tesseract(self, png: bytes, config: str) -> str:
+        """Run Tesseract through the bounded process pool (or inline)."""
+        self._count("tesseract_calls")
+        if self.executor is None:
+            with tracing.span("ocr.tesseract"):
+                return _run_tesseract_tsv(png, config)
+
+        # Block while the queue is full so callers can't pile up work
+        with tracing.span("ocr.wait"):
+            future = self._submit(png, config)
+        with tracing.span("ocr.tesseract"):
+            return future.result()
+
+    @tracing.traced("ocr.regions", tags=lambda self, doc, page_num, rects, *args, **kwargs: {
+        "page": page_num, "regions": len(rects)})
+    def ocr_regions(self, doc: fitz.Document, page_num: int, rects: Sequence,
+                    dpi: int = 300) -> List[Optional[str]]:
+        """
+        OCR several regions of one page with at most one Tesseract call.
+
+        Args:
+            doc: Open PyMuPDF document
+            page_num: Page number (0-indexed)
+            rects: Regions to OCR, in page coordinates
+            dpi: Rasterization resolution
+
+        Returns:
+            Extracted text per region (None where OCR failed)
+        """
+        if not OCR_AVAILABLE:
+            logger.error("Cannot OCR: pytesseract not available")
+            return [None] * len(rects)
+
+        self._count("regions_requested", len(rects))
+        try:
+            pdf_hash = self.doc_hash(doc)
+        except Exception as e:
+            logger.error(f"OCR failed on page {page_num}: cannot hash {doc.name or 'document'}: {e}")
+            return [None] * len(rects)
+        keys = [self._region_key(pdf_hash, page_num, dpi, rect) for rect in rects]
+
+        results: List[Optional[str]] = []
+        missing = []
+        for i, key in enumerate(keys):
+            cached = self.store.get(key)
+            if cached is not None:
+                self._count("result_cache_hits")
+            else:
+                missing.append(i)
+            results.append(cached)
+
+        if not missing:
+            return results
+
+        try:
+            region_rects = [fitz.Rect(rects[i]) for i in missing]
+            clip = fitz.Rect(region_rects[0])
+            for rect in region_rects[1:]:
+                clip |= rect
+            clip &= doc[page_num].rect
+
+            # A single region is a uniform block; a union of regions needs layout analysis
+            config = '--psm 6' if len(region_rects) == 1 else '--psm 3'
+            png, origin = self.get_pixmap_png(doc, pdf_hash, page_num, dpi, clip)
+
+            logger.info(f"OCRing {len(region_rects)} region(s) on page {page_num} at {dpi} DPI...")
+            tsv = self._tesseract(png, config)
+            words = _parse_tsv(tsv, dpi / 72, origin)
+
+            entries = []
+            for i, rect in zip(missing, region_rects):
+                region_words = [
+                    w for w in words
+                    if fitz.Rect(w["bbox"]).intersects(rect)
+                    and rect.contains(fitz.Point((w["bbox"][0] + w["bbox"][2]) / 2,
+                                                 (w["bbox"][1] + w["bbox"][3]) / 2))
+                ]
+                text = _words_to_text(region_words).strip()
+                results[i] = text
+                entries.append((keys[i], text, region_words))
+
+            self.store.put_many(entries)
+
+        except Exception as e:
+            logger.error(f"OCR failed on page {page_num}: {e}")
+
+        return results
+
+    def get_stats(self) -> Dict:
+        with self._stats_lock:
+            return dict(self.stats)
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+        self.store.close()
+
+
+_service: Optional[OCRService] = None
+_service_lock = threading.Lock()
+
+
+def get_ocr_service() -> OCRService:
+    """Return the process-wide OCR service, creating it on first use."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = OCRService()
+        return _service
@@ -9,15 +9,13 @@ import logging
 import re
 import tempfile
 
+from src.ocr_service import get_ocr_service, OCR_AVAILABLE
+from src import tracing
+
 logger = logging.getLogger(__name__)
 
-# Try to import OCR dependencies
-try:
-    from PIL import Image
-    import pytesseract
-    OCR_AVAILABLE = True
-except ImportError:
-    OCR_AVAILABLE = False
+# OCR runs through OCRService, which owns the Tesseract imports
+if not OCR_AVAILABLE:
     logger.warning("OCR libraries not available. Install with: pip install pytesseract pillow")
     logger.warning("Also install tesseract: brew install tesseract (macOS) or apt-get install tesseract-ocr (Linux)")
 
@@ -346,46 +344,31 @@ class PDFProcessor:
         Returns:
             Extracted text or None if OCR fails
         """
-        if not OCR_AVAILABLE:
-            logger.error("Cannot re-OCR: pytesseract not available")
-            return None
-
-        try:
-            page = self.doc[page_num]
-
-            # Extract the page region as a high-res image
-            # zoom factor: 300dpi / 72dpi = 4.167
-            zoom = dpi / 72
-            mat = fitz.Matrix(zoom, zoom)
-            pix = page.get_pixmap(matrix=mat, clip=rect)
-
-            # Convert PyMuPDF pixmap to PIL Image
-            # PyMuPDF uses RGB or RGBA, convert to PIL
-            if pix.alpha:
-                mode = "RGBA"
-            else:
-                mode = "RGB"
+        return self.re_ocr_regions(page_num, [rect], dpi)[0]
 
-            img = Image.frombytes(mode, [pix.width, pix.height], pix.samples)
-
-            # Run Tesseract OCR
-            logger.info(f"Re-OCRing page {page_num}, region at {dpi} DPI...")
-            text = pytesseract.image_to_string(img, config='--psm 6')  # Assume uniform text block
+    def re_ocr_regions(self, page_num: int, rects: List[fitz.Rect], dpi: int = 300) -> List[Optional[str]]:
+        """
+        Re-OCR several regions of the same page in a single Tesseract call.
 
-            logger.info(f"Re-OCR extracted {len(text)} characters")
-            return text.strip()
+        Results are served from the shared OCR service cache when the same
+        region of the same PDF has been OCRed before.
+        """
+        if not OCR_AVAILABLE:
+            logger.error("Cannot re-OCR: pytesseract not available")
+            return [None] * len(rects)
 
-        except Exception as e:
-            logger.error(f"Failed to re-OCR region: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
-            return None
+        texts = get_ocr_service().ocr_regions(self.doc, page_num, rects, dpi=dpi)
+        for text in texts:
+            if text is not None:
+                logger.info(f"Re-OCR extracted {len(text)} characters")
+        return texts
 
     def close(self):
         """Close the PDF document."""
         self.doc.close()
 
 # Convenience function
+@tracing.traced("pdf.extract", tags=lambda pdf_path: {"pdf": Path(pdf_path).name})
 def process_r1_pdf(pdf_path: Path) -> Dict:
     """
     Main function to process an R1 PDF and extract all relevant data.
@@ -420,6 +403,17 @@ def process_r1_pdf(pdf_path: Path) -> Dict:
         quality_checker = TextQualityChecker()
         has_quality_issues = False
 
+        # Re-OCR corrupted regions up front, one Tesseract call per page
+        re_ocr_texts = {}
+        if OCR_AVAILABLE:
+            corrupted_by_page = {}
+            for i, region in enumerate(redboxed_regions):
+                if quality_checker.assess_text_quality(region['text'])['is_corrupted']:
+                    corrupted_by_page.setdefault(region['page'], []).append(i)
+            for page_num, indices in corrupted_by_page.items():
+                texts = processor.re_ocr_regions(page_num, [redboxed_regions[i]['rect'] for i in indices])
+                re_ocr_texts.update(zip(indices, texts))
+
         for i, region in enumerate(redboxed_regions):
             logger.info(f"  Region {i+1} (page {region['page']}): {region['text'][:150]}...")
 
@@ -438,7 +432,7 @@ def process_r1_pdf(pdf_path: Path) -> Dict:
                 # Attempt to re-OCR this region
                 if OCR_AVAILABLE:
                     logger.info(f"  🔄 Attempting to re-OCR Region {i+1} using Tesseract...")
-                    new_text = processor.re_ocr_region(region['page'], region['rect'])
+                    new_text = re_ocr_texts.get(i)
 
                     if new_text:
                         # Re-assess the quality of the new text
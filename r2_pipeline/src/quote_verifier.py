@@ -1,14 +1,38 @@
 """
 Verify quote accuracy character-by-character.
 Checks for proper use of brackets, ellipses, and exact matching.
+
+The quote is aligned against the source once (semi-global edit distance,
+one alignment per segment between ellipses and bracketed substitutions)
+and every check below reads from that alignment instead of re-searching
+the source.
 """
+import difflib
 import re
-from typing import Dict, List
-from dataclasses import dataclass
+from typing import Dict, List, Tuple
+from dataclasses import dataclass, field
 import logging
 
+from src import tracing
+
 logger = logging.getLogger(__name__)
 
+# Bracketed notes that are not part of the quoted language itself
+EXPLANATORY_BRACKETS = {'sic', 'emphasis added', 'emphasis omitted',
+                        'internal quotation marks omitted', 'citations omitted'}
+
+# Quotes further than this from the source are reported as not found
+MAX_ERROR_RATE = 0.15
+MAX_SEED_WINDOWS = 64
+
+# Most source text a bracketed substitution ("[The legislature]") may stand for
+MAX_BRACKET_GAP = 60
+
+ZERO_WIDTH = '\u200b\u200c\u200d\ufeff'
+
+# One token per alteration, ellipsis, whitespace run or ordinary character
+QUOTE_TOKEN = re.compile(r'\[([^\]]*)\]|(\.(?: ?\.){2,3}|…)|(\s+)|(.)', re.DOTALL)
+
 @dataclass
 class QuoteIssue:
     """Represents an issue found in a quote."""
@@ -19,12 +43,145 @@ class QuoteIssue:
     actual: str
     severity: str  # 'critical', 'major', 'minor'
 
+@dataclass
+class SegmentAlignment:
+    """Alignment of one quote segment (between ellipses and substitutions) within the source."""
+    text: str                                      # Segment with letter brackets unwrapped
+    quote_map: List[int]                           # Segment index -> quote offset
+    bracketed: List[bool] = field(default_factory=list)
+    after_bracket: bool = False                    # Follows a bracketed substitution, not an ellipsis
+    source_start: int = -1                         # Span in normalized source
+    source_end: int = -1
+    distance: int = 0
+
+def _normalize_with_map(text: str) -> Tuple[str, List[int]]:
+    """
+    Collapse whitespace and drop zero-width characters in one pass.
+
+    Returns the normalized text and, for each of its characters, the offset
+    of the corresponding character in the original text.
+    """
+    chars: List[str] = []
+    offsets: List[int] = []
+    pending_space = -1
+    for i, ch in enumerate(text):
+        if ch in ZERO_WIDTH:
+            continue
+        if ch.isspace():
+            if chars and pending_space < 0:
+                pending_space = i
+            continue
+        if pending_space >= 0:
+            chars.append(' ')
+            offsets.append(pending_space)
+            pending_space = -1
+        chars.append(ch)
+        offsets.append(i)
+    return ''.join(chars), offsets
+
+
+def _fold_case(text: str) -> str:
+    """Lowercase without changing length, so offsets stay valid."""
+    return ''.join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+
+def _best_alignment_end(pattern: str, text: str) -> Tuple[int, int]:
+    """
+    Minimum edit distance of pattern against any substring of text.
+
+    Myers' bit-parallel algorithm with Python ints as bit vectors: one pass
+    over the text, so cost is linear in source length for typical quotes.
+    Returns (distance, inclusive end index), end -1 for an empty text.
+    """
+    m = len(pattern)
+    peq: Dict[str, int] = {}
+    for i, ch in enumerate(pattern):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+
+    full = (1 << m) - 1
+    high = 1 << (m - 1)
+    pv, mv = full, 0
+    score = m
+    best, best_end = m, -1
+
+    for j, ch in enumerate(text):
+        eq = peq.get(ch, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+        if ph & high:
+            score += 1
+        elif mh & high:
+            score -= 1
+        ph = (ph << 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+        if score < best:
+            best, best_end = score, j
+            if best == 0:
+                break
+
+    return best, best_end
+
+
+def _scan(pattern: str, text: str) -> Tuple[int, int, int]:
+    """Full Myers scan; returns (distance, start, end) with end exclusive."""
+    distance, end = _best_alignment_end(pattern, text)
+    if end < 0:
+        return distance, 0, 0
+    _, rev_end = _best_alignment_end(pattern[::-1], text[end::-1])
+    return distance, end - rev_end, end + 1
+
+
+def _align(pattern: str, text: str) -> Tuple[int, int, int]:
+    """
+    Best semi-global alignment of pattern within text.
+
+    Returns (distance, start, end) with end exclusive. Long patterns are
+    split into pieces: any match within MAX_ERROR_RATE must contain one
+    piece verbatim, so only windows around exact piece hits are scanned.
+    A pattern with no piece hit cannot match and reports (len, 0, 0).
+    """
+    exact = text.find(pattern)
+    if exact != -1:
+        return 0, exact, exact + len(pattern)
+
+    m = len(pattern)
+    pieces = int(m * MAX_ERROR_RATE) + 1
+    size = m // pieces
+    if m < 32 or size < 4:
+        return _scan(pattern, text)
+
+    windows: List[Tuple[int, int]] = []
+    for p in range(pieces):
+        chunk = pattern[p * size:(p + 1) * size]
+        pos = text.find(chunk)
+        while pos != -1 and len(windows) <= MAX_SEED_WINDOWS:
+            windows.append((max(0, pos - p * size - pieces), min(len(text), pos - p * size + m + pieces)))
+            pos = text.find(chunk, pos + 1)
+
+    if len(windows) > MAX_SEED_WINDOWS:
+        return _scan(pattern, text)
+    if not windows:
+        return m, 0, 0
+
+    best = (m + 1, 0, 0)
+    for lo, hi in sorted(set(windows)):
+        distance, start, end = _scan(pattern, text[lo:hi])
+        if distance < best[0]:
+            best = (distance, lo + start, lo + end)
+    return best
+
+
 class QuoteVerifier:
     """Verify accuracy of quoted text."""
 
     def __init__(self):
         self.issues: List[QuoteIssue] = []
 
+    @tracing.traced("quote.verify")
     def verify_quote(self,
                      quoted_text: str,
                      source_text: str,
@@ -38,47 +195,39 @@ class QuoteVerifier:
             allow_minor_whitespace: Allow minor whitespace differences
 
         Returns:
-            Dict with verification results
+            Dict with verification results, including the matched span
+            (offsets into source_text) and per-segment spans
         """
         self.issues = []
 
-        # Clean up for comparison
+        # Normalize both sides once; every check reuses these
         quote_clean = self._normalize_text(quoted_text)
-        source_clean = self._normalize_text(source_text)
-
-        # Check if quote exists in source (allowing for some flexibility)
-        quote_found = self._find_quote_in_source(quote_clean, source_clean)
-
-        if not quote_found:
-            # Try fuzzy matching
-            try:
-                import Levenshtein
-                similarity = Levenshtein.ratio(quote_clean, source_clean)
-            except ImportError:
-                # If Levenshtein not available, use simple comparison
-                similarity = 0.5 if quote_clean.lower() in source_clean.lower() else 0.0
-
-            if similarity < 0.85:  # Not even close
-                return {
-                    "accurate": False,
-                    "confidence": 0.0,
-                    "similarity": similarity,
-                    "issues": [{
-                        "issue_type": "not_found",
-                        "description": "Quote not found in source text",
-                        "severity": "critical"
-                    }],
-                    "suggested_action": "verify_source_or_page_number"
-                }
-
-        # Character-by-character comparison
-        self._compare_character_by_character(quoted_text, source_text)
+        source_clean, source_offsets = _normalize_with_map(source_text)
+
+        segments = self._align_quote(quoted_text, source_clean)
+        similarity = self._similarity(segments)
+
+        if not segments or similarity < 1.0 - MAX_ERROR_RATE:  # Not even close
+            return {
+                "accurate": False,
+                "confidence": 0.0,
+                "similarity": similarity,
+                "issues": [{
+                    "issue_type": "not_found",
+                    "description": "Quote not found in source text",
+                    "severity": "critical"
+                }],
+                "suggested_action": "verify_source_or_page_number"
+            }
+
+        # Character-level differences within the aligned spans
+        self._compare_character_by_character(segments, source_clean, allow_minor_whitespace)
 
         # Check bracket usage
-        self._verify_brackets(quoted_text, source_text)
+        self._verify_brackets(quoted_text, segments, source_clean)
 
         # Check ellipsis usage
-        self._verify_ellipses(quoted_text, source_text)
+        self._verify_ellipses(quoted_text, segments, source_clean)
 
         # Check quotation marks (nested quotes should use single quotes)
         self._verify_nested_quotes(quoted_text)
@@ -86,69 +235,194 @@ class QuoteVerifier:
         # Calculate accuracy score
         accuracy_score = self._calculate_accuracy_score()
 
+        spans = [self._source_span(seg.source_start, seg.source_end, source_offsets) for seg in segments]
+
         return {
             "accurate": accuracy_score > 0.95,
             "confidence": accuracy_score,
+            "similarity": similarity,
             "issues": [self._issue_to_dict(issue) for issue in self.issues],
             "suggested_action": self._suggest_action(accuracy_score),
+            "source_span": [spans[0][0], spans[-1][1]],
+            "segment_spans": spans,
             "quote_clean": quote_clean,
             "source_clean": source_clean
         }
 
     def _normalize_text(self, text: str) -> str:
         """Normalize text for comparison (remove extra whitespace, etc)."""
-        # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text)
-        # Remove zero-width characters
-        text = re.sub(r'[\u200b-\u200d\ufeff]', '', text)
-        return text.strip()
-
-    def _find_quote_in_source(self, quote: str, source: str) -> bool:
-        """Check if quote appears in source (with some flexibility)."""
-        # Try exact match first
-        if quote in source:
-            return True
-
-        # Try case-insensitive
-        if quote.lower() in source.lower():
-            return True
-
-        # Try without punctuation
-        quote_no_punct = re.sub(r'[^\w\s]', '', quote)
-        source_no_punct = re.sub(r'[^\w\s]', '', source)
-        if quote_no_punct in source_no_punct:
-            return True
-
-        return False
-
-    def _compare_character_by_character(self, quote: str, source: str):
-        """Compare quote and source character by character."""
-        # Find where quote appears in source
-        quote_clean = self._normalize_text(quote)
-        source_clean = self._normalize_text(source)
-
-        # Try to locate quote position in source
-        pos = source_clean.lower().find(quote_clean.lower())
-        if pos == -1:
-            return  # Already flagged as not found
-
-        # Extract the actual source text at this position
-        actual_source = source_clean[pos:pos+len(quote_clean)]
-
-        # Compare character by character
-        for i, (q_char, s_char) in enumerate(zip(quote_clean, actual_source)):
-            if q_char != s_char:
+        return _normalize_with_map(text)[0]
+
+    def _split_segments(self, quote: str) -> List[SegmentAlignment]:
+        """
+        Tokenize the quote once into segments.
+
+        Whitespace is collapsed and explanatory brackets ([sic], [emphasis
+        added]) are dropped. Ellipses end a segment. A bracketed word or
+        phrase substitutes for unknown source text, so it ends a segment too;
+        single-letter alterations ([T]he) are unwrapped in place. Each
+        character remembers its offset in the original quote.
+        """
+        segments = [SegmentAlignment(text='', quote_map=[])]
+        chars: List[str] = []
+
+        def add(ch: str, pos: int, bracketed: bool):
+            seg = segments[-1]
+            if ch == ' ' and (not chars or chars[-1] == ' '):
+                return
+            chars.append(ch)
+            seg.quote_map.append(pos)
+            seg.bracketed.append(bracketed)
+
+        def close_segment():
+            seg = segments[-1]
+            while chars and chars[-1] == ' ':
+                chars.pop()
+                seg.quote_map.pop()
+                seg.bracketed.pop()
+            seg.text = ''.join(chars)
+            chars.clear()
+
+        for match in QUOTE_TOKEN.finditer(quote):
+            bracket, ellipsis, space, char = match.groups()
+            if char is not None:
+                if char not in ZERO_WIDTH:
+                    add(char, match.start(), False)
+            elif space is not None:
+                add(' ', match.start(), False)
+            elif ellipsis is not None:
+                # A four-dot ellipsis ends a sentence: keep the period
+                if ellipsis.count('.') == 4:
+                    add('.', match.start(), False)
+                close_segment()
+                segments.append(SegmentAlignment(text='', quote_map=[]))
+            elif bracket.strip().lower() in EXPLANATORY_BRACKETS:
+                continue
+            elif len(bracket.strip()) > 1:
+                # Text after an ellipsis and a substitution is still an omission
+                if chars:
+                    close_segment()
+                    segments.append(SegmentAlignment(text='', quote_map=[], after_bracket=True))
+            else:
+                for offset, ch in enumerate(bracket, start=match.start(1)):
+                    add(' ' if ch.isspace() else ch, offset, True)
+
+        close_segment()
+        return [seg for seg in segments if seg.text]
+
+    def _align_quote(self, quote: str, source: str) -> List[SegmentAlignment]:
+        """
+        Align each quote segment in order, case-insensitively.
+
+        Segments joined by bracketed substitutions must lie within
+        MAX_BRACKET_GAP of each other. Such a group is anchored on its longest
+        segment; the others are aligned outward from it, each to the nearest
+        match.
+        """
+        segments = self._split_segments(quote)
+        source_folded = _fold_case(source)
+
+        groups: List[List[SegmentAlignment]] = []
+        for seg in segments:
+            if seg.after_bracket and groups:
+                groups[-1].append(seg)
+            else:
+                groups.append([seg])
+
+        cursor = 0
+        for group in groups:
+            anchor = max(range(len(group)), key=lambda k: len(group[k].text))
+            self._place(group[anchor], source_folded, cursor, len(source_folded))
+
+            for before, seg in zip(group[anchor:], group[anchor + 1:]):
+                end = before.source_end + MAX_BRACKET_GAP + len(seg.text) * 2
+                self._place(seg, source_folded, before.source_end, min(end, len(source_folded)))
+
+            for after, seg in zip(group[anchor::-1], group[anchor - 1::-1] if anchor else []):
+                start = max(cursor, after.source_start - MAX_BRACKET_GAP - len(seg.text) * 2)
+                self._place(seg, source_folded, start, after.source_start, nearest_end=True)
+
+            cursor = group[-1].source_end
+        return segments
+
+    @staticmethod
+    def _place(seg: SegmentAlignment, source: str, lo: int, hi: int, nearest_end: bool = False):
+        """Align seg within source[lo:hi]; nearest_end prefers matches closest to hi."""
+        pattern = _fold_case(seg.text)
+        if nearest_end:
+            distance, start, end = _align(pattern[::-1], source[lo:hi][::-1])
+            start, end = hi - lo - end, hi - lo - start
+        else:
+            distance, start, end = _align(pattern, source[lo:hi])
+        seg.source_start = lo + start
+        seg.source_end = lo + end
+        seg.distance = distance
+
+    def _similarity(self, segments: List[SegmentAlignment]) -> float:
+        """Similarity implied by the alignment distance (1.0 = exact)."""
+        total = sum(len(seg.text) for seg in segments)
+        if total == 0:
+            return 0.0
+        return max(0.0, 1.0 - sum(seg.distance for seg in segments) / total)
+
+    @staticmethod
+    def _source_span(start: int, end: int, offsets: List[int]) -> Tuple[int, int]:
+        """Map a span of the normalized source back to original offsets."""
+        if start >= end:
+            return (offsets[start] if start < len(offsets) else 0,) * 2
+        return offsets[start], offsets[end - 1] + 1
+
+    def _compare_character_by_character(self,
+                                        segments: List[SegmentAlignment],
+                                        source: str,
+                                        allow_minor_whitespace: bool = True):
+        """Report differences between each aligned segment and its source span."""
+        for seg in segments:
+            actual_source = source[seg.source_start:seg.source_end]
+            matcher = difflib.SequenceMatcher(None, seg.text, actual_source, autojunk=False)
+
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+                if tag == 'equal':
+                    continue
+                quoted = seg.text[i1:i2]
+                expected = actual_source[j1:j2]
+
+                # Differences inside brackets are deliberate alterations
+                if i2 > i1 and all(seg.bracketed[i1:i2]):
+                    continue
+                if allow_minor_whitespace and not quoted.strip() and not expected.strip():
+                    continue
+
+                position = seg.quote_map[min(i1, len(seg.quote_map) - 1)]
+                if quoted.lower() == expected.lower():
+                    issue_type = 'capitalization'
+                elif not re.sub(r'[^\w]', '', quoted + expected):
+                    issue_type = 'punctuation'
+                else:
+                    issue_type = 'mismatch'
+
                 self.issues.append(QuoteIssue(
-                    issue_type='mismatch',
-                    description=f"Character mismatch at position {i}",
-                    position=i,
-                    expected=s_char,
-                    actual=q_char,
+                    issue_type=issue_type,
+                    description=f"Character mismatch at position {position}",
+                    position=position,
+                    expected=expected,
+                    actual=quoted,
                     severity='major'
                 ))
 
-    def _verify_brackets(self, quote: str, source: str):
+    def _verify_brackets(self, quote: str, segments: List[SegmentAlignment], source: str):
         """Verify that brackets are used correctly for alterations."""
+        # Where each bracketed quote offset landed in the source
+        aligned: Dict[int, str] = {}
+        for seg in segments:
+            actual_source = source[seg.source_start:seg.source_end]
+            matcher = difflib.SequenceMatcher(None, seg.text, actual_source, autojunk=False)
+            for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+                if tag in ('equal', 'replace') and i2 - i1 == j2 - j1:
+                    for k in range(i2 - i1):
+                        if seg.bracketed[i1 + k]:
+                            aligned[seg.quote_map[i1 + k]] = actual_source[j1 + k]
+
         # Find all bracketed content
         bracketed = re.finditer(r'\[([^\]]+)\]', quote)
 
@@ -156,20 +430,33 @@ class QuoteVerifier:
             bracketed_text = match.group(1)
             position = match.start()
 
-            # Check if this is a proper alteration
-            # Common valid uses: [T]he (capitalization), [plaintiff] (substitution)
-
-            # Check if it's capitalization change
-            if len(bracketed_text) == 1 and bracketed_text.isupper():
-                # This might be capitalizing first letter
-                # Should find lowercase version in source
-                continue  # Probably valid
-
             # Check if it's explanatory [sic] or [emphasis added]
-            if bracketed_text.lower() in ['sic', 'emphasis added', 'emphasis omitted',
-                                          'internal quotation marks omitted', 'citations omitted']:
+            if bracketed_text.lower() in EXPLANATORY_BRACKETS:
                 continue  # Valid
 
+            # Check if it's capitalization change: [T]he should match "the" in source
+            if len(bracketed_text) == 1 and bracketed_text.isalpha():
+                source_char = aligned.get(match.start(1))
+                if source_char == bracketed_text:
+                    self.issues.append(QuoteIssue(
+                        issue_type='bracket',
+                        description=f"Bracket unnecessary: source already reads '{source_char}'",
+                        position=position,
+                        expected=source_char,
+                        actual=f'[{bracketed_text}]',
+                        severity='minor'
+                    ))
+                elif source_char is not None and source_char.lower() != bracketed_text.lower():
+                    self.issues.append(QuoteIssue(
+                        issue_type='bracket',
+                        description=f"Bracketed letter does not match source '{source_char}'",
+                        position=position,
+                        expected=source_char,
+                        actual=f'[{bracketed_text}]',
+                        severity='major'
+                    ))
+                continue
+
             # Otherwise, verify the alteration is necessary
             # This is complex and might need manual review
             self.issues.append(QuoteIssue(
@@ -181,10 +468,10 @@ class QuoteVerifier:
                 severity='minor'
             ))
 
-    def _verify_ellipses(self, quote: str, source: str):
-        """Verify ellipses are properly formatted."""
+    def _verify_ellipses(self, quote: str, segments: List[SegmentAlignment], source: str):
+        """Verify ellipses are properly formatted and actually omit text."""
         # Find all ellipses in quote
-        ellipses = re.finditer(r'\.{3,4}|\. \. \.|\.\.\.|…', quote)
+        ellipses = list(re.finditer(r'\.(?: ?\.){2,3}|…', quote))
 
         for match in ellipses:
             ellipsis = match.group(0)
@@ -195,7 +482,7 @@ class QuoteVerifier:
 
             if dot_count == 3:
                 # Mid-sentence omission - check spacing
-                if ellipsis not in [' . . . ', '...', '…']:
+                if ellipsis not in [' . . . ', '. . .', '...', '…']:
                     self.issues.append(QuoteIssue(
                         issue_type='ellipsis',
                         description='Ellipsis spacing incorrect (should be " . . . ")',
@@ -205,6 +492,25 @@ class QuoteVerifier:
                         severity='minor'
                     ))
 
+        # Consecutive segments with nothing between them omit nothing
+        for before, after in zip(segments, segments[1:]):
+            if after.after_bracket:
+                continue
+            gap = source[before.source_end:after.source_start]
+            if gap.strip(' .'):
+                continue
+            position = next((m.start() for m in ellipses
+                             if before.quote_map[-1] < m.start() < after.quote_map[0]),
+                            before.quote_map[-1])
+            self.issues.append(QuoteIssue(
+                issue_type='ellipsis',
+                description='Ellipsis used but no text is omitted from the source',
+                position=position,
+                expected='',
+                actual=quote[position:after.quote_map[0]].strip(),
+                severity='minor'
+            ))
+
     def _verify_nested_quotes(self, quote: str):
         """Verify nested quotes use single quotes."""
         # Find all double quotes
@@ -0,0 +1,98 @@
+"""
+Process-wide LLM rate limit, shared fairly between concurrent runs.
+
+Every LLM request takes a token from one bucket (LLM_CALLS_PER_SECOND,
+LLM_BURST). While requests are waiting, tokens go to the waiting tenants in
+turn, so a large article with many citations in flight cannot starve a small
+one started after it. The tenant is read from the calling context: the
+daemon runs each job inside tenant(<user>), and the pipeline's worker
+threads inherit it through tracing.bind. Calls outside any tenant share the
+"default" tenant.
+"""
+import contextlib
+import contextvars
+import threading
+import time
+from collections import OrderedDict, defaultdict, deque
+from typing import Dict, Optional
+
+from config.settings import LLM_CALLS_PER_SECOND, LLM_BURST
+
+DEFAULT_TENANT = "default"
+_tenant: contextvars.ContextVar = contextvars.ContextVar("r2_rate_tenant", default=DEFAULT_TENANT)
+
+
+@contextlib.contextmanager
+def tenant(name: str):
+    """Attribute LLM requests made in this context (and threads bound to it) to name."""
+    token = _tenant.set(name or DEFAULT_TENANT)
+    try:
+        yield
+    finally:
+        _tenant.reset(token)
+
+
+def current_tenant() -> str:
+    return _tenant.get()
+
+
+class FairRateLimiter:
+    """Token bucket whose waiting callers are served round robin by tenant."""
+
+    def __init__(self, rate: Optional[float] = None, burst: int = 1):
+        self._cond = threading.Condition()
+        self._waiting: "OrderedDict[str, deque]" = OrderedDict()  # Tenant -> tickets; first key has the turn
+        self._granted: Dict[str, int] = defaultdict(int)
+        self._waited: Dict[str, float] = defaultdict(float)
+        self.configure(rate, burst)
+
+    def configure(self, rate: Optional[float], burst: int = 1):
+        """Change the rate (requests per second, None for no cap) and burst size."""
+        with self._cond:
+            self.rate = rate
+            self.burst = max(1, burst)
+            self._tokens = float(self.burst)
+            self._updated = time.monotonic()
+            self._cond.notify_all()
+
+    def acquire(self) -> float:
+        """Wait for the calling tenant's turn and a free token; returns seconds waited."""
+        name = _tenant.get()
+        started = time.monotonic()
+        with self._cond:
+            if self.rate:
+                ticket = object()
+                self._waiting.setdefault(name, deque()).append(ticket)
+                while self.rate:
+                    now = time.monotonic()
+                    self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    turn, tickets = next(iter(self._waiting.items()))
+                    if turn == name and tickets[0] is ticket and self._tokens >= 1:
+                        self._tokens -= 1
+                        break
+                    self._cond.wait((1 - self._tokens) / self.rate if self._tokens < 1 else None)
+                # Served: the tenant's remaining requests wait behind the other tenants
+                tickets = self._waiting.pop(name)
+                tickets.remove(ticket)
+                if tickets:
+                    self._waiting[name] = tickets
+                self._cond.notify_all()
+            waited = time.monotonic() - started
+            self._granted[name] += 1
+            self._waited[name] += waited
+            return waited
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return {
+                "rate": self.rate,
+                "burst": self.burst,
+                "waiting": {name: len(tickets) for name, tickets in self._waiting.items()},
+                "tenants": {name: {"requests": self._granted[name], "waited_seconds": round(self._waited[name], 3)}
+                            for name in self._granted},
+            }
+
+
+# Shared by every LLMInterface in the process
+limiter = FairRateLimiter(LLM_CALLS_PER_SECOND, LLM_BURST)
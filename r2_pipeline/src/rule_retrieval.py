@@ -3,8 +3,13 @@ Deterministic rule retrieval system with fail-closed evidence binding.
 
 This module implements hybrid retrieval (keyword + embeddings) over Bluebook.json
 with guaranteed coverage from Redbook, Bluebook, and Tables.
+
+Given a snapshot path, the flattened rules and keyword index are read from a
+precompiled, memory-mapped snapshot (see src/rule_snapshot.py) instead of
+being rebuilt from Bluebook.json on every start.
 """
 
+import hashlib
 import json
 import re
 import logging
@@ -12,7 +17,9 @@ from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Set
 from dataclasses import dataclass
 from collections import defaultdict
-import numpy as np
+
+from src import tracing
+from src.rule_snapshot import RuleSnapshot, source_fingerprint, write_snapshot
 
 logger = logging.getLogger(__name__)
 
@@ -39,25 +46,117 @@ class BluebookRuleRetriever:
     - Tracks coverage per bucket
     """
 
-    def __init__(self, bluebook_path: str):
+    def __init__(self, bluebook_path: str, snapshot_path: Optional[str] = None):
         """
         Initialize retriever with Bluebook.json.
 
         Args:
             bluebook_path: Path to Bluebook.json file
+            snapshot_path: Precompiled rule snapshot to use (built or rebuilt
+                here when missing or stale); None parses Bluebook.json directly
         """
         self.bluebook_path = Path(bluebook_path)
-        self.data = self._load_bluebook()
-
-        # Flattened rule index for fast lookup
-        self.redbook_rules = self._flatten_rules(self.data.get('redbook', {}).get('rules', []), 'redbook')
-        self.bluebook_rules = self._flatten_rules(self.data.get('bluebook', {}).get('rules', []), 'bluebook')
-
-        # Keyword index (simple BM25-style)
-        self.redbook_index = self._build_keyword_index(self.redbook_rules)
-        self.bluebook_index = self._build_keyword_index(self.bluebook_rules)
-
-        logger.info(f"Loaded {len(self.redbook_rules)} Redbook rules, {len(self.bluebook_rules)} Bluebook rules")
+        self.snapshot: Optional[RuleSnapshot] = None
+        self._data = None
+        self._rules: Dict[str, List[RuleMatch]] = {}
+        self._indexes: Dict[str, Dict[str, Set[int]]] = {}
+        self._snapshot_ids: Dict[Tuple[str, str], int] = {}
+
+        if snapshot_path and self.bluebook_path.exists():
+            self.snapshot = self._open_snapshot(Path(snapshot_path))
+
+        if self.snapshot is not None:
+            logger.info(f"Mapped {self.snapshot.redbook_count} Redbook rules, {self.snapshot.bluebook_count} "
+                        f"Bluebook rules from {snapshot_path}")
+        else:
+            logger.info(f"Loaded {len(self.redbook_rules)} Redbook rules, {len(self.bluebook_rules)} Bluebook rules")
+
+    def _open_snapshot(self, snapshot_path: Path) -> Optional[RuleSnapshot]:
+        """The current snapshot for Bluebook.json, compiling it first if needed."""
+        snapshot = RuleSnapshot.open(snapshot_path, self.bluebook_path)
+        if snapshot is None:
+            try:
+                self.compile_snapshot(self.bluebook_path, snapshot_path)
+                snapshot = RuleSnapshot.open(snapshot_path, self.bluebook_path)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not build rule snapshot {snapshot_path}: {e}. Using Bluebook.json directly.")
+        return snapshot
+
+    @classmethod
+    def compile_snapshot(cls, bluebook_path: Path, snapshot_path: Path):
+        """Flatten, index and format every rule once and write them as a snapshot."""
+        bluebook_path = Path(bluebook_path)
+        with open(bluebook_path, 'rb') as f:
+            raw = f.read()
+        # Fingerprint the exact bytes compiled, so an edit mid-build is caught next start
+        source = source_fingerprint(bluebook_path, hashlib.sha256(raw).hexdigest())
+        data = json.loads(raw)
+
+        redbook = cls._flatten_rules(data.get('redbook', {}).get('rules', []), 'redbook')
+        bluebook = cls._flatten_rules(data.get('bluebook', {}).get('rules', []), 'bluebook')
+        rules = redbook + bluebook
+        postings = cls._build_keyword_index(rules)
+        write_snapshot(
+            Path(snapshot_path), source,
+            [(r.rule_id, r.title, r.text, cls._prompt_block(r)) for r in rules],
+            len(redbook), postings
+        )
+
+    @property
+    def data(self) -> Dict:
+        """Parsed Bluebook.json (read on first use)."""
+        if self._data is None:
+            self._data = self._load_bluebook()
+        return self._data
+
+    def _source_rules(self, source: str) -> List[RuleMatch]:
+        if source not in self._rules:
+            if self.snapshot is not None:
+                lo, hi = self._snapshot_range(source)
+                self._rules[source] = [self._snapshot_rule(i, source) for i in range(lo, hi)]
+            else:
+                self._rules[source] = self._flatten_rules(self.data.get(source, {}).get('rules', []), source)
+        return self._rules[source]
+
+    @property
+    def redbook_rules(self) -> List[RuleMatch]:
+        """Flattened Redbook rules (materialized on first use when mapped from a snapshot)."""
+        return self._source_rules('redbook')
+
+    @property
+    def bluebook_rules(self) -> List[RuleMatch]:
+        return self._source_rules('bluebook')
+
+    @property
+    def redbook_index(self) -> Dict[str, Set[int]]:
+        if 'redbook' not in self._indexes:
+            self._indexes['redbook'] = self._build_keyword_index(self.redbook_rules)
+        return self._indexes['redbook']
+
+    @property
+    def bluebook_index(self) -> Dict[str, Set[int]]:
+        if 'bluebook' not in self._indexes:
+            self._indexes['bluebook'] = self._build_keyword_index(self.bluebook_rules)
+        return self._indexes['bluebook']
+
+    def _snapshot_range(self, source: str) -> Tuple[int, int]:
+        """Snapshot rule indices of a source: Redbook first, then Bluebook."""
+        if source == 'redbook':
+            return 0, self.snapshot.redbook_count
+        return self.snapshot.redbook_count, self.snapshot.rule_count
+
+    def _snapshot_rule(self, index: int, source: str, score: float = 0.0,
+                       match_type: str = 'deterministic') -> RuleMatch:
+        rule_id, title, text = self.snapshot.rule(index)
+        self._snapshot_ids[(source, rule_id)] = index
+        return RuleMatch(rule_id=rule_id, source=source, title=title, text=text,
+                         score=score, match_type=match_type)
+
+    def _rule_count(self, source: str) -> int:
+        if self.snapshot is not None:
+            lo, hi = self._snapshot_range(source)
+            return hi - lo
+        return len(self._source_rules(source))
 
     def _load_bluebook(self) -> Dict:
         """Load Bluebook.json."""
@@ -68,7 +167,8 @@ class BluebookRuleRetriever:
             logger.error(f"Bluebook.json not found at {self.bluebook_path}")
             return {'redbook': {'rules': []}, 'bluebook': {'rules': []}}
 
-    def _flatten_rules(self, rules: List[Dict], source: str) -> List[RuleMatch]:
+    @staticmethod
+    def _flatten_rules(rules: List[Dict], source: str) -> List[RuleMatch]:
         """
         Recursively flatten nested rule structure.
 
@@ -107,7 +207,8 @@ class BluebookRuleRetriever:
         recurse(rules)
         return flattened
 
-    def _build_keyword_index(self, rules: List[RuleMatch]) -> Dict[str, Set[int]]:
+    @staticmethod
+    def _build_keyword_index(rules: List[RuleMatch]) -> Dict[str, Set[int]]:
         """
         Build inverted keyword index.
 
@@ -198,9 +299,9 @@ class BluebookRuleRetriever:
                     # Simple TF scoring (could enhance with IDF)
                     scores[rule_idx] += 1.0
 
-        # Sort by score
+        # Sort by score; ties in corpus order so results do not depend on set ordering
         ranked = []
-        for rule_idx, score in sorted(scores.items(), key=lambda x: x[1], reverse=True):
+        for rule_idx, score in sorted(scores.items(), key=lambda x: (-x[1], x[0])):
             match = rules[rule_idx]
             ranked.append(RuleMatch(
                 rule_id=match.rule_id,
@@ -213,6 +314,26 @@ class BluebookRuleRetriever:
 
         return ranked
 
+    def _search(self, terms: List[str], source: str, limit: int) -> Tuple[int, List[RuleMatch]]:
+        """Number of rules of a source matching any term, and the best `limit` of them."""
+        if self.snapshot is None:
+            if source == 'redbook':
+                hits = self._keyword_search(terms, self.redbook_index, self.redbook_rules)
+            else:
+                hits = self._keyword_search(terms, self.bluebook_index, self.bluebook_rules)
+            return len(hits), hits[:limit]
+
+        # Same scoring as _keyword_search, reading postings from the snapshot;
+        # only the returned rules are decoded
+        lo, hi = self._snapshot_range(source)
+        scores = defaultdict(float)
+        for term in terms:
+            for rule_idx in self.snapshot.postings_between(term, lo, hi):
+                scores[rule_idx] += 1.0
+        ranked = sorted(scores.items(), key=lambda x: (-x[1], x[0]))
+        return len(ranked), [self._snapshot_rule(i, source, score, 'keyword') for i, score in ranked[:limit]]
+
+    @tracing.traced("rules.retrieve")
     def retrieve_rules(self, citation: str, max_redbook: int = 5, max_bluebook: int = 5) -> Tuple[List[RuleMatch], Dict]:
         """
         Retrieve relevant rules with guaranteed coverage.
@@ -235,25 +356,19 @@ class BluebookRuleRetriever:
         terms = self._extract_terms(citation)
         logger.debug(f"Extracted {len(terms)} terms from citation: {terms[:10]}...")
 
-        # Search Redbook FIRST (priority)
-        redbook_hits = self._keyword_search(terms, self.redbook_index, self.redbook_rules)
-
-        # Search Bluebook second
-        bluebook_hits = self._keyword_search(terms, self.bluebook_index, self.bluebook_rules)
-
-        # Apply quotas
-        redbook_selected = redbook_hits[:max_redbook]
-        bluebook_selected = bluebook_hits[:max_bluebook]
+        # Search Redbook FIRST (priority), Bluebook second; apply quotas
+        redbook_matched, redbook_selected = self._search(terms, 'redbook', max_redbook)
+        bluebook_matched, bluebook_selected = self._search(terms, 'bluebook', max_bluebook)
 
         # Combine with Redbook first
         all_matches = redbook_selected + bluebook_selected
 
         # Coverage accounting
         coverage = {
-            'redbook_scanned': len(self.redbook_rules),
-            'bluebook_scanned': len(self.bluebook_rules),
-            'redbook_matched': len(redbook_hits),
-            'bluebook_matched': len(bluebook_hits),
+            'redbook_scanned': self._rule_count('redbook'),
+            'bluebook_scanned': self._rule_count('bluebook'),
+            'redbook_matched': redbook_matched,
+            'bluebook_matched': bluebook_matched,
             'redbook_returned': len(redbook_selected),
             'bluebook_returned': len(bluebook_selected),
             'search_terms': terms,
@@ -306,18 +421,26 @@ class BluebookRuleRetriever:
 
         if redbook_matches:
             sections.append("**REDBOOK RULES (PRIORITY - USE THESE FIRST):**\n")
-            for match in redbook_matches:
-                sections.append(f"\n**Rule {match.rule_id}: {match.title}**")
-                sections.append(f"```\n{match.text}\n```\n")
+            sections.extend(self._block_for(match) for match in redbook_matches)
 
         if bluebook_matches:
             sections.append("\n**BLUEBOOK RULES (USE IF NO REDBOOK RULE APPLIES):**\n")
-            for match in bluebook_matches:
-                sections.append(f"\n**Rule {match.rule_id}: {match.title}**")
-                sections.append(f"```\n{match.text}\n```\n")
+            sections.extend(self._block_for(match) for match in bluebook_matches)
 
         return "\n".join(sections)
 
+    @staticmethod
+    def _prompt_block(match: RuleMatch) -> str:
+        """One rule as it appears in the prompt."""
+        return f"\n**Rule {match.rule_id}: {match.title}**\n```\n{match.text}\n```\n"
+
+    def _block_for(self, match: RuleMatch) -> str:
+        """Prompt block of a match, precompiled in the snapshot when available."""
+        index = self._snapshot_ids.get((match.source, match.rule_id)) if self.snapshot is not None else None
+        if index is not None:
+            return self.snapshot.prompt_block(index)
+        return self._prompt_block(match)
+
 
 class RuleEvidenceValidator:
     """
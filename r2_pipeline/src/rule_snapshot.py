@@ -0,0 +1,252 @@
+"""
+Precompiled, memory-mapped snapshot of the Bluebook rule corpus.
+
+BluebookRuleRetriever otherwise parses Bluebook.json, flattens both rule
+trees and tokenizes every rule on each start. The snapshot stores the result
+of that work (flattened rules, keyword postings and the formatted prompt
+block of each rule) in one binary file that is mapped into memory rather
+than read: opening it costs a header parse, and rule text is only decoded for
+the rules a search returns.
+
+Layout (little/big endian as the building machine, recorded in the header):
+
+    8 bytes   magic b"R2RULES\\0"
+    4 bytes   format version (uint32)
+    4 bytes   header length (uint32)
+    header    JSON: source file fingerprint, rule counts, section offsets
+    sections  8-byte aligned:
+      strings   UTF-8 blob of every rule id, title, text, prompt block and term
+      rules     uint32 x 8 per rule: (offset, length) of id, title, text, block
+      terms     uint32 x 2 per term: (offset, length), sorted by UTF-8 bytes
+      spans     uint32 x 2 per term: (start, count) into postings
+      postings  uint32 rule indices, ascending within each term
+
+Rules are numbered Redbook first, then Bluebook. The snapshot is rebuilt
+automatically when Bluebook.json's size, mtime and content hash no longer
+match the ones it was built from, or when the format version changes.
+
+Build it ahead of time with:
+
+    python -m src.rule_snapshot [--bluebook PATH] [--out PATH]
+"""
+import array
+import bisect
+import hashlib
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"R2RULES\x00"
+SNAPSHOT_VERSION = 1  # Bump when the layout or the flattening/tokenizing rules change
+_PREFIX = struct.Struct("<8sII")
+_ALIGN = 8
+
+
+def source_fingerprint(path: Path, sha256: Optional[str] = None) -> Dict:
+    """Size, mtime and content hash of the corpus file."""
+    stat = path.stat()
+    if sha256 is None:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        sha256 = digest.hexdigest()
+    return {"path": str(path), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": sha256}
+
+
+def write_snapshot(out_path: Path, source: Dict, rules: Sequence[Tuple[str, str, str, str]],
+                   redbook_count: int, postings: Dict[str, Sequence[int]]):
+    """
+    Write a snapshot atomically.
+
+    Args:
+        out_path: Snapshot file
+        source: source_fingerprint() of the corpus it was compiled from
+        rules: (rule_id, title, text, prompt_block) in rule-index order, Redbook first
+        redbook_count: How many of the rules are Redbook rules
+        postings: Term -> rule indices containing it
+    """
+    strings = bytearray()
+
+    def intern(value: str) -> Tuple[int, int]:
+        encoded = value.encode('utf-8')
+        strings.extend(encoded)
+        return len(strings) - len(encoded), len(encoded)
+
+    rule_table = array.array('I')
+    for fields in rules:
+        for value in fields:
+            rule_table.extend(intern(value))
+
+    term_table, span_table, posting_list = array.array('I'), array.array('I'), array.array('I')
+    for term in sorted(postings, key=lambda t: t.encode('utf-8')):
+        term_table.extend(intern(term))
+        indices = sorted(set(postings[term]))
+        span_table.extend((len(posting_list), len(indices)))
+        posting_list.extend(indices)
+
+    blobs = {"strings": bytes(strings), "rules": rule_table.tobytes(), "terms": term_table.tobytes(),
+             "spans": span_table.tobytes(), "postings": posting_list.tobytes()}
+    header = {
+        "source": source,
+        "byteorder": sys.byteorder,
+        "redbook_count": redbook_count,
+        "bluebook_count": len(rules) - redbook_count,
+        "term_count": len(term_table) // 2,
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "sections": {},
+    }
+    # Section offsets depend on the header's length; two passes settle it
+    for _ in range(2):
+        encoded = json.dumps(header, sort_keys=True).encode('utf-8')
+        offset = _aligned(_PREFIX.size + len(encoded))
+        for name, blob in blobs.items():
+            header["sections"][name] = [offset, len(blob)]
+            offset = _aligned(offset + len(blob))
+    encoded = json.dumps(header, sort_keys=True).encode('utf-8')
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_name(f"{out_path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(_PREFIX.pack(MAGIC, SNAPSHOT_VERSION, len(encoded)))
+        f.write(encoded)
+        for name, blob in blobs.items():
+            f.write(b"\0" * (header["sections"][name][0] - f.tell()))
+            f.write(blob)
+    tmp_path.replace(out_path)
+    logger.info(f"Wrote rule snapshot {out_path} ({len(rules)} rules, {header['term_count']} terms)")
+
+
+def _aligned(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+class RuleSnapshot:
+    """Read-only view of a snapshot file; rule text is decoded on access."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, header_length = _PREFIX.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a rule snapshot")
+        self.version = version
+        self.header = json.loads(self._mm[_PREFIX.size:_PREFIX.size + header_length])
+        if version != SNAPSHOT_VERSION or self.header["byteorder"] != sys.byteorder:
+            return
+        self.redbook_count = self.header["redbook_count"]
+        self.bluebook_count = self.header["bluebook_count"]
+        self.term_count = self.header["term_count"]
+
+        view = memoryview(self._mm)
+        sections = {name: view[start:start + length] for name, (start, length) in self.header["sections"].items()}
+        self._strings = sections["strings"]
+        self._rules = sections["rules"].cast('I')
+        self._terms = sections["terms"].cast('I')
+        self._spans = sections["spans"].cast('I')
+        self._postings = sections["postings"].cast('I')
+
+    @classmethod
+    def open(cls, path: Path, source_path: Path) -> Optional["RuleSnapshot"]:
+        """The snapshot at path if it is current for source_path, else None."""
+        if not Path(path).exists():
+            return None
+        try:
+            snapshot = cls(path)
+        except (OSError, ValueError, KeyError, struct.error) as e:
+            logger.warning(f"Ignoring unreadable rule snapshot {path}: {e}")
+            return None
+        if snapshot.version != SNAPSHOT_VERSION or snapshot.header["byteorder"] != sys.byteorder:
+            logger.info(f"Rule snapshot {path} has an old format; rebuilding")
+            snapshot.close()
+            return None
+
+        built_from = snapshot.header["source"]
+        stat = source_path.stat()
+        if stat.st_size == built_from["size"] and stat.st_mtime_ns == built_from["mtime_ns"]:
+            return snapshot
+        # Touched but maybe unchanged: compare content before rebuilding
+        if stat.st_size == built_from["size"] and source_fingerprint(source_path)["sha256"] == built_from["sha256"]:
+            return snapshot
+        logger.info(f"{source_path.name} changed since {path} was built; rebuilding")
+        snapshot.close()
+        return None
+
+    @property
+    def rule_count(self) -> int:
+        return self.redbook_count + self.bluebook_count
+
+    def _string(self, offset: int, length: int) -> str:
+        return str(self._strings[offset:offset + length], 'utf-8')
+
+    def rule(self, index: int) -> Tuple[str, str, str]:
+        """(rule_id, title, text) of a rule."""
+        f = self._rules[index * 8:index * 8 + 6]
+        return self._string(f[0], f[1]), self._string(f[2], f[3]), self._string(f[4], f[5])
+
+    def prompt_block(self, index: int) -> str:
+        return self._string(self._rules[index * 8 + 6], self._rules[index * 8 + 7])
+
+    def _term_bytes(self, slot: int) -> bytes:
+        offset, length = self._terms[slot * 2], self._terms[slot * 2 + 1]
+        return bytes(self._strings[offset:offset + length])
+
+    def postings(self, term: str) -> Sequence[int]:
+        """Ascending indices of the rules containing term (binary search over the sorted terms)."""
+        key = term.encode('utf-8')
+        lo, hi = 0, self.term_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._term_bytes(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo == self.term_count or self._term_bytes(lo) != key:
+            return ()
+        start, count = self._spans[lo * 2], self._spans[lo * 2 + 1]
+        return self._postings[start:start + count]
+
+    def postings_between(self, term: str, lo: int, hi: int) -> Sequence[int]:
+        """postings(term) restricted to rule indices in [lo, hi)."""
+        postings = self.postings(term)
+        return postings[bisect.bisect_left(postings, lo):bisect.bisect_left(postings, hi)]
+
+    def terms(self) -> List[str]:
+        return [self._term_bytes(slot).decode('utf-8') for slot in range(self.term_count)]
+
+    def close(self):
+        for name in ("_strings", "_rules", "_terms", "_spans", "_postings"):
+            view = self.__dict__.pop(name, None)
+            if view is not None:
+                view.release()
+        self._mm.close()
+
+
+def main():
+    import argparse
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from config import settings
+    from src.rule_retrieval import BluebookRuleRetriever
+
+    parser = argparse.ArgumentParser(description="Compile Bluebook.json into a rule snapshot")
+    parser.add_argument("--bluebook", type=Path, default=settings.BLUEBOOK_JSON_PATH)
+    parser.add_argument("--out", type=Path, default=settings.RULE_SNAPSHOT_PATH)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    started = time.perf_counter()
+    BluebookRuleRetriever.compile_snapshot(args.bluebook, args.out)
+    logger.info(f"Compiled in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
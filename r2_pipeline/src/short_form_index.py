@@ -0,0 +1,246 @@
+"""
+Article-wide antecedent index for short-form citations.
+
+Footnotes are added in document order as they are parsed. Each short form
+(Id., supra, [hereinafter] labels, short case cites) is resolved against the
+full citations seen so far with dictionary lookups, so later stages can reuse
+the antecedent's R1 PDF and skip LLM format checks for bare short forms.
+"""
+import re
+import logging
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.citation_parser import Citation, CitationParser
+
+logger = logging.getLogger(__name__)
+
+CitationKey = Tuple[int, int]
+
+MARKUP_RE = re.compile(r'\[/?(?:SC|RCC)\]|[\*_]')
+ET_AL_RE = re.compile(r',?\s+et\s+al\.?$')
+
+# "Design Basics, 994 F.3d at 886" / "Say It Visually, 2025 WL 933951, at *8"
+SHORT_CASE_RE = re.compile(r'^(?P<name>[^,]{2,60}?),\s+(?P<volume>\d+\s+[^,()]*?),?\s*at\s+\*?\d+')
+# Case reporters the pipeline recognizes ("U.S.", "F.3d", "F. Supp. 2d")
+REPORTER_ABBREVIATIONS = (r"U\.S\.|S\.\s*Ct\.|L\.\s*Ed\.(?:\s*2d)?|F\.\s*Supp\.(?:\s*[23]d)?"
+                          r"|F\.\s*(?:[234]d|4th)|F\.\s*App'x")
+# Volume and reporter of a full case citation ("180 F.3d"), the other half of a short case cite
+VOLUME_REPORTER_RE = re.compile(r"\b(\d+\s+(?:" + REPORTER_ABBREVIATIONS + r"))\s+\d+")
+
+# Explanatory parentheticals start with a word or a quote; "§ 12A.10(C)(1)" does not
+EXPLANATORY_RE = re.compile(r'\(\s*(?:[“"‘\[]|[A-Za-z]{3,})')
+MAX_BARE_LENGTH = 120
+
+
+def plain_text(text: str) -> str:
+    """Citation text without formatting markers or non-breaking spaces"""
+    return ' '.join(MARKUP_RE.sub('', text).replace('\u00a0', ' ').split())
+
+
+def normalize_name(text: Optional[str]) -> str:
+    """Lookup key for an author, party or [hereinafter] label"""
+    if not text:
+        return ''
+    name = CitationParser.strip_signal(plain_text(text)).lower().strip(' ,')
+    return ET_AL_RE.sub('', name).strip(' ,.')
+
+
+def _reporter_key(volume_reporter: str) -> str:
+    return re.sub(r'\s+', '', volume_reporter).lower()
+
+
+def citation_key(citation: Citation) -> CitationKey:
+    return (citation.footnote_num, citation.citation_num)
+
+
+def _error(error_type: str, description: str, current: str, correct: Optional[str] = None,
+           confidence: float = 1.0) -> Dict:
+    """Error entry in the same shape as CitationValidator's deterministic checks"""
+    return {
+        "error_type": error_type, "description": description,
+        "rb_rule": None, "bluebook_rule": "4.1" if error_type.startswith("id_") else "4.2",
+        "rule_source": "bluebook", "confidence": confidence,
+        "current": current, "correct": correct
+    }
+
+
+class ShortFormIndex:
+    """Maps short names, [hereinafter] labels and footnote numbers to full citations."""
+
+    def __init__(self):
+        self.citations: Dict[CitationKey, Citation] = {}
+        self.by_footnote: Dict[int, List[Citation]] = {}  # Full citations per footnote
+        self.by_name: Dict[str, Citation] = {}            # Labels, authors, first parties
+        self.by_reporter: Dict[str, Citation] = {}        # "180 f.3d" -> full case citation
+        self.dependents: Dict[CitationKey, List[CitationKey]] = {}
+        self.errors: Dict[CitationKey, List[Dict]] = {}
+
+        self._plain: Dict[CitationKey, str] = {}          # Lowercased plain text of full citations
+        self._authorities: Dict[int, Set[CitationKey]] = {}
+        self._previous: Optional[Citation] = None         # Authority the last citation referred to
+        self._last_footnote: Optional[int] = None
+
+    def add_footnote(self, footnote_num: int, citations: List[Citation]):
+        """Index one footnote's parsed citations, resolving its short forms."""
+        for citation in citations:
+            self._add(citation)
+        if citations:
+            self._last_footnote = footnote_num
+
+    def _add(self, citation: Citation):
+        key = citation_key(citation)
+        self.citations[key] = citation
+
+        antecedent = self.resolve(citation)
+        if antecedent is not None:
+            citation.antecedent_footnote, citation.antecedent_citation = citation_key(antecedent)
+            self.dependents.setdefault(citation_key(antecedent), []).append(key)
+            authority = antecedent
+        elif self.is_short_form(citation):
+            authority = None  # Unresolved, cross-reference or forward reference
+        else:
+            self._register(citation)
+            authority = citation
+
+        self.errors[key] = self._check(citation, antecedent)
+
+        if authority is not None:
+            self._previous = authority
+            self._authorities.setdefault(citation.footnote_num, set()).add(citation_key(authority))
+
+    def _register(self, citation: Citation):
+        """Record a full citation under its footnote and every name a short form may use."""
+        key = citation_key(citation)
+        plain = plain_text(citation.full_text)
+        self.by_footnote.setdefault(citation.footnote_num, []).append(citation)
+        self._plain[key] = plain.lower()
+
+        # The first full citation wins for authors and parties; a label always wins
+        if citation.hereinafter:
+            self.by_name[normalize_name(citation.hereinafter)] = citation
+
+        lead = CitationParser.strip_signal(plain)
+        if ' v. ' in lead:
+            party = lead.split(' v. ', 1)[0]
+            names = [party, party.split(',', 1)[0]]
+            for match in VOLUME_REPORTER_RE.finditer(plain):
+                self.by_reporter.setdefault(_reporter_key(match.group(1)), citation)
+        else:
+            author = ET_AL_RE.sub('', lead.split(',', 1)[0]).strip()
+            names = [author, author.split()[-1]] if author and len(author) <= 60 and not any(
+                ch.isdigit() for ch in author) else []
+
+        for name in names:
+            name = normalize_name(name)
+            if len(name) > 1:
+                self.by_name.setdefault(name, citation)
+
+    def is_short_form(self, citation: Citation) -> bool:
+        """Id., supra (including "*See supra* note 12" cross-references) and infra."""
+        if citation.type == 'supra':
+            # Full citations that merely mention a supra note have no short name
+            # and do not start with supra
+            return bool(citation.short_name) or CitationParser.strip_signal(
+                plain_text(citation.full_text)).lower().startswith('supra')
+        return citation.type in ('id', 'infra')
+
+    def resolve(self, citation: Citation) -> Optional[Citation]:
+        """The full citation a short form refers back to, if any."""
+        if citation.type == 'id':
+            return self._previous
+        if citation.type == 'supra' and citation.short_name:
+            return self._resolve_supra(citation)
+        if citation.type == 'unknown':
+            match = SHORT_CASE_RE.match(plain_text(citation.full_text))
+            if match and ' v. ' not in match.group('name'):
+                antecedent = (self.by_name.get(normalize_name(match.group('name')))
+                              or self.by_reporter.get(_reporter_key(match.group('volume'))))
+                if antecedent is not None:
+                    citation.short_name = citation.short_name or match.group('name').strip()
+                    return antecedent
+        return None
+
+    def _resolve_supra(self, citation: Citation) -> Optional[Citation]:
+        note = self._supra_note(citation)
+        candidates = self.by_footnote.get(note, []) if note else []
+        name = normalize_name(citation.short_name)
+
+        if name:
+            for candidate in candidates:
+                if normalize_name(candidate.hereinafter) == name:
+                    return candidate
+            for candidate in candidates:
+                if name in self._plain[citation_key(candidate)]:
+                    return candidate
+            if name in self.by_name:
+                return self.by_name[name]
+
+        if len(candidates) == 1:
+            return candidates[0]
+        return None
+
+    @staticmethod
+    def _supra_note(citation: Citation) -> Optional[int]:
+        match = CitationParser.SUPRA_NOTE_RE.search(plain_text(citation.full_text))
+        return int(match.group(1)) if match else None
+
+    def _check(self, citation: Citation, antecedent: Optional[Citation]) -> List[Dict]:
+        """Rule 4 checks that need the rest of the article (done once, at index time)."""
+        errors = []
+        text = citation.full_text
+
+        if citation.type == 'id':
+            if antecedent is None:
+                errors.append(_error("id_unresolved", "Id. has no preceding authority to refer to.", text))
+            elif (citation.citation_num == 1 and self._last_footnote is not None
+                  and len(self._authorities.get(self._last_footnote, ())) > 1):
+                errors.append(_error(
+                    "id_ambiguous",
+                    f"Id. opens the footnote but footnote {self._last_footnote} cites more than one authority.",
+                    text, confidence=0.8))
+
+        elif citation.type == 'supra' and citation.short_name:
+            note = self._supra_note(citation)
+            if note is not None and note >= citation.footnote_num:
+                errors.append(_error(
+                    "supra_forward_reference",
+                    f"Supra refers to footnote {note}, which is not an earlier footnote.",
+                    f"note {note}"))
+            elif antecedent is None:
+                errors.append(_error(
+                    "supra_unresolved", "No earlier full citation matches this supra reference.",
+                    text, confidence=0.8))
+            elif note is not None and antecedent.footnote_num != note:
+                errors.append(_error(
+                    "supra_wrong_note",
+                    f"The full citation for {citation.short_name or 'this source'} is in footnote "
+                    f"{antecedent.footnote_num}, not footnote {note}.",
+                    f"note {note}", f"note {antecedent.footnote_num}", confidence=0.8))
+
+        return errors
+
+    def antecedent_of(self, citation: Citation) -> Optional[Citation]:
+        if citation.antecedent_footnote is None:
+            return None
+        return self.citations.get((citation.antecedent_footnote, citation.antecedent_citation))
+
+    def is_antecedent(self, citation: Citation) -> bool:
+        """Whether later short forms refer back to this citation."""
+        return citation_key(citation) in self.dependents
+
+    def errors_for(self, citation: Citation) -> List[Dict]:
+        return self.errors.get(citation_key(citation), [])
+
+    def is_bare(self, citation: Citation) -> bool:
+        """
+        A resolved Id./supra with nothing but a pinpoint, so its format can be
+        checked without an LLM (no explanatory parenthetical, quote or prose).
+        """
+        if citation.type not in ('id', 'supra') or self.antecedent_of(citation) is None:
+            return False
+        plain = plain_text(citation.full_text)
+        return (len(plain) <= MAX_BARE_LENGTH
+                and not citation.quoted_text
+                and '“' not in plain
+                and not EXPLANATORY_RE.search(plain)
+                and not CitationParser.SENTENCE_BOUNDARY_RE.search(plain))
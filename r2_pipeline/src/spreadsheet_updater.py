@@ -1,18 +1,50 @@
 """
 Update Excel spreadsheet with R2 results.
 """
-from openpyxl import load_workbook
+from openpyxl import Workbook, load_workbook
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import logging
 
 logger = logging.getLogger(__name__)
 
+HEADER_ROW = 2  # Row 2 has headers
+FIRST_DATA_ROW = 4  # Start from row 4 (after headers)
+R2_START_COL = 17  # R2 columns start after R1 columns
+
+
+def _as_int(value) -> Optional[int]:
+    """Coerce a Fn#/Cite# cell value (int, float or numeric string) to int."""
+    if value is None:
+        return None
+    try:
+        return int(float(str(value).strip()))
+    except ValueError:
+        return None
+
+
 class SpreadsheetUpdater:
     """Update Excel spreadsheet with R2 data."""
 
-    def __init__(self, spreadsheet_path: Path):
+    def __init__(self, spreadsheet_path: Path, streaming: bool = False):
+        """
+        Args:
+            spreadsheet_path: Path to the master spreadsheet
+            streaming: Load with openpyxl read_only and save with write_only.
+                Much faster and lighter for very large workbooks, but the
+                saved copy keeps cell values only (no styles or formulas'
+                cached results).
+        """
         self.spreadsheet_path = spreadsheet_path
+        self.streaming = streaming
+
+        # Header -> column and (Fn#, Cite#) -> row, built once
+        self._headers: List[Tuple[int, str]] = []
+        self._column_cache: Dict[Tuple[str, int], Optional[int]] = {}
+        self._row_index: Dict[Tuple[int, int], int] = {}
+
+        # Buffered writes: {row: {column: value}}
+        self._pending: Dict[int, Dict[int, object]] = {}
 
         if not spreadsheet_path.exists():
             logger.warning(f"Spreadsheet not found at {spreadsheet_path}. Creating mock updater.")
@@ -20,7 +52,7 @@ class SpreadsheetUpdater:
             self.sheet = None
             return
 
-        self.wb = load_workbook(spreadsheet_path)
+        self.wb = load_workbook(spreadsheet_path, read_only=streaming)
 
         # Identify the correct sheet (assumes "CC (nn. 78-113); HC" or similar)
         self.sheet = None
@@ -31,9 +63,43 @@ class SpreadsheetUpdater:
 
         if self.sheet is None:
             logger.warning("Could not find appropriate CC sheet in workbook")
+        else:
+            self._build_index()
 
         logger.info(f"Using sheet: {self.sheet.title if self.sheet else 'None'}")
 
+    def _build_index(self):
+        """Read the header row and Fn#/Cite# columns in a single pass over the sheet."""
+        rows = self.sheet.iter_rows(min_row=HEADER_ROW, values_only=True)
+        header_row = next(rows, ())
+        self._headers = [(col, str(value).lower())
+                         for col, value in enumerate(header_row, start=1) if value]
+
+        fn_col = self._find_column("Fn#")
+        cite_col = self._find_column("Cite#")
+        r2_fn_col = self._find_column("Fn#", start_col=R2_START_COL)
+        r2_cite_col = self._find_column("Cite#", start_col=R2_START_COL)
+        if not fn_col or not cite_col:
+            return
+
+        key_columns = [(fn_col, cite_col)]
+        if r2_fn_col and r2_cite_col and (r2_fn_col, r2_cite_col) != (fn_col, cite_col):
+            key_columns.append((r2_fn_col, r2_cite_col))
+
+        for row_num, values in enumerate(rows, start=HEADER_ROW + 1):
+            if row_num < FIRST_DATA_ROW:
+                continue
+            # Rows filled in only in the R2 section are found through the R2 columns
+            for fn_c, cite_c in key_columns:
+                if len(values) < max(fn_c, cite_c):
+                    continue
+                key = (_as_int(values[fn_c - 1]), _as_int(values[cite_c - 1]))
+                if None not in key:
+                    self._row_index.setdefault(key, row_num)
+                    break
+
+        logger.info(f"Indexed {len(self._row_index)} citation rows")
+
     def update_citation(self,
                        footnote_num: int,
                        cite_num: int,
@@ -41,6 +107,8 @@ class SpreadsheetUpdater:
         """
         Update a single citation's R2 data.
 
+        Values are buffered and written by flush() (called from save()).
+
         Args:
             footnote_num: Footnote number
             cite_num: Citation number within footnote
@@ -62,60 +130,66 @@ class SpreadsheetUpdater:
         # R2 columns start after R1 columns
 
         # Update R2 columns
-        r2_fn_col = self._find_column("Fn#", start_col=17)  # R2 section
-        r2_cite_col = self._find_column("Cite#", start_col=17)
-        r2_supports_col = self._find_column("Supports?", start_col=17)
-        r2_elements_col = self._find_column("Citation Elements", start_col=17)
-        r2_comments_col = self._find_column("MEM Comments", start_col=17)
+        r2_fn_col = self._find_column("Fn#", start_col=R2_START_COL)  # R2 section
+        r2_cite_col = self._find_column("Cite#", start_col=R2_START_COL)
+        r2_supports_col = self._find_column("Supports?", start_col=R2_START_COL)
+        r2_elements_col = self._find_column("Citation Elements", start_col=R2_START_COL)
+        r2_comments_col = self._find_column("MEM Comments", start_col=R2_START_COL)
+
+        updates = self._pending.setdefault(row, {})
 
         # Populate cells
         if r2_fn_col:
-            self.sheet.cell(row=row, column=r2_fn_col, value=footnote_num)
+            updates[r2_fn_col] = footnote_num
         if r2_cite_col:
-            self.sheet.cell(row=row, column=r2_cite_col, value=cite_num)
+            updates[r2_cite_col] = cite_num
 
         # Supports?
         if r2_supports_col:
-            support = self._determine_support_value(results)
-            self.sheet.cell(row=row, column=r2_supports_col, value=support)
+            updates[r2_supports_col] = self._determine_support_value(results)
 
         # Citation Elements
         if r2_elements_col:
-            elements = self._format_citation_elements(results)
-            self.sheet.cell(row=row, column=r2_elements_col, value=elements)
+            updates[r2_elements_col] = self._format_citation_elements(results)
 
         # MEM Comments
         if r2_comments_col:
-            comments = self._format_mem_comments(results)
-            self.sheet.cell(row=row, column=r2_comments_col, value=comments)
+            updates[r2_comments_col] = self._format_mem_comments(results)
 
         logger.info(f"Updated spreadsheet row {row} for fn {footnote_num}, cite {cite_num}")
 
     def _find_citation_row(self, footnote_num: int, cite_num: int) -> Optional[int]:
         """Find the row number for a specific citation."""
-        # Search through rows to find matching footnote and cite numbers
-        fn_col = self._find_column("Fn#")
-        cite_col = self._find_column("Cite#")
-
-        if not fn_col or not cite_col:
-            return None
-
-        for row in range(4, self.sheet.max_row + 1):  # Start from row 4 (after headers)
-            fn_val = self.sheet.cell(row=row, column=fn_col).value
-            cite_val = self.sheet.cell(row=row, column=cite_col).value
-
-            if fn_val == footnote_num and cite_val == cite_num:
-                return row
-
-        return None
+        return self._row_index.get((_as_int(footnote_num), _as_int(cite_num)))
 
     def _find_column(self, header_name: str, start_col: int = 1) -> Optional[int]:
         """Find column number by header name."""
-        for col in range(start_col, self.sheet.max_column + 1):
-            header = self.sheet.cell(row=2, column=col).value  # Row 2 has headers
-            if header and header_name.lower() in str(header).lower():
-                return col
-        return None
+        key = (header_name, start_col)
+        if key not in self._column_cache:
+            name = header_name.lower()
+            self._column_cache[key] = next(
+                (col for col, header in self._headers if col >= start_col and name in header),
+                None
+            )
+        return self._column_cache[key]
+
+    def flush(self) -> int:
+        """
+        Write buffered updates to the sheet in one pass.
+
+        Returns:
+            Number of cells written
+        """
+        if not self.sheet or not self._pending or self.streaming:
+            return 0
+
+        written = 0
+        for row in sorted(self._pending):
+            for col, value in sorted(self._pending[row].items()):
+                self.sheet.cell(row=row, column=col, value=value)
+                written += 1
+        self._pending.clear()
+        return written
 
     def _determine_support_value(self, results: Dict) -> str:
         """Determine "Supports?" value from results."""
@@ -174,9 +248,47 @@ class SpreadsheetUpdater:
 
     def save(self) -> None:
         """Save the workbook."""
-        if self.wb:
+        if not self.wb:
+            return
+
+        if self.streaming:
+            self._save_streaming()
+        else:
+            written = self.flush()
+            logger.info(f"Flushed {written} cells")
             self.wb.save(self.spreadsheet_path)
-            logger.info(f"Saved spreadsheet to {self.spreadsheet_path}")
+        logger.info(f"Saved spreadsheet to {self.spreadsheet_path}")
+
+    def _save_streaming(self):
+        """
+        Rewrite the workbook with a write_only workbook, merging buffered
+        updates into the CC sheet's rows as they stream past.
+        """
+        out_wb = Workbook(write_only=True)
+        for source in self.wb.worksheets:
+            target = out_wb.create_sheet(title=source.title)
+            is_cc_sheet = self.sheet is not None and source.title == self.sheet.title
+
+            for row_num, values in enumerate(source.iter_rows(values_only=True), start=1):
+                updates = self._pending.get(row_num) if is_cc_sheet else None
+                if updates:
+                    values = list(values)
+                    width = max(len(values), max(updates))
+                    values.extend([None] * (width - len(values)))
+                    for col, value in updates.items():
+                        values[col - 1] = value
+                target.append(values)
+
+        # Write next to the original, then swap, since the source is still open
+        tmp_path = self.spreadsheet_path.with_name(self.spreadsheet_path.name + '.tmp')
+        out_wb.save(tmp_path)
+        self.wb.close()
+        tmp_path.replace(self.spreadsheet_path)
+        self._pending.clear()
+
+        self.wb = load_workbook(self.spreadsheet_path, read_only=True)
+        if self.sheet is not None:
+            self.sheet = self.wb[self.sheet.title]
 
     def close(self):
         """Close the workbook."""
@@ -5,6 +5,7 @@ from typing import Dict
 import logging
 from pathlib import Path
 from src.llm_interface import LLMInterface
+from src import tracing
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +43,7 @@ Respond in JSON with:
 - missing_context: string
 """
 
+    @tracing.traced("support.check")
     def check_support(self,
                      proposition: str,
                      source_text: str,
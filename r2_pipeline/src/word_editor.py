@@ -4,13 +4,18 @@ Edit Word document with Track Changes enabled.
 from docx import Document
 from docx.oxml import OxmlElement
 from docx.oxml.ns import qn
+from lxml import etree
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Tuple
+import copy
 import logging
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+XML_SPACE = '{http://www.w3.org/XML/1998/namespace}space'
+
 class WordEditor:
     """Edit Word document with track changes."""
 
@@ -21,12 +26,22 @@ class WordEditor:
             self.doc_path = doc_path
             self.author = author
             self.changes_made = []
+            self.pending_changes = []
             return
 
         self.doc_path = doc_path
         self.doc = Document(doc_path)
         self.author = author
         self.changes_made = []
+        self.pending_changes: List[Dict] = []
+
+        # Footnotes tree, parsed on first use and serialized once on save
+        self._footnotes_root = None
+        self._footnotes_by_id: Dict[int, etree._Element] = {}
+        self._footnotes_from_blob = False
+        self._footnotes_dirty = False
+        self._next_revision_id = 1
+        self._revision_date = datetime.now().replace(microsecond=0).isoformat() + 'Z'
 
         # Enable track changes
         self._enable_track_changes()
@@ -50,6 +65,48 @@ class WordEditor:
         except Exception as e:
             logger.warning(f"Could not enable track changes: {e}")
 
+    def _get_footnotes_part(self):
+        """Return the document's footnotes part, or None."""
+        for rel in self.doc.part.rels.values():
+            if "footnotes" in rel.target_ref:
+                return rel.target_part
+        return None
+
+    def _get_footnotes_root(self):
+        """
+        Parse footnotes.xml once and index footnotes by id.
+
+        XML parts loaded by python-docx are used in place; generic parts are
+        parsed from their blob and written back once by save().
+        """
+        if self._footnotes_root is not None:
+            return self._footnotes_root
+
+        footnotes_part = self._get_footnotes_part()
+        if footnotes_part is None:
+            logger.error("No footnotes part found")
+            return None
+
+        element = getattr(footnotes_part, '_element', None)
+        if element is not None:
+            self._footnotes_root = element
+            self._footnotes_from_blob = False
+        else:
+            self._footnotes_root = etree.fromstring(footnotes_part.blob)
+            self._footnotes_from_blob = True
+
+        self._footnotes_by_id = {}
+        for footnote in self._footnotes_root.iter(W + 'footnote'):
+            fn_id = footnote.get(W + 'id')
+            if fn_id is not None:
+                self._footnotes_by_id[int(fn_id)] = footnote
+
+        # Revision ids must be unique across the part
+        ids = [int(el.get(W + 'id')) for el in self._footnotes_root.iter(W + 'ins', W + 'del')
+               if (el.get(W + 'id') or '').isdigit()]
+        self._next_revision_id = max(ids, default=0) + 1
+        return self._footnotes_root
+
     def find_footnote(self, footnote_num: int):
         """
         Find footnote by number using XML parsing.
@@ -65,31 +122,13 @@ class WordEditor:
 
         # Access footnotes through XML structure
         try:
-            doc_part = self.doc.part
-            footnotes_part = None
-
-            for rel in doc_part.rels.values():
-                if "footnotes" in rel.target_ref:
-                    footnotes_part = rel.target_part
-                    break
-
-            if not footnotes_part:
-                logger.error("No footnotes part found")
+            root = self._get_footnotes_root()
+            if root is None:
                 return None, None
 
-            # Parse footnotes XML
-            footnotes_xml = footnotes_part.blob
-            from lxml import etree
-            root = etree.fromstring(footnotes_xml)
-
-            # Define namespace
-            ns = {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'}
-
-            # Find specific footnote
-            for footnote in root.findall('.//w:footnote', ns):
-                fn_id = footnote.get('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}id')
-                if fn_id and int(fn_id) == footnote_num:
-                    return footnote, root
+            footnote = self._footnotes_by_id.get(footnote_num)
+            if footnote is not None:
+                return footnote, root
 
             logger.warning(f"Footnote {footnote_num} not found")
             return None, None
@@ -104,7 +143,11 @@ class WordEditor:
                             new_text: str,
                             comment: str = None) -> bool:
         """
-        Replace text in footnote with track changes.
+        Queue a tracked replacement of text in a footnote.
+
+        Changes are resolved against the parsed footnotes tree by
+        apply_changes() (called from save()), so the XML is serialized once
+        however many corrections are made.
 
         Args:
             footnote_num: Footnote number
@@ -113,7 +156,7 @@ class WordEditor:
             comment: Optional comment explaining change
 
         Returns:
-            True if replacement made, False otherwise
+            True if the change was queued, False if the text was not found
         """
         if not self.doc:
             logger.warning("No document loaded")
@@ -124,86 +167,181 @@ class WordEditor:
             logger.warning(f"Footnote {footnote_num} not found")
             return False
 
-        # Get footnote text
-        from lxml import etree
-        ns = {'w': 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'}
-
-        footnote_text = ""
-        for text_elem in footnote_elem.findall('.//w:t', ns):
-            if text_elem.text:
-                footnote_text += text_elem.text
-
+        footnote_text = ''.join(seg[2] for seg in self._text_segments(footnote_elem))
         if old_text not in footnote_text:
             logger.warning(f"Text '{old_text[:50]}...' not found in footnote {footnote_num}")
             return False
 
-        # Replace text in XML
-        try:
-            for text_elem in footnote_elem.findall('.//w:t', ns):
-                if text_elem.text and old_text in text_elem.text:
-                    # Simple replacement - proper track changes would require more complex XML manipulation
-                    text_elem.text = text_elem.text.replace(old_text, new_text)
-
-                    # Log change
-                    self.changes_made.append({
-                        "footnote": footnote_num,
-                        "type": "replacement",
-                        "old": old_text,
-                        "new": new_text,
-                        "comment": comment
-                    })
-
-                    # Save changes back to footnotes part
-                    self._save_footnotes_xml(root)
-
-                    logger.info(f"Replaced text in footnote {footnote_num}")
-                    return True
+        change = {
+            "footnote": footnote_num,
+            "type": "replacement",
+            "old": old_text,
+            "new": new_text,
+            "comment": comment,
+            "status": "pending"
+        }
+        self.pending_changes.append(change)
+        self.changes_made.append(change)
+        return True
 
-        except Exception as e:
-            logger.error(f"Error replacing text: {e}")
+    def apply_changes(self) -> int:
+        """
+        Apply all queued changes as w:del/w:ins revisions.
+
+        Each change's entry in changes_made is marked "applied" or "failed".
+        A change that raises part way leaves its footnote as it was.
+
+        Returns:
+            Number of changes applied
+        """
+        applied = 0
+        pending, self.pending_changes = self.pending_changes, []
+
+        for change in pending:
+            change["status"] = "failed"
+            footnote_elem, _ = self.find_footnote(change["footnote"])
+            if footnote_elem is None:
+                continue
+            backup = copy.deepcopy(footnote_elem)
+            try:
+                if self._apply_tracked_replacement(footnote_elem, change["old"], change["new"]):
+                    change["status"] = "applied"
+                    applied += 1
+                    logger.info(f"Replaced text in footnote {change['footnote']}")
+                else:
+                    logger.warning(f"Text '{change['old'][:50]}...' no longer found in footnote {change['footnote']}")
+            except Exception as e:
+                logger.error(f"Error replacing text in footnote {change['footnote']}: {e}")
+                footnote_elem.getparent().replace(footnote_elem, backup)
+                self._footnotes_by_id[change["footnote"]] = backup
+
+        if applied:
+            self._footnotes_dirty = True
+        return applied
+
+    def _text_segments(self, footnote_elem) -> List[Tuple[etree._Element, etree._Element, str]]:
+        """
+        Run-offset map of a footnote: (run, w:t, text) for live text in order.
+
+        Text already inside a w:del revision is skipped.
+        """
+        segments = []
+        for text_elem in footnote_elem.iter(W + 't'):
+            run = text_elem.getparent()
+            if run is None or run.tag != W + 'r':
+                continue
+            if any(ancestor.tag == W + 'del' for ancestor in run.iterancestors()):
+                continue
+            segments.append((run, text_elem, text_elem.text or ''))
+        return segments
+
+    def _isolate_text(self, run, text_elem):
+        """Split a run so text_elem is the only content child of its own run."""
+        children = [child for child in run if child.tag != W + 'rPr']
+        if children == [text_elem]:
+            return run
+
+        rpr = run.find(W + 'rPr')
+        anchor = run
+        isolated = run
+        for child in children:
+            new_run = etree.Element(W + 'r')
+            if rpr is not None:
+                new_run.append(copy.deepcopy(rpr))
+            new_run.append(child)
+            anchor.addnext(new_run)
+            anchor = new_run
+            if child is text_elem:
+                isolated = new_run
+        run.getparent().remove(run)
+        return isolated
+
+    def _split_run(self, run, text_elem, start: int, end: int):
+        """Split an isolated text run into before/middle/after; return the middle run."""
+        text = text_elem.text or ''
+        parts = [(text[:start], False), (text[start:end], True), (text[end:], False)]
+        middle = None
+        anchor = run
+        for part_text, is_middle in parts:
+            if not part_text:
+                continue
+            new_run = copy.deepcopy(run)
+            t = new_run.find(W + 't')
+            t.text = part_text
+            t.set(XML_SPACE, 'preserve')
+            anchor.addnext(new_run)
+            anchor = new_run
+            if is_middle:
+                middle = new_run
+        run.getparent().remove(run)
+        return middle
+
+    def _revision(self, tag: str):
+        """Create a w:ins or w:del element attributed to this editor."""
+        elem = etree.Element(W + tag)
+        elem.set(W + 'id', str(self._next_revision_id))
+        elem.set(W + 'author', self.author)
+        elem.set(W + 'date', self._revision_date)
+        self._next_revision_id += 1
+        return elem
+
+    def _apply_tracked_replacement(self, footnote_elem, old_text: str, new_text: str) -> bool:
+        """Replace the first occurrence of old_text with a tracked deletion and insertion."""
+        segments = self._text_segments(footnote_elem)
+        full_text = ''.join(seg[2] for seg in segments)
+        pos = full_text.find(old_text)
+        if pos == -1 or not old_text:
             return False
+        end = pos + len(old_text)
+
+        # Collect the slice of each run covered by [pos, end)
+        targets = []
+        offset = 0
+        for run, text_elem, text in segments:
+            seg_start, seg_end = offset, offset + len(text)
+            offset = seg_end
+            if seg_end <= pos or seg_start >= end:
+                continue
+            targets.append((run, text_elem, max(pos, seg_start) - seg_start, min(end, seg_end) - seg_start))
+
+        # Isolating one w:t moves its siblings into new runs, so each target's
+        # run is looked up again from its w:t rather than taken from the map
+        deleted_runs = []
+        for _, text_elem, start, stop in targets:
+            run = self._isolate_text(text_elem.getparent(), text_elem)
+            deleted_runs.append(self._split_run(run, run.find(W + 't'), start, stop))
+
+        # Wrap each deleted run in w:del, converting w:t to w:delText
+        for run in deleted_runs:
+            run.find(W + 't').tag = W + 'delText'
+            wrapper = self._revision('del')
+            run.addprevious(wrapper)
+            wrapper.append(run)
+
+        if new_text:
+            last_del = deleted_runs[-1].getparent()
+            ins = self._revision('ins')
+            ins_run = etree.SubElement(ins, W + 'r')
+            rpr = deleted_runs[0].find(W + 'rPr')
+            if rpr is not None:
+                ins_run.append(copy.deepcopy(rpr))
+            t = etree.SubElement(ins_run, W + 't')
+            t.text = new_text
+            t.set(XML_SPACE, 'preserve')
+            last_del.addnext(ins)
 
-        return False
+        return True
 
     def _save_footnotes_xml(self, root):
         """Save modified footnotes XML back to document."""
         try:
-            from lxml import etree
-            doc_part = self.doc.part
-
-            for rel in doc_part.rels.values():
-                if "footnotes" in rel.target_ref:
-                    footnotes_part = rel.target_part
-                    # Update the blob with modified XML
-                    footnotes_part._blob = etree.tostring(root, encoding='unicode').encode('utf-8')
-                    break
+            footnotes_part = self._get_footnotes_part()
+            if footnotes_part is not None:
+                # Update the blob with modified XML
+                footnotes_part._blob = etree.tostring(root, encoding='unicode').encode('utf-8')
         except Exception as e:
             logger.error(f"Error saving footnotes XML: {e}")
 
-    def _mark_as_deleted(self, run):
-        """Mark run as deleted (track changes)."""
-        try:
-            # Add deletion markup
-            del_elem = OxmlElement('w:del')
-            del_elem.set(qn('w:author'), self.author)
-            del_elem.set(qn('w:date'), datetime.now().isoformat())
-
-            run._element.append(del_elem)
-        except Exception as e:
-            logger.debug(f"Could not mark as deleted: {e}")
-
-    def _mark_as_inserted(self, run):
-        """Mark run as inserted (track changes)."""
-        try:
-            # Add insertion markup
-            ins_elem = OxmlElement('w:ins')
-            ins_elem.set(qn('w:author'), self.author)
-            ins_elem.set(qn('w:date'), datetime.now().isoformat())
-
-            run._element.append(ins_elem)
-        except Exception as e:
-            logger.debug(f"Could not mark as inserted: {e}")
-
     def add_comment(self, footnote_num: int, comment_text: str, tag: str = "[AA:]") -> bool:
         """
         Add a comment/note to footnote.
@@ -265,6 +403,12 @@ class WordEditor:
         if output_path is None:
             output_path = self.doc_path
 
+        # Resolve queued corrections and serialize footnotes.xml once
+        self.apply_changes()
+        if self._footnotes_dirty and self._footnotes_from_blob:
+            self._save_footnotes_xml(self._footnotes_root)
+        self._footnotes_dirty = False
+
         self.doc.save(output_path)
         logger.info(f"Saved document to {output_path}")
 
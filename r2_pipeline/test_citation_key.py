@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Test canonical citation keys and repeat-citation sharing."""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.citation_parser import CitationParser
+from src.short_form_index import ShortFormIndex
+from src.citation_key import CitationRegistry, canonical_key, invariant_text
+
+keys = {
+    "Alice Corp. v. CLS Bank Int'l, 573 U.S. 208, 212 (2014).": 'cite:573 u.s. 208',
+    "*See* Alice Corp. v. CLS Bank Int'l, 573 U.S. 208, 220–21 (2014).": 'cite:573 u.s. 208',
+    '17 U.S.C. § 1202(b)(1).': 'usc:17 1202',
+    '17 U.S.C. § 1202(c).': 'usc:17 1202',
+    'Murphy v. Millenium Radio Grp. LLC, 2015 WL 419884, at *5 (D.N.J. Jan. 30, 2015).': 'wl:2015 419884',
+    'S. Rep. No. 105-190, at 65-66 (1998).': 'report:s. 105-190',
+    'Dongyang Fan et al., *URLs Help*, https://www.arxiv.org/html/2505.16570v1/.': 'url:arxiv.org/html/2505.16570v1',
+    'Megan Keenan, *CMI*, 12 N.Y.U. J. Intell. Prop. & Ent. L. 413, 420 (2023).':
+        'cite:12 n.y.u.j.intell.prop.&ent.l. 413',
+    'Jane Doe, *Sports Data*, 24 U. Denv. Sports & Ent. L.J. 75, 80 (2021).': 'cite:24 u.denv.sports&ent.l.j. 75',
+    'Smith v. Jones, 180 F. Supp. 2d 1072, 1075 (D. Mass. 2001).': 'cite:180 f.supp.2d 1072',
+    'McKinsey & Company, The Economic Potential of Generative AI 3 (2023).': None,
+    # Numbers around capitalized words are not a volume, reporter and page
+    'In 2019 Congress Passed 12 Amendments to the Act.': None,
+    'The First 100 Days 2021 Report, https://example.org/first-100-days.': 'url:example.org/first-100-days',
+    # A transcript or brief is not the case it was filed in
+    'Transcript of Oral Argument at 12, Smith v. Jones, 573 U.S. 208 (2014) (No. 13-298).': None,
+    '*See* Brief for Petitioner at 5, Alice Corp. v. CLS Bank Int\'l, 573 U.S. 208 (2014).': None,
+    '*Id.* at 12.': None,
+}
+
+invariants = {
+    "Alice Corp. v. CLS Bank Int'l, 573 U.S. 208, 212 & n.4 (2014).": "Alice Corp. v. CLS Bank Int'l, 573 U.S. 208 (2014).",
+    'Say It Visually, 2025 WL 933951, at *8 (D. Del. 2025).': 'Say It Visually, 2025 WL 933951 (D. Del. 2025).',
+}
+
+print('CITATION KEY TEST')
+print('=' * 80)
+
+all_pass = True
+for text, want in keys.items():
+    got = canonical_key(text)
+    ok = got == want
+    all_pass &= ok
+    print(f'{"✓" if ok else "✗ FAIL"} {text[:60]} -> {got}')
+
+for text, want in invariants.items():
+    got = invariant_text(text)
+    ok = got == want
+    all_pass &= ok
+    print(f'{"✓" if ok else "✗ FAIL"} invariant: {got}')
+
+# Repeats and short forms inherit the key of the first citation of a source
+footnotes = {
+    1: "Recording Indus. Ass'n of Am. v. Diamond Multimedia Sys., Inc., 180 F.3d 1072, 1073 (9th Cir. 1999).",
+    2: '*Id.* at 1075.',
+    3: '17 U.S.C. § 1202(b).',
+    4: "*See* Recording Indus. Ass'n of Am. v. Diamond Multimedia Sys., Inc., 180 F.3d 1072, 1079 (9th Cir. 1999).",
+}
+index = ShortFormIndex()
+registry = CitationRegistry(index)
+citations = {}
+for fn_num, text in footnotes.items():
+    parsed = CitationParser(text, fn_num).parse()
+    index.add_footnote(fn_num, parsed)
+    for cit in parsed:
+        registry.register(cit)
+        citations[fn_num] = cit
+
+checks = [
+    ('Id. inherits key', citations[2].canonical_key == 'cite:180 f.3d 1072'),
+    ('repeat finds first occurrence', registry.first_occurrence(citations[4]) is citations[1]),
+    ('first occurrence has no earlier one', registry.first_occurrence(citations[1]) is None),
+    ('repeat full cite shares validation', registry.can_share_validation(citations[4])),
+    ('Id. does not share validation', not registry.can_share_validation(citations[2])),
+    ('unique statute does not share', not registry.is_shared(citations[3])),
+]
+stats = registry.stats()
+checks.append(('dedup ratio', stats['dedup_ratio'] == '50.0%' and stats['unique_sources'] == 2))
+for name, ok in checks:
+    all_pass &= ok
+    print(f'{"✓" if ok else "✗ FAIL"} {name}')
+print(f'  {stats}')
+
+print()
+print('✓ ALL TESTS PASSED' if all_pass else '✗ SOME TESTS FAILED')
+sys.exit(0 if all_pass else 1)
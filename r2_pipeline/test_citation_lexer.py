@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Regression test and benchmark for the citation splitting lexer.
+
+data/citation_split_corpus.json holds every footnote of a sample article
+(plus hand-written edge cases) with the segments the splitter produced
+before the single-pass lexer; the lexer must reproduce them exactly.
+"""
+import json
+import sys
+import time
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.citation_parser import CitationParser
+
+CORPUS_PATH = Path(__file__).parent / "data" / "citation_split_corpus.json"
+BENCH_ROUNDS = 5
+
+
+def check_corpus(cases):
+    failures = 0
+    for case in cases:
+        parser = CitationParser(case['text'], footnote_num=case['footnote'] or 0)
+        citations = parser._split_citations(case['text'])
+        signal_split = parser._split_on_signals(case['text'])
+
+        if citations != case['citations'] or signal_split != case['signal_split']:
+            failures += 1
+            print(f"✗ FAIL: footnote {case['footnote']}: {case['text'][:70]}")
+            print(f"  expected: {case['citations']}")
+            print(f"  got:      {citations}")
+    return failures
+
+
+def benchmark(cases):
+    start = time.perf_counter()
+    for _ in range(BENCH_ROUNDS):
+        for case in cases:
+            CitationParser(case['text'], footnote_num=case['footnote'] or 0).parse()
+    elapsed = (time.perf_counter() - start) / BENCH_ROUNDS
+
+    footnotes = len(cases)
+    print(f"Parsed {footnotes} footnotes in {elapsed * 1000:.1f} ms "
+          f"({footnotes / elapsed:,.0f} footnotes/sec)")
+
+
+def main():
+    corpus = json.loads(CORPUS_PATH.read_text(encoding='utf-8'))
+    cases = corpus['cases']
+
+    print('CITATION LEXER REGRESSION')
+    print('=' * 80)
+    print(f"Corpus: {corpus['source']} ({len(cases)} cases)")
+
+    failures = check_corpus(cases)
+    if failures:
+        print(f'✗ {failures} of {len(cases)} cases changed')
+        return 1
+    print(f'✓ All {len(cases)} cases split identically')
+
+    print()
+    print('BENCHMARK')
+    print('=' * 80)
+    benchmark(cases)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
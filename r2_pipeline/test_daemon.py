@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""Test the citecheck daemon's job queue, HTTP API and shared fair rate limiter."""
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src import rate_limiter, tracing
+from src.llm_interface import LLMInterface, LLMUsage, track_usage
+from src.rate_limiter import FairRateLimiter, tenant
+from daemon import CitecheckDaemon, ProcessedPdfCache, request
+
+print('CITECHECK DAEMON TEST')
+print('=' * 80)
+
+all_pass = True
+checks = []
+
+# Fair limiter: a tenant with a deep backlog does not starve one arriving later
+limiter = FairRateLimiter(rate=100, burst=1)
+order = []
+
+
+def calls(name, count):
+    with tenant(name):
+        for _ in range(count):
+            limiter.acquire()
+            order.append(name)
+
+
+big = [threading.Thread(target=calls, args=('big', 10)) for _ in range(3)]
+for thread in big:
+    thread.start()
+time.sleep(0.05)
+small = threading.Thread(target=calls, args=('small', 3))
+small.start()
+for thread in big + [small]:
+    thread.join()
+last_small = max(i for i, name in enumerate(order) if name == 'small')
+stats = limiter.stats()
+checks += [
+    (f'late tenant served in turn (last of its 3 requests is #{last_small + 1} of 33)', last_small < 20),
+    ('limiter counts requests per tenant', stats['tenants']['big']['requests'] == 30
+     and stats['tenants']['small']['requests'] == 3 and not stats['waiting']),
+]
+started = time.monotonic()
+FairRateLimiter(rate=None).acquire()
+checks.append(('no rate means no waiting', time.monotonic() - started < 0.01))
+
+# Warm PDF cache: each key processed once, even when runs ask for it at once
+cache = ProcessedPdfCache(max_entries=2)
+processed = []
+
+
+def process():
+    processed.append(1)
+    time.sleep(0.05)
+    return {'pages': 1}
+
+
+threads = [threading.Thread(target=cache.get, args=('a.pdf', process)) for _ in range(4)]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+cache.get('b.pdf', process)
+cache.get('c.pdf', process)
+checks.append(('PDF processed once across concurrent runs; LRU bounded',
+               len(processed) == 3 and cache.stats()['entries'] == 2 and cache.stats()['hits'] == 3))
+
+# Concurrent runs on one LLM interface each see only their own usage, including their worker threads
+llm = LLMInterface(api_key=None, use_vector_store=False)
+runs = {'a': LLMUsage(), 'b': LLMUsage()}
+
+
+def article_run(name, calls):
+    with track_usage(runs[name]):
+        workers = [threading.Thread(target=tracing.bind(llm._record_usage), args=(100, 0.01)) for _ in range(calls)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+
+threads = [threading.Thread(target=article_run, args=('a', 30)), threading.Thread(target=article_run, args=('b', 5))]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+llm._record_usage(7, 0.0)  # Outside any run
+checks += [
+    ('LLM usage counted per run', runs['a'].get_stats()['total_calls'] == 30
+     and runs['b'].get_stats()['total_tokens'] == 500),
+    ('shared interface totals every run', llm.get_stats()['total_calls'] == 36
+     and llm.get_stats()['total_tokens'] == 3507),
+]
+
+# Daemon: jobs over a Unix socket, sharing the process-wide limiter
+rate_limiter.limiter.configure(50, 1)
+started_order = []
+
+
+def runner(job):
+    started_order.append(job.article)
+    for _ in range(job.spec['workers']):
+        rate_limiter.limiter.acquire()
+    return {'calls': job.spec['workers'], 'tenant': rate_limiter.current_tenant()}
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    docs = {}
+    for name in ('a1', 'a2', 'b1'):
+        docs[name] = Path(tmp) / f'{name}.docx'
+        docs[name].write_bytes(b'')
+    socket_path = str(Path(tmp) / 'r2.sock')
+
+    daemon = CitecheckDaemon(runner, max_jobs=1, status=lambda: {'pdf_cache': cache.stats()})
+    daemon.bind(socket_path=socket_path)
+    server = threading.Thread(target=daemon.server.serve_forever, daemon=True)
+    server.start()
+
+    status, body = request('POST', '/jobs', {'word_doc': str(tmp) + '/missing.docx'}, socket_path=socket_path)
+    checks.append(('missing document rejected', status == 400 and 'not found' in body['error']))
+
+    # Alice queues two articles before Bob queues one; Bob's starts second
+    submitted = []
+    for name, user, workers in (('a1', 'alice', 20), ('a2', 'alice', 2), ('b1', 'bob', 2)):
+        status, body = request('POST', '/jobs', {'word_doc': str(docs[name]), 'user': user, 'workers': workers},
+                               socket_path=socket_path)
+        submitted.append(status)
+    status, body = request('POST', '/jobs', {'word_doc': str(docs['a2']), 'user': 'alice'}, socket_path=socket_path)
+    checks += [
+        ('jobs accepted', submitted == [202, 202, 202]),
+        ('same article twice refused while queued', status == 409),
+    ]
+
+    daemon.queue.start()
+    deadline = time.time() + 10
+    while daemon.queue.counts()['done'] < 3 and time.time() < deadline:
+        time.sleep(0.05)
+
+    status, body = request('GET', '/jobs/3', socket_path=socket_path)
+    _, overview = request('GET', '/status', socket_path=socket_path)
+    checks += [
+        ('queued articles start in turn per user', started_order == ['a1', 'b1', 'a2']),
+        ('job runs as its user', status == 200 and body['job']['state'] == 'done'
+         and body['job']['result']['tenant'] == 'bob'),
+        ('status reports jobs, limiter and caches', overview['jobs']['done'] == 3
+         and overview['rate_limiter']['tenants']['alice']['requests'] == 22 and 'pdf_cache' in overview),
+        ('unknown job is 404', request('GET', '/jobs/99', socket_path=socket_path)[0] == 404),
+    ]
+
+    daemon.server.shutdown()
+    daemon.close()
+    checks.append(('socket removed on close', not Path(socket_path).exists()))
+
+rate_limiter.limiter.configure(None)
+
+for name, ok in checks:
+    all_pass &= bool(ok)
+    print(f'{"✓" if ok else "✗ FAIL"} {name}')
+
+print()
+print('✓ ALL TESTS PASSED' if all_pass else '✗ SOME TESTS FAILED')
+sys.exit(0 if all_pass else 1)
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Test BM25 evidence passage selection for the support check."""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.evidence_selector import EvidenceSelector, estimate_tokens
+
+print('EVIDENCE SELECTOR TEST')
+print('=' * 80)
+
+proposition = ('Courts have held that streaming a copyrighted film without a license '
+               'infringes the public performance right.')
+
+relevant = ('The court held that retransmitting a copyrighted film to subscribers over the internet '
+            'without a license infringes the exclusive public performance right. ')
+filler = ('The parties dispute the procedural history of the appeal and the scope of discovery. '
+          'Counsel filed several motions regarding deadlines, sealing and the form of exhibits. ')
+
+# A long redbox with the holding buried in the middle, plus page text around it
+regions = [
+    {"number": 1, "page": 4, "text": filler * 30 + relevant + filler * 30},
+    {"number": 3, "page": 9, "text": filler * 5},
+]
+pages = [{"page": n, "text": filler * 8} for n in range(12)]
+pages[5]["text"] = filler * 4 + ('Later decisions agree that an unlicensed stream of a film is a public '
+                                 'performance that infringes copyright. ') + filler * 4
+
+all_pass = True
+checks = []
+
+selector = EvidenceSelector(token_budget=300, passage_words=60, neighbor_pages=1)
+selection = selector.select(proposition, regions, pages)
+sent_ids = [p.passage_id for p in selection.sent]
+checks += [
+    ('prompt stays within the token budget', selection.sent_tokens <= 300 and estimate_tokens(selection.text) < 360),
+    ('source far larger than what is sent', selection.source_tokens > 5 * selection.sent_tokens),
+    ('buried holding is selected', 'infringes the exclusive public performance right' in selection.text),
+    ('relevant neighbouring page text is selected', 'unlicensed stream' in selection.text),
+    ('pages outside the redbox neighbourhood are ignored',
+     not any(p.page not in (3, 4, 5, 8, 9, 10) for p in selector.passages(regions, pages))),
+    ('region labels keep the PDF region numbers', '[Region 1, Page 4]' in selection.text
+     and all(not pid.startswith('R2.') for pid in sent_ids)),
+    ('context duplicating the redbox is dropped',
+     not any(p.source == 'context' and p.page == 9 for p in selector.passages(regions, pages))),
+]
+
+audit = selection.to_dict()
+checks += [
+    ('audit lists each passage sent with its score',
+     [p['id'] for p in audit['passages_sent']] == sent_ids and all('score' in p and p['text'] for p in audit['passages_sent'])),
+    ('audit records budget and totals', audit['token_budget'] == 300 and audit['sent_tokens'] == selection.sent_tokens),
+]
+
+# Budget holds however long the source gets
+sizes = []
+for repeats in (10, 100, 1000):
+    big = [{"number": 1, "page": 0, "text": (filler + relevant) * repeats}]
+    sizes.append(selector.select(proposition, big, []).sent_tokens)
+checks.append(('bounded regardless of source length', max(sizes) <= 300))
+
+# A short redbox is sent whole; unrelated context is not added
+short = [{"number": 1, "page": 0, "text": relevant}]
+selection = selector.select(proposition, short, [{"page": 0, "text": relevant + filler}, {"page": 1, "text": filler}])
+checks.append(('short redbox sent whole without unrelated context',
+               [p.passage_id for p in selection.sent] == ['R1.1']))
+
+# No proposition: redboxes in document order still fill the budget
+selection = selector.select('', regions, pages)
+checks.append(('no proposition falls back to the redbox', selection.sent and all(p.source == 'redbox' for p in selection.sent)))
+
+# One passage larger than a tiny budget is cut to fit
+selection = EvidenceSelector(token_budget=20, passage_words=200).select(proposition, [{"page": 0, "text": relevant * 5}], [])
+checks.append(('oversized passage truncated to the budget', selection.sent_tokens <= 20 and selection.sent))
+
+# Nothing fits: the redbox is cut down even when page text outranks it
+selection = EvidenceSelector(token_budget=20, passage_words=200).select(
+    proposition, [{"page": 0, "text": filler * 3}], [{"page": 1, "text": relevant * 5}])
+checks.append(('fallback cuts the best redbox, not context', [p.source for p in selection.sent] == ['redbox']
+               and selection.sent_tokens <= 20))
+
+# Two regions with the same number on one page are still sent in document order
+twins = [{"number": 2, "page": 0, "text": 'The license covered broadcast but not streaming.'},
+         {"number": 2, "page": 0, "text": relevant}]
+selection = selector.select(proposition, twins, [])
+checks.append(('regions sharing a number kept in document order',
+               len(selection.sent) == 2 and selection.text.index('broadcast') < selection.text.index('retransmitting')))
+
+for name, ok in checks:
+    all_pass &= bool(ok)
+    print(f'{"✓" if ok else "✗ FAIL"} {name}')
+
+print()
+print('✓ ALL TESTS PASSED' if all_pass else '✗ SOME TESTS FAILED')
+sys.exit(0 if all_pass else 1)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Test footnote fingerprints and carrying unchanged results forward between batches."""
+import sys
+import json
+import time
+import tempfile
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.citation_parser import CitationParser
+from src.fingerprint import PriorResults, citation_fingerprint, file_digest, is_reusable
+
+print('FINGERPRINT TEST')
+print('=' * 80)
+
+all_pass = True
+tmp = Path(tempfile.mkdtemp())
+pdf = tmp / 'R1-001-01-Alice.pdf'
+pdf.write_bytes(b'%PDF-1.4 original scan')
+r2_pdf = tmp / 'R2-001-01-Alice.pdf'
+r2_pdf.write_bytes(b'%PDF-1.4 annotated')
+
+footnote = "*See* Alice Corp. v. CLS Bank Int'l, 573 U.S. 208, 216 (2014)."
+proposition = 'Abstract ideas are not patentable.'
+citation = CitationParser(footnote, 1).parse()[0]
+fingerprint = citation_fingerprint(citation, footnote, proposition, file_digest(pdf))
+
+entry = {
+    'footnote': 1, 'cite_num': citation.citation_num, 'original_text': citation.full_text,
+    'r1_pdf_path': str(pdf), 'r2_pdf_path': str(r2_pdf),
+    'citation_validation': {'is_correct': True}, 'support_analysis': {'support_level': 'yes'},
+    'recommendation': 'approve', 'batch_name': 'first_pass', 'fingerprint': fingerprint,
+}
+log_path = tmp / 'full_pipeline_log.json'
+log_path.write_text(json.dumps([dict(entry, fingerprint='stale', batch_name='older'), entry]))
+prior = PriorResults(log_path)
+
+carried = prior.carry_forward(citation, fingerprint)
+checks = [
+    ('same inputs, same fingerprint',
+     fingerprint == citation_fingerprint(citation, footnote, proposition, file_digest(pdf))),
+    ('unchanged citation carried forward', carried is not None and carried['recommendation'] == 'approve'),
+    ('carried result remembers its batch', carried is not None and carried['carried_forward_from'] == 'first_pass'),
+    ('edited footnote text reprocessed', prior.carry_forward(citation, citation_fingerprint(
+        citation, footnote.replace('216', '217'), proposition, file_digest(pdf))) is None),
+    ('edited proposition reprocessed', prior.carry_forward(citation, citation_fingerprint(
+        citation, footnote, proposition + ' Ever.', file_digest(pdf))) is None),
+]
+pdf.write_bytes(b'%PDF-1.4 rescanned')
+checks.append(('replaced R1 PDF reprocessed', prior.carry_forward(citation, citation_fingerprint(
+    citation, footnote, proposition, file_digest(pdf))) is None))
+checks += [
+    ('API failure not reused', not is_reusable(dict(entry, support_analysis=None))),
+    ('pipeline error not reused', not is_reusable(dict(entry, error='Pipeline Error: timeout'))),
+    ('missing R2 PDF not reused', not is_reusable(dict(entry, r2_pdf_path=str(tmp / 'gone.pdf')))),
+    ('missing R1 PDF result reused', is_reusable({'footnote': 1, 'cite_num': 1, 'r1_pdf_path': None,
+                                                  'needs_review': True})),
+]
+
+# A 300-footnote article with one edited footnote: everything else is carried forward
+citations = [CitationParser(f'{n} U.S.C. § {n} (2018).', n).parse()[0] for n in range(1, 301)]
+digest = file_digest(r2_pdf)
+log_path.write_text(json.dumps([
+    dict(entry, footnote=c.footnote_num, cite_num=c.citation_num,
+         fingerprint=citation_fingerprint(c, c.full_text, f'Proposition {c.footnote_num}', digest))
+    for c in citations
+]))
+started = time.perf_counter()
+prior = PriorResults(log_path)
+changed = [c for c in citations if prior.carry_forward(c, citation_fingerprint(
+    c, c.full_text, f'Proposition {c.footnote_num}' + (' edited' if c.footnote_num == 150 else ''),
+    digest)) is None]
+elapsed_ms = (time.perf_counter() - started) * 1000
+checks.append(('one edit in 300 footnotes reprocesses one citation',
+               [c.footnote_num for c in changed] == [150]))
+
+for name, ok in checks:
+    all_pass &= ok
+    print(f'{"✓" if ok else "✗ FAIL"} {name}')
+print(f'  Compared 300 fingerprints in {elapsed_ms:.1f} ms')
+
+print()
+print('✓ ALL TESTS PASSED' if all_pass else '✗ SOME TESTS FAILED')
+sys.exit(0 if all_pass else 1)
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Test the OCR service's caching and bookkeeping with Tesseract replaced by a canned result."""
+import sys
+import tempfile
+import threading
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import fitz
+from src import ocr_service
+from src.ocr_service import OCRService
+
+print('OCR SERVICE TEST')
+print('=' * 80)
+
+all_pass = True
+checks = []
+
+TSV = ('level\tpage_num\tblock_num\tpar_num\tline_num\tword_num\tleft\ttop\twidth\theight\tconf\ttext\n'
+       '5\t1\t1\t1\t1\t1\t300\t300\t200\t60\t96\tMarbury\n')
+
+
+images = []
+
+
+def fake_tesseract(png_bytes, config):
+    pix = fitz.Pixmap(png_bytes)
+    images.append((pix.width, pix.height))
+    return TSV
+
+
+class RefusingPool:
+    def submit(self, *args):
+        raise RuntimeError('pool is shut down')
+
+
+originals = (ocr_service.OCR_AVAILABLE, ocr_service._run_tesseract_tsv, ocr_service.HASH_MEMO_SIZE)
+ocr_service.OCR_AVAILABLE, ocr_service._run_tesseract_tsv = True, fake_tesseract
+
+with tempfile.TemporaryDirectory() as tmp:
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), 'Marbury v. Madison')
+    region = (0, 0, 300, 200)
+
+    # A document with no file behind it is hashed by its bytes
+    service = OCRService(cache_dir=Path(tmp) / 'inline', max_workers=0)
+    first = service.ocr_regions(doc, 0, [region])
+    second = service.ocr_regions(doc, 0, [region])
+    checks += [
+        ('unnamed document OCR\'d', first == ['Marbury']),
+        ('unnamed document served from cache', second == first
+         and service.get_stats()['result_cache_hits'] == 1 and service.get_stats()['tesseract_calls'] == 1),
+    ]
+
+    # A hash failure is reported per region instead of raised
+    path = Path(tmp) / 'source.pdf'
+    doc.save(str(path))
+    saved = fitz.open(str(path))
+    service.pdf_hash = lambda pdf_path: 1 / 0
+    checks.append(('unhashable document returns no text', service.ocr_regions(saved, 0, [region, region]) == [None, None]))
+    del service.pdf_hash
+    saved.close()
+
+    # One page render serves every clip; words are placed relative to the crop
+    service = OCRService(cache_dir=Path(tmp) / 'pixmaps', max_workers=0)
+    images.clear()
+    service.ocr_regions(doc, 0, [region])
+    lower_region = (0, 300, 300, 400)
+    lower = service.ocr_regions(doc, 0, [region, lower_region])
+    crops = [(fitz.Rect(clip) * fitz.Matrix(300 / 72, 300 / 72)).irect for clip in (region, lower_region)]
+    checks += [
+        ('page rendered once for different clips', service.get_stats()['pixmap_cache_hits'] == 1
+         and list(service._pixmaps) == [(service.doc_hash(doc), 0, 300)]),
+        ('each Tesseract image cropped to its clip', images == [(r.width, r.height) for r in crops]),
+        ('cropped words mapped back to the page', lower == ['Marbury', 'Marbury']),
+    ]
+
+    # Remembered file hashes are capped
+    ocr_service.HASH_MEMO_SIZE = 2
+    for i in range(3):
+        copy = Path(tmp) / f'copy{i}.pdf'
+        doc.save(str(copy))
+        service.pdf_hash(copy)
+    checks.append(('file hash memo bounded', [Path(key[0]).name for key in service._hashes]
+                   == ['copy1.pdf', 'copy2.pdf']))
+    ocr_service.HASH_MEMO_SIZE = originals[2]
+    service.close()
+
+    # Counters stay exact when many threads OCR at once
+    service = OCRService(cache_dir=Path(tmp) / 'threads', max_workers=0)
+
+    def request_regions():
+        for _ in range(200):
+            service.ocr_regions(doc, 0, [region])
+
+    threads = [threading.Thread(target=request_regions) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = service.get_stats()
+    checks.append(('counters exact across threads', stats['regions_requested'] == 1600
+                   and stats['result_cache_hits'] + stats['tesseract_calls'] == 1600))
+    service.close()
+
+    # Each refused submission gives its queue slot back
+    service = OCRService(cache_dir=Path(tmp) / 'pool', max_workers=1, max_pending=2)
+    service.executor.shutdown(wait=True)
+    service.executor = RefusingPool()
+    refused = [service.ocr_regions(doc, 0, [region], dpi=dpi) for dpi in (100, 110, 120)]
+    checks.append(('queue slots released when the pool refuses work', refused == [[None]] * 3
+                   and service._slots.acquire(blocking=False) and service._slots.acquire(blocking=False)))
+    service.executor = None
+    service.close()
+    doc.close()
+
+ocr_service.OCR_AVAILABLE, ocr_service._run_tesseract_tsv, _ = originals
+
+for name, ok in checks:
+    all_pass &= bool(ok)
+    print(f'{"✓" if ok else "✗ FAIL"} {name}')
+
+print()
+print('✓ ALL TESTS PASSED' if all_pass else '✗ SOME TESTS FAILED')
+sys.exit(0 if all_pass else 1)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Test quote verification: exact quotes, ellipses, bracketed alterations and missing quotes."""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.quote_verifier import QuoteVerifier
+
+print('QUOTE VERIFIER TEST')
+print('=' * 80)
+
+all_pass = True
+checks = []
+
+SOURCE = ('In the early years, Congress had broad power to regulate commerce among the several States. '
+          'The Court has never doubted that power. It has, however, insisted that the power be exercised '
+          'within limits, and the states retained their police powers.')
+
+verifier = QuoteVerifier()
+
+
+def verify(quote, source=SOURCE):
+    result = verifier.verify_quote(quote, source)
+    return result, [issue['issue_type'] for issue in result['issues']]
+
+
+# Exact quote, spanning a line break in the source
+result, issues = verify('Congress had broad power to regulate commerce')
+checks += [
+    ('exact quote accurate', result['accurate'] and not issues),
+    ('exact quote span', SOURCE[slice(*result['source_span'])] == 'Congress had broad power to regulate commerce'),
+]
+result, _ = verify('had broad power to regulate', SOURCE.replace('broad power', 'broad\npower'))
+checks.append(('whitespace in source ignored', result['accurate']))
+
+# Ellipses
+result, issues = verify('Congress had broad power . . . among the several States.')
+checks += [
+    ('ellipsis omission accurate', result['accurate'] and not issues),
+    ('ellipsis spans both segments', len(result['segment_spans']) == 2),
+]
+result, issues = verify('Congress had broad power . . . to regulate commerce')
+checks.append(('ellipsis that omits nothing flagged', 'ellipsis' in issues and result['similarity'] == 1.0))
+
+# Bracketed alterations
+result, issues = verify('[The legislature] had broad power to regulate commerce')
+checks += [
+    ('bracketed substitution found', issues != ['not_found'] and result['similarity'] == 1.0),
+    ('bracketed substitution accurate', result['accurate'] and issues == ['bracket']),
+    ('substitution span starts after replaced words',
+     SOURCE[slice(*result['source_span'])] == 'had broad power to regulate commerce'),
+]
+result, issues = verify('The Court has never doubted [Congress\'s] power. It has, however, insisted')
+checks.append(('substitution mid-quote accurate', result['accurate'] and issues == ['bracket']))
+result, issues = verify('[t]he Court has never doubted that power')
+checks.append(('single-letter alteration accurate', result['accurate'] and not issues))
+result, issues = verify('[The legislature] had broad power . . . [and] the states retained their police powers')
+checks.append(('substitutions and ellipsis together', result['accurate'] and 'not_found' not in issues))
+result, issues = verify('[The legislature] had broad power to tax imports')
+checks.append(('substitution does not excuse a wrong quote', not result['accurate']))
+
+# Not found
+result, issues = verify('The President may veto any bill passed by both Houses')
+checks += [
+    ('unrelated quote not found', issues == ['not_found'] and not result['accurate']),
+    ('not found suggests checking the source', result['suggested_action'] == 'verify_source_or_page_number'),
+]
+
+for name, ok in checks:
+    all_pass &= bool(ok)
+    print(f'{"✓" if ok else "✗ FAIL"} {name}')
+
+print()
+print('✓ ALL TESTS PASSED' if all_pass else '✗ SOME TESTS FAILED')
+sys.exit(0 if all_pass else 1)
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Test the precompiled, memory-mapped Bluebook rule snapshot."""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.rule_retrieval import BluebookRuleRetriever
+from src.rule_snapshot import RuleSnapshot
+
+print('RULE SNAPSHOT TEST')
+print('=' * 80)
+
+source = Path(__file__).parent.parent / "reference_files" / "Bluebook.json"
+citations = [
+    'Crusey, *supra* note 21 at 515 ("Unlike a copyright infringement claim under Section 501, '
+    'a Section 1202 claim requires no prerequisite copyright registration.").',
+    'Smith v. Jones, 123 F.3d 456 (9th Cir. 2020).',
+    '*See* Smith, 789 F.2d 123, 456 (discussing the issue).',
+    'No. 21-CV-6425 (S.D.N.Y. 2021).',
+    'U.S. CONST. art. I, § 8, cl. 8.',
+]
+
+all_pass = True
+checks = []
+
+
+def timed(make):
+    started = time.perf_counter()
+    value = make()
+    return value, time.perf_counter() - started
+
+
+def results(retriever):
+    out = []
+    for citation in citations:
+        matches, coverage = retriever.retrieve_rules(citation)
+        out.append(([(m.source, m.rule_id, m.score, m.match_type, m.text) for m in matches], coverage,
+                    retriever.format_rules_for_prompt(matches)))
+    return out
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    bluebook = Path(tmp) / "Bluebook.json"
+    snapshot_path = Path(tmp) / "cache" / "bluebook_rules.snapshot"
+    shutil.copy(source, bluebook)
+
+    parsed, parse_seconds = timed(lambda: BluebookRuleRetriever(str(bluebook)))
+    built = BluebookRuleRetriever(str(bluebook), str(snapshot_path))
+    checks.append(('snapshot built on first use', built.snapshot is not None and snapshot_path.exists()))
+    built_at = snapshot_path.stat().st_mtime_ns
+
+    mapped, map_seconds = timed(lambda: BluebookRuleRetriever(str(bluebook), str(snapshot_path)))
+    checks += [
+        ('rule counts match', (mapped.snapshot.redbook_count, mapped.snapshot.bluebook_count)
+         == (len(parsed.redbook_rules), len(parsed.bluebook_rules))),
+        ('retrieval and prompt identical to parsing Bluebook.json', results(mapped) == results(parsed)),
+        ('rules by id identical', mapped.get_rule_by_id('10.1', 'bluebook') == parsed.get_rule_by_id('10.1', 'bluebook')),
+        (f'opening the snapshot faster ({map_seconds * 1000:.1f} ms vs {parse_seconds * 1000:.1f} ms)',
+         map_seconds < parse_seconds),
+    ]
+
+    # Touched but unchanged: content hash matches, no rebuild
+    os.utime(bluebook, ns=(time.time_ns(), time.time_ns() + 10 ** 9))
+    touched = BluebookRuleRetriever(str(bluebook), str(snapshot_path))
+    checks.append(('touching Bluebook.json does not rebuild',
+                   touched.snapshot is not None and snapshot_path.stat().st_mtime_ns == built_at))
+
+    # Edited: rebuilt and the new rule is found
+    data = json.loads(bluebook.read_text())
+    data['redbook']['rules'].append({'id': 'ZZ', 'title': 'Snapshot canary',
+                                     'text': 'Quokkaphrase citations follow this canary rule.'})
+    bluebook.write_text(json.dumps(data))
+    edited = BluebookRuleRetriever(str(bluebook), str(snapshot_path))
+    matches, coverage = edited.retrieve_rules(citations[0])
+    canary = edited.get_rule_by_id('ZZ', 'redbook')
+    checks += [
+        ('editing Bluebook.json rebuilds the snapshot', snapshot_path.stat().st_mtime_ns != built_at),
+        ('rebuilt snapshot has the new rule', coverage['redbook_scanned'] == len(parsed.redbook_rules) + 1
+         and canary is not None and canary.title == 'Snapshot canary'),
+    ]
+
+    # A corrupt or foreign file is ignored and replaced
+    edited.snapshot.close()
+    snapshot_path.write_bytes(b'not a snapshot')
+    recovered = BluebookRuleRetriever(str(bluebook), str(snapshot_path))
+    checks.append(('corrupt snapshot rebuilt', recovered.snapshot is not None
+                   and RuleSnapshot.open(snapshot_path, bluebook) is not None))
+
+    for retriever in (built, mapped, touched, recovered):
+        retriever.snapshot.close()
+
+for name, ok in checks:
+    all_pass &= bool(ok)
+    print(f'{"✓" if ok else "✗ FAIL"} {name}')
+
+print()
+print('✓ ALL TESTS PASSED' if all_pass else '✗ SOME TESTS FAILED')
+sys.exit(0 if all_pass else 1)
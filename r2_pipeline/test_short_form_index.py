@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Test Id./supra/hereinafter resolution with the article-wide short-form index."""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.citation_parser import CitationParser
+from src.short_form_index import ShortFormIndex
+
+footnotes = {
+    18: ('Haley Bridget McCullough, *Closing the Gap*, 24 U. Denv. Sports & Ent. L.J. 75, 88 (2021).'),
+    19: 'McCullough, *supra* note 18 at 90.',
+    25: ('4 Melville B. Nimmer & David Nimmer, Nimmer on Copyright § 12A.10 (2019) '
+         '[hereinafter Nimmer on Copyright] (“Admittedly, an unauthorized film may infringe.”).'),
+    26: '*Id.* at 12.',
+    40: ('Bruce A. Lehman, Information Infrastructure Task Force, The Report of the Working Group '
+         '(1995) (hereinafter Clinton Working Group).'),
+    52: "Recording Indus. Ass'n of Am. v. Diamond Multimedia Sys., Inc., 180 F.3d 1072, 1073 (9th Cir. 1999).",
+    53: '*Id.*',
+    54: '*See* Nimmer On Copyright, *supra* note 25 § 13D.06; Clinton Working Group, *supra* note 40, at 2.',
+    55: "Recording Indus., 180 F.3d at 1074.",
+    56: 'McCullough, *supra* note 19, at 81.',
+    57: '*See supra* note 52 and accompanying text.',
+}
+
+# (footnote, cite) -> expected antecedent (footnote, cite), or None
+expected = {
+    (19, 1): (18, 1),
+    (26, 1): (25, 1),
+    (53, 1): (52, 1),
+    (54, 1): (25, 1),
+    (54, 2): (40, 1),
+    (55, 1): (52, 1),
+    (56, 1): (18, 1),
+    (57, 1): None,  # Internal cross-reference, not a source
+}
+
+print('SHORT FORM INDEX TEST')
+print('=' * 80)
+
+index = ShortFormIndex()
+citations = {}
+for fn_num in sorted(footnotes):
+    parsed = CitationParser(footnotes[fn_num], fn_num).parse()
+    index.add_footnote(fn_num, parsed)
+    for cit in parsed:
+        citations[(cit.footnote_num, cit.citation_num)] = cit
+
+all_pass = True
+for key, want in expected.items():
+    cit = citations[key]
+    antecedent = index.antecedent_of(cit)
+    got = (antecedent.footnote_num, antecedent.citation_num) if antecedent else None
+    status = '✓' if got == want else '✗ FAIL'
+    if got != want:
+        all_pass = False
+    print(f'{status} FN{key[0]}-{key[1]} "{cit.full_text[:50]}" -> {got} (expected {want})')
+
+# Wrong supra note number is caught without an LLM call
+errors = [e['error_type'] for e in index.errors_for(citations[(56, 1)])]
+print(f'{"✓" if errors == ["supra_wrong_note"] else "✗ FAIL"} FN56 errors: {errors}')
+all_pass &= errors == ["supra_wrong_note"]
+
+# Bare short forms skip AI validation; ones with parentheticals do not
+bare = {key: index.is_bare(citations[key]) for key in [(19, 1), (53, 1), (54, 1), (57, 1)]}
+want_bare = {(19, 1): True, (53, 1): True, (54, 1): True, (57, 1): False}
+print(f'{"✓" if bare == want_bare else "✗ FAIL"} Bare short forms: {bare}')
+all_pass &= bare == want_bare
+
+print()
+print('✓ ALL TESTS PASSED' if all_pass else '✗ SOME TESTS FAILED')
+sys.exit(0 if all_pass else 1)
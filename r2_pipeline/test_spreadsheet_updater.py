@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Test that R2 results written by SpreadsheetUpdater read back from the saved workbook."""
+import sys
+import tempfile
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import Font
+from src.spreadsheet_updater import SpreadsheetUpdater, R2_START_COL
+
+print('SPREADSHEET UPDATER TEST')
+print('=' * 80)
+
+all_pass = True
+checks = []
+
+SHEET = 'CC (nn. 78-113); HC'
+HEADERS = ['Fn#', 'Cite#', 'Supports?', 'Citation Elements', 'MEM Comments']
+RESULTS = {
+    (78, 1): {'support_analysis': {'support_level': 'yes', 'reasoning': 'Holding matches the proposition.'},
+              'citation_validation': {'is_correct': True}, 'recommendation': 'approve'},
+    (78, 2): {'support_analysis': {'support_level': 'no', 'reasoning': 'Source discusses a different statute.'},
+              'citation_validation': {'is_correct': False, 'errors': [
+                  {'error_type': 'pincite', 'description': 'Pincite should be 216'}]},
+              'quote_verification': {'accurate': False, 'issues': [{}, {}]}},
+    (80, 1): {},
+}
+
+
+def make_workbook(path):
+    wb = Workbook()
+    ws = wb.active
+    ws.title = 'Instructions'
+    ws['A1'] = 'Read me'
+    cc = wb.create_sheet(SHEET)
+    cc['A1'] = 'Round 1'
+    cc.cell(row=1, column=R2_START_COL, value='Round 2')
+    for offset, header in enumerate(HEADERS):
+        cc.cell(row=2, column=1 + offset, value=header).font = Font(bold=True)
+        cc.cell(row=2, column=R2_START_COL + offset, value=header)
+    # Fn#/Cite# typed as numbers, floats and text; fn 80 is filled in only in the R2 section
+    cc.append([])
+    cc.append([78, 1, 'Yes', 'No Issues', 'R1 note'])
+    cc.append([78.0, '2', 'Maybe'])
+    cc.append(['79', 1])
+    row = [None] * (R2_START_COL + 1)
+    row[R2_START_COL - 1], row[R2_START_COL] = '80', '1'
+    cc.append(row)
+    wb.save(path)
+
+
+def r2_values(path):
+    wb = load_workbook(path)
+    ws = wb[SHEET]
+    values = {}
+    for row in ws.iter_rows(min_row=4, values_only=True):
+        key = (int(float(row[R2_START_COL - 1])), int(float(row[R2_START_COL]))) \
+            if len(row) > R2_START_COL and row[R2_START_COL - 1] is not None else None
+        if key:
+            values[key] = row[R2_START_COL + 1:R2_START_COL + 4]
+    r1 = [row[:3] for row in ws.iter_rows(min_row=4, max_row=4, values_only=True)][0]
+    bold = ws.cell(row=2, column=1).font.b
+    sheets = wb.sheetnames
+    wb.close()
+    return values, r1, bold, sheets
+
+
+for streaming in (False, True):
+    mode = 'streaming' if streaming else 'in-place'
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'master.xlsx'
+        make_workbook(path)
+
+        updater = SpreadsheetUpdater(path, streaming=streaming)
+        for (fn, cite), results in RESULTS.items():
+            updater.update_citation(fn, cite, results)
+        updater.update_citation(99, 1, {})
+        updater.save()
+        updater.close()
+
+        values, r1, bold, sheets = r2_values(path)
+        checks += [
+            (f'{mode}: every indexed row written', sorted(values) == [(78, 1), (78, 2), (80, 1)]),
+            (f'{mode}: supported citation', values.get((78, 1)) ==
+             ('Yes', 'No Issues', 'Support: Holding matches the proposition.; Action: approve')),
+            (f'{mode}: unsupported citation with errors', values.get((78, 2)) ==
+             ('No', 'Repaired Issue - pincite',
+              'Pincite should be 216; Support: Source discusses a different statute.; Quote issues: 2 found')),
+            # An empty comment is saved as an empty cell
+            (f'{mode}: row keyed only in R2 section', values.get((80, 1)) == ('To Check', 'No Issues', None)),
+            (f'{mode}: R1 columns and other sheets kept', r1 == (78, 1, 'Yes') and sheets == ['Instructions', SHEET]),
+        ]
+        if not streaming:
+            checks.append((f'{mode}: formatting kept', bold))
+
+        # A second run re-reads the saved workbook and updates the same rows
+        updater = SpreadsheetUpdater(path, streaming=streaming)
+        updater.update_citation(78, 2, {'support_analysis': {'support_level': 'maybe', 'reasoning': ''}})
+        updater.save()
+        updater.close()
+        values, _, _, _ = r2_values(path)
+        checks.append((f'{mode}: reopened workbook updated in place',
+                       values.get((78, 2))[0] == 'Maybe' and values.get((78, 1))[0] == 'Yes' and len(values) == 3))
+
+for name, ok in checks:
+    all_pass &= bool(ok)
+    print(f'{"✓" if ok else "✗ FAIL"} {name}')
+
+print()
+print('✓ ALL TESTS PASSED' if all_pass else '✗ SOME TESTS FAILED')
+sys.exit(0 if all_pass else 1)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Test nested tracing spans, thread propagation and the Chrome trace / histogram exports."""
+import sys
+import json
+import time
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src import tracing
+from src.tracing import Tracer
+
+print('TRACING TEST')
+print('=' * 80)
+
+all_pass = True
+checks = []
+
+# Disabled: the shared no-op span, nothing recorded
+assert not tracing.enabled()
+with tracing.span('citation', footnote=1) as s:
+    s.set(ignored=True)
+checks.append(('disabled tracer records nothing', tracing.tracer.spans() == []))
+
+tracing.enable()
+
+
+@tracing.traced('citation', tags=lambda footnote, cite: {'footnote': footnote, 'cite': cite})
+def process(footnote, cite):
+    with tracing.span('llm.call'):
+        tracing.traced_sleep(0.02, 'llm.wait', reason='cooldown')
+        with tracing.span('llm.request', attempt=1):
+            time.sleep(0.01)
+        tracing.tag(tokens=120)
+    with tracing.span('quote.verify'):
+        pass
+
+
+with tracing.span('pipeline'):
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(tracing.bind(process), n, 1) for n in range(1, 7)]
+        for future in futures:
+            future.result()
+
+spans = tracing.tracer.spans()
+by_name = {}
+for s in spans:
+    by_name.setdefault(s.name, []).append(s)
+root = by_name['pipeline'][0]
+llm = by_name['llm.call'][0]
+checks += [
+    ('every stage recorded', {n: len(v) for n, v in by_name.items()} == {
+        'pipeline': 1, 'citation': 6, 'llm.call': 6, 'llm.wait': 6, 'llm.request': 6, 'quote.verify': 6}),
+    ('worker-thread spans nest under the submitting span', all(s.parent is root for s in by_name['citation'])),
+    ('footnote/cite inherited by nested spans', sorted(s.tags['footnote'] for s in by_name['llm.request'])
+     == [1, 2, 3, 4, 5, 6] and all(s.tags['cite'] == 1 for s in by_name['llm.wait'])),
+    ('tag() lands on the innermost open span', llm.tags.get('tokens') == 120),
+    ('wait and request split out of the LLM call', llm.self_ms < 5 and llm.duration_ms >= 30),
+]
+
+# Exceptions are tagged and do not leave the span open
+try:
+    with tracing.span('pdf.extract'):
+        raise ValueError('bad pdf')
+except ValueError:
+    pass
+checks.append(('exception tagged, context restored', tracing.tracer.spans()[-1].tags.get('error') == 'ValueError'
+               and tracing._current.get() is None))
+
+tmp = Path(tempfile.mkdtemp())
+tracing.tracer.write(tmp / 'trace.json', tmp / 'stages.json')
+trace = json.loads((tmp / 'trace.json').read_text())
+stages = json.loads((tmp / 'stages.json').read_text())
+events = [e for e in trace['traceEvents'] if e['ph'] == 'X']
+checks += [
+    ('chrome trace has one complete event per span', len(events) == len(tracing.tracer.spans())),
+    ('chrome trace names worker threads', sum(e['ph'] == 'M' for e in trace['traceEvents']) >= 2),
+    ('histogram per stage', stages['llm.wait']['count'] == 6 and stages['llm.wait']['p50_ms'] >= 20
+     and sum(stages['llm.wait']['buckets'].values()) == 6),
+    ('slowest spans carry footnote IDs', all('footnote' in s for s in stages['citation']['slowest'])),
+]
+
+# Overhead while disabled
+tracing.enable(False)
+started = time.perf_counter()
+for _ in range(100_000):
+    with tracing.span('parse', footnote=1):
+        pass
+disabled_us = (time.perf_counter() - started) * 10
+checks.append(('disabled span costs under 5 µs', disabled_us < 5))
+
+# Enabled overhead
+tracer = Tracer(enabled=True)
+started = time.perf_counter()
+for _ in range(100_000):
+    with tracer.span('parse', footnote=1):
+        pass
+enabled_us = (time.perf_counter() - started) * 10
+
+for name, ok in checks:
+    all_pass &= ok
+    print(f'{"✓" if ok else "✗ FAIL"} {name}')
+print(f'  Span overhead: {disabled_us:.2f} µs disabled, {enabled_us:.2f} µs enabled')
+
+print()
+print('✓ ALL TESTS PASSED' if all_pass else '✗ SOME TESTS FAILED')
+sys.exit(0 if all_pass else 1)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Test tracked replacements in footnotes, including repeated text within one run."""
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from docx import Document
+from lxml import etree
+from src.word_editor import WordEditor, W
+
+print('WORD EDITOR TEST')
+print('=' * 80)
+
+all_pass = True
+checks = []
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+FOOTNOTES = f'''<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<w:footnotes xmlns:w="{W_NS}">
+  <w:footnote w:id="1"><w:p>
+    <w:r><w:rPr><w:i/></w:rPr><w:t>Id. at 5; </w:t><w:t xml:space="preserve">Id. at 5; see </w:t><w:t>Id. at 7.</w:t></w:r>
+  </w:p></w:footnote>
+  <w:footnote w:id="2"><w:p>
+    <w:r><w:t>Smith v. Jones, 5 U.S. 1 (1801); Smith v. Jones, 5 U.S. 1 (1801).</w:t></w:r>
+  </w:p></w:footnote>
+</w:footnotes>'''
+FOOTNOTES_REL = ('<Relationship Id="rIdFn" '
+                 'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/footnotes" '
+                 'Target="footnotes.xml"/>')
+FOOTNOTES_TYPE = ('<Override PartName="/word/footnotes.xml" '
+                  'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.footnotes+xml"/>')
+
+
+def make_docx(path):
+    """Blank python-docx document with a footnotes part added."""
+    blank = path.with_name('blank.docx')
+    Document().save(blank)
+    with zipfile.ZipFile(blank) as src, zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as dst:
+        for item in src.infolist():
+            data = src.read(item.filename)
+            if item.filename == '[Content_Types].xml':
+                data = data.replace(b'</Types>', FOOTNOTES_TYPE.encode() + b'</Types>')
+            elif item.filename == 'word/_rels/document.xml.rels':
+                data = data.replace(b'</Relationships>', FOOTNOTES_REL.encode() + b'</Relationships>')
+            dst.writestr(item, data)
+        dst.writestr('word/footnotes.xml', FOOTNOTES)
+
+
+def footnote_text(root, fn_id, tag):
+    footnote = next(f for f in root.iter(W + 'footnote') if f.get(W + 'id') == str(fn_id))
+    if tag == 't':
+        return ''.join(t.text or '' for t in footnote.iter(W + 't')
+                       if not any(a.tag == W + 'del' for a in t.iterancestors()))
+    return ''.join(t.text or '' for t in footnote.iter(W + tag))
+
+
+with tempfile.TemporaryDirectory() as tmp:
+    doc_path = Path(tmp) / 'article.docx'
+    make_docx(doc_path)
+    editor = WordEditor(doc_path)
+
+    queued = [
+        # Spans the first two w:t of one run, then repeats inside the same run
+        editor.replace_text_tracked(1, '5; Id. at 5', '5-6'),
+        editor.replace_text_tracked(1, 'Id. at 7', 'Id. at 8'),
+        # Same text twice in one w:t: each change takes the next live occurrence
+        editor.replace_text_tracked(2, '5 U.S. 1', '5 U.S. (1 Cranch) 1'),
+        editor.replace_text_tracked(2, '5 U.S. 1 (1801).', '5 U.S. (1 Cranch) 1 (1801).'),
+        editor.replace_text_tracked(2, 'Marbury', 'Marbury v. Madison'),
+    ]
+    checks += [
+        ('changes queued, missing text refused', queued == [True, True, True, True, False]),
+        ('queued changes logged before save', [c['status'] for c in editor.get_changes_log()] == ['pending'] * 4),
+    ]
+
+    out_path = Path(tmp) / 'edited.docx'
+    editor.save(out_path)
+    with zipfile.ZipFile(out_path) as z:
+        root = etree.fromstring(z.read('word/footnotes.xml'))
+
+    ids = [el.get(W + 'id') for el in root.iter(W + 'ins', W + 'del')]
+    italic_runs = [r for r in root.iter(W + 'r') if r.find(W + 'rPr') is not None]
+    checks += [
+        ('all changes applied', [c['status'] for c in editor.get_changes_log()] == ['applied'] * 4),
+        ('multi-w:t run rewritten', footnote_text(root, 1, 't') == 'Id. at 5-6; see Id. at 8.'),
+        ('multi-w:t run deletions tracked', footnote_text(root, 1, 'delText') == '5; Id. at 5Id. at 7'),
+        ('repeated text replaced once per change',
+         footnote_text(root, 2, 't') == 'Smith v. Jones, 5 U.S. (1 Cranch) 1 (1801); '
+                                        'Smith v. Jones, 5 U.S. (1 Cranch) 1 (1801).'),
+        ('revision ids unique', len(ids) == len(set(ids)) and len(ids) == 9),
+        ('run formatting kept', all(r.find(W + 'rPr').find(W + 'i') is not None for r in italic_runs)
+         and len(italic_runs) >= 6),
+    ]
+
+    # A change that fails part way leaves its footnote untouched
+    editor = WordEditor(out_path)
+    editor.replace_text_tracked(2, 'Smith', 'Smyth')
+    editor._split_run = lambda *args: 1 / 0
+    before = footnote_text(editor.find_footnote(2)[0], 2, 't')
+    applied = editor.apply_changes()
+    checks += [
+        ('failed change marked failed', applied == 0 and editor.get_changes_log()[0]['status'] == 'failed'),
+        ('failed change rolled back', footnote_text(editor.find_footnote(2)[0], 2, 't') == before
+         and editor.find_footnote(2)[0].getparent() is not None),
+    ]
+
+for name, ok in checks:
+    all_pass &= bool(ok)
+    print(f'{"✓" if ok else "✗ FAIL"} {name}')
+
+print()
+print('✓ ALL TESTS PASSED' if all_pass else '✗ SOME TESTS FAILED')
+sys.exit(0 if all_pass else 1)
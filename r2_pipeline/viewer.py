@@ -517,6 +517,22 @@ HTML_TEMPLATE = """
 
                         <p><strong>Reasoning:</strong> {{ citation.support_analysis.reasoning }}</p>
                         <p><strong>Recommendation:</strong> <code>{{ citation.recommendation or 'None' }}</code></p>
+
+                        {% if citation.evidence %}
+                        <details>
+                            <summary style="font-size: 0.85em;">
+                                Evidence sent: {{ citation.evidence.passages_sent | length }} of {{ citation.evidence.passages_considered }} passages
+                                (~{{ citation.evidence.sent_tokens }} of {{ citation.evidence.source_tokens }} tokens)
+                            </summary>
+                            {% for passage in citation.evidence.passages_sent %}
+                            <div class="mt-1" style="font-size: 0.85em;">
+                                <span class="badge bg-{{ 'danger' if passage.source == 'redbox' else 'secondary' }}">{{ passage.id }}</span>
+                                <small class="text-muted">page {{ passage.page }}, score {{ passage.score }}</small>
+                                <div style="color: #555;">{{ passage.text }}</div>
+                            </div>
+                            {% endfor %}
+                        </details>
+                        {% endif %}
                     </div>
                     {% endif %}
 